@@ -111,6 +111,10 @@ MAX_CLIP_SAT_FRAC: float = _env_float("AION_ML_MAX_CLIP_SATURATION_FRAC", 0.18)
 MAX_STATS_SAMPLES: int = _env_int("AION_ML_MAX_STATS_SAMPLES", 200_000)
 MAX_VAL_SAMPLES: int = _env_int("AION_ML_MAX_VAL_SAMPLES", 80_000)
 
+# Shared multi-horizon training matrix: rows kept by the single-pass reservoir.
+# Each horizon still fits on at most 800k of these rows.
+TRAIN_MATRIX_MAX_ROWS: int = _env_int("AION_ML_TRAIN_MATRIX_MAX_ROWS", 1_600_000)
+
 # Dynamic clip controls
 CLIP_FACTOR: float = _env_float("AION_ML_CLIP_FACTOR", 1.20)
 MIN_CLIP_SHORT: float = _env_float("AION_ML_MIN_CLIP_SHORT", 0.03)
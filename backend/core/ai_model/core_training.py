@@ -31,6 +31,9 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
@@ -44,7 +47,22 @@ from backend.core.sector_training.sector_inference import SectorModelStore
 
 store = SectorModelStore()
 
-from backend.core.memmap_trainer import train_lgbm_memmap_reservoir
+from backend.core.memmap_trainer import (
+    LGBM_DATASET_PARAMS,
+    MatrixHandle,
+    TrainingMatrix,
+    build_training_matrix,
+    load_lgbm_binary,
+    open_training_matrix,
+    save_lgbm_binary,
+    train_lgbm_memmap_reservoir,
+    train_lgbm_on_rows,
+)
+from backend.core.training_scheduler import (
+    TrainingScheduler,
+    get_training_scheduler,
+    training_scheduler_enabled,
+)
 from backend.core.confidence_calibrator import (
     load_calibration_map,
     load_accuracy_latest,
@@ -95,6 +113,7 @@ from backend.core.ai_model.target_builder import (
     MAX_TARGET_ZERO_FRAC,
     MAX_STATS_SAMPLES,
     MAX_VAL_SAMPLES,
+    TRAIN_MATRIX_MAX_ROWS,
     HARD_MAX_ABS_RET,
     MIN_PRED_STD,
     MIN_CONF,
@@ -105,6 +124,7 @@ from backend.core.ai_model.target_builder import (
     # internal helpers (leading underscore) referenced by core_training
     _preflight_dataset_or_die,
     _stream_target_stats,
+    _target_stats_from_samples,
     _clip_limit_for_horizon,
     _iter_parquet_batches,
     _stream_validation_sample,
@@ -115,11 +135,17 @@ from backend.core.ai_model.target_builder import (
     _save_return_stats,
     _load_return_stats,
     _last_close_asof,
-    _try_import_pyarrow,
 )
-from backend.core.ai_model.trainer import _make_regressor, _tune_lightgbm_regressor
+from backend.core.ai_model.dataset_cache import LgbmDatasetCache, lgbm_dataset_cache_enabled
+from backend.core.ai_model.trainer import (
+    _make_regressor,
+    _score_lgbm_datasets,
+    _score_lgbm_params,
+    _tune_lightgbm_batched,
+    _tune_lightgbm_regressor,
+)
 from backend.core.ai_model.sanity_gates import _post_train_sanity
-from backend.core.ai_model.feature_pipeline import _load_feature_list
+from backend.core.ai_model.feature_pipeline import _latest_rows_from_dataset, _load_feature_list
 
 # Exported for legacy callers (e.g., sector_training) that import from
 # core_training directly.
@@ -173,6 +199,506 @@ def _resolve_dataset_path(dataset_name: str) -> Path:
 # (Imported from target_builder; do not redefine here — keep single source of truth.)
 # ==========================================================
 
+# ==========================================================
+# SHARED TRAINING MATRIX
+# ==========================================================
+def _shared_matrix_enabled() -> bool:
+    return os.getenv("AION_ML_SHARED_MATRIX", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def build_shared_training_matrix(
+    dataset_name: str = "training_data_daily.parquet",
+    batch_size: int = 150_000,
+    symbol_whitelist: Optional[set[str]] = None,
+    feature_cols: Optional[List[str]] = None,
+    target_cols: Optional[List[str]] = None,
+) -> TrainingMatrix:
+    """Single parquet pass -> float32 feature memmap + one target column per horizon.
+
+    Callers own the result and must call .cleanup() when done.
+    """
+    if feature_cols is None or target_cols is None:
+        feat_info = _load_feature_list()
+        feature_cols = feature_cols or feat_info.get("feature_columns", [])
+        target_cols = target_cols or feat_info.get("target_columns", [])
+
+    df_path = _resolve_dataset_path(dataset_name)
+    horizon_targets = [f"target_ret_{h}" for h in HORIZONS if f"target_ret_{h}" in (target_cols or [])]
+
+    mx = build_training_matrix(
+        parquet_path=str(df_path),
+        feature_cols=list(feature_cols or []),
+        target_cols=horizon_targets,
+        symbol_whitelist=symbol_whitelist,
+        tmp_root=str(TMP_MEMMAP_ROOT),
+        max_rows=int(TRAIN_MATRIX_MAX_ROWS),
+        batch_rows=int(batch_size),
+        seed=42,
+    )
+    log(
+        f"[ai_model] 🧱 Shared training matrix: rows_used={mx.rows_used}, rows_seen={mx.rows_seen}, "
+        f"features={len(mx.feature_cols)}, targets={len(mx.target_cols)}, ingest={mx.seconds_ingest:.1f}s"
+    )
+    return mx
+
+
+def _matrix_target_stats(mx: TrainingMatrix, target_col: str, row_mask: Optional[np.ndarray]) -> Dict[str, Any]:
+    if target_col not in mx.target_cols:
+        return {"status": "error", "error": f"target column missing from matrix: {target_col}"}
+    rows = mx.target_rows(target_col, row_mask)
+    sample = mx.target(target_col)[rows[: int(MAX_STATS_SAMPLES)]].astype(float)
+    sample = np.clip(sample, -float(HARD_MAX_ABS_RET), float(HARD_MAX_ABS_RET))
+    return _target_stats_from_samples(sample, mx.usable_rows_est(target_col, rows, row_mask))
+
+
+def _matrix_xy(
+    mx: TrainingMatrix,
+    target_col: str,
+    row_mask: Optional[np.ndarray],
+    *,
+    limit: int,
+    y_clip_low: float,
+    y_clip_high: float,
+    seed: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(X, y) for rows with a finite target: first `limit` rows, or a seeded sample."""
+    rows = mx.target_rows(target_col, row_mask)
+    if rows.size > limit:
+        if seed is None:
+            rows = rows[: int(limit)]
+        else:
+            rows = np.sort(np.random.default_rng(seed).choice(rows, size=int(limit), replace=False))
+    return mx.features(rows), mx.labels(target_col, rows, y_clip_low, y_clip_high)
+
+
+def _target_gate(horizon: str, tstats: Dict[str, Any]) -> Tuple[float, Optional[Dict[str, Any]]]:
+    """(clip_limit, skip summary or None) from a horizon's target stats."""
+    usable_est = int(tstats.get("usable_rows_est", 0) or 0)
+    y_std = float(tstats.get("std", 0.0) or 0.0)
+    y_zero_frac = float(tstats.get("zero_frac", 1.0) or 1.0)
+
+    clip_lim = _clip_limit_for_horizon(horizon, tstats)
+
+    log(
+        f"[ai_model] 📌 Horizon={horizon} target stats: "
+        f"usable_est={usable_est}, std={y_std:.6g}, zero_frac={y_zero_frac:.4f}, "
+        f"p01={tstats.get('p01'):.6g}, p50={tstats.get('p50'):.6g}, p99={tstats.get('p99'):.6g}, "
+        f"clip_limit={clip_lim:.4f}"
+    )
+
+    if usable_est < MIN_USABLE_ROWS:
+        return clip_lim, {"status": "skipped", "reason": f"too_few_usable_rows({usable_est}<{MIN_USABLE_ROWS})", "target_stats": tstats}
+
+    if y_std < MIN_TARGET_STD:
+        return clip_lim, {"status": "skipped", "reason": f"low_target_variance(std<{MIN_TARGET_STD})", "target_stats": tstats}
+
+    if y_zero_frac >= MAX_TARGET_ZERO_FRAC:
+        return clip_lim, {"status": "skipped", "reason": f"targets_mostly_zero(zero_frac>={MAX_TARGET_ZERO_FRAC})", "target_stats": tstats}
+
+    return clip_lim, None
+
+
+def _finalize_lgbm_horizon(
+    horizon: str,
+    booster: Any,
+    mm: Any,
+    Xv: np.ndarray,
+    yv: np.ndarray,
+    *,
+    tstats: Dict[str, Any],
+    clip_lim: float,
+    feature_cols: List[str],
+    model_root: Path,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Sanity-gate a trained booster; save it (and track importance) unless rejected.
+
+    Returns (horizon summary, validation diagnostics).
+    """
+    vdiag = _post_train_sanity(booster, Xv, yv, horizon=horizon, clip_limit=float(clip_lim))
+
+    if vdiag.get("status") == "reject":
+        log(f"[ai_model] 🧨 Rejecting horizon={horizon}: {vdiag.get('reject_reason')}")
+        return {
+            "status": "rejected",
+            "reason": vdiag.get("reject_reason"),
+            "target_stats": tstats,
+            "validation": vdiag,
+            "rows_seen": int(mm.rows_seen),
+            "rows_used": int(mm.rows_used),
+            "seconds_ingest": float(mm.seconds_ingest),
+            "seconds_train": float(mm.seconds_train),
+        }, vdiag
+
+    bp = _booster_path(horizon, model_root=model_root)
+    booster.save_model(str(bp))
+    dump(booster, _model_path(horizon, model_root=model_root))
+
+    summary = {
+        "status": "ok",
+        "model_path": str(_model_path(horizon, model_root=model_root)),
+        "booster_path": str(bp),
+        "target_stats": tstats,
+        "validation": vdiag,
+        "clip_limit": float(clip_lim),
+        "rows_seen": int(mm.rows_seen),
+        "rows_used": int(mm.rows_used),
+        "seconds_ingest": float(mm.seconds_ingest),
+        "seconds_train": float(mm.seconds_train),
+    }
+
+    # Track feature importance (adaptive ML pipeline)
+    try:
+        from backend.core.ai_model.feature_importance import FeatureImportanceTracker
+        importance_tracker = FeatureImportanceTracker()
+        top_features = importance_tracker.compute_importance(
+            booster,
+            feature_cols,
+            horizon,
+            top_n=20
+        )
+        summary["top_features"] = list(top_features.keys())[:5]
+    except Exception as e:
+        log(f"[ai_model] ⚠️ Feature importance tracking failed for {horizon}: {e}")
+
+    return summary, vdiag
+
+
+def _mark_return_stats(return_stats: Dict[str, Any], horizon: str, tstats: Dict[str, Any], vdiag: Dict[str, Any]) -> None:
+    """Flag return_stats[horizon] valid/invalid from post-train validation."""
+    try:
+        rs = return_stats.get(horizon) if isinstance(return_stats, dict) else None
+        if not isinstance(rs, dict):
+            rs = dict(tstats) if isinstance(tstats, dict) else {}
+            return_stats[horizon] = rs
+        rejected = vdiag.get("status") == "reject"
+        rs["valid_global"] = not rejected
+        rs["invalid_reason"] = str(vdiag.get("reject_reason") or "rejected") if rejected else None
+        if isinstance(vdiag, dict):
+            rs["validation"] = dict(vdiag)
+    except Exception:
+        pass
+
+
+def _lgbm_base_params() -> Dict[str, Any]:
+    return {
+        "objective": "regression",
+        "metric": "rmse",
+        "verbosity": -1,
+        "learning_rate": 0.05,
+        "num_leaves": 64,
+        "feature_fraction": 0.8,
+        "bagging_fraction": 0.8,
+        "bagging_freq": 1,
+        "min_data_in_leaf": 50,
+        "lambda_l2": 1.0,
+        "num_boost_round": 800,
+    }
+
+
+def _lgbm_binary_selection(mx: TrainingMatrix, clip_lim: float, **extra: Any) -> Dict[str, Any]:
+    """Everything besides features/partition/whitelist that decides the selected rows."""
+    return {"matrix_rows": int(mx.capacity), "clip": round(float(clip_lim), 10), **extra}
+
+
+def _optuna_binaries(
+    mx: TrainingMatrix,
+    tgt_ret: str,
+    row_mask: Optional[np.ndarray],
+    clip_lim: float,
+    *,
+    horizon: str,
+    dcache: LgbmDatasetCache,
+    symbol_whitelist: Optional[set[str]],
+) -> Tuple[Optional[str], Optional[str], int]:
+    """(train_bin, val_bin, rows) for the bounded Optuna sample, building them on a miss.
+
+    Paths are None when the sample is too small or the binaries could not be saved.
+    """
+    sel = _lgbm_binary_selection(mx, clip_lim, limit=250_000, test_size=0.2, split_seed=42)
+    tpath = dcache.path(horizon, "optuna_train", symbol_whitelist=symbol_whitelist, **sel)
+    vpath = dcache.path(horizon, "optuna_val", symbol_whitelist=symbol_whitelist, **sel)
+
+    cached = load_lgbm_binary(tpath)
+    if cached is not None and load_lgbm_binary(vpath) is not None:
+        dcache.record(True)
+        return tpath, vpath, int(cached[1].get("rows", 0))
+
+    dcache.record(False)
+    X, y = _matrix_xy(mx, tgt_ret, row_mask, limit=250_000, y_clip_low=-float(clip_lim), y_clip_high=float(clip_lim))
+    n = int(len(y))
+    if n < 5000:
+        return None, None, n
+
+    X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=42)
+    try:
+        dtrain = lgb.Dataset(X_train, label=y_train, params=dict(LGBM_DATASET_PARAMS), free_raw_data=True).construct()
+        dval = lgb.Dataset(
+            X_val, label=y_val, reference=dtrain, params=dict(LGBM_DATASET_PARAMS), free_raw_data=True
+        ).construct()
+        save_lgbm_binary(dval, vpath, dcache.meta(rows=n))
+        save_lgbm_binary(dtrain, tpath, dcache.meta(rows=n))
+    except Exception as e:
+        log(f"[ai_model] ⚠️ Could not persist Optuna datasets for {horizon}: {e}")
+        return None, None, n
+    return tpath, vpath, n
+
+
+# ==========================================================
+# SCHEDULED (PROCESS POOL) TRAINING
+# ==========================================================
+# Worker-side state: one reopened matrix and one Optuna split per process.
+_WORKER_MATRIX: Dict[str, Any] = {}
+_WORKER_OPTUNA: Dict[str, Any] = {}
+
+
+def _job_mem_bytes(rows: int, n_features: int) -> int:
+    """Rough peak RSS of one LightGBM job: feature copy + binned dataset + slack."""
+    return int(rows) * int(n_features) * 4 * 3 + 64 * 1024**2
+
+
+def _worker_matrix(handle: MatrixHandle, symbol_whitelist: Optional[set[str]]) -> Tuple[TrainingMatrix, Optional[np.ndarray]]:
+    key = handle.tmp_dir
+    if _WORKER_MATRIX.get("key") != key:
+        _WORKER_MATRIX.clear()
+        _WORKER_OPTUNA.clear()
+        _WORKER_MATRIX.update({"key": key, "mx": open_training_matrix(handle)})
+    mx = _WORKER_MATRIX["mx"]
+    return mx, mx.row_mask(symbol_whitelist)
+
+
+def _optuna_trial_job(
+    handle: MatrixHandle,
+    symbol_whitelist: Optional[set[str]],
+    target_col: str,
+    clip_lim: float,
+    params: Dict[str, Any],
+    binaries: Optional[Tuple[str, str]] = None,
+) -> float:
+    """One Optuna trial (validation RMSE) on the same bounded sample as the sequential path.
+
+    With `binaries` (cached train/val Datasets) the matrix is not touched.
+    """
+    params = dict(params)
+    params["num_threads"] = int(os.getenv("OMP_NUM_THREADS", "0") or 0)
+    if binaries is not None:
+        if _WORKER_OPTUNA.get("key") != binaries:
+            dtrain, _ = load_lgbm_binary(binaries[0]) or (None, None)
+            dval, _ = load_lgbm_binary(binaries[1], reference=dtrain) or (None, None)
+            _WORKER_OPTUNA.clear()
+            if dtrain is not None and dval is not None:
+                _WORKER_OPTUNA.update({"key": binaries, "datasets": (dtrain, dval)})
+        if "datasets" in _WORKER_OPTUNA:
+            return _score_lgbm_datasets(params, *_WORKER_OPTUNA["datasets"])
+
+    mx, row_mask = _worker_matrix(handle, symbol_whitelist)
+    key = f"{target_col}|{sorted(symbol_whitelist) if symbol_whitelist else ''}|{clip_lim}"
+    if _WORKER_OPTUNA.get("key") != key:
+        X, y = _matrix_xy(mx, target_col, row_mask, limit=250_000, y_clip_low=-clip_lim, y_clip_high=clip_lim)
+        _WORKER_OPTUNA.clear()
+        _WORKER_OPTUNA.update({"key": key, "split": train_test_split(X, y, test_size=0.2, random_state=42)})
+    X_train, X_val, y_train, y_val = _WORKER_OPTUNA["split"]
+    return _score_lgbm_params(params, X_train, y_train, X_val, y_val)
+
+
+def _fit_horizon_job(
+    handle: MatrixHandle,
+    symbol_whitelist: Optional[set[str]],
+    horizon: str,
+    params: Dict[str, Any],
+    tstats: Dict[str, Any],
+    clip_lim: float,
+    feature_cols: List[str],
+    model_root: str,
+    binary_cache: Optional[str] = None,
+    binary_meta: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Final fit + validation + save for one horizon (runs in a scheduler worker)."""
+    mx, row_mask = _worker_matrix(handle, symbol_whitelist)
+    tgt_ret = f"target_ret_{horizon}"
+    params = dict(params)
+    params["num_threads"] = int(os.getenv("OMP_NUM_THREADS", "0") or 0)
+    mm = train_lgbm_on_rows(
+        mx,
+        tgt_ret,
+        params,
+        row_mask,
+        max_rows=800_000,
+        min_rows=MIN_USABLE_ROWS,
+        seed=42,
+        y_clip_low=-float(clip_lim),
+        y_clip_high=float(clip_lim),
+        binary_cache=binary_cache,
+        binary_meta=binary_meta,
+    )
+    Xv, yv = _matrix_xy(
+        mx, tgt_ret, row_mask, limit=MAX_VAL_SAMPLES, y_clip_low=-float(clip_lim), y_clip_high=float(clip_lim), seed=42
+    )
+    summary, vdiag = _finalize_lgbm_horizon(
+        horizon,
+        mm.model,
+        mm,
+        Xv,
+        yv,
+        tstats=tstats,
+        clip_lim=float(clip_lim),
+        feature_cols=feature_cols,
+        model_root=Path(model_root),
+    )
+    summary["lgbm_dataset_cached"] = bool(mm.dataset_cached)
+    return summary, vdiag
+
+
+def _fit_binary_kwargs(
+    dcache: Optional[LgbmDatasetCache],
+    mx: TrainingMatrix,
+    horizon: str,
+    clip_lim: float,
+    symbol_whitelist: Optional[set[str]],
+) -> Dict[str, Any]:
+    """train_lgbm_on_rows(binary_cache=..., binary_meta=...) for the final fit."""
+    if dcache is None:
+        return {}
+    sel = _lgbm_binary_selection(mx, clip_lim, max_rows=800_000, seed=42)
+    return {
+        "binary_cache": dcache.path(horizon, "fit", symbol_whitelist=symbol_whitelist, **sel),
+        "binary_meta": dcache.meta(),
+    }
+
+
+def _train_horizons_scheduled(
+    sched: TrainingScheduler,
+    mx: TrainingMatrix,
+    row_mask: Optional[np.ndarray],
+    *,
+    symbol_whitelist: Optional[set[str]],
+    feature_cols: List[str],
+    target_cols: List[str],
+    use_optuna: bool,
+    n_trials: int,
+    model_root: Path,
+    job_group: str,
+    dcache: Optional[LgbmDatasetCache] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Run every horizon's Optuna trials and final fit as scheduler jobs.
+
+    One light coordinator thread per horizon drives the ask/tell loop and
+    waits on its jobs; the scheduler bounds real concurrency.
+    """
+    handle = mx.handle()
+    # The whitelist is only a row mask when the matrix was built unfiltered.
+    wl = symbol_whitelist if row_mask is not None else None
+    summaries: Dict[str, Any] = {}
+    return_stats: Dict[str, Any] = {}
+    lock = threading.Lock()
+
+    def _one(horizon: str) -> None:
+        tgt_ret = f"target_ret_{horizon}"
+        try:
+            _feature_map_path(horizon, model_root=model_root).write_text(json.dumps(feature_cols, indent=2), encoding="utf-8")
+        except Exception:
+            pass
+
+        tstats = _matrix_target_stats(mx, tgt_ret, row_mask)
+        if tstats.get("status") != "ok":
+            with lock:
+                summaries[horizon] = {"status": "error", "error": f"target_stats_failed: {tstats.get('error')}"}
+            return
+
+        clip_lim, skip = _target_gate(horizon, tstats)
+        if skip is not None:
+            with lock:
+                summaries[horizon] = skip
+            return
+
+        tstats["clip_limit"] = float(clip_lim)
+        with lock:
+            return_stats[horizon] = dict(tstats)
+
+        n_rows = int(len(mx.target_rows(tgt_ret, row_mask)))
+        base = _lgbm_base_params()
+        if use_optuna and n_trials and n_trials > 0:
+            n_opt = min(250_000, n_rows)
+            binaries: Optional[Tuple[str, str]] = None
+            if dcache is not None and n_opt >= 5000:
+                tpath, vpath, _ = _optuna_binaries(
+                    mx, tgt_ret, row_mask, clip_lim, horizon=horizon, dcache=dcache, symbol_whitelist=symbol_whitelist
+                )
+                binaries = (tpath, vpath) if (tpath and vpath) else None
+            if n_opt >= 5000:
+                mem = _job_mem_bytes(n_opt, len(feature_cols))
+
+                def evaluate(batch: List[Dict[str, Any]]) -> List[float]:
+                    futs = [
+                        sched.submit(
+                            f"{job_group}/{horizon}/optuna",
+                            _optuna_trial_job,
+                            {
+                                "handle": handle,
+                                "symbol_whitelist": wl,
+                                "target_col": tgt_ret,
+                                "clip_lim": float(clip_lim),
+                                "params": params,
+                                "binaries": binaries,
+                            },
+                            group=job_group,
+                            mem_bytes=mem,
+                        )
+                        for params in batch
+                    ]
+                    scores: List[float] = []
+                    for f in futs:
+                        try:
+                            scores.append(float(f.result()))
+                        except Exception as e:
+                            log(f"[ai_model] ⚠️ Optuna trial failed for {horizon}: {e}")
+                            scores.append(float("nan"))
+                    return scores
+
+                base.update(
+                    _tune_lightgbm_batched(evaluate, horizon, n_trials=int(n_trials), batch_size=sched.budget.max_workers) or {}
+                )
+            else:
+                log(f"[ai_model] ⚠️ Not enough rows for Optuna sample on {horizon}. Skipping tuning.")
+
+        fut = sched.submit(
+            f"{job_group}/{horizon}/fit",
+            _fit_horizon_job,
+            {
+                "handle": handle,
+                "symbol_whitelist": wl,
+                "horizon": horizon,
+                "params": base,
+                "tstats": tstats,
+                "clip_lim": float(clip_lim),
+                "feature_cols": list(feature_cols),
+                "model_root": str(model_root),
+                **_fit_binary_kwargs(dcache, mx, horizon, clip_lim, symbol_whitelist),
+            },
+            group=job_group,
+            mem_bytes=_job_mem_bytes(min(800_000, n_rows), len(feature_cols)),
+        )
+        try:
+            summary, vdiag = fut.result()
+        except Exception as e:
+            log(f"[ai_model] ❌ Scheduled training failed for {horizon}: {e}")
+            with lock:
+                summaries[horizon] = {"status": "error", "error": str(e), "target_stats": tstats}
+            return
+
+        if dcache is not None:
+            dcache.record(bool(summary.get("lgbm_dataset_cached")))
+        with lock:
+            summaries[horizon] = summary
+            _mark_return_stats(return_stats, horizon, tstats, vdiag)
+
+    horizons = [h for h in HORIZONS if f"target_ret_{h}" in target_cols]
+    with ThreadPoolExecutor(max_workers=max(1, len(horizons))) as coord:
+        for f in [coord.submit(_one, h) for h in horizons]:
+            f.result()
+
+    return summaries, return_stats
+
+
 def train_model(
     dataset_name: str = "training_data_daily.parquet",
     use_optuna: bool = True,
@@ -180,7 +706,20 @@ def train_model(
     batch_size: int = 150_000,
     symbol_whitelist: Optional[set[str]] = None,
     model_root: Path | None = None,
+    matrix: Optional[TrainingMatrix] = None,
+    job_group: str = "global",
 ) -> Dict[str, Any]:
+    """Train one regressor per horizon.
+
+    All horizons train from row masks over one shared TrainingMatrix (built
+    here with a single parquet pass unless the caller passes `matrix`, in
+    which case symbol_whitelist becomes a row mask over it).
+    AION_ML_SHARED_MATRIX=0 restores per-horizon parquet streaming.
+
+    With LightGBM and the shared matrix available, horizon fits and Optuna
+    trials run as jobs on the process-wide TrainingScheduler (tagged with
+    `job_group`); AION_TRAIN_SCHEDULER=0 keeps the sequential loop.
+    """
     log(f"[ai_model] 🧠 Training regression models v1.7.0 (optuna={use_optuna}, batch_rows={batch_size})")
 
     model_root = model_root or MODEL_ROOT
@@ -199,7 +738,34 @@ def train_model(
     summaries: Dict[str, Any] = {}
     return_stats: Dict[str, Any] = {}
 
-    for horizon in HORIZONS:
+    mx = matrix
+    owns_matrix = False
+    if mx is None and _shared_matrix_enabled():
+        try:
+            mx = build_shared_training_matrix(
+                dataset_name=str(df_path),
+                batch_size=batch_size,
+                symbol_whitelist=symbol_whitelist,
+                feature_cols=feature_cols,
+                target_cols=target_cols,
+            )
+            owns_matrix = True
+        except Exception as e:
+            log(f"[ai_model] ⚠️ Shared training matrix failed; streaming per horizon: {e}")
+            mx = None
+    row_mask = mx.row_mask(symbol_whitelist) if (mx is not None and not owns_matrix) else None
+
+    dcache: Optional[LgbmDatasetCache] = None
+    if mx is not None and HAS_LGBM and lgbm_dataset_cache_enabled():
+        dcache = LgbmDatasetCache(Path(model_root), feature_cols, df_path)
+        dcache.prune()
+
+    sched: Optional[TrainingScheduler] = None
+    if mx is not None and HAS_LGBM and training_scheduler_enabled():
+        sched = get_training_scheduler()
+    t_sched = time.time()
+
+    for horizon in (HORIZONS if sched is None else []):
         tgt_ret = f"target_ret_{horizon}"
         if tgt_ret not in target_cols:
             continue
@@ -210,42 +776,25 @@ def train_model(
         except Exception:
             pass
 
-        tstats = _stream_target_stats(
-            df_path,
-            tgt_ret,
-            batch_size=max(50_000, int(batch_size)),
-            max_samples=MAX_STATS_SAMPLES,
-            symbol_whitelist=symbol_whitelist,
-        )
+        if mx is not None:
+            tstats = _matrix_target_stats(mx, tgt_ret, row_mask)
+        else:
+            tstats = _stream_target_stats(
+                df_path,
+                tgt_ret,
+                batch_size=max(50_000, int(batch_size)),
+                max_samples=MAX_STATS_SAMPLES,
+                symbol_whitelist=symbol_whitelist,
+            )
         if tstats.get("status") != "ok":
             summaries[horizon] = {"status": "error", "error": f"target_stats_failed: {tstats.get('error')}"}
             continue
 
-        usable_est = int(tstats.get("usable_rows_est", 0) or 0)
-        y_std = float(tstats.get("std", 0.0) or 0.0)
-        y_zero_frac = float(tstats.get("zero_frac", 1.0) or 1.0)
-
-        clip_lim = _clip_limit_for_horizon(horizon, tstats)
+        clip_lim, skip = _target_gate(horizon, tstats)
         y_clip_low = -clip_lim
         y_clip_high = clip_lim
-
-        log(
-            f"[ai_model] 📌 Horizon={horizon} target stats: "
-            f"usable_est={usable_est}, std={y_std:.6g}, zero_frac={y_zero_frac:.4f}, "
-            f"p01={tstats.get('p01'):.6g}, p50={tstats.get('p50'):.6g}, p99={tstats.get('p99'):.6g}, "
-            f"clip_limit={clip_lim:.4f}"
-        )
-
-        if usable_est < MIN_USABLE_ROWS:
-            summaries[horizon] = {"status": "skipped", "reason": f"too_few_usable_rows({usable_est}<{MIN_USABLE_ROWS})", "target_stats": tstats}
-            continue
-
-        if y_std < MIN_TARGET_STD:
-            summaries[horizon] = {"status": "skipped", "reason": f"low_target_variance(std<{MIN_TARGET_STD})", "target_stats": tstats}
-            continue
-
-        if y_zero_frac >= MAX_TARGET_ZERO_FRAC:
-            summaries[horizon] = {"status": "skipped", "reason": f"targets_mostly_zero(zero_frac>={MAX_TARGET_ZERO_FRAC})", "target_stats": tstats}
+        if skip is not None:
+            summaries[horizon] = skip
             continue
 
         tstats["clip_limit"] = float(clip_lim)
@@ -256,19 +805,7 @@ def train_model(
         # --------------------------
         if HAS_LGBM:
             try:
-                base = {
-                    "objective": "regression",
-                    "metric": "rmse",
-                    "verbosity": -1,
-                    "learning_rate": 0.05,
-                    "num_leaves": 64,
-                    "feature_fraction": 0.8,
-                    "bagging_fraction": 0.8,
-                    "bagging_freq": 1,
-                    "min_data_in_leaf": 50,
-                    "lambda_l2": 1.0,
-                    "num_boost_round": 800,
-                }
+                base = _lgbm_base_params()
 
                 tuned: Dict[str, Any] = {}
                 if use_optuna and n_trials and n_trials > 0:
@@ -278,139 +815,127 @@ def train_model(
                     X_parts: List[np.ndarray] = []
                     y_parts: List[np.ndarray] = []
                     total_used = 0
-
-                    for df_batch in _iter_parquet_batches(df_path, needed_cols, batch_size=batch_size, symbol_whitelist=symbol_whitelist):
-                        if df_batch.empty or tgt_ret not in df_batch.columns:
-                            continue
-
-                        y_raw = pd.to_numeric(df_batch[tgt_ret], errors="coerce").replace([np.inf, -np.inf], np.nan)
-                        mask = y_raw.notna()
-                        if not mask.any():
-                            continue
-
-                        X_df = df_batch.loc[mask, feature_cols]
-                        X_df = X_df.apply(pd.to_numeric, errors="coerce").replace([np.inf, -np.inf], np.nan).fillna(0.0)
-
-                        y = y_raw.loc[mask].clip(lower=y_clip_low, upper=y_clip_high).to_numpy(dtype=np.float32, copy=False)
-                        X = X_df.to_numpy(dtype=np.float32, copy=False)
-
-                        if X.size == 0 or y.size == 0:
-                            continue
-
-                        X_parts.append(X)
-                        y_parts.append(y)
-                        total_used += int(len(y))
-                        if total_used >= 250_000:
-                            break
-
-                    if total_used >= 5000:
-                        X_all = np.concatenate(X_parts, axis=0)
-                        y_all = np.concatenate(y_parts, axis=0)
+                    optuna_datasets = None
+
+                    if mx is not None and dcache is not None:
+                        tpath, vpath, total_used = _optuna_binaries(
+                            mx, tgt_ret, row_mask, clip_lim, horizon=horizon, dcache=dcache, symbol_whitelist=symbol_whitelist
+                        )
+                        dtrain, _ = load_lgbm_binary(tpath) if tpath else (None, None)
+                        dval, _ = load_lgbm_binary(vpath, reference=dtrain) if (vpath and dtrain is not None) else (None, None)
+                        if dtrain is not None and dval is not None:
+                            optuna_datasets = (dtrain, dval)
+                    if mx is not None and optuna_datasets is None:
+                        X_opt, y_opt = _matrix_xy(
+                            mx, tgt_ret, row_mask, limit=250_000, y_clip_low=y_clip_low, y_clip_high=y_clip_high
+                        )
+                        X_parts, y_parts = [X_opt], [y_opt]
+                        total_used = int(len(y_opt))
+                    elif mx is None:
+                        for df_batch in _iter_parquet_batches(df_path, needed_cols, batch_size=batch_size, symbol_whitelist=symbol_whitelist):
+                            if df_batch.empty or tgt_ret not in df_batch.columns:
+                                continue
+
+                            y_raw = pd.to_numeric(df_batch[tgt_ret], errors="coerce").replace([np.inf, -np.inf], np.nan)
+                            mask = y_raw.notna()
+                            if not mask.any():
+                                continue
+
+                            X_df = df_batch.loc[mask, feature_cols]
+                            X_df = X_df.apply(pd.to_numeric, errors="coerce").replace([np.inf, -np.inf], np.nan).fillna(0.0)
+
+                            y = y_raw.loc[mask].clip(lower=y_clip_low, upper=y_clip_high).to_numpy(dtype=np.float32, copy=False)
+                            X = X_df.to_numpy(dtype=np.float32, copy=False)
+
+                            if X.size == 0 or y.size == 0:
+                                continue
+
+                            X_parts.append(X)
+                            y_parts.append(y)
+                            total_used += int(len(y))
+                            if total_used >= 250_000:
+                                break
+
+                    if optuna_datasets is not None and total_used >= 5000:
+                        tuned = _tune_lightgbm_regressor(None, None, horizon, n_trials=int(n_trials), datasets=optuna_datasets)
+                    elif total_used >= 5000:
+                        X_all = np.concatenate(X_parts, axis=0) if len(X_parts) > 1 else X_parts[0]
+                        y_all = np.concatenate(y_parts, axis=0) if len(y_parts) > 1 else y_parts[0]
                         tuned = _tune_lightgbm_regressor(X_all, y_all, horizon, n_trials=int(n_trials))
                     else:
                         log(f"[ai_model] ⚠️ Not enough rows for Optuna sample on {horizon}. Skipping tuning.")
 
                 base.update(tuned or {})
 
-                mm = train_lgbm_memmap_reservoir(
-                    parquet_path=str(df_path),
-                    feature_cols=feature_cols,
-                    target_col=tgt_ret,
-                    lgb_params=base,
-                    symbol_whitelist=symbol_whitelist,
-                    tmp_root=str(TMP_MEMMAP_ROOT),
-                    max_rows=800_000,
-                    batch_rows=int(batch_size),
-                    min_rows=MIN_USABLE_ROWS,
-                    seed=42,
-                    cleanup=True,
-                    y_clip_low=float(y_clip_low),
-                    y_clip_high=float(y_clip_high),
-                )
+                if mx is not None:
+                    mm = train_lgbm_on_rows(
+                        mx,
+                        tgt_ret,
+                        base,
+                        row_mask,
+                        max_rows=800_000,
+                        min_rows=MIN_USABLE_ROWS,
+                        seed=42,
+                        y_clip_low=float(y_clip_low),
+                        y_clip_high=float(y_clip_high),
+                        **_fit_binary_kwargs(dcache, mx, horizon, clip_lim, symbol_whitelist),
+                    )
+                    if dcache is not None:
+                        dcache.record(mm.dataset_cached)
+                else:
+                    mm = train_lgbm_memmap_reservoir(
+                        parquet_path=str(df_path),
+                        feature_cols=feature_cols,
+                        target_col=tgt_ret,
+                        lgb_params=base,
+                        symbol_whitelist=symbol_whitelist,
+                        tmp_root=str(TMP_MEMMAP_ROOT),
+                        max_rows=800_000,
+                        batch_rows=int(batch_size),
+                        min_rows=MIN_USABLE_ROWS,
+                        seed=42,
+                        cleanup=True,
+                        y_clip_low=float(y_clip_low),
+                        y_clip_high=float(y_clip_high),
+                    )
 
                 booster = mm.model
 
-                Xv, yv = _stream_validation_sample(
-                    df_path,
+                if mx is not None:
+                    Xv, yv = _matrix_xy(
+                        mx,
+                        tgt_ret,
+                        row_mask,
+                        limit=MAX_VAL_SAMPLES,
+                        y_clip_low=float(y_clip_low),
+                        y_clip_high=float(y_clip_high),
+                        seed=42,
+                    )
+                else:
+                    Xv, yv = _stream_validation_sample(
+                        df_path,
+                        feature_cols=feature_cols,
+                        target_col=tgt_ret,
+                        batch_size=max(50_000, int(batch_size)),
+                        max_rows=MAX_VAL_SAMPLES,
+                        seed=42,
+                        y_clip_low=float(y_clip_low),
+                        y_clip_high=float(y_clip_high),
+                        symbol_whitelist=symbol_whitelist,
+                    )
+
+                summaries[horizon], vdiag = _finalize_lgbm_horizon(
+                    horizon,
+                    booster,
+                    mm,
+                    Xv,
+                    yv,
+                    tstats=tstats,
+                    clip_lim=float(clip_lim),
                     feature_cols=feature_cols,
-                    target_col=tgt_ret,
-                    batch_size=max(50_000, int(batch_size)),
-                    max_rows=MAX_VAL_SAMPLES,
-                    seed=42,
-                    y_clip_low=float(y_clip_low),
-                    y_clip_high=float(y_clip_high),
-                    symbol_whitelist=symbol_whitelist,
+                    model_root=model_root,
                 )
-
-                vdiag = _post_train_sanity(booster, Xv, yv, horizon=horizon, clip_limit=float(clip_lim))
-
-                if vdiag.get("status") == "reject":
-                    summaries[horizon] = {
-                        "status": "rejected",
-                        "reason": vdiag.get("reject_reason"),
-                        "target_stats": tstats,
-                        "validation": vdiag,
-                        "rows_seen": int(mm.rows_seen),
-                        "rows_used": int(mm.rows_used),
-                        "seconds_ingest": float(mm.seconds_ingest),
-                        "seconds_train": float(mm.seconds_train),
-                    }
-                    log(f"[ai_model] 🧨 Rejecting horizon={horizon}: {vdiag.get('reject_reason')}")
-                    try:
-                        rs = return_stats.get(horizon) if isinstance(return_stats, dict) else None
-                        if not isinstance(rs, dict):
-                            rs = dict(tstats) if isinstance(tstats, dict) else {}
-                            return_stats[horizon] = rs
-                        rs["valid_global"] = False
-                        rs["invalid_reason"] = str(vdiag.get("reject_reason") or "rejected")
-                        if isinstance(vdiag, dict):
-                            rs["validation"] = dict(vdiag)
-                    except Exception:
-                        pass
-                    continue
-
-                bp = _booster_path(horizon, model_root=model_root)
-                booster.save_model(str(bp))
-                dump(booster, _model_path(horizon, model_root=model_root))
-
-                summaries[horizon] = {
-                    "status": "ok",
-                    "model_path": str(_model_path(horizon, model_root=model_root)),
-                    "booster_path": str(bp),
-                    "target_stats": tstats,
-                    "validation": vdiag,
-                    "clip_limit": float(clip_lim),
-                    "rows_seen": int(mm.rows_seen),
-                    "rows_used": int(mm.rows_used),
-                    "seconds_ingest": float(mm.seconds_ingest),
-                    "seconds_train": float(mm.seconds_train),
-                }
-                
-                # Track feature importance (adaptive ML pipeline)
-                try:
-                    from backend.core.ai_model.feature_importance import FeatureImportanceTracker
-                    importance_tracker = FeatureImportanceTracker()
-                    top_features = importance_tracker.compute_importance(
-                        booster,
-                        feature_cols,
-                        horizon,
-                        top_n=20
-                    )
-                    summaries[horizon]["top_features"] = list(top_features.keys())[:5]
-                except Exception as e:
-                    log(f"[ai_model] ⚠️ Feature importance tracking failed for {horizon}: {e}")
-
-                try:
-                    rs = return_stats.get(horizon) if isinstance(return_stats, dict) else None
-                    if not isinstance(rs, dict):
-                        rs = dict(tstats) if isinstance(tstats, dict) else {}
-                        return_stats[horizon] = rs
-                    rs["valid_global"] = True
-                    rs["invalid_reason"] = None
-                    if isinstance(vdiag, dict):
-                        rs["validation"] = dict(vdiag)
-                except Exception:
-                    pass
+                _mark_return_stats(return_stats, horizon, tstats, vdiag)
             except Exception as e:
                 log(f"[ai_model] ❌ Memmap training failed for {horizon}: {e}")
                 summaries[horizon] = {"status": "error", "error": str(e), "target_stats": tstats}
@@ -426,41 +951,48 @@ def train_model(
             y_parts: List[np.ndarray] = []
             total_used = 0
 
-            for df_batch in _iter_parquet_batches(df_path, needed_cols, batch_size=batch_size, symbol_whitelist=symbol_whitelist):
-                if df_batch.empty or tgt_ret not in df_batch.columns:
-                    continue
-
-                y_raw = pd.to_numeric(df_batch[tgt_ret], errors="coerce").replace([np.inf, -np.inf], np.nan)
-                mask = y_raw.notna()
-                if not mask.any():
-                    continue
-
-                X_df = (
-                    df_batch.loc[mask, feature_cols]
-                    .apply(pd.to_numeric, errors="coerce")
-                    .replace([np.inf, -np.inf], np.nan)
-                    .fillna(0.0)
+            if mx is not None:
+                X_rf, y_rf = _matrix_xy(
+                    mx, tgt_ret, row_mask, limit=500_000, y_clip_low=y_clip_low, y_clip_high=y_clip_high
                 )
+                X_parts, y_parts = [X_rf], [y_rf]
+                total_used = int(len(y_rf))
+            else:
+                for df_batch in _iter_parquet_batches(df_path, needed_cols, batch_size=batch_size, symbol_whitelist=symbol_whitelist):
+                    if df_batch.empty or tgt_ret not in df_batch.columns:
+                        continue
+
+                    y_raw = pd.to_numeric(df_batch[tgt_ret], errors="coerce").replace([np.inf, -np.inf], np.nan)
+                    mask = y_raw.notna()
+                    if not mask.any():
+                        continue
+
+                    X_df = (
+                        df_batch.loc[mask, feature_cols]
+                        .apply(pd.to_numeric, errors="coerce")
+                        .replace([np.inf, -np.inf], np.nan)
+                        .fillna(0.0)
+                    )
 
-                y = y_raw.loc[mask].clip(lower=y_clip_low, upper=y_clip_high).to_numpy(dtype=np.float32, copy=False)
-                X = X_df.to_numpy(dtype=np.float32, copy=False)
+                    y = y_raw.loc[mask].clip(lower=y_clip_low, upper=y_clip_high).to_numpy(dtype=np.float32, copy=False)
+                    X = X_df.to_numpy(dtype=np.float32, copy=False)
 
-                if X.size == 0 or y.size == 0:
-                    continue
+                    if X.size == 0 or y.size == 0:
+                        continue
 
-                X_parts.append(X)
-                y_parts.append(y)
-                total_used += int(len(y))
+                    X_parts.append(X)
+                    y_parts.append(y)
+                    total_used += int(len(y))
 
-                if total_used >= 500_000:
-                    break
+                    if total_used >= 500_000:
+                        break
 
             if total_used < 5000:
                 summaries[horizon] = {"status": "skipped", "reason": f"too_few_samples({total_used})", "target_stats": tstats}
                 continue
 
-            X_all = np.concatenate(X_parts, axis=0)
-            y_all = np.concatenate(y_parts, axis=0)
+            X_all = np.concatenate(X_parts, axis=0) if len(X_parts) > 1 else X_parts[0]
+            y_all = np.concatenate(y_parts, axis=0) if len(y_parts) > 1 else y_parts[0]
 
             X_train, X_val, y_train, y_val = train_test_split(X_all, y_all, test_size=0.2, random_state=42)
 
@@ -495,7 +1027,7 @@ def train_model(
                 "validation": vdiag,
                 "clip_limit": float(clip_lim),
             }
-            
+        
             # Track feature importance (adaptive ML pipeline)
             try:
                 from backend.core.ai_model.feature_importance import FeatureImportanceTracker
@@ -514,10 +1046,40 @@ def train_model(
             log(f"[ai_model] ❌ RF training failed for {horizon}: {e}")
             summaries[horizon] = {"status": "error", "error": str(e), "target_stats": tstats}
 
+    if sched is not None:
+        summaries, return_stats = _train_horizons_scheduled(
+            sched,
+            mx,
+            row_mask,
+            symbol_whitelist=symbol_whitelist,
+            feature_cols=feature_cols,
+            target_cols=target_cols,
+            use_optuna=use_optuna,
+            n_trials=n_trials,
+            model_root=Path(model_root),
+            job_group=job_group,
+            dcache=dcache,
+        )
+
+    if owns_matrix and mx is not None:
+        mx.cleanup()
+
     if return_stats:
         _save_return_stats(return_stats)
 
-    return {"status": "ok", "horizons": summaries}
+    out: Dict[str, Any] = {"status": "ok", "horizons": summaries}
+    if mx is not None:
+        out["training_matrix"] = {
+            "shared": not owns_matrix,
+            "rows_seen": int(mx.rows_seen),
+            "rows_used": int(mx.rows_used),
+            "seconds_ingest": float(mx.seconds_ingest),
+        }
+    if sched is not None:
+        out["scheduler"] = sched.report(group=job_group, since=t_sched)
+    if dcache is not None:
+        out["lgbm_dataset_cache"] = dcache.stats()
+    return out
 
 
 def train_all_models(
@@ -528,6 +1090,8 @@ def train_all_models(
     symbol_whitelist: Optional[set[str]] = None,
     model_root: Path | None = None,
     as_of_date: Optional[str] = None,  # NEW: for replay mode point-in-time filtering
+    matrix: Optional[TrainingMatrix] = None,
+    job_group: str = "global",
     **_: Any,
 ) -> Dict[str, Any]:
     # NOTE: Orchestration layers (nightly/replay) may pass extra keywords like
@@ -549,6 +1113,8 @@ def train_all_models(
         batch_size=batch_size,
         symbol_whitelist=symbol_whitelist,
         model_root=model_root,
+        matrix=matrix,
+        job_group=job_group,
     )
 
 
@@ -690,54 +1256,11 @@ def _load_latest_features_df(
         except Exception as e:
             log(f"[ai_model] ⚠️ Failed preparing latest_features snapshot df: {e}")
 
-    pa, ds = _try_import_pyarrow()
-    if pa is None or ds is None:
-        raise RuntimeError(
-            "No latest_features snapshot and pyarrow unavailable for fallback prediction load."
-        )
-
-    df_path = Path(PATHS["ML_DATASET_DAILY"])
-    cols = ["symbol", "asof_date"] + required_feature_cols
-
-    latest_map: Dict[str, Tuple[str, np.ndarray]] = {}
-
-    for df_batch in _iter_parquet_batches(
-        df_path,
-        cols,
-        batch_size=200_000,
+    return _latest_rows_from_dataset(
+        Path(PATHS["ML_DATASET_DAILY"]),
+        required_feature_cols,
         symbol_whitelist=symbol_whitelist,
-    ):
-        if df_batch.empty:
-            continue
-
-        df_batch["symbol"] = df_batch["symbol"].astype(str).str.upper()
-        df_batch["asof_date"] = df_batch["asof_date"].astype(str)
-
-        feats = (
-            df_batch[required_feature_cols]
-            .apply(pd.to_numeric, errors="coerce")
-            .replace([np.inf, -np.inf], np.nan)
-            .fillna(0.0)
-            .to_numpy(dtype=np.float32, copy=False)
-        )
-
-        syms = df_batch["symbol"].values
-        dates = df_batch["asof_date"].values
-
-        for i in range(len(df_batch)):
-            s = str(syms[i])
-            d = str(dates[i])
-            prev = latest_map.get(s)
-            if prev is None or d > prev[0]:
-                latest_map[s] = (d, feats[i].copy())
-
-    if not latest_map:
-        raise RuntimeError("Prediction feature fallback produced no rows.")
-
-    symbols = sorted(latest_map.keys())
-    mat = np.vstack([latest_map[s][1] for s in symbols]).astype(np.float32, copy=False)
-    out = pd.DataFrame(mat, index=symbols, columns=required_feature_cols)
-    return out
+    )
 
 
 # ==========================================================
@@ -0,0 +1,182 @@
+"""backend.core.ai_model.dataset_cache
+
+Persisted LightGBM binary Datasets, reused between nightly runs.
+
+Building an lgb.Dataset from numpy re-bins every feature, and the nightly
+run did that for every horizon's Optuna sample and final fit even when the
+feature list and the training rows had not changed. The binned Datasets are
+now saved next to the model artifacts:
+
+    <model_root>/lgbm_datasets/<horizon>.<role>.<digest>.bin (+ .bin.json)
+
+role is "fit", "optuna_train" or "optuna_val". The digest covers
+    • the feature list hash (_load_feature_list() output),
+    • the dataset partition fingerprint (parquet size + footer hash, which
+      covers row counts, schema and column statistics, + RAW date partitions,
+      so new partitions change it but a byte-identical rewrite does not),
+    • the row selection (horizon target, symbol whitelist, caps, seed, clip),
+    • the LightGBM version (binary format).
+
+Any change produces a new digest (a miss); files whose sidecar records a
+different feature hash or partition fingerprint are pruned at the start
+of training.
+
+AION_LGBM_DATASET_CACHE=0 disables the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import lightgbm as lgb  # type: ignore
+    _LGB_VERSION = str(getattr(lgb, "__version__", "unknown"))
+except Exception:
+    _LGB_VERSION = "none"
+
+from backend.core.data_pipeline import log
+
+LGBM_DATASET_DIRNAME = "lgbm_datasets"
+
+
+def lgbm_dataset_cache_enabled() -> bool:
+    return os.getenv("AION_LGBM_DATASET_CACHE", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def feature_list_hash(feature_cols: Iterable[str]) -> str:
+    return hashlib.sha1(json.dumps(list(feature_cols)).encode("utf-8")).hexdigest()[:16]
+
+
+_PARQUET_MAGIC = b"PAR1"
+
+
+def _parquet_footer_digest(p: Path, size: int) -> Optional[str]:
+    """sha1 of the parquet footer (row groups, row counts, schema, column stats)."""
+    if size < 12:
+        return None
+    with open(p, "rb") as f:
+        f.seek(size - 8)
+        tail = f.read(8)
+        if tail[4:] != _PARQUET_MAGIC:
+            return None
+        footer_len = int.from_bytes(tail[:4], "little")
+        if footer_len <= 0 or footer_len > size - 12:
+            return None
+        f.seek(size - 8 - footer_len)
+        return hashlib.sha1(f.read(footer_len)).hexdigest()
+
+
+def dataset_partition_fingerprint(parquet_path: Path) -> str:
+    """Content fingerprint of the training parquet and (if present) its RAW date partitions.
+
+    Keyed on the parquet footer rather than mtime, so the nightly dataset
+    phase rewriting unchanged rows keeps the persisted Datasets valid.
+    Files that are not parquet fall back to size + mtime.
+    """
+    p = Path(parquet_path)
+    parts: List[Any] = []
+    try:
+        st = p.stat()
+        footer = _parquet_footer_digest(p, int(st.st_size))
+        parts.append([int(st.st_size), footer if footer is not None else int(st.st_mtime_ns)])
+    except Exception:
+        parts.append(None)
+    raw_parts = p.with_name(p.stem + ".raw.parts")
+    if raw_parts.is_dir():
+        try:
+            parts.append(sorted(d.name for d in raw_parts.iterdir() if d.is_dir()))
+        except Exception:
+            pass
+    return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _whitelist_hash(symbol_whitelist: Optional[Iterable[str]]) -> str:
+    if not symbol_whitelist:
+        return "all"
+    syms = sorted({str(s).upper() for s in symbol_whitelist})
+    return hashlib.sha1(",".join(syms).encode("utf-8")).hexdigest()[:16]
+
+
+class LgbmDatasetCache:
+    """Path keying, lookup counters and pruning for one model root."""
+
+    def __init__(self, model_root: Path, feature_cols: List[str], parquet_path: Path):
+        self.root = Path(model_root) / LGBM_DATASET_DIRNAME
+        self.feature_hash = feature_list_hash(feature_cols)
+        self.partition = dataset_partition_fingerprint(parquet_path)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "pruned": 0}
+
+    def path(
+        self,
+        horizon: str,
+        role: str,
+        *,
+        symbol_whitelist: Optional[Iterable[str]] = None,
+        **selection: Any,
+    ) -> str:
+        """Binary Dataset path for one (horizon, role, row selection)."""
+        key = {
+            "features": self.feature_hash,
+            "partition": self.partition,
+            "horizon": str(horizon),
+            "role": str(role),
+            "whitelist": _whitelist_hash(symbol_whitelist),
+            "lightgbm": _LGB_VERSION,
+            "selection": {k: selection[k] for k in sorted(selection)},
+        }
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        return str(self.root / f"{horizon}.{role}.{digest}.bin")
+
+    def meta(self, **extra: Any) -> Dict[str, Any]:
+        """Sidecar fields used by prune()."""
+        return {"feature_hash": self.feature_hash, "partition": self.partition, **extra}
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            self._stats["hits" if hit else "misses"] += 1
+
+    def prune(self) -> int:
+        """Delete binaries built for another feature list or dataset partition set."""
+        if not self.root.is_dir():
+            return 0
+        removed = 0
+        for meta_path in self.root.glob("*.bin.json"):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except Exception:
+                meta = {}
+            if meta.get("feature_hash") == self.feature_hash and meta.get("partition") == self.partition:
+                continue
+            for f in (meta_path, meta_path.with_suffix("")):
+                try:
+                    f.unlink()
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    log(f"[ai_model] ⚠️ Failed removing stale LightGBM dataset {f}: {e}")
+            removed += 1
+        # Binaries without a sidecar and leftover temp files are partial writes.
+        orphans = [b for b in self.root.glob("*.bin") if not Path(str(b) + ".json").exists()]
+        for f in orphans + list(self.root.glob("*.tmp*")):
+            try:
+                f.unlink()
+                removed += 1
+            except Exception:
+                pass
+        if removed:
+            log(f"[ai_model] 🧹 Pruned {removed} stale LightGBM dataset(s) under {self.root}")
+        with self._lock:
+            self._stats["pruned"] += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+        out.update({"root": str(self.root), "feature_hash": self.feature_hash, "partition": self.partition})
+        return out
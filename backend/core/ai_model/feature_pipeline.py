@@ -3,7 +3,7 @@
 Includes:
 - pyarrow/parquet batch scanning helpers
 - latest_features snapshot loader
-- fallback loader that scans the training parquet for the latest row per symbol
+- fallback loader for the latest row per symbol (sidecar index, else Arrow scan)
 - feature_list loader: _load_feature_list()
 """
 
@@ -11,7 +11,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set
 
 import numpy as np
 import pandas as pd
@@ -166,53 +166,62 @@ def _load_latest_features_df(
         except Exception as e:
             log(f"[ai_model] ⚠️ Failed preparing latest_features snapshot df: {e}")
 
-    # Fallback: parquet scan for latest row per symbol
+    # Fallback: latest row per symbol straight from the dataset parquet
+    return _latest_rows_from_dataset(
+        _resolve_dataset_path(DATASET_FILE.name),
+        required_feature_cols,
+        symbol_whitelist=symbol_whitelist,
+    )
+
+
+def _latest_rows_from_dataset(
+    df_path: Path,
+    required_feature_cols: List[str],
+    *,
+    symbol_whitelist: Optional[Set[str]] = None,
+) -> pd.DataFrame:
+    """
+    Latest dataset row per symbol as a float32 frame indexed by symbol.
+
+    Uses the latest-row sidecar index written by build_ml_dataset when it is
+    present and current (reads only the row groups holding those rows);
+    otherwise scans the parquet and reduces each batch with Arrow compute.
+    """
     pa, ds = _try_import_pyarrow()
     if pa is None or ds is None:
         raise RuntimeError("No latest_features snapshot and pyarrow unavailable for fallback prediction load.")
 
-    df_path = _resolve_dataset_path(DATASET_FILE.name)
-    cols = ["symbol", "asof_date"] + list(required_feature_cols)
+    from backend.core import latest_row_index as lri
 
-    latest_map: Dict[str, Tuple[str, np.ndarray]] = {}
+    available = set(ds.dataset(str(df_path), format="parquet").schema.names)
+    feat_cols = [c for c in required_feature_cols if c in available]
 
-    for df_batch in _iter_parquet_batches(
-        df_path,
-        columns=cols,
-        batch_size=200_000,
-        symbol_whitelist=symbol_whitelist,
-    ):
-        if df_batch is None or df_batch.empty:
-            continue
-
-        if "symbol" not in df_batch.columns or "asof_date" not in df_batch.columns:
-            continue
-
-        df_batch["symbol"] = df_batch["symbol"].astype(str).str.upper()
-        df_batch["asof_date"] = df_batch["asof_date"].astype(str)
-
-        feats = (
-            df_batch[required_feature_cols]
-            .apply(pd.to_numeric, errors="coerce")
-            .replace([np.inf, -np.inf], np.nan)
-            .fillna(0.0)
-            .to_numpy(dtype=np.float32, copy=False)
+    table = None
+    if lri.latest_row_index_enabled():
+        try:
+            table = lri.read_latest_rows(df_path, feat_cols, symbol_whitelist=symbol_whitelist)
+        except Exception as e:
+            log(f"[ai_model] ⚠️ Latest-row index read failed; scanning dataset: {e}")
+            table = None
+    if table is None:
+        table = lri.scan_latest_rows(
+            df_path,
+            ["symbol", "asof_date"] + feat_cols,
+            symbol_whitelist=symbol_whitelist,
         )
 
-        syms = df_batch["symbol"].values
-        dates = df_batch["asof_date"].values
-
-        for i in range(len(df_batch)):
-            s = str(syms[i])
-            d = str(dates[i])
-            prev = latest_map.get(s)
-            if prev is None or d > prev[0]:
-                latest_map[s] = (d, feats[i].copy())
-
-    if not latest_map:
+    if table.num_rows == 0:
         raise RuntimeError("Prediction feature fallback produced no rows.")
 
-    symbols = sorted(latest_map.keys())
-    mat = np.vstack([latest_map[s][1] for s in symbols]).astype(np.float32, copy=False)
-    out = pd.DataFrame(mat, index=symbols, columns=required_feature_cols)
-    return out
+    df = table.to_pandas().set_index("symbol").sort_index()
+    df.index.name = None
+    for c in required_feature_cols:
+        if c not in df.columns:
+            df[c] = 0.0
+    out = (
+        df[required_feature_cols]
+        .apply(pd.to_numeric, errors="coerce")
+        .replace([np.inf, -np.inf], np.nan)
+        .fillna(0.0)
+    )
+    return out.astype(np.float32, copy=False)
@@ -42,6 +42,7 @@ from .constants import (
     MAX_CLIP_SAT_FRAC,
     MAX_STATS_SAMPLES,
     MAX_VAL_SAMPLES,
+    TRAIN_MATRIX_MAX_ROWS,
     CLIP_FACTOR,
     MIN_CLIP_SHORT,
     MIN_CLIP_LONG,
@@ -63,6 +64,7 @@ __all__ = [
     "MAX_TARGET_ZERO_FRAC",
     "MAX_STATS_SAMPLES",
     "MAX_VAL_SAMPLES",
+    "TRAIN_MATRIX_MAX_ROWS",
     "HARD_MAX_ABS_RET",
     "MIN_PRED_STD",
     "MIN_CONF",
@@ -72,6 +74,7 @@ __all__ = [
     "_try_import_pyarrow",
     "_preflight_dataset_or_die",
     "_stream_target_stats",
+    "_target_stats_from_samples",
     "_clip_limit_for_horizon",
     "_iter_parquet_batches",
     "_stream_validation_sample",
@@ -301,7 +304,12 @@ def _stream_target_stats(
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
-    if not samples:
+    return _target_stats_from_samples(np.asarray(samples, dtype=float), usable)
+
+
+def _target_stats_from_samples(samples: np.ndarray, usable: int) -> Dict[str, Any]:
+    """Target distribution stats from already-clipped finite samples."""
+    if samples.size == 0:
         return {
             "status": "ok",
             "usable_rows_est": int(usable),
@@ -316,7 +324,7 @@ def _stream_target_stats(
             "zero_frac": 1.0,
         }
 
-    y = np.array(samples, dtype=float)
+    y = np.asarray(samples, dtype=float)
     zero_frac = float(np.mean(np.isclose(y, 0.0, atol=1e-12)))
 
     return {
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 from backend.core.data_pipeline import log
@@ -32,52 +32,89 @@ def _make_regressor(params: Optional[dict] = None):
     )
 
 
+def _suggest_lgbm_params(trial: "optuna.trial.Trial") -> Dict[str, Any]:
+    """Optuna search space for the per-horizon LightGBM regressor."""
+    return {
+        "objective": "regression",
+        "metric": "rmse",
+        "verbosity": -1,
+        "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.2, log=True),
+        "num_leaves": trial.suggest_int("num_leaves", 16, 256),
+        "max_depth": trial.suggest_int("max_depth", 3, 12),
+        "feature_fraction": trial.suggest_float("feature_fraction", 0.6, 1.0),
+        "bagging_fraction": trial.suggest_float("bagging_fraction", 0.6, 1.0),
+        "bagging_freq": trial.suggest_int("bagging_freq", 0, 10),
+        "min_data_in_leaf": trial.suggest_int("min_data_in_leaf", 10, 200),
+        "lambda_l2": trial.suggest_float("lambda_l2", 1e-4, 10.0, log=True),
+    }
+
+
+def _score_lgbm_params(
+    params: Dict[str, Any],
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+) -> float:
+    """Validation RMSE of one early-stopped LightGBM fit."""
+    dtrain = lgb.Dataset(X_train, label=y_train, free_raw_data=True)
+    dval = lgb.Dataset(X_val, label=y_val, reference=dtrain, free_raw_data=True)
+
+    booster = lgb.train(
+        params,
+        dtrain,
+        num_boost_round=600,
+        valid_sets=[dval],
+        valid_names=["val"],
+        callbacks=[lgb.early_stopping(stopping_rounds=50, verbose=False)],
+    )
+    pred = booster.predict(X_val, num_iteration=booster.best_iteration)
+    return float(np.sqrt(mean_squared_error(y_val, pred)))
+
+
+def _score_lgbm_datasets(params: Dict[str, Any], dtrain: "lgb.Dataset", dval: "lgb.Dataset") -> float:
+    """Validation RMSE of one early-stopped fit on prebuilt (e.g. cached binary) Datasets."""
+    params = dict(params)
+    params["metric"] = "rmse"
+    booster = lgb.train(
+        params,
+        dtrain,
+        num_boost_round=600,
+        valid_sets=[dval],
+        valid_names=["val"],
+        callbacks=[lgb.early_stopping(stopping_rounds=50, verbose=False)],
+    )
+    return float(booster.best_score["val"]["rmse"])
+
+
 def _tune_lightgbm_regressor(
-    X: np.ndarray,
-    y: np.ndarray,
+    X: Optional[np.ndarray],
+    y: Optional[np.ndarray],
     horizon: str,
     n_trials: int = 100,  # Increased from 20 to 100 for proper hyperparameter tuning
+    datasets: Optional[Tuple["lgb.Dataset", "lgb.Dataset"]] = None,
 ) -> Dict[str, Any]:
+    """Optuna search; `datasets` = prebuilt (train, val) Datasets replaces the X/y split."""
     if not (HAS_OPTUNA and HAS_LGBM):
         return {}
 
-    if len(y) < 200:
+    if datasets is None and len(y) < 200:
         log(f"[ai_model] ⚠️ Skipping Optuna for {horizon}: too few samples ({len(y)})")
         return {}
 
     log(f"[ai_model] 🔍 Optuna regression tuning horizon={horizon}, trials={n_trials}")
 
-    X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=42)
-
-    def objective(trial: "optuna.trial.Trial") -> float:
-        params = {
-            "objective": "regression",
-            "metric": "rmse",
-            "verbosity": -1,
-            "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.2, log=True),
-            "num_leaves": trial.suggest_int("num_leaves", 16, 256),
-            "max_depth": trial.suggest_int("max_depth", 3, 12),
-            "feature_fraction": trial.suggest_float("feature_fraction", 0.6, 1.0),
-            "bagging_fraction": trial.suggest_float("bagging_fraction", 0.6, 1.0),
-            "bagging_freq": trial.suggest_int("bagging_freq", 0, 10),
-            "min_data_in_leaf": trial.suggest_int("min_data_in_leaf", 10, 200),
-            "lambda_l2": trial.suggest_float("lambda_l2", 1e-4, 10.0, log=True),
-        }
-
-        dtrain = lgb.Dataset(X_train, label=y_train, free_raw_data=True)
-        dval = lgb.Dataset(X_val, label=y_val, reference=dtrain, free_raw_data=True)
-
-        booster = lgb.train(
-            params,
-            dtrain,
-            num_boost_round=600,
-            valid_sets=[dval],
-            valid_names=["val"],
-            callbacks=[lgb.early_stopping(stopping_rounds=50, verbose=False)],
-        )
-        pred = booster.predict(X_val, num_iteration=booster.best_iteration)
-        rmse = float(np.sqrt(mean_squared_error(y_val, pred)))
-        return rmse
+    if datasets is not None:
+        dtrain, dval = datasets
+
+        def objective(trial: "optuna.trial.Trial") -> float:
+            return _score_lgbm_datasets(_suggest_lgbm_params(trial), dtrain, dval)
+
+    else:
+        X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=42)
+
+        def objective(trial: "optuna.trial.Trial") -> float:
+            return _score_lgbm_params(_suggest_lgbm_params(trial), X_train, y_train, X_val, y_val)
 
     study = optuna.create_study(direction="minimize")
     study.optimize(objective, n_trials=n_trials)
@@ -85,3 +122,40 @@ def _tune_lightgbm_regressor(
     best = study.best_params
     log(f"[ai_model] 🎯 Best regression params for {horizon}: {best}")
     return best
+
+
+def _tune_lightgbm_batched(
+    evaluate: Callable[[List[Dict[str, Any]]], List[float]],
+    horizon: str,
+    n_trials: int = 100,
+    batch_size: int = 4,
+) -> Dict[str, Any]:
+    """Ask/tell Optuna loop: `evaluate` scores a batch of param dicts (e.g. on a process pool).
+
+    Non-finite scores are told as failed trials.
+    """
+    if not (HAS_OPTUNA and HAS_LGBM):
+        return {}
+
+    log(f"[ai_model] 🔍 Optuna regression tuning horizon={horizon}, trials={n_trials} (batches of {batch_size})")
+
+    study = optuna.create_study(direction="minimize")
+    done = 0
+    while done < int(n_trials):
+        k = max(1, min(int(batch_size), int(n_trials) - done))
+        trials = [study.ask() for _ in range(k)]
+        scores = evaluate([_suggest_lgbm_params(t) for t in trials])
+        for trial, score in zip(trials, scores):
+            if score is not None and np.isfinite(score):
+                study.tell(trial, float(score))
+            else:
+                study.tell(trial, state=optuna.trial.TrialState.FAIL)
+        done += k
+
+    try:
+        best = study.best_params
+    except ValueError:
+        log(f"[ai_model] ⚠️ Optuna found no successful trial for {horizon}.")
+        return {}
+    log(f"[ai_model] 🎯 Best regression params for {horizon}: {best}")
+    return best
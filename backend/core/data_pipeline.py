@@ -1,4 +1,4 @@
-# backend/core/data_pipeline.py — v1.3 (Aligned: context is source-of-truth for news/social + AION brain support)
+# backend/core/data_pipeline.py — v1.4 (Aligned: context is source-of-truth for news/social + AION brain support + sharded rolling)
 """
 Data Pipeline — AION Analytics (Rolling Engine)
 
@@ -22,6 +22,29 @@ UPDATED (v1.3):
          - save_aion_brain()
       Uses canonical path via PATHS["brain"] (aion_brain.json.gz)
 
+UPDATED (v1.4):
+    ✅ Optional sharded rolling backend (AION_ROLLING_SHARDED=1):
+         - one gzip shard per symbol + manifest under PATHS["rolling_shards"]
+         - get_node(sym) / put_node(sym, node) touch only one shard
+         - save_rolling() rewrites only shards whose content changed
+         - _read_rolling() stays a compatibility shim that assembles the dict
+      AION_ROLLING_MONOLITH_MIRROR=1 (default) keeps rolling_body.json.gz
+      written too, for tools that open the file directly: every
+      save_rolling() rewrites it, put_node() leaves it to the next
+      save_rolling() or sync_rolling_mirror().
+    ✅ Rolling summary side index (AION_ROLLING_SUMMARY=1, default):
+         - save_rolling()/put_node() also write PATHS["rolling_summary"]
+           (symbol, name, sector, price, per-horizon score/confidence/
+           predicted_return, updated_at) as uncompressed numpy arrays
+         - read_rolling_summary() serves endpoints that only need those
+           fields without decompressing full histories
+    ✅ Process-wide rolling snapshot cache (AION_ROLLING_CACHE=1, default):
+         - _read_rolling() parses the source once per (path, size, mtime)
+           and returns a copy-on-write dict (nodes copied on first access)
+         - read_rolling_view() returns a read-only view with no copying
+         - save_rolling()/put_node() invalidate; rolling_cache_stats()
+           exposes hit/miss and parse-time counters
+
 NOTE:
     This version is aligned with backend.core.config.PATHS:
 
@@ -37,10 +60,14 @@ import json
 import gzip
 import shutil
 import os
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Callable, Tuple
 
 from backend.core.config import PATHS
+from backend.core.rolling_cache import FrozenDict, get_rolling_cache
+from backend.core.rolling_store import ShardedRollingStore, get_rolling_store
+from backend.core.rolling_summary import RollingSummary, RollingSummaryIndex, get_rolling_summary_index
 from utils.logger import log as _log  # shared logger
 
 # IMPORTANT:
@@ -65,6 +92,9 @@ if AION_BRAIN_PATH is None:
 BACKUP_DIR: Path = PATHS["rolling_backups"]
 BACKUP_DIR.mkdir(parents=True, exist_ok=True)
 
+ROLLING_SHARDS_DIR: Path = Path(PATHS.get("rolling_shards") or (ROLLING_BODY_PATH.parent / "rolling_shards"))
+ROLLING_SUMMARY_PATH: Path = Path(PATHS.get("rolling_summary") or (ROLLING_BODY_PATH.parent / "rolling_summary.npz"))
+
 HORIZONS = ["1d", "3d", "1w", "2w", "4w", "13w", "26w", "52w"]
 
 # Log read summaries (counts) can be noisy when UI polls /api/system/status.
@@ -72,6 +102,35 @@ HORIZONS = ["1d", "3d", "1w", "2w", "4w", "13w", "26w", "52w"]
 AION_LOG_READ_SUMMARY = os.getenv("AION_LOG_READ_SUMMARY", "0").strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def rolling_sharded_enabled() -> bool:
+    """Sharded rolling backend toggle (read per call so tests/replay can flip it)."""
+    return _env_bool("AION_ROLLING_SHARDED", "0")
+
+
+def _monolith_mirror_enabled() -> bool:
+    return _env_bool("AION_ROLLING_MONOLITH_MIRROR", "1")
+
+
+def _rolling_store() -> ShardedRollingStore:
+    return get_rolling_store(ROLLING_SHARDS_DIR)
+
+
+def rolling_summary_enabled() -> bool:
+    return _env_bool("AION_ROLLING_SUMMARY", "1")
+
+
+def _summary_index() -> RollingSummaryIndex:
+    return get_rolling_summary_index(ROLLING_SUMMARY_PATH)
+
+
+def rolling_cache_enabled() -> bool:
+    return _env_bool("AION_ROLLING_CACHE", "1")
+
+
 # -------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------
@@ -200,12 +259,101 @@ def _norm_dict_block(x: Any) -> Dict[str, Any]:
 # Public Loaders
 # -------------------------------------------------------------
 
+def _rolling_source() -> Tuple[Path, Callable[[], Dict[str, Any]]]:
+    """(file whose size/mtime identifies the current rolling, uncached loader).
+
+    With the sharded backend enabled this is the manifest and the store
+    assembles the dict from shards; until the first sharded save exists it
+    falls back to rolling_body.
+    """
+    if rolling_sharded_enabled():
+        store = _rolling_store()
+        if store.exists():
+            def _load_sharded() -> Dict[str, Any]:
+                data = store.load_all()
+                if AION_LOG_READ_SUMMARY:
+                    log(f"[data_pipeline] ℹ️ _read_rolling → {len(data)} keys from {ROLLING_SHARDS_DIR} (sharded)")
+                return data
+
+            return store.manifest_path, _load_sharded
+
+    def _load_body() -> Dict[str, Any]:
+        data = _load_json_gz(ROLLING_BODY_PATH)
+        if AION_LOG_READ_SUMMARY:
+            log(f"[data_pipeline] ℹ️ _read_rolling → {len(data)} keys from {ROLLING_BODY_PATH}")
+        return data
+
+    return Path(ROLLING_BODY_PATH), _load_body
+
+
 def _read_rolling() -> Dict[str, Any]:
-    """Load the canonical rolling snapshot."""
-    data = _load_json_gz(ROLLING_BODY_PATH)
-    if AION_LOG_READ_SUMMARY:
-        log(f"[data_pipeline] ℹ️ _read_rolling → {len(data)} keys from {ROLLING_BODY_PATH}")
-    return data
+    """Load the canonical rolling snapshot.
+
+    Served from the process-wide snapshot cache as a copy-on-write dict:
+    callers may mutate it (and its nodes) freely without affecting other
+    readers. AION_ROLLING_CACHE=0 parses the source on every call.
+    """
+    path, loader = _rolling_source()
+    if not rolling_cache_enabled():
+        return loader()
+    return get_rolling_cache().snapshot(path, loader).mutable()
+
+
+def read_rolling_view() -> FrozenDict:
+    """Read-only view of the cached rolling snapshot (no per-node copies).
+
+    Nested dicts/lists come back as read-only dict/list subclasses; call
+    .copy() on any of them for a mutable deep copy.
+    """
+    path, loader = _rolling_source()
+    if not rolling_cache_enabled():
+        return FrozenDict(loader())
+    return get_rolling_cache().snapshot(path, loader).view()
+
+
+def rolling_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/parse-time counters of the rolling snapshot cache."""
+    stats = get_rolling_cache().stats()
+    stats["enabled"] = rolling_cache_enabled()
+    return stats
+
+
+def _invalidate_rolling_cache() -> None:
+    get_rolling_cache().invalidate()
+
+
+_ROLLING_UPDATE_LOCK = threading.RLock()
+
+
+def rolling_update_lock() -> threading.RLock:
+    """In-process lock for whole-rolling read-modify-write cycles.
+
+    Writers that can run concurrently (the nightly fetch phases) hold it from
+    _read_rolling() to save_rolling() so none of them saves a stale copy over
+    another's fields. Do network I/O before taking it.
+    """
+    return _ROLLING_UPDATE_LOCK
+
+
+def get_node(sym: str) -> Dict[str, Any] | None:
+    """Load a single rolling node without parsing the whole universe (when sharded)."""
+    if rolling_sharded_enabled():
+        store = _rolling_store()
+        if store.exists():
+            node = store.get_node(str(sym))
+            return node if isinstance(node, dict) else None
+    node = _read_rolling().get(str(sym))
+    return node if isinstance(node, dict) else None
+
+
+def get_nodes(symbols: List[str]) -> Dict[str, Any]:
+    """Load only the requested rolling nodes (lazy per-shard when sharded)."""
+    if rolling_sharded_enabled():
+        store = _rolling_store()
+        if store.exists():
+            return store.get_nodes([str(s) for s in symbols])
+    rolling = _read_rolling()
+    return {str(s): rolling[str(s)] for s in symbols if str(s) in rolling}
 
 
 def _read_brain() -> Dict[str, Any]:
@@ -448,9 +596,142 @@ def save_rolling(rolling: Dict[str, Any], *, allow_empty: bool = False):
         return
 
     rolling = _normalize_rolling(rolling)
+
+    if rolling_sharded_enabled():
+        stats = _rolling_store().replace_all(rolling)
+        log(
+            f"[data_pipeline] 💾 rolling shards updated ({len(rolling)} symbols: "
+            f"{stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed)"
+        )
+        if not _monolith_mirror_enabled():
+            _invalidate_rolling_cache()
+            _write_rolling_summary(rolling)
+            return
+
     _backup_file(ROLLING_BODY_PATH)
     _save_json_gz(ROLLING_BODY_PATH, rolling)
+    _invalidate_rolling_cache()
     log(f"[data_pipeline] 💾 rolling.json.gz updated ({len(rolling)} symbols)")
+    _write_rolling_summary(rolling)
+
+
+def put_node(sym: str, node: Dict[str, Any]) -> None:
+    """Normalize & persist a single rolling node.
+
+    Sharded backend: one atomic shard write (plus manifest); the monolith
+    mirror is refreshed in batch by save_rolling()/sync_rolling_mirror().
+    Monolithic backend: read-modify-write of rolling_body via save_rolling().
+    """
+    if not isinstance(node, dict):
+        return
+    sym = str(sym)
+    norm = node if sym.startswith("_") else _normalize_symbol(node)
+
+    if rolling_sharded_enabled():
+        store = _rolling_store()
+        if not store.exists():
+            # First sharded write: seed shards from the current monolith so
+            # the store never holds a partial universe.
+            seed = _load_json_gz(ROLLING_BODY_PATH)
+            seed[sym] = norm
+            save_rolling(seed, allow_empty=True)
+            return
+        store.put_node(sym, norm)
+        _invalidate_rolling_cache()
+        _update_rolling_summary({sym: norm})
+        return
+
+    rolling = _read_rolling()
+    rolling[sym] = norm
+    save_rolling(rolling, allow_empty=True)
+
+
+def sync_rolling_mirror() -> bool:
+    """Rewrite rolling_body from the shards if put_node() left it stale.
+
+    The mirror is stale when the shard manifest is newer than rolling_body,
+    so any number of single-node writes costs one full rewrite here. The
+    nightly job calls this once after its last phase.
+    Returns True if rolling_body was rewritten.
+    """
+    if not (rolling_sharded_enabled() and _monolith_mirror_enabled()):
+        return False
+    store = _rolling_store()
+    try:
+        manifest_mtime = store.manifest_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    try:
+        if ROLLING_BODY_PATH.stat().st_mtime_ns >= manifest_mtime:
+            return False
+    except FileNotFoundError:
+        pass
+    rolling = store.load_all()
+    _backup_file(ROLLING_BODY_PATH)
+    _save_json_gz(ROLLING_BODY_PATH, rolling)
+    log(f"[data_pipeline] 💾 rolling.json.gz mirrored from shards ({len(rolling)} symbols)")
+    return True
+
+
+# -------------------------------------------------------------
+# Rolling summary side index
+# -------------------------------------------------------------
+
+def _write_rolling_summary(rolling: Dict[str, Any]) -> None:
+    """Best-effort rewrite of the summary index after a full rolling save."""
+    if not rolling_summary_enabled():
+        return
+    try:
+        _summary_index().write(rolling, HORIZONS)
+    except Exception as e:
+        log(f"[data_pipeline] ⚠️ rolling summary write failed: {e}")
+
+
+def _update_rolling_summary(nodes: Dict[str, Any]) -> None:
+    """Best-effort upsert of a few summary rows after put_node()."""
+    if not rolling_summary_enabled():
+        return
+    try:
+        _summary_index().update(nodes, HORIZONS)
+    except Exception as e:
+        log(f"[data_pipeline] ⚠️ rolling summary update failed: {e}")
+
+
+def _rolling_source_mtime_ns() -> int | None:
+    """mtime of whatever _read_rolling() would load (manifest or rolling_body)."""
+    path, _ = _rolling_source()
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def get_rolling_summary() -> RollingSummary:
+    """Columnar summary view (see backend.core.rolling_summary).
+
+    Rebuilt once from the full rolling when the index is missing or older
+    than the rolling source (e.g. rolling restored from a backup).
+    """
+    return _summary_index().read(
+        source_mtime_ns=_rolling_source_mtime_ns(),
+        load_rolling=read_rolling_view,
+        horizons=HORIZONS,
+        persist=rolling_summary_enabled(),
+    )
+
+
+def read_rolling_summary(symbols: List[str] | None = None) -> Dict[str, Dict[str, Any]]:
+    """Per-symbol summary rows without decompressing full histories.
+
+    Returns {SYM: {"symbol", "name", "sector", "price", "updated_at",
+    "predictions": {horizon: {"score", "confidence", "predicted_return"}}}}.
+    `price` is the first positive of price/last/close/c (None if unknown).
+    """
+    try:
+        return get_rolling_summary().rows(symbols)
+    except Exception as e:
+        log(f"[data_pipeline] ⚠️ read_rolling_summary failed: {e}")
+        return {}
 
 
 def save_brain(brain: Dict[str, Any]):
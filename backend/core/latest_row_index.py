@@ -0,0 +1,213 @@
+# backend/core/latest_row_index.py
+"""
+Latest-Row Index — AION Analytics
+
+Prediction needs the newest dataset row per symbol. When the
+latest_features snapshot is missing, the only way to get those rows used to
+be a full scan of training_data_daily.parquet that compared every row in a
+Python loop.
+
+This module does two things:
+
+    • reduce_latest() finds the latest row per symbol with Arrow compute. It
+      does a stable sort on (symbol, asof_date desc) and keeps the first row
+      of each symbol run. On an asof_date tie the first row seen wins, which
+      is what the old `d > prev` loop did.
+    • build_index() runs once per dataset build. It reads only the
+      symbol/asof_date columns of the FINAL parquet and writes a small
+      sidecar (symbol, asof_date, row, row_group, row_in_group).
+      read_latest_rows() then reads just the row groups that hold those
+      rows and takes them. There is no scan.
+
+The sidecar records the dataset's row count and byte size. If the dataset
+no longer matches it, read_latest_rows() returns None and the caller falls
+back to scan_latest_rows().
+
+Env knobs:
+    AION_LATEST_ROW_INDEX=0     don't build or consult the sidecar
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+import numpy as np
+
+from utils.logger import log
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+    import pyarrow.dataset as ds  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover
+    pa = pc = ds = pq = None  # type: ignore
+
+KEY_COLUMNS = ["symbol", "asof_date"]
+
+
+def latest_row_index_enabled() -> bool:
+    return os.getenv("AION_LATEST_ROW_INDEX", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def index_path_for(dataset_path: Path) -> Path:
+    """training_data_daily.parquet → training_data_daily.latest_rows.parquet"""
+    p = Path(dataset_path)
+    return p.with_name(f"{p.stem}.latest_rows.parquet")
+
+
+def normalize_keys(table: "pa.Table") -> "pa.Table":
+    """Symbols → upper-case strings, asof_date → strings (ISO dates sort lexically)."""
+    sym = pc.utf8_upper(pc.cast(table.column("symbol"), pa.string()))
+    asof = pc.cast(table.column("asof_date"), pa.string())
+    table = table.set_column(table.schema.get_field_index("symbol"), "symbol", sym)
+    table = table.set_column(table.schema.get_field_index("asof_date"), "asof_date", asof)
+    return table.filter(pc.is_valid(table.column("symbol")))
+
+
+def reduce_latest(table: "pa.Table", prev: Optional["pa.Table"] = None) -> "pa.Table":
+    """
+    One row per symbol: the max asof_date, first occurrence on ties.
+
+    `prev` is the result of an earlier reduce over preceding rows. It is put
+    in front, so on a tie it beats the new rows.
+    """
+    if prev is not None and prev.num_rows:
+        table = pa.concat_tables([prev, table.cast(prev.schema)])
+    if table.num_rows <= 1:
+        return table
+    order = pc.sort_indices(table, sort_keys=[("symbol", "ascending"), ("asof_date", "descending")])
+    table = table.take(order)
+    sym = table.column("symbol").combine_chunks()
+    first = pc.not_equal(sym.slice(1), sym.slice(0, len(sym) - 1)).fill_null(True)
+    keep = pa.concat_arrays([pa.array([True]), first])
+    return table.filter(keep)
+
+
+def _whitelist_filter(table: "pa.Table", symbol_whitelist: Optional[Set[str]]) -> "pa.Table":
+    if not symbol_whitelist:
+        return table
+    wl = pa.array(sorted({str(s).upper() for s in symbol_whitelist}), type=pa.string())
+    return table.filter(pc.is_in(table.column("symbol"), value_set=wl))
+
+
+def scan_latest_rows(
+    dataset_path: Path,
+    columns: List[str],
+    *,
+    symbol_whitelist: Optional[Set[str]] = None,
+    batch_size: int = 200_000,
+) -> "pa.Table":
+    """Full scan of `columns` (must include symbol/asof_date), reduced batch by batch."""
+    dataset = ds.dataset(str(dataset_path), format="parquet")
+    scanner = dataset.scanner(columns=list(columns), batch_size=int(batch_size))
+    latest: Optional[pa.Table] = None
+    for rb in scanner.to_batches():
+        if rb.num_rows <= 0:
+            continue
+        t = _whitelist_filter(normalize_keys(pa.Table.from_batches([rb])), symbol_whitelist)
+        if t.num_rows:
+            latest = reduce_latest(t, latest)
+    if latest is None:
+        return normalize_keys(dataset.schema.empty_table().select(list(columns)))
+    return latest
+
+
+def build_index(dataset_path: Path, index_path: Optional[Path] = None) -> int:
+    """Write the latest-row sidecar for `dataset_path`. Returns the symbol count."""
+    dataset_path = Path(dataset_path)
+    index_path = Path(index_path or index_path_for(dataset_path))
+    pf = pq.ParquetFile(str(dataset_path))
+
+    latest: Optional[pa.Table] = None
+    offset = 0
+    for rg in range(pf.num_row_groups):
+        t = normalize_keys(pf.read_row_group(rg, columns=KEY_COLUMNS))
+        n = pf.metadata.row_group(rg).num_rows
+        if t.num_rows != n:
+            # null symbols were dropped: recover positions from the raw column
+            valid = pc.is_valid(pf.read_row_group(rg, columns=["symbol"]).column("symbol"))
+            pos = pc.indices_nonzero(valid)
+        else:
+            pos = pa.array(np.arange(n, dtype=np.int64))
+        t = t.append_column("row_group", pa.array(np.full(t.num_rows, rg, dtype=np.int32)))
+        t = t.append_column("row_in_group", pc.cast(pos, pa.int64()))
+        t = t.append_column("row", pc.add(pc.cast(pos, pa.int64()), offset))
+        offset += n
+        latest = reduce_latest(t, latest)
+
+    if latest is None:
+        latest = pa.table(
+            {
+                "symbol": pa.array([], pa.string()),
+                "asof_date": pa.array([], pa.string()),
+                "row_group": pa.array([], pa.int32()),
+                "row_in_group": pa.array([], pa.int64()),
+                "row": pa.array([], pa.int64()),
+            }
+        )
+    latest = latest.replace_schema_metadata(
+        {
+            b"dataset_rows": str(pf.metadata.num_rows).encode(),
+            b"dataset_bytes": str(dataset_path.stat().st_size).encode(),
+        }
+    )
+    tmp = index_path.with_name(index_path.name + f".{os.getpid()}.tmp")
+    pq.write_table(latest, str(tmp), compression="snappy")
+    os.replace(tmp, index_path)
+    return int(latest.num_rows)
+
+
+def _load_index(dataset_path: Path, index_path: Path, pf: "pq.ParquetFile") -> Optional["pa.Table"]:
+    if not index_path.exists():
+        return None
+    idx = pq.read_table(str(index_path))
+    meta = idx.schema.metadata or {}
+    try:
+        rows = int(meta.get(b"dataset_rows", b"-1"))
+        size = int(meta.get(b"dataset_bytes", b"-1"))
+    except ValueError:
+        return None
+    if rows != pf.metadata.num_rows or size != dataset_path.stat().st_size:
+        log(f"[latest_row_index] ⚠️ Index {index_path.name} is stale for {dataset_path.name}; ignoring")
+        return None
+    return idx
+
+
+def read_latest_rows(
+    dataset_path: Path,
+    columns: Iterable[str],
+    *,
+    symbol_whitelist: Optional[Set[str]] = None,
+    index_path: Optional[Path] = None,
+) -> Optional["pa.Table"]:
+    """
+    Latest row per symbol via the sidecar index (None if missing or stale).
+
+    Only the row groups that hold a latest row are read.
+    """
+    dataset_path = Path(dataset_path)
+    index_path = Path(index_path or index_path_for(dataset_path))
+    pf = pq.ParquetFile(str(dataset_path))
+    idx = _load_index(dataset_path, index_path, pf)
+    if idx is None:
+        return None
+    idx = _whitelist_filter(idx, symbol_whitelist)
+
+    columns = [c for c in columns if c not in KEY_COLUMNS]
+    pieces: List[pa.Table] = []
+    groups = pc.unique(idx.column("row_group")).to_pylist() if idx.num_rows else []
+    for rg in sorted(groups):
+        sel = idx.filter(pc.equal(idx.column("row_group"), rg))
+        data = pf.read_row_group(int(rg), columns=columns).take(sel.column("row_in_group"))
+        for name in reversed(KEY_COLUMNS):
+            data = data.add_column(0, name, sel.column(name))
+        pieces.append(data)
+    if not pieces:
+        empty = pf.schema_arrow.empty_table().select(columns)
+        for name in reversed(KEY_COLUMNS):
+            empty = empty.add_column(0, name, pa.array([], pa.string()))
+        return empty
+    return pa.concat_tables(pieces)
@@ -12,16 +12,29 @@ OOM hardening upgrades (2025-12-28):
 - More efficient memmap writes (bulk fill while reservoir not full).
 - Debug option to keep memmap temp dir: set AION_KEEP_MEMMAP=1.
 - Safety cap for huge batch_rows: uses internal chunk_rows (default 4096) for conversion/writes.
+
+Shared multi-horizon matrix:
+- build_training_matrix() streams the parquet ONCE into a float32 feature
+  memmap plus a float32 target memmap (one column per horizon, NaN = no
+  target) and per-row symbol codes, reservoir-sampled like the trainer above.
+- Every horizon (and every sector via symbol masks) then trains from row
+  masks over that matrix with train_lgbm_on_rows() instead of rescanning.
+- TrainingMatrix.handle() is a small picklable description; worker
+  processes reopen the same files read-only with open_training_matrix().
+- train_lgbm_on_rows(binary_cache=...) reuses a saved LightGBM binary
+  Dataset (bins + labels) instead of gathering and re-binning the rows.
 """
 
 from __future__ import annotations
 
+import json
 import os
 import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import numpy as np
+import pandas as pd
 import lightgbm as lgb
 
 # -------------------------
@@ -48,6 +61,37 @@ class MemmapTrainResult:
     seconds_ingest: float
     seconds_train: float
     tmp_dir: str
+    dataset_cached: bool = False
+
+
+# Binary Datasets are reused with different tuned params; pre-filtering would
+# freeze min_data_in_leaf into the saved bins.
+LGBM_DATASET_PARAMS: Dict = {"feature_pre_filter": False, "verbosity": -1}
+
+
+def load_lgbm_binary(path: str, reference: Optional["lgb.Dataset"] = None) -> Optional[Tuple["lgb.Dataset", Dict]]:
+    """(Dataset, sidecar meta) for a saved binary Dataset, or None if absent/incomplete."""
+    meta_path = path + ".json"
+    if not (os.path.exists(path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except Exception:
+        return None
+    return lgb.Dataset(path, reference=reference, params=dict(LGBM_DATASET_PARAMS)), meta
+
+
+def save_lgbm_binary(dataset: "lgb.Dataset", path: str, meta: Dict) -> None:
+    """Atomically save a constructed Dataset plus its sidecar meta (meta last = commit)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    dataset.save_binary(tmp)
+    os.replace(tmp, path)
+    meta_tmp = f"{path}.json.tmp{os.getpid()}"
+    with open(meta_tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(meta_tmp, path + ".json")
 
 
 def _ensure_pyarrow() -> None:
@@ -257,6 +301,392 @@ def train_lgbm_memmap_reservoir(
     )
 
 
+# ==========================================================
+# Shared multi-horizon training matrix
+# ==========================================================
+
+def _column_float32(tsub: "pa.Table", name: str, length: int, fill: float) -> np.ndarray:
+    """One Arrow column as float32; non-numeric values coerce to NaN."""
+    if name not in tsub.column_names:
+        return np.full((length,), fill, dtype=np.float32)
+    col = tsub.column(name)
+    try:
+        a = np.asarray(col.to_numpy(zero_copy_only=False))
+        if a.dtype.kind in "fiub":
+            return _safe_float32(a)
+    except Exception:
+        pass
+    return pd.to_numeric(pd.Series(col.to_pandas()), errors="coerce").to_numpy(dtype=np.float32)
+
+
+def _reservoir_slots(rng: np.random.Generator, seen_before: int, m: int, max_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized reservoir step for m new rows once the reservoir is full.
+
+    Returns (source row positions, reservoir slots); when several rows hit
+    the same slot only the last one is kept, as in the sequential version.
+    """
+    t = np.arange(seen_before + 1, seen_before + m + 1, dtype=np.int64)
+    j = (rng.random(m) * t).astype(np.int64)
+    hit = np.flatnonzero(j < max_rows)
+    if hit.size == 0:
+        return hit, hit
+    slots = j[hit]
+    _, last = np.unique(slots[::-1], return_index=True)
+    keep = hit[::-1][last]
+    return keep, j[keep]
+
+
+@dataclass
+class TrainingMatrix:
+    """Reservoir sample of the training parquet shared by all horizons.
+
+    X: float32 [rows, features] (NaN where the source value was missing)
+    Y: float32 [rows, targets]  (NaN where the row has no target)
+    sym_codes: int32 [rows] index into `symbols` (-1 = unknown)
+    """
+
+    X: np.ndarray
+    Y: np.ndarray
+    sym_codes: np.ndarray
+    symbols: List[str]
+    feature_cols: List[str]
+    target_cols: List[str]
+    features_finite: np.ndarray
+    usable_counts: Dict[str, int]
+    rows_seen: int
+    rows_used: int
+    seconds_ingest: float
+    tmp_dir: str
+    capacity: int = 0
+    owner: bool = True
+
+    def handle(self) -> "MatrixHandle":
+        """Picklable handle for worker processes (writes codes/finite mask next to the memmaps)."""
+        for arr in (self.X, self.Y):
+            flush = getattr(arr, "flush", None)
+            if callable(flush):
+                flush()
+        np.save(os.path.join(self.tmp_dir, "sym_codes.npy"), np.asarray(self.sym_codes))
+        np.save(os.path.join(self.tmp_dir, "features_finite.npy"), np.asarray(self.features_finite))
+        return MatrixHandle(
+            tmp_dir=self.tmp_dir,
+            capacity=int(self.capacity or self.rows_used),
+            rows_used=int(self.rows_used),
+            rows_seen=int(self.rows_seen),
+            feature_cols=list(self.feature_cols),
+            target_cols=list(self.target_cols),
+            symbols=list(self.symbols),
+            usable_counts=dict(self.usable_counts),
+        )
+
+    def target(self, target_col: str) -> np.ndarray:
+        return self.Y[:, self.target_cols.index(target_col)]
+
+    def row_mask(self, symbol_whitelist: Optional[Set[str]]) -> Optional[np.ndarray]:
+        """Rows whose symbol is in the whitelist (None = all rows)."""
+        wl = _norm_whitelist(symbol_whitelist)
+        if not wl:
+            return None
+        codes = [i for i, s in enumerate(self.symbols) if s in wl]
+        return np.isin(self.sym_codes, np.asarray(codes, dtype=np.int32))
+
+    def target_rows(self, target_col: str, row_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Row indices with a finite target (optionally within row_mask)."""
+        ok = np.isfinite(self.target(target_col))
+        if row_mask is not None:
+            ok &= row_mask
+        return np.flatnonzero(ok)
+
+    def usable_rows_est(self, target_col: str, rows: np.ndarray, row_mask: Optional[np.ndarray]) -> int:
+        """Usable rows in the full stream: exact without a mask, scaled from the sample otherwise."""
+        if row_mask is None:
+            return int(self.usable_counts.get(target_col, 0))
+        scale = float(self.rows_seen) / float(max(1, self.rows_used))
+        return int(round(len(rows) * scale))
+
+    def features(self, rows: np.ndarray) -> np.ndarray:
+        """Feature rows copied into RAM with non-finite values set to 0.0."""
+        X = np.asarray(self.X[rows], dtype=np.float32)
+        if not np.isfinite(X).all():
+            X = np.nan_to_num(X, nan=0.0, posinf=0.0, neginf=0.0)
+        return X
+
+    def labels(self, target_col: str, rows: np.ndarray, y_clip_low: float | None, y_clip_high: float | None) -> np.ndarray:
+        y = np.asarray(self.target(target_col)[rows], dtype=np.float32)
+        if y_clip_low is not None and y_clip_high is not None:
+            y = np.clip(y, float(y_clip_low), float(y_clip_high))
+        return y
+
+    def cleanup(self) -> None:
+        if not self.owner:
+            return
+        if os.getenv("AION_KEEP_MEMMAP", "0") != "1":
+            self.X = self.Y = np.empty((0, 0), dtype=np.float32)
+            _cleanup_dir(self.tmp_dir)
+
+
+@dataclass
+class MatrixHandle:
+    """Everything needed to reopen a TrainingMatrix in another process."""
+
+    tmp_dir: str
+    capacity: int
+    rows_used: int
+    rows_seen: int
+    feature_cols: List[str]
+    target_cols: List[str]
+    symbols: List[str]
+    usable_counts: Dict[str, int]
+
+
+def open_training_matrix(handle: MatrixHandle) -> TrainingMatrix:
+    """Read-only view of a matrix built by another process (never deletes files)."""
+    shape_x = (int(handle.capacity), len(handle.feature_cols))
+    shape_y = (int(handle.capacity), len(handle.target_cols))
+    X = np.memmap(os.path.join(handle.tmp_dir, "X.float32.mmap"), mode="r", dtype=np.float32, shape=shape_x)
+    Y = np.memmap(os.path.join(handle.tmp_dir, "Y.float32.mmap"), mode="r", dtype=np.float32, shape=shape_y)
+    n = int(handle.rows_used)
+    return TrainingMatrix(
+        X=X[:n],
+        Y=Y[:n],
+        sym_codes=np.load(os.path.join(handle.tmp_dir, "sym_codes.npy")),
+        symbols=list(handle.symbols),
+        feature_cols=list(handle.feature_cols),
+        target_cols=list(handle.target_cols),
+        features_finite=np.load(os.path.join(handle.tmp_dir, "features_finite.npy")),
+        usable_counts=dict(handle.usable_counts),
+        rows_seen=int(handle.rows_seen),
+        rows_used=n,
+        seconds_ingest=0.0,
+        tmp_dir=str(handle.tmp_dir),
+        capacity=int(handle.capacity),
+        owner=False,
+    )
+
+
+def build_training_matrix(
+    parquet_path: str,
+    feature_cols: List[str],
+    target_cols: List[str],
+    symbol_whitelist: Optional[Set[str]] = None,
+    *,
+    tmp_root: str,
+    max_rows: int = 1_600_000,
+    batch_rows: int = 100_000,
+    seed: int = 42,
+) -> TrainingMatrix:
+    """Stream parquet once -> reservoir sample of rows with any finite target."""
+    _ensure_pyarrow()
+
+    if max_rows <= 0:
+        raise ValueError("max_rows must be positive")
+    n_features = len(feature_cols)
+    n_targets = len(target_cols)
+    if n_features == 0:
+        raise ValueError("feature_cols is empty")
+    if n_targets == 0:
+        raise ValueError("target_cols is empty")
+
+    os.makedirs(tmp_root, exist_ok=True)
+    run_id = f"mx_{int(time.time())}_{os.getpid()}_{np.random.default_rng(seed).integers(0, 1_000_000)}"
+    tmp_dir = os.path.join(tmp_root, run_id)
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    X_mm = np.memmap(os.path.join(tmp_dir, "X.float32.mmap"), mode="w+", dtype=np.float32, shape=(max_rows, n_features))
+    Y_mm = np.memmap(os.path.join(tmp_dir, "Y.float32.mmap"), mode="w+", dtype=np.float32, shape=(max_rows, n_targets))
+    codes = np.full((max_rows,), -1, dtype=np.int32)
+
+    symbols: List[str] = []
+    sym_index: Dict[str, int] = {}
+    usable = np.zeros((n_targets,), dtype=np.int64)
+    rows_seen = 0
+    rows_used = 0
+
+    ingest_start = time.time()
+    symbol_whitelist_u = _norm_whitelist(symbol_whitelist)
+
+    pf = pq.ParquetFile(parquet_path)
+    schema_names = set(pf.schema_arrow.names)
+    cols = [c for c in list(feature_cols) + list(target_cols) if c in schema_names]
+    has_symbol = "symbol" in schema_names
+    if has_symbol:
+        cols.append("symbol")
+
+    chunk_rows = int(os.getenv("AION_MEMMAP_CHUNK_ROWS", "4096"))
+    chunk_rows = max(256, min(50_000, chunk_rows))
+
+    for batch in pf.iter_batches(batch_size=int(batch_rows), columns=cols):
+        tbl = pa.Table.from_batches([batch])
+        n_batch = int(tbl.num_rows)
+        if n_batch <= 0:
+            continue
+
+        keep_mask = None
+        if symbol_whitelist_u is not None:
+            keep_mask = _arrow_mask_for_symbols(tbl, symbol_whitelist_u)
+
+        for start in range(0, n_batch, chunk_rows):
+            length = min(chunk_rows, n_batch - start)
+            tsub = tbl.slice(start, length)
+
+            km = None
+            if keep_mask is not None:
+                km = keep_mask[start : start + length]
+                if km.size == 0 or not km.any():
+                    continue
+
+            X_chunk = np.stack([_column_float32(tsub, c, length, 0.0) for c in feature_cols], axis=1)
+            Y_chunk = np.stack([_column_float32(tsub, c, length, np.nan) for c in target_cols], axis=1)
+            Y_chunk[~np.isfinite(Y_chunk)] = np.nan
+
+            row_ok = np.isfinite(Y_chunk).any(axis=1)
+            if km is not None:
+                row_ok &= km
+            if not row_ok.all():
+                X_chunk = X_chunk[row_ok]
+                Y_chunk = Y_chunk[row_ok]
+
+            # Symbol codes for kept rows only (filtered symbols never enter `symbols`)
+            if has_symbol:
+                raw = tsub.column("symbol").to_pandas().astype(str).str.upper().to_numpy()[row_ok]
+                uniq, inv = np.unique(raw, return_inverse=True)
+                for u in uniq.tolist():
+                    if u not in sym_index:
+                        sym_index[u] = len(symbols)
+                        symbols.append(u)
+                c_chunk = np.asarray([sym_index[u] for u in uniq.tolist()], dtype=np.int32)[inv]
+            else:
+                c_chunk = np.full((int(row_ok.sum()),), -1, dtype=np.int32)
+
+            m = int(X_chunk.shape[0])
+            if m == 0:
+                continue
+            usable += np.isfinite(Y_chunk).sum(axis=0)
+
+            take = 0
+            if rows_used < max_rows:
+                take = min(m, max_rows - rows_used)
+                X_mm[rows_used : rows_used + take] = X_chunk[:take]
+                Y_mm[rows_used : rows_used + take] = Y_chunk[:take]
+                codes[rows_used : rows_used + take] = c_chunk[:take]
+                rows_used += take
+                rows_seen += take
+            if take < m:
+                src, slots = _reservoir_slots(rng, rows_seen, m - take, max_rows)
+                src = src + take
+                X_mm[slots] = X_chunk[src]
+                Y_mm[slots] = Y_chunk[src]
+                codes[slots] = c_chunk[src]
+                rows_seen += m - take
+
+    X = X_mm[:rows_used]
+    features_finite = np.ones((rows_used,), dtype=bool)
+    for start in range(0, rows_used, 65_536):
+        features_finite[start : start + 65_536] = np.isfinite(X[start : start + 65_536]).all(axis=1)
+
+    return TrainingMatrix(
+        X=X,
+        Y=Y_mm[:rows_used],
+        sym_codes=codes[:rows_used],
+        symbols=symbols,
+        feature_cols=list(feature_cols),
+        target_cols=list(target_cols),
+        features_finite=features_finite,
+        usable_counts={c: int(n) for c, n in zip(target_cols, usable.tolist())},
+        rows_seen=int(rows_seen),
+        rows_used=int(rows_used),
+        seconds_ingest=float(time.time() - ingest_start),
+        tmp_dir=str(tmp_dir),
+        capacity=int(max_rows),
+    )
+
+
+def train_lgbm_on_rows(
+    matrix: TrainingMatrix,
+    target_col: str,
+    lgb_params: Dict,
+    row_mask: Optional[np.ndarray] = None,
+    *,
+    max_rows: int = 800_000,
+    min_rows: int = 20_000,
+    seed: int = 42,
+    y_clip_low: float | None = None,
+    y_clip_high: float | None = None,
+    binary_cache: Optional[str] = None,
+    binary_meta: Optional[Dict] = None,
+) -> MemmapTrainResult:
+    """Train LGBM on matrix rows with a finite target and finite features.
+
+    Same row rule as train_lgbm_memmap_reservoir; rows above max_rows are
+    subsampled uniformly (seeded).
+
+    binary_cache: path of a LightGBM binary Dataset for exactly this row
+    selection. Loaded when present; otherwise written after the fit (with
+    binary_meta in its sidecar). The caller owns keying/invalidation: the
+    path must change whenever the selected rows would.
+    """
+    ingest_start = time.time()
+    if binary_cache:
+        cached = load_lgbm_binary(binary_cache)
+        if cached is not None:
+            dtrain, meta = cached
+            seconds_ingest = time.time() - ingest_start
+            train_start = time.time()
+            model = lgb.train(
+                params=lgb_params, train_set=dtrain, num_boost_round=int(lgb_params.get("num_boost_round", 800))
+            )
+            return MemmapTrainResult(
+                model=model,
+                rows_seen=int(meta.get("rows_seen", 0)),
+                rows_used=int(meta.get("rows_used", 0)),
+                seconds_ingest=float(seconds_ingest),
+                seconds_train=float(time.time() - train_start),
+                tmp_dir=str(matrix.tmp_dir),
+                dataset_cached=True,
+            )
+
+    rows = matrix.target_rows(target_col, row_mask)
+    rows = rows[matrix.features_finite[rows]]
+    rows_seen = int(rows.size)
+    if rows.size > max_rows:
+        rows = np.sort(np.random.default_rng(seed).choice(rows, size=int(max_rows), replace=False))
+    rows_used = int(rows.size)
+
+    if rows_used < min_rows:
+        raise RuntimeError(
+            f"Not enough training rows for {target_col}: rows_used={rows_used}, min_rows={min_rows}"
+        )
+
+    X_train = np.asarray(matrix.X[rows], dtype=np.float32)
+    y_train = matrix.labels(target_col, rows, y_clip_low, y_clip_high)
+    seconds_ingest = time.time() - ingest_start
+
+    train_start = time.time()
+    if binary_cache:
+        dtrain = lgb.Dataset(X_train, label=y_train, params=dict(LGBM_DATASET_PARAMS), free_raw_data=False)
+    else:
+        dtrain = lgb.Dataset(X_train, label=y_train, free_raw_data=False)
+    num_boost_round = int(lgb_params.get("num_boost_round", 800))
+    model = lgb.train(params=lgb_params, train_set=dtrain, num_boost_round=num_boost_round)
+    seconds_train = time.time() - train_start
+
+    if binary_cache:
+        try:
+            save_lgbm_binary(dtrain, binary_cache, {**(binary_meta or {}), "rows_seen": rows_seen, "rows_used": rows_used})
+        except Exception:
+            pass
+
+    return MemmapTrainResult(
+        model=model,
+        rows_seen=rows_seen,
+        rows_used=rows_used,
+        seconds_ingest=float(seconds_ingest),
+        seconds_train=float(seconds_train),
+        tmp_dir=str(matrix.tmp_dir),
+    )
+
+
 def _cleanup_dir(path: str) -> None:
     try:
         for root, dirs, files in os.walk(path, topdown=False):
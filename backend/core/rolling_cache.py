@@ -0,0 +1,369 @@
+# backend/core/rolling_cache.py
+"""
+Rolling Snapshot Cache — AION Analytics
+
+_read_rolling() is called from dozens of places (routers, policy engine,
+context state, supervisor, continuous learning, fetchers). Without a cache
+each call re-decompresses and re-parses the same rolling file, so a nightly
+run parses it dozens of times and API processes parse it per request.
+
+This module keeps one parsed snapshot per source path, keyed on
+(size, mtime_ns) of that path, and hands out views instead of the shared
+object:
+
+    • FrozenDict / FrozenList — read-only views (still dict/list instances,
+      so isinstance() checks keep working). Nested containers are wrapped
+      lazily on access; mutators raise TypeError.
+    • CopyOnWriteRolling — a mutable top-level dict whose nodes are copied
+      from the snapshot the first time they are accessed. Writes only ever
+      touch the caller's copies, never the cached snapshot.
+
+Node copies use a per-node pickle blob (memoized on the snapshot), which
+is several times cheaper than the original gzip + JSON parse.
+
+Counters (hits, misses, parse seconds, invalidations) are available via
+RollingSnapshotCache.stats().
+"""
+
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_READ_ONLY_MSG = "rolling snapshot view is read-only; use _read_rolling() for a mutable copy"
+
+
+def _thaw(x: Any) -> Any:
+    """Deep mutable copy of a JSON-like value (plain dict/list)."""
+    if isinstance(x, (dict, list)):
+        return pickle.loads(pickle.dumps(_raw(x), protocol=pickle.HIGHEST_PROTOCOL))
+    return x
+
+
+def _raw(x: Any) -> Any:
+    """Plain dict/list for a frozen view (shallow; children may be shared)."""
+    if isinstance(x, FrozenDict):
+        return dict(dict.items(x))
+    if isinstance(x, FrozenList):
+        return list(list.__iter__(x))
+    return x
+
+
+def _freeze(x: Any) -> Any:
+    if type(x) is dict:
+        return FrozenDict(x)
+    if type(x) is list:
+        return FrozenList(x)
+    return x
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(_READ_ONLY_MSG)
+
+
+class FrozenDict(dict):
+    """Read-only dict view over a shared snapshot container.
+
+    Overriding __iter__ keeps dict(view) / {**view} on the slow path, so
+    nested containers always come out wrapped rather than shared.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return _freeze(dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return _freeze(dict.__getitem__(self, key))
+        return default
+
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def items(self):
+        return [(k, _freeze(v)) for k, v in dict.items(self)]
+
+    def values(self):
+        return [_freeze(v) for v in dict.values(self)]
+
+    def copy(self) -> Dict[str, Any]:
+        """Mutable deep copy."""
+        return _thaw(self)
+
+    thaw = copy
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+    def __reduce_ex__(self, protocol):
+        return (dict, (_raw(self),))
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = __ior__ = _read_only
+
+
+class FrozenList(list):
+    """Read-only list view over a shared snapshot container."""
+
+    __slots__ = ()
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return FrozenList(list.__getitem__(self, idx))
+        return _freeze(list.__getitem__(self, idx))
+
+    def __iter__(self):
+        for v in list.__iter__(self):
+            yield _freeze(v)
+
+    def __reversed__(self):
+        for v in list.__reversed__(self):
+            yield _freeze(v)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def copy(self) -> list:
+        """Mutable deep copy."""
+        return _thaw(self)
+
+    thaw = copy
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+    def __reduce_ex__(self, protocol):
+        return (list, (_raw(self),))
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+
+class _Snapshot:
+    """One parsed rolling dict plus memoized per-node pickle blobs."""
+
+    __slots__ = ("data", "key", "_blobs")
+
+    def __init__(self, data: Dict[str, Any], key: Optional[Tuple[int, int]]):
+        self.data = data
+        self.key = key
+        self._blobs: Dict[str, bytes] = {}
+
+    def node_copy(self, sym: str) -> Any:
+        node = self.data[sym]
+        if not isinstance(node, (dict, list)):
+            return node
+        blob = self._blobs.get(sym)
+        if blob is None:
+            blob = pickle.dumps(node, protocol=pickle.HIGHEST_PROTOCOL)
+            self._blobs[sym] = blob
+        return pickle.loads(blob)
+
+    def view(self) -> FrozenDict:
+        return FrozenDict(self.data)
+
+    def mutable(self) -> "CopyOnWriteRolling":
+        return CopyOnWriteRolling(self)
+
+
+class CopyOnWriteRolling(dict):
+    """Mutable rolling dict backed by a shared snapshot.
+
+    Nodes are copied from the snapshot on first access (item lookup, get,
+    items, values, pop, ...); assignments store the caller's object as-is.
+    The cached snapshot is never mutated through this object.
+    """
+
+    __slots__ = ("_snapshot", "_owned")
+
+    def __init__(self, snapshot: _Snapshot):
+        dict.__init__(self, snapshot.data)
+        self._snapshot = snapshot
+        self._owned: set = set()
+
+    def _own(self, key) -> None:
+        if key in self._owned or not dict.__contains__(self, key):
+            return
+        dict.__setitem__(self, key, self._snapshot.node_copy(key))
+        self._owned.add(key)
+
+    def __getitem__(self, key):
+        self._own(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return self[key]
+        return default
+
+    def __setitem__(self, key, value) -> None:
+        dict.__setitem__(self, key, value)
+        self._owned.add(key)
+
+    def __delitem__(self, key) -> None:
+        dict.__delitem__(self, key)
+        self._owned.discard(key)
+
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def items(self):
+        return [(k, self[k]) for k in list(dict.keys(self))]
+
+    def values(self):
+        return [self[k] for k in list(dict.keys(self))]
+
+    def pop(self, key, *default):
+        if dict.__contains__(self, key):
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        key = next(reversed(dict.keys(self)))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if dict.__contains__(self, key):
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, other=(), **kwargs) -> None:
+        items = other.items() if hasattr(other, "items") else other
+        for k, v in items:
+            self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __or__(self, other):
+        out = dict(self)
+        out.update(other)
+        return out
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._owned.clear()
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {k: _thaw(v) for k, v in self.items()}
+
+    def __reduce_ex__(self, protocol):
+        return (dict, (dict(self),))
+
+
+def _file_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return (int(st.st_size), int(st.st_mtime_ns))
+
+
+class RollingSnapshotCache:
+    """Read-through cache of parsed rolling snapshots keyed on (path, size, mtime)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, _Snapshot] = {}
+        self._stats: Dict[str, float] = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "parse_seconds_total": 0.0,
+            "last_parse_seconds": 0.0,
+        }
+
+    def _path_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._path_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._path_locks[key] = lock
+            return lock
+
+    def snapshot(self, path: Path, loader: Callable[[], Dict[str, Any]]) -> _Snapshot:
+        """Cached snapshot for `path`, (re)parsed with `loader` when the file changed.
+
+        The file is stat'ed before loading so a concurrent replace leaves the
+        entry keyed on the older version and triggers a reload next time.
+        Missing files and empty/failed loads are never cached.
+        """
+        name = str(path)
+        with self._path_lock(name):
+            key = _file_key(Path(path))
+            with self._lock:
+                entry = self._entries.get(name)
+                if key is not None and entry is not None and entry.key == key:
+                    self._stats["hits"] += 1
+                    return entry
+
+            t0 = time.perf_counter()
+            data = loader()
+            dt = time.perf_counter() - t0
+            if not isinstance(data, dict):
+                data = {}
+
+            snap = _Snapshot(data, key)
+            with self._lock:
+                self._stats["misses"] += 1
+                self._stats["parse_seconds_total"] += dt
+                self._stats["last_parse_seconds"] = dt
+                if key is not None and data:
+                    self._entries[name] = snap
+                else:
+                    self._entries.pop(name, None)
+            return snap
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Drop the entry for `path` (or every entry)."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(path), None)
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            lookups = out["hits"] + out["misses"]
+            out["hit_ratio"] = (out["hits"] / lookups) if lookups else 0.0
+            out["entries"] = {
+                name: {"size": snap.key[0], "mtime_ns": snap.key[1], "symbols": len(snap.data)}
+                for name, snap in self._entries.items()
+                if snap.key is not None
+            }
+            return out
+
+
+# -------------------------------------------------------------
+# Singleton access
+# -------------------------------------------------------------
+
+_cache: Optional[RollingSnapshotCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_rolling_cache() -> RollingSnapshotCache:
+    """Return the process-wide snapshot cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RollingSnapshotCache()
+        return _cache
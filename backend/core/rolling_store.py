@@ -0,0 +1,375 @@
+# backend/core/rolling_store.py
+"""
+Sharded Rolling Store — AION Analytics
+
+The monolithic rolling_body.json.gz forces every reader to decompress and
+parse the whole universe even when it only needs one symbol, and every
+writer to re-serialize all of it.
+
+This store keeps one gzip JSON shard per symbol plus a small manifest:
+
+    <root>/manifest.json
+    <root>/manifest.lock
+    <root>/shards/<SYMBOL>.json.gz
+
+Properties:
+    • get_node(sym) loads only the requested shard (lazy, mtime-cached in
+      an LRU bounded by SHARD_CACHE_BYTES of decompressed payload).
+    • put_node(sym, node) writes one shard atomically (tmp + os.replace).
+    • replace_all(rolling) skips shards whose content digest is unchanged.
+    • load_all() assembles the full dict for legacy callers without filling
+      the shard cache (callers keep the parsed dict; a second raw copy of
+      the universe would only double the memory).
+    • Manifest read-modify-write holds an fcntl lock on manifest.lock, so
+      nightly and API processes writing concurrently never drop entries.
+
+Meta keys (those starting with "_") are stored as regular shards.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from dt_backend.core.file_locking import AcquireLock
+from utils.logger import log
+
+MANIFEST_VERSION = 1
+SHARD_SUFFIX = ".json.gz"
+MANIFEST_LOCK_TIMEOUT = 30.0
+SHARD_CACHE_BYTES = 64 << 20
+
+
+def _utc_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _shard_name(sym: str) -> str:
+    """Filesystem-safe shard file name for a symbol (e.g. BRK/B, ^VIX)."""
+    return quote(str(sym), safe="") + SHARD_SUFFIX
+
+
+def _sym_from_shard(name: str) -> str:
+    return unquote(name[: -len(SHARD_SUFFIX)])
+
+
+def _encode_node(node: Any) -> bytes:
+    return json.dumps(node, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(str(tmp), str(path))
+    except Exception:
+        try:
+            if tmp.exists():
+                tmp.unlink()
+        except Exception:
+            pass
+        raise
+
+
+class ShardedRollingStore:
+    """Per-symbol rolling storage with a manifest and lazy shard loading."""
+
+    def __init__(self, root: Path, *, compresslevel: int = 6, cache_bytes: int = SHARD_CACHE_BYTES):
+        self.root = Path(root)
+        self.shards_dir = self.root / "shards"
+        self.manifest_path = self.root / "manifest.json"
+        self.lock_path = self.root / "manifest.lock"
+        self.compresslevel = int(compresslevel)
+        self._lock = threading.RLock()
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_mtime: Optional[int] = None
+        # sym -> (shard mtime_ns, decompressed payload), least recently used first
+        self._cache: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._cache_bytes = 0
+        self.cache_bytes = max(0, int(cache_bytes))
+
+    # ---------------------------------------------------------
+    # Manifest
+    # ---------------------------------------------------------
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            mtime = self.manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._manifest = {"version": MANIFEST_VERSION, "updated_at": None, "symbols": {}}
+            self._manifest_mtime = None
+            return self._manifest
+
+        if self._manifest is not None and self._manifest_mtime == mtime:
+            return self._manifest
+
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict) or not isinstance(data.get("symbols"), dict):
+                raise ValueError("malformed manifest")
+        except Exception as e:
+            log(f"[rolling_store] ⚠️ Manifest unreadable ({e}) — rebuilding from shards.")
+            data = self._rebuild_manifest()
+
+        self._manifest = data
+        self._manifest_mtime = mtime
+        return data
+
+    def _rebuild_manifest(self) -> Dict[str, Any]:
+        symbols: Dict[str, Any] = {}
+        if self.shards_dir.exists():
+            for p in self.shards_dir.glob("*" + SHARD_SUFFIX):
+                try:
+                    st = p.stat()
+                    symbols[_sym_from_shard(p.name)] = {
+                        "file": p.name,
+                        "digest": None,
+                        "bytes": int(st.st_size),
+                        "updated_at": None,
+                    }
+                except Exception:
+                    continue
+        return {"version": MANIFEST_VERSION, "updated_at": _utc_iso(), "symbols": symbols}
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        manifest["version"] = MANIFEST_VERSION
+        manifest["updated_at"] = _utc_iso()
+        self.root.mkdir(parents=True, exist_ok=True)
+        _atomic_write_bytes(self.manifest_path, json.dumps(manifest, separators=(",", ":")).encode("utf-8"))
+        self._manifest = manifest
+        try:
+            self._manifest_mtime = self.manifest_path.stat().st_mtime_ns
+        except Exception:
+            self._manifest_mtime = None
+
+    @contextmanager
+    def _manifest_update(self) -> Iterator[Dict[str, Any]]:
+        """Cross-process read-modify-write section; yields the on-disk manifest."""
+        with self._lock, AcquireLock(self.lock_path, timeout=MANIFEST_LOCK_TIMEOUT) as acquired:
+            if not acquired:
+                log(f"[rolling_store] ⚠️ Manifest lock not acquired — updating {self.manifest_path} unlocked.")
+            # Another process may have written within our cached mtime tick.
+            self._manifest = None
+            yield self._load_manifest()
+
+    def manifest(self) -> Dict[str, Any]:
+        """Return a copy of the manifest (symbol → shard metadata)."""
+        with self._lock:
+            m = self._load_manifest()
+            return {**m, "symbols": dict(m.get("symbols") or {})}
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list((self._load_manifest().get("symbols") or {}).keys())
+
+    def __contains__(self, sym: str) -> bool:
+        with self._lock:
+            return str(sym) in (self._load_manifest().get("symbols") or {})
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_manifest().get("symbols") or {})
+
+    # ---------------------------------------------------------
+    # Shard IO
+    # ---------------------------------------------------------
+
+    def _shard_path(self, sym: str) -> Path:
+        return self.shards_dir / _shard_name(sym)
+
+    def _uncache(self, sym: str) -> None:
+        entry = self._cache.pop(sym, None)
+        if entry is not None:
+            self._cache_bytes -= len(entry[1])
+
+    def _cache_put(self, sym: str, mtime: int, payload: bytes) -> None:
+        self._uncache(sym)
+        if len(payload) > self.cache_bytes:
+            return
+        self._cache[sym] = (mtime, payload)
+        self._cache_bytes += len(payload)
+        while self._cache_bytes > self.cache_bytes:
+            _, (_, old) = self._cache.popitem(last=False)
+            self._cache_bytes -= len(old)
+
+    def _read_shard(self, sym: str, *, cache: bool = True) -> Any:
+        path = self._shard_path(sym)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._uncache(sym)
+            return None
+
+        cached = self._cache.get(sym)
+        if cached is not None and cached[0] == mtime:
+            payload = cached[1]
+            self._cache.move_to_end(sym)
+        else:
+            try:
+                with gzip.open(path, "rb") as f:
+                    payload = f.read()
+            except Exception as e:
+                log(f"[rolling_store] ⚠️ Failed to read shard {path.name}: {e}")
+                return None
+            if cache:
+                self._cache_put(sym, mtime, payload)
+            else:
+                self._uncache(sym)
+
+        try:
+            node = json.loads(payload.decode("utf-8"))
+        except Exception as e:
+            log(f"[rolling_store] ⚠️ Corrupt shard {path.name}: {e}")
+            return None
+        return node
+
+    def _write_shard(self, sym: str, payload: bytes) -> Dict[str, Any]:
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+        path = self._shard_path(sym)
+        blob = gzip.compress(payload, compresslevel=self.compresslevel)
+        _atomic_write_bytes(path, blob)
+        self._uncache(sym)
+        return {
+            "file": path.name,
+            "digest": hashlib.sha1(payload).hexdigest(),
+            "bytes": len(blob),
+            "updated_at": _utc_iso(),
+        }
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+
+    def get_node(self, sym: str) -> Any:
+        """Load a single symbol node. Returns None if the symbol has no shard."""
+        with self._lock:
+            if str(sym) not in (self._load_manifest().get("symbols") or {}):
+                return None
+            return self._read_shard(str(sym))
+
+    def get_nodes(self, syms: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Load only the requested symbols."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for sym in syms:
+            node = self.get_node(sym)
+            if node is not None:
+                out[str(sym)] = node
+        return out
+
+    def put_node(self, sym: str, node: Dict[str, Any]) -> bool:
+        """Atomically write one symbol shard. Returns False if content was unchanged."""
+        return self.put_nodes({sym: node}) > 0
+
+    def put_nodes(self, nodes: Dict[str, Dict[str, Any]]) -> int:
+        """Write several shards with a single manifest update. Returns shards written."""
+        with self._manifest_update() as manifest:
+            entries = dict(manifest.get("symbols") or {})
+            written = 0
+            for sym, node in (nodes or {}).items():
+                sym = str(sym)
+                payload = _encode_node(node)
+                digest = hashlib.sha1(payload).hexdigest()
+                prev = entries.get(sym) or {}
+                if prev.get("digest") == digest and self._shard_path(sym).exists():
+                    continue
+                entries[sym] = self._write_shard(sym, payload)
+                written += 1
+            if written:
+                self._write_manifest({**manifest, "symbols": entries})
+            return written
+
+    def delete_node(self, sym: str) -> bool:
+        with self._manifest_update() as manifest:
+            entries = dict(manifest.get("symbols") or {})
+            if str(sym) not in entries:
+                return False
+            entries.pop(str(sym), None)
+            self._write_manifest({**manifest, "symbols": entries})
+            try:
+                self._shard_path(str(sym)).unlink()
+            except FileNotFoundError:
+                pass
+            self._uncache(str(sym))
+            return True
+
+    def replace_all(self, rolling: Dict[str, Any]) -> Dict[str, int]:
+        """Make the store mirror `rolling` exactly.
+
+        Only shards whose serialized content changed are rewritten; symbols
+        absent from `rolling` are removed. The manifest is written once.
+        """
+        with self._manifest_update() as manifest:
+            old = dict(manifest.get("symbols") or {})
+            entries: Dict[str, Any] = {}
+            written = 0
+            for sym, node in (rolling or {}).items():
+                sym = str(sym)
+                payload = _encode_node(node)
+                prev = old.get(sym) or {}
+                if prev.get("digest") == hashlib.sha1(payload).hexdigest() and self._shard_path(sym).exists():
+                    entries[sym] = prev
+                    continue
+                entries[sym] = self._write_shard(sym, payload)
+                written += 1
+
+            removed = [s for s in old if s not in entries]
+            if written or removed or not self.exists():
+                self._write_manifest({**manifest, "symbols": entries})
+
+            for sym in removed:
+                try:
+                    self._shard_path(sym).unlink()
+                except FileNotFoundError:
+                    pass
+                self._uncache(sym)
+
+            return {"written": written, "unchanged": len(entries) - written, "removed": len(removed)}
+
+    def load_all(self) -> Dict[str, Any]:
+        """Assemble the full rolling dict (compatibility path for legacy callers)."""
+        with self._lock:
+            out: Dict[str, Any] = {}
+            for sym in list((self._load_manifest().get("symbols") or {}).keys()):
+                node = self._read_shard(sym, cache=False)
+                if node is not None:
+                    out[sym] = node
+            return out
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+            self._manifest = None
+            self._manifest_mtime = None
+
+
+# -------------------------------------------------------------
+# Singleton access
+# -------------------------------------------------------------
+
+_stores: Dict[str, ShardedRollingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_rolling_store(root: Path) -> ShardedRollingStore:
+    """Return the process-wide store for `root`."""
+    key = str(Path(root).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ShardedRollingStore(Path(root))
+            _stores[key] = store
+        return store
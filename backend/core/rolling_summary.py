@@ -0,0 +1,369 @@
+# backend/core/rolling_summary.py
+"""
+Rolling Summary Index — AION Analytics
+
+Most API endpoints only need a handful of fields per symbol (name, sector,
+last price, per-horizon score/confidence/predicted_return), yet they used
+to decompress and parse the full rolling (years of bars per symbol) to get
+them. save_rolling() now also writes a compact columnar side index:
+
+    <brains>/rolling_summary.npz      (uncompressed numpy arrays)
+
+Layout (one row per symbol, meta keys excluded):
+    symbols, names, sectors, updated_at   unicode arrays [n]
+    price                                 float64 [n]  (NaN = unknown)
+    preds                                 float32 [n, H, 3]
+                                          (score, confidence, predicted_return)
+    horizons                              unicode [H]
+    version, generated_at                 scalars
+
+Loading is a single np.load of a few flat arrays (milliseconds for a few
+thousand symbols) and is mtime-cached per process. Readers pass the mtime
+of the rolling source they trust; an index older than that is rebuilt once
+from the full rolling so the summary never serves stale data.
+
+put_node() goes through RollingSummaryIndex.update(), which overwrites or
+appends only the touched rows in the column arrays (upsert_summary_arrays)
+instead of rebuilding every row.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import log
+
+SUMMARY_VERSION = 1
+PRED_FIELDS: Tuple[str, ...] = ("score", "confidence", "predicted_return")
+_PRICE_KEYS: Tuple[str, ...] = ("price", "last", "close", "c")
+
+
+def _utc_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _to_float(x: Any) -> float:
+    try:
+        if x is None:
+            return math.nan
+        v = float(x)
+        return v if math.isfinite(v) else math.nan
+    except Exception:
+        return math.nan
+
+
+def node_price(node: Dict[str, Any]) -> float:
+    """First positive price among price/last/close/c (NaN if none)."""
+    for k in _PRICE_KEYS:
+        v = _to_float(node.get(k))
+        if v > 0:
+            return v
+    return math.nan
+
+
+def _str_array(values: Sequence[str]) -> np.ndarray:
+    return np.asarray(list(values), dtype=str) if len(values) else np.zeros(0, dtype="U1")
+
+
+def build_summary_arrays(
+    items: Iterable[Tuple[str, Dict[str, Any]]],
+    horizons: Sequence[str],
+    *,
+    generated_at: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """Columnar summary arrays for (symbol, node) pairs; meta keys are skipped."""
+    generated_at = generated_at or _utc_iso()
+    horizons = [str(h) for h in horizons]
+    syms: List[str] = []
+    names: List[str] = []
+    sectors: List[str] = []
+    updated: List[str] = []
+    prices: List[float] = []
+    preds: List[List[List[float]]] = []
+
+    for sym, node in items:
+        sym = str(sym)
+        if sym.startswith("_") or not isinstance(node, dict):
+            continue
+        syms.append(sym)
+        names.append(str(node.get("name") or ""))
+        sectors.append(str(node.get("sector") or ""))
+        updated.append(str(node.get("updated_at") or node.get("last_updated") or generated_at))
+        prices.append(node_price(node))
+        block = node.get("predictions") if isinstance(node.get("predictions"), dict) else {}
+        row = []
+        for h in horizons:
+            p = block.get(h) if isinstance(block.get(h), dict) else {}
+            row.append([_to_float(p.get(f)) for f in PRED_FIELDS])
+        preds.append(row)
+
+    return {
+        "version": np.asarray(SUMMARY_VERSION, dtype=np.int32),
+        "generated_at": np.asarray(generated_at),
+        "horizons": _str_array(horizons),
+        "symbols": _str_array(syms),
+        "names": _str_array(names),
+        "sectors": _str_array(sectors),
+        "updated_at": _str_array(updated),
+        "price": np.asarray(prices, dtype=np.float64),
+        "preds": np.asarray(preds, dtype=np.float32).reshape(len(syms), len(horizons), len(PRED_FIELDS)),
+    }
+
+
+_ROW_COLUMNS: Tuple[str, ...] = ("symbols", "names", "sectors", "updated_at", "price", "preds")
+
+
+def upsert_summary_arrays(
+    base: Dict[str, np.ndarray],
+    index: Dict[str, int],
+    rows: Dict[str, np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """Copy of `base` with `rows` (same horizons) overwritten in place or appended.
+
+    `index` maps base symbols to row positions. Only the touched rows are
+    rebuilt; the untouched ones are copied column-wise, never re-parsed.
+    """
+    pos = [index.get(s) for s in rows["symbols"].tolist()]
+    hit = [k for k, p in enumerate(pos) if p is not None]
+    miss = [k for k, p in enumerate(pos) if p is None]
+    out = dict(base)
+    out["generated_at"] = rows["generated_at"]
+    for key in _ROW_COLUMNS:
+        col, new = base[key], rows[key]
+        if col.dtype.kind == "U" and new.dtype.itemsize > col.dtype.itemsize:
+            col = col.astype(new.dtype)  # widen so longer strings aren't truncated
+        else:
+            col = col.copy()
+        if hit:
+            col[[pos[k] for k in hit]] = new[hit]
+        if miss:
+            col = np.concatenate([col, new[miss]])
+        out[key] = col
+    return out
+
+
+def _opt(v: float) -> Optional[float]:
+    return None if math.isnan(v) else v
+
+
+class RollingSummary:
+    """Read-only view over one loaded summary index."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.generated_at = str(arrays["generated_at"])
+        self.horizons: List[str] = arrays["horizons"].tolist()
+        self.symbols: List[str] = arrays["symbols"].tolist()
+        self.names: List[str] = arrays["names"].tolist()
+        self.sectors: List[str] = arrays["sectors"].tolist()
+        self.updated_at: List[str] = arrays["updated_at"].tolist()
+        self.price: np.ndarray = arrays["price"]
+        self.preds: np.ndarray = arrays["preds"]
+        self._index: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+
+    @classmethod
+    def from_rolling(cls, rolling: Dict[str, Any], horizons: Sequence[str]) -> "RollingSummary":
+        return cls(build_summary_arrays(rolling.items(), horizons))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, sym: object) -> bool:
+        return sym in self._index
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Node-like dict; horizons with no known fields are omitted."""
+        predictions: Dict[str, Dict[str, float]] = {}
+        for j, vals in enumerate(self.preds[i].tolist()):
+            block = {f: float(v) for f, v in zip(PRED_FIELDS, vals) if not math.isnan(v)}
+            if block:
+                predictions[self.horizons[j]] = block
+        return {
+            "symbol": self.symbols[i],
+            "name": self.names[i],
+            "sector": self.sectors[i],
+            "price": _opt(float(self.price[i])),
+            "updated_at": self.updated_at[i],
+            "predictions": predictions,
+        }
+
+    def get(self, sym: str) -> Optional[Dict[str, Any]]:
+        i = self._index.get(str(sym))
+        return None if i is None else self.row(i)
+
+    def rows(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """{SYM: row} for all symbols, or only the requested ones that exist."""
+        if symbols is None:
+            return {s: self.row(i) for i, s in enumerate(self.symbols)}
+        out: Dict[str, Dict[str, Any]] = {}
+        for s in symbols:
+            i = self._index.get(str(s))
+            if i is not None:
+                out[self.symbols[i]] = self.row(i)
+        return out
+
+    def prices(self) -> Dict[str, float]:
+        """{SYM: price} for symbols with a known positive price."""
+        ok = np.flatnonzero(self.price > 0)
+        return {self.symbols[i]: float(self.price[i]) for i in ok.tolist()}
+
+    def sector_map(self) -> Dict[str, str]:
+        return {s: sec for s, sec in zip(self.symbols, self.sectors) if sec}
+
+    def to_items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """(symbol, node-like dict) pairs accepted by build_summary_arrays."""
+        out = []
+        for i, s in enumerate(self.symbols):
+            r = self.row(i)
+            out.append((s, {
+                "name": r["name"],
+                "sector": r["sector"],
+                "price": r["price"],
+                "updated_at": r["updated_at"],
+                "predictions": r["predictions"],
+            }))
+        return out
+
+
+class RollingSummaryIndex:
+    """Owns the summary file: atomic writes, mtime-cached loads, single-row updates."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._cached: Optional[Tuple[int, RollingSummary]] = None
+        # Fallback when the file cannot be written: (source mtime_ns, summary)
+        self._memory: Optional[Tuple[Optional[int], RollingSummary]] = None
+
+    def _mtime(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _write_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(str(tmp), str(self.path))
+        except Exception:
+            try:
+                if tmp.exists():
+                    tmp.unlink()
+            except Exception:
+                pass
+            raise
+        summary = RollingSummary(arrays)
+        mtime = self._mtime()
+        self._cached = (mtime, summary) if mtime is not None else None
+
+    def write(self, rolling: Dict[str, Any], horizons: Sequence[str]) -> int:
+        """Rewrite the index from a full rolling dict. Returns the row count."""
+        arrays = build_summary_arrays(rolling.items(), horizons)
+        with self._lock:
+            self._write_arrays(arrays)
+            self._memory = None
+        return int(arrays["symbols"].shape[0])
+
+    def update(self, nodes: Dict[str, Dict[str, Any]], horizons: Sequence[str]) -> bool:
+        """Upsert a few rows. Returns False when there is no index to update yet."""
+        with self._lock:
+            current = self.load()
+            if current is None:
+                return False
+            stamped: Dict[str, Dict[str, Any]] = {}
+            for sym, node in nodes.items():
+                if str(sym).startswith("_") or not isinstance(node, dict):
+                    continue
+                node = dict(node)
+                node.setdefault("updated_at", node.get("last_updated") or _utc_iso())
+                stamped[str(sym)] = node
+            if not stamped:
+                return True
+            if current.horizons != [str(h) for h in horizons]:
+                # Horizon layout changed: re-lay every row once.
+                merged = dict(current.to_items())
+                merged.update(stamped)
+                self._write_arrays(build_summary_arrays(merged.items(), horizons))
+                return True
+            rows = build_summary_arrays(stamped.items(), horizons)
+            self._write_arrays(upsert_summary_arrays(current.arrays, current._index, rows))
+            return True
+
+    def load(self) -> Optional[RollingSummary]:
+        """Summary from disk (mtime-cached), or None if missing/unreadable."""
+        with self._lock:
+            mtime = self._mtime()
+            if mtime is None:
+                return None
+            if self._cached is not None and self._cached[0] == mtime:
+                return self._cached[1]
+            try:
+                with np.load(self.path, allow_pickle=False) as z:
+                    arrays = {k: z[k] for k in z.files}
+                if int(arrays.get("version", -1)) != SUMMARY_VERSION:
+                    return None
+                summary = RollingSummary(arrays)
+            except Exception as e:
+                log(f"[rolling_summary] ⚠️ Failed to load {self.path}: {e}")
+                return None
+            self._cached = (mtime, summary)
+            return summary
+
+    def read(
+        self,
+        *,
+        source_mtime_ns: Optional[int],
+        load_rolling: Callable[[], Dict[str, Any]],
+        horizons: Sequence[str],
+        persist: bool = True,
+    ) -> RollingSummary:
+        """Summary no older than the rolling source; rebuilt from it when stale."""
+        with self._lock:
+            summary = self.load()
+            mtime = self._mtime()
+            if summary is not None and (source_mtime_ns is None or (mtime or 0) >= source_mtime_ns):
+                return summary
+            if self._memory is not None and self._memory[0] == source_mtime_ns:
+                return self._memory[1]
+
+            rolling = load_rolling() or {}
+            summary = RollingSummary.from_rolling(rolling, horizons)
+            if persist and rolling:
+                try:
+                    self._write_arrays(build_summary_arrays(rolling.items(), horizons))
+                    self._memory = None
+                    log(f"[rolling_summary] 🗂️ rebuilt {self.path.name} ({len(summary)} symbols)")
+                    return summary
+                except Exception as e:
+                    log(f"[rolling_summary] ⚠️ Failed to write {self.path}: {e}")
+            self._memory = (source_mtime_ns, summary)
+            return summary
+
+
+# -------------------------------------------------------------
+# Singleton access
+# -------------------------------------------------------------
+
+_indexes: Dict[str, RollingSummaryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_rolling_summary_index(path: Path) -> RollingSummaryIndex:
+    """Return the process-wide summary index for `path`."""
+    key = str(Path(path).resolve())
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None:
+            idx = RollingSummaryIndex(Path(path))
+            _indexes[key] = idx
+        return idx
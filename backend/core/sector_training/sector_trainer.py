@@ -28,6 +28,7 @@ from backend.core.sector_training.sector_feature_policy import prune_features_fo
 # <<< END ADDITION
 
 # NOTE: We reuse the global dataset parquet and feature list. Sector training scopes by symbol rows (via sector one-hot in features).
+# The parquet is scanned once into a shared TrainingMatrix; each sector trains from a symbol row mask over it.
 
 
 def _load_feature_list_paths():
@@ -168,6 +169,27 @@ def train_sector_models(
     workers = _resolve_workers(max_workers)
     log(f"[sector_training] 🧭 Sector training: sectors={len(sectors)} max_workers={workers}")
 
+    # One parquet pass shared by every sector/horizon (read-only across threads).
+    shared_matrix = None
+    if core_training._shared_matrix_enabled():
+        try:
+            shared_matrix = core_training.build_shared_training_matrix(
+                dataset_name=dataset_name,
+                batch_size=batch_size,
+                feature_cols=feature_cols,
+                target_cols=target_cols,
+            )
+        except Exception as e:
+            log(f"[sector_training] ⚠️ Shared training matrix failed; sectors will build their own: {e}")
+            shared_matrix = None
+
+    # With the shared matrix, fits/trials go through the process-wide
+    # TrainingScheduler, which owns the core/memory budget; sector threads
+    # only coordinate, so run them all and let the scheduler queue jobs.
+    if shared_matrix is not None and core_training.HAS_LGBM and core_training.training_scheduler_enabled():
+        workers = max(1, len(sectors))
+        log(f"[sector_training] 🧵 Scheduler-driven sector training: coordinators={workers}")
+
     results: Dict[str, Any] = {"status": "ok", "sectors": {}}
 
     def train_one_sector(sec: str) -> Tuple[str, Dict[str, Any]]:
@@ -188,6 +210,8 @@ def train_sector_models(
                 batch_size=batch_size,
                 symbol_whitelist=symbols if symbols else None,
                 model_root=sp.model_dir,
+                matrix=shared_matrix,
+                job_group=f"sector:{sec_norm}",
             )
             sector_summary = res if isinstance(res, dict) else {"status": "error", "error": "unexpected_train_result"}
         except Exception as e:
@@ -213,6 +237,9 @@ def train_sector_models(
                 summ = {"status": "error", "error": str(e)}
             results["sectors"][sec] = summ
 
+    if shared_matrix is not None:
+        shared_matrix.cleanup()
+
     return results
 
 
@@ -0,0 +1,272 @@
+# backend/core/training_scheduler.py
+"""
+Training Scheduler — AION Analytics
+
+Global training (core_training.train_all_models) and sector training
+(sector_trainer.train_sector_models) used to size their own concurrency
+independently (a sequential horizon loop vs. a thread pool from
+AION_TRAIN_MAX_WORKERS), so overlapping phases oversubscribed the cores
+with LightGBM's default "all threads" per model.
+
+This module provides ONE process-wide scheduler that both stages submit
+horizon × sector × Optuna-trial jobs to:
+
+    • Jobs run on a spawn-context process pool (safe with OpenMP/LightGBM).
+    • A ResourceBudget splits total cores into workers × num_threads and
+      admits jobs only while their estimated memory fits the budget.
+    • Every job records queue time (submit → start) and wall time
+      (start → finish); report() is written into the nightly summary.
+
+Env knobs:
+    AION_TRAIN_SCHEDULER=0        disable (callers fall back to sequential)
+    AION_TRAIN_TOTAL_CORES        cores to budget (default: os.cpu_count())
+    AION_TRAIN_THREADS_PER_JOB    LightGBM num_threads per job (default: 4)
+    AION_TRAIN_MAX_WORKERS        hard cap on concurrent jobs
+    AION_TRAIN_MEM_GB             memory budget (default: 60% of available RAM)
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import log
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return int(default)
+
+
+def training_scheduler_enabled() -> bool:
+    return os.getenv("AION_TRAIN_SCHEDULER", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def _available_memory_bytes() -> int:
+    try:
+        import psutil  # type: ignore
+
+        return int(psutil.virtual_memory().available)
+    except Exception:
+        pass
+    try:
+        return int(os.sysconf("SC_AVPHYS_PAGES")) * int(os.sysconf("SC_PAGE_SIZE"))
+    except Exception:
+        return 8 * 1024**3
+
+
+@dataclass
+class ResourceBudget:
+    """Cores and memory the scheduler may hand out."""
+
+    total_cores: int
+    threads_per_job: int
+    max_workers: int
+    mem_bytes: int
+
+    @classmethod
+    def from_env(cls) -> "ResourceBudget":
+        cores = max(1, _env_int("AION_TRAIN_TOTAL_CORES", os.cpu_count() or 1))
+        threads = max(1, min(cores, _env_int("AION_TRAIN_THREADS_PER_JOB", 4)))
+        workers = max(1, cores // threads)
+        cap = _env_int("AION_TRAIN_MAX_WORKERS", 0)
+        if cap > 0:
+            workers = min(workers, cap)
+        mem_gb = os.getenv("AION_TRAIN_MEM_GB")
+        try:
+            mem = int(float(mem_gb) * 1024**3) if mem_gb else int(_available_memory_bytes() * 0.6)
+        except Exception:
+            mem = int(_available_memory_bytes() * 0.6)
+        return cls(total_cores=cores, threads_per_job=threads, max_workers=workers, mem_bytes=max(1, mem))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_cores": int(self.total_cores),
+            "threads_per_job": int(self.threads_per_job),
+            "max_workers": int(self.max_workers),
+            "mem_budget_gb": round(self.mem_bytes / 1024**3, 2),
+        }
+
+
+@dataclass
+class JobRecord:
+    key: str
+    group: str
+    mem_bytes: int
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    status: str = "queued"
+    error: Optional[str] = None
+    pid: Optional[int] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        queue = (self.started_at - self.submitted_at) if self.started_at else None
+        wall = (self.finished_at - self.started_at) if (self.started_at and self.finished_at) else None
+        return {
+            "key": self.key,
+            "group": self.group,
+            "status": self.status,
+            "queue_secs": round(queue, 3) if queue is not None else None,
+            "wall_secs": round(wall, 3) if wall is not None else None,
+            "mem_est_mb": round(self.mem_bytes / 1024**2, 1),
+            "pid": self.pid,
+            "error": self.error,
+        }
+
+
+def _run_job(fn: Callable[..., Any], kwargs: Dict[str, Any], threads: int) -> Dict[str, Any]:
+    """Worker-side wrapper: pins OpenMP threads and timestamps the job."""
+    os.environ["OMP_NUM_THREADS"] = str(int(threads))
+    started = time.time()
+    result = fn(**kwargs)
+    return {"result": result, "started_at": started, "finished_at": time.time(), "pid": os.getpid()}
+
+
+class TrainingScheduler:
+    """Process-pool scheduler with core/memory budgeting and per-job timing."""
+
+    def __init__(self, budget: Optional[ResourceBudget] = None):
+        self.budget = budget or ResourceBudget.from_env()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._mem_cond = threading.Condition()
+        self._mem_in_use = 0
+        self._records: List[JobRecord] = []
+
+    @property
+    def threads_per_job(self) -> int:
+        return int(self.budget.threads_per_job)
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                ctx = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(max_workers=int(self.budget.max_workers), mp_context=ctx)
+                log(f"[training_scheduler] 🧵 Process pool started: {self.budget.as_dict()}")
+            return self._pool
+
+    def _acquire_mem(self, need: int) -> None:
+        # A job larger than the whole budget still runs, but alone.
+        need = min(int(need), int(self.budget.mem_bytes))
+        with self._mem_cond:
+            while self._mem_in_use > 0 and self._mem_in_use + need > self.budget.mem_bytes:
+                self._mem_cond.wait()
+            self._mem_in_use += need
+
+    def _release_mem(self, need: int) -> None:
+        need = min(int(need), int(self.budget.mem_bytes))
+        with self._mem_cond:
+            self._mem_in_use = max(0, self._mem_in_use - need)
+            self._mem_cond.notify_all()
+
+    def submit(
+        self,
+        key: str,
+        fn: Callable[..., Any],
+        kwargs: Optional[Dict[str, Any]] = None,
+        *,
+        group: str = "global",
+        mem_bytes: int = 0,
+    ) -> "Future[Any]":
+        """Queue `fn(**kwargs)` (module-level, picklable). Blocks while memory is over budget.
+
+        The returned future resolves to fn's return value.
+        """
+        rec = JobRecord(key=str(key), group=str(group), mem_bytes=int(mem_bytes), submitted_at=time.time())
+        with self._lock:
+            self._records.append(rec)
+
+        self._acquire_mem(rec.mem_bytes)
+        out: "Future[Any]" = Future()
+        try:
+            inner = self._ensure_pool().submit(_run_job, fn, dict(kwargs or {}), self.threads_per_job)
+        except Exception as e:
+            self._release_mem(rec.mem_bytes)
+            rec.status, rec.error = "error", str(e)
+            out.set_exception(e)
+            return out
+        rec.status = "submitted"
+
+        def _done(f: "Future[Dict[str, Any]]") -> None:
+            self._release_mem(rec.mem_bytes)
+            try:
+                payload = f.result()
+                rec.started_at = float(payload["started_at"])
+                rec.finished_at = float(payload["finished_at"])
+                rec.pid = int(payload["pid"])
+                rec.status = "ok"
+                out.set_result(payload["result"])
+            except Exception as e:
+                rec.finished_at = time.time()
+                rec.started_at = rec.started_at or rec.finished_at
+                rec.status, rec.error = "error", str(e)
+                out.set_exception(e)
+
+        inner.add_done_callback(_done)
+        return out
+
+    def report(self, group: Optional[str] = None, since: Optional[float] = None) -> Dict[str, Any]:
+        """Budget + per-job queue/wall times (optionally one group / jobs submitted since `since`)."""
+        with self._lock:
+            recs = [
+                r
+                for r in self._records
+                if (group is None or r.group == group) and (since is None or r.submitted_at >= since)
+            ]
+        jobs = [r.as_dict() for r in recs]
+        walls = [j["wall_secs"] for j in jobs if j["wall_secs"] is not None]
+        queues = [j["queue_secs"] for j in jobs if j["queue_secs"] is not None]
+        return {
+            "budget": self.budget.as_dict(),
+            "jobs": jobs,
+            "totals": {
+                "jobs": len(jobs),
+                "errors": sum(1 for j in jobs if j["status"] == "error"),
+                "wall_secs_sum": round(sum(walls), 3),
+                "queue_secs_max": round(max(queues), 3) if queues else 0.0,
+                "queue_secs_mean": round(sum(queues) / len(queues), 3) if queues else 0.0,
+            },
+        }
+
+    def reset_report(self) -> None:
+        with self._lock:
+            self._records = [r for r in self._records if r.status in ("queued", "submitted")]
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+# -------------------------------------------------------------
+# Singleton access
+# -------------------------------------------------------------
+
+_scheduler: Optional[TrainingScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_training_scheduler() -> TrainingScheduler:
+    """Return the process-wide scheduler shared by global and sector training."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = TrainingScheduler()
+        return _scheduler
+
+
+def shutdown_training_scheduler() -> None:
+    global _scheduler
+    with _scheduler_lock:
+        sched, _scheduler = _scheduler, None
+    if sched is not None:
+        sched.shutdown()
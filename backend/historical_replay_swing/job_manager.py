@@ -7,6 +7,9 @@ This is the *plumbing* layer:
   - resume/restart/version rules
   - one-day-at-a-time checkpointing
   - status metrics (percent/current day/elapsed/ETA)
+  - optional parallel mode (ReplayConfig.workers / AION_SWING_REPLAY_WORKERS
+    > 1): several days in flight, each in its own subprocess with its own
+    snapshot mount and output sandbox (see parallel_executor)
 
 Important: a *true* historical replay requires the data pipeline to be
 "as-of" date aware (bars/fundamentals/macro/dataset builder). This
@@ -16,13 +19,14 @@ manager is designed so we can plug that in incrementally.
 from __future__ import annotations
 
 import json
+import multiprocessing
 import os
 import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, date
 from pathlib import Path
-from typing import Any, Dict, Optional, List, Tuple
+from typing import Any, Callable, Dict, Optional, List, Tuple
 
 from backend.core.config import PATHS, TIMEZONE
 from utils.logger import log
@@ -147,9 +151,12 @@ def get_state() -> Dict[str, Any]:
             "start_date": None,
             "end_date": None,
             "current_day": None,
+            "in_flight_days": [],
             "completed_days": [],
+            "failed_days": [],
             "days_completed": 0,
             "total_days": 0,
+            "workers": 1,
             "percent_complete": 0.0,
             "elapsed_secs": 0.0,
             "eta_secs": None,
@@ -216,9 +223,12 @@ def reset_state() -> Dict[str, Any]:
         "start_date": None,
         "end_date": None,
         "current_day": None,
+        "in_flight_days": [],
         "completed_days": [],
+        "failed_days": [],
         "days_completed": 0,
         "total_days": 0,
+        "workers": 1,
         "percent_complete": 0.0,
         "elapsed_secs": 0.0,
         "eta_secs": None,
@@ -234,6 +244,7 @@ class ReplayConfig:
     lookback_days: int = 28
     version: str = REPLAY_VERSION
     set_maintenance_mode: bool = True
+    workers: Optional[int] = None  # None → AION_SWING_REPLAY_WORKERS (default 1)
 
 
 _thread: Optional[threading.Thread] = None
@@ -245,7 +256,10 @@ def _compute_eta(elapsed_secs: float, done: int, total: int) -> Optional[float]:
     return (elapsed_secs / done) * (total - done)
 
 
-def _run_one_day(target_day: date) -> Dict[str, Any]:
+def _run_one_day(
+    target_day: date,
+    phase_overrides: Optional[Dict[str, Callable[[Any], Any]]] = None,
+) -> Dict[str, Any]:
     """Run replay for one day using snapshot data."""
     from backend.historical_replay_swing.snapshot_manager import SnapshotManager
     from backend.historical_replay_swing.validation import ReplayValidator
@@ -290,6 +304,7 @@ def _run_one_day(target_day: date) -> Dict[str, Any]:
         mode="replay",
         as_of_date=date_str,
         force=True,
+        phase_overrides=phase_overrides,
     )
     
     result["validation"] = {
@@ -320,6 +335,11 @@ def start_replay(cfg: Optional[ReplayConfig] = None) -> Dict[str, Any]:
     started_at = st.get("started_at") or _now().isoformat()
     prev_elapsed = float(st.get("elapsed_secs") or 0.0)
 
+    from backend.historical_replay_swing.parallel_executor import workers_default
+
+    n_workers = max(1, int(cfg.workers)) if cfg.workers else workers_default()
+    n_workers = min(n_workers, len(days))
+
     state = {
         "status": "running",
         "version": cfg.version,
@@ -328,9 +348,12 @@ def start_replay(cfg: Optional[ReplayConfig] = None) -> Dict[str, Any]:
         "start_date": start_day.isoformat(),
         "end_date": end_day.isoformat(),
         "current_day": start_day.isoformat(),
+        "in_flight_days": [],
         "completed_days": [],
+        "failed_days": [],
         "days_completed": 0,
         "total_days": len(days),
+        "workers": n_workers,
         "percent_complete": 0.0,
         "elapsed_secs": prev_elapsed,
         "eta_secs": None,
@@ -388,7 +411,86 @@ def start_replay(cfg: Optional[ReplayConfig] = None) -> Dict[str, Any]:
                 _set_maintenance(False)
             _release_lock()
 
-    _thread = threading.Thread(target=_worker, daemon=True)
+    def _worker_parallel() -> None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        from backend.historical_replay_swing.parallel_executor import (
+            compute_parallel_eta,
+            run_days_parallel,
+            run_root_for,
+        )
+
+        t0 = time.time()
+        day_secs: List[float] = []
+        run_root = run_root_for(cfg.version, started_at)
+        log(f"[swing_replay] 🧵 Replaying {len(days)} days on {n_workers} worker processes → {run_root}")
+
+        def _on_start(in_flight: List[str]) -> None:
+            cur = get_state()
+            cur["in_flight_days"] = in_flight
+            cur["current_day"] = in_flight[0] if in_flight else None
+            _write_state(cur)
+
+        def _on_done(res: Dict[str, Any], in_flight: List[str]) -> None:
+            day = str(res.get("day"))
+            cur = get_state()
+            completed = sorted(set(cur.get("completed_days") or []) | {day})
+            failed = list(cur.get("failed_days") or [])
+            if str(res.get("status")) in ("error", "crashed", "skipped"):
+                failed = sorted(set(failed) | {day})
+                cur["last_error"] = res.get("error") or f"{day}: nightly {res.get('status')}"
+                log(f"[swing_replay] ❌ {day} failed: {cur['last_error']}")
+            else:
+                log(f"[swing_replay] ✅ {day} done in {res.get('secs')}s")
+            if res.get("secs") is not None:
+                day_secs.append(float(res["secs"]))
+
+            elapsed = prev_elapsed + (time.time() - t0)
+            cur.update({
+                "in_flight_days": in_flight,
+                "current_day": in_flight[0] if in_flight else None,
+                "completed_days": completed,
+                "failed_days": failed,
+                "days_completed": len(completed),
+                "elapsed_secs": round(elapsed, 3),
+                "percent_complete": (len(completed) / len(days)) * 100.0,
+                "eta_secs": compute_parallel_eta(day_secs, len(days) - len(completed), n_workers),
+            })
+            _write_state(cur)
+
+        try:
+            # One task per child: every day gets a fresh interpreter, env and PATHS.
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx, max_tasks_per_child=1) as pool:
+                run_days_parallel(
+                    [d.isoformat() for d in days],
+                    workers=n_workers,
+                    run_root=run_root,
+                    executor=pool,
+                    on_start=_on_start,
+                    on_done=_on_done,
+                    should_stop=lambda: get_state().get("status") == "stopping",
+                )
+
+            cur = get_state()
+            stopped = cur.get("status") == "stopping"
+            cur.update({
+                "status": "stopped" if stopped else "complete",
+                "finished_at": _now().isoformat(),
+                "current_day": None,
+                "in_flight_days": [],
+                "elapsed_secs": round(prev_elapsed + (time.time() - t0), 3),
+            })
+            if not stopped:
+                cur.update({"percent_complete": 100.0, "eta_secs": 0.0})
+            _write_state(cur)
+
+        finally:
+            if cfg.set_maintenance_mode:
+                _set_maintenance(False)
+            _release_lock()
+
+    _thread = threading.Thread(target=_worker_parallel if n_workers > 1 else _worker, daemon=True)
     _thread.start()
     return {"status": "started", "state": get_state()}
 
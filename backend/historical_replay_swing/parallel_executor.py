@@ -0,0 +1,374 @@
+"""backend.historical_replay_swing.parallel_executor
+
+Parallel swing replay: several as-of dates at once, one subprocess per day.
+
+The sequential replay sets AION_RUN_MODE / AION_ASOF_DATE in the process
+environment and runs one full nightly job per day, so days cannot overlap.
+Here every day runs in a fresh spawn process (max_tasks_per_child=1), which
+owns its environment and gets:
+
+    • an output sandbox (<run>/days/<date>/): PATHS entries under the
+      writable trees (da_brains, ml_data, logs, insights, analytics,
+      dashboard_cache, stock_cache) are re-rooted into it before the nightly
+      modules are imported, and so are the path constants of backend
+      modules already loaded in the worker (e.g. data_pipeline's rolling
+      paths). Small state files (core brains, bot configs, knob overrides)
+      are copied in as the starting point.
+    • a snapshot mount: PATHS["swing_replay_snapshots"] points at
+      <sandbox>/snapshots, which holds only that day's snapshot (symlink,
+      copy where symlinks are not allowed).
+    • a stage cache (<run>/stage_cache/) for phases whose output does not
+      depend on the as-of date (ASOF_INDEPENDENT_PHASES). The first day to
+      reach such a phase runs it; later days copy its outputs into their
+      sandbox and reuse the payload.
+
+Days do not see each other's outputs, so learning state carries over from
+day to day only in the sequential (workers=1) replay.
+
+Env knobs:
+    AION_SWING_REPLAY_WORKERS=N    days in flight (default 1 = sequential)
+    AION_SWING_REPLAY_CACHE_WAIT   secs to wait on another day's cache
+                                   fill before running uncached (600)
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import shutil
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Root config, not backend.core.config: importing backend.core loads
+# data_pipeline, which binds the live rolling paths before apply_sandbox.
+from config import PATHS
+from utils.logger import log
+
+# PATHS keys whose trees are re-rooted into the per-day sandbox.
+SANDBOX_KEYS: Tuple[str, ...] = (
+    "da_brains",
+    "ml_data",
+    "logs",
+    "insights",
+    "analytics",
+    "dashboard_cache",
+    "stock_cache",
+)
+
+# Copied from the live tree into every sandbox (if present).
+SEED_KEYS: Tuple[str, ...] = (
+    "core_brains",
+    "bots_config",
+    "bots_ui_overrides",
+    "swing_knob_overrides",
+    "swing_knob_profiles_dir",
+    "swing_exploration_budget",
+    "swing_tuner_state",
+)
+
+# Phase key -> outputs (relative to the sandbox) to carry between days.
+# news_intel builds from the shared news cache, never from the snapshot.
+ASOF_INDEPENDENT_PHASES: Dict[str, Tuple[str, ...]] = {
+    "news_intel": ("ml_data/news_features",),
+}
+
+
+def workers_default() -> int:
+    try:
+        return max(1, int(os.getenv("AION_SWING_REPLAY_WORKERS", "1") or "1"))
+    except Exception:
+        return 1
+
+
+def _cache_wait_secs() -> float:
+    try:
+        return max(0.0, float(os.getenv("AION_SWING_REPLAY_CACHE_WAIT", "600") or "600"))
+    except Exception:
+        return 600.0
+
+
+def run_root_for(version: str, started_at: str) -> Path:
+    stamp = "".join(ch if ch.isalnum() else "_" for ch in f"{version}_{started_at}")
+    return Path(PATHS["swing_replay_root"]) / "runs" / stamp
+
+
+def _roots(paths: Dict[str, Any]) -> List[Tuple[str, Path]]:
+    roots = [(k, Path(paths[k])) for k in SANDBOX_KEYS if isinstance(paths.get(k), Path)]
+    # Longest root first so nested trees map to their own dir.
+    return sorted(roots, key=lambda kv: len(kv[1].parts), reverse=True)
+
+
+def _reroot(path: Path, roots: List[Tuple[str, Path]], sandbox: Path) -> Path:
+    for name, root in roots:
+        try:
+            return sandbox / name / path.relative_to(root)
+        except ValueError:
+            continue
+    return path
+
+
+def sandbox_paths(paths: Dict[str, Any], sandbox: Path) -> Dict[str, Any]:
+    """
+    PATHS with every entry under a SANDBOX_KEYS tree re-rooted into `sandbox`.
+
+    Entries outside those trees (universe, raw data, news cache) are shared
+    read-only inputs and keep their path.
+    """
+    sandbox = Path(sandbox)
+    roots = _roots(paths)
+    out = {k: (_reroot(v, roots, sandbox) if isinstance(v, Path) else v) for k, v in paths.items()}
+    out["swing_replay_snapshots"] = sandbox / "snapshots"
+    return out
+
+
+def _copy_any(src: Path, dst: Path) -> None:
+    if src.is_dir():
+        shutil.copytree(src, dst, dirs_exist_ok=True)
+    elif src.exists():
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, dst)
+
+
+def _reroot_constants(module: Any, roots: List[Tuple[str, Path]], sandbox: Path) -> None:
+    for name, value in list(vars(module).items()):
+        if name.isupper() and isinstance(value, Path):
+            setattr(module, name, _reroot(value, roots, sandbox))
+
+
+def apply_sandbox(sandbox: Path) -> Dict[str, Any]:
+    """
+    Re-root this process's PATHS (in place), the matching root config
+    constants and the path constants of already imported backend modules
+    into `sandbox`, seed it, and return the original PATHS.
+
+    Should run before the nightly modules are imported: most of them bind
+    their paths at import time, and only module-level UPPER_CASE Path
+    constants are patched afterwards.
+    """
+    import config as root_config
+
+    sandbox = Path(sandbox)
+    live = dict(PATHS)
+    boxed = sandbox_paths(live, sandbox)
+
+    roots = _roots(live)
+    _reroot_constants(root_config, roots, sandbox)
+    for name, module in list(sys.modules.items()):
+        if module is not None and (name == "backend" or name.startswith("backend.")):
+            _reroot_constants(module, roots, sandbox)
+    PATHS.clear()
+    PATHS.update(boxed)
+
+    for key, value in boxed.items():
+        if isinstance(value, Path) and value != live.get(key) and value.suffix == "":
+            value.mkdir(parents=True, exist_ok=True)
+    for key in SEED_KEYS:
+        if isinstance(live.get(key), Path) and boxed[key] != live[key]:
+            _copy_any(Path(live[key]), Path(boxed[key]))
+    return live
+
+
+def mount_snapshot(snapshots_root: Path, sandbox: Path, day: str) -> Path:
+    """Expose only `day`'s snapshot under <sandbox>/snapshots/<day>."""
+    src = Path(snapshots_root) / day
+    mount = Path(sandbox) / "snapshots"
+    mount.mkdir(parents=True, exist_ok=True)
+    dst = mount / day
+    if dst.exists() or dst.is_symlink() or not src.is_dir():
+        return mount
+    try:
+        dst.symlink_to(src.resolve(), target_is_directory=True)
+    except OSError:
+        shutil.copytree(src, dst)
+    return mount
+
+
+class StageCache:
+    """
+    Per-run cache of as-of independent phases, shared by the day processes.
+
+    <root>/<phase>/payload.json holds the phase result and <root>/<phase>/files
+    its sandbox outputs. A <phase>.lock file (O_EXCL) makes sure only one
+    day fills an entry; the others wait for it.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _lock(self, key: str, wait_secs: float) -> bool:
+        lp = self.root / f"{key}.lock"
+        deadline = time.time() + wait_secs
+        while True:
+            try:
+                fd = os.open(str(lp), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return True
+            except FileExistsError:
+                if (self.root / key / "payload.json").exists() or time.time() >= deadline:
+                    return False
+                time.sleep(0.25)
+
+    def _unlock(self, key: str) -> None:
+        try:
+            (self.root / f"{key}.lock").unlink()
+        except FileNotFoundError:
+            pass
+
+    def _restore(self, key: str, sandbox: Path) -> Any:
+        entry = self.root / key
+        files = entry / "files"
+        if files.is_dir():
+            shutil.copytree(files, sandbox, dirs_exist_ok=True)
+        return json.loads((entry / "payload.json").read_text(encoding="utf-8"))
+
+    def _store(self, key: str, sandbox: Path, outputs: Tuple[str, ...], payload: Any) -> None:
+        entry = self.root / key
+        entry.mkdir(parents=True, exist_ok=True)
+        for rel in outputs:
+            src = sandbox / rel
+            if src.exists():
+                _copy_any(src, entry / "files" / rel)
+        tmp = entry / "payload.json.tmp"
+        tmp.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        tmp.replace(entry / "payload.json")
+
+    def wrap(
+        self,
+        key: str,
+        fn: Callable[[Any], Any],
+        sandbox: Path,
+        outputs: Tuple[str, ...] = (),
+    ) -> Callable[[Any], Any]:
+        """Phase fn that reuses (or fills) the cached result for `key`."""
+        sandbox = Path(sandbox)
+
+        def run(ctx: Any) -> Any:
+            if (self.root / key / "payload.json").exists():
+                log(f"[swing_replay] ♻️ Stage cache hit: {key}")
+                return {"stage_cache": "hit", "result": self._restore(key, sandbox)}
+            owner = self._lock(key, _cache_wait_secs())
+            try:
+                if (self.root / key / "payload.json").exists():
+                    log(f"[swing_replay] ♻️ Stage cache hit: {key}")
+                    return {"stage_cache": "hit", "result": self._restore(key, sandbox)}
+                payload = fn(ctx)
+                if owner:
+                    self._store(key, sandbox, outputs, payload)
+                return payload
+            finally:
+                if owner:
+                    self._unlock(key)
+
+        return run
+
+    def overrides(self, sandbox: Path) -> Dict[str, Callable[[Any], Any]]:
+        """phase_overrides for run_nightly_job covering ASOF_INDEPENDENT_PHASES."""
+        from backend.jobs.nightly_job import PHASE_SPECS
+
+        return {
+            key: self.wrap(key, PHASE_SPECS[key]["fn"], sandbox, outputs)
+            for key, outputs in ASOF_INDEPENDENT_PHASES.items()
+            if key in PHASE_SPECS
+        }
+
+
+def run_day_isolated(day: str, run_root: str, snapshots_root: str) -> Dict[str, Any]:
+    """
+    Subprocess entry point: replay one as-of date inside its own sandbox.
+
+    Never raises; failures come back as {"status": "error", ...}.
+    """
+    t0 = time.time()
+    sandbox = Path(run_root) / "days" / day
+    try:
+        os.environ["AION_RUN_MODE"] = "replay"
+        os.environ["AION_ASOF_DATE"] = day
+        apply_sandbox(sandbox)
+        mount_snapshot(Path(snapshots_root), sandbox, day)
+
+        from backend.historical_replay_swing.job_manager import _run_one_day
+
+        cache = StageCache(Path(run_root) / "stage_cache")
+        out = _run_one_day(date.fromisoformat(day), phase_overrides=cache.overrides(sandbox))
+        out["status"] = str(out.get("status") or (out.get("nightly") or {}).get("status") or "ok")
+        out["day"] = day
+    except Exception as e:
+        out = {"day": day, "status": "error", "error": str(e), "traceback": traceback.format_exc()}
+    out["secs"] = round(time.time() - t0, 3)
+    out["sandbox"] = str(sandbox)
+    return out
+
+
+def compute_parallel_eta(day_secs: List[float], remaining: int, workers: int) -> Optional[float]:
+    """Mean day duration × the number of worker rounds still needed."""
+    if not day_secs or remaining <= 0:
+        return 0.0 if remaining <= 0 else None
+    mean = sum(day_secs) / len(day_secs)
+    return round(mean * math.ceil(remaining / max(1, workers)), 3)
+
+
+def run_days_parallel(
+    days: List[str],
+    *,
+    workers: int,
+    run_root: Path,
+    executor: Executor,
+    on_start: Callable[[List[str]], None],
+    on_done: Callable[[Dict[str, Any], List[str]], None],
+    should_stop: Callable[[], bool],
+    day_fn: Callable[[str, str, str], Dict[str, Any]] = run_day_isolated,
+) -> List[Dict[str, Any]]:
+    """
+    Keep up to `workers` days in flight on `executor` until all are done
+    or should_stop() turns true (in-flight days then finish; no new ones
+    start). Returns the day results in completion order.
+
+    on_start(in_flight) fires after a submit, on_done(result, in_flight)
+    after a completion.
+    """
+    snapshots_root = str(PATHS["swing_replay_snapshots"])
+    pending = list(days)
+    running: Dict[Future, str] = {}
+    results: List[Dict[str, Any]] = []
+
+    while pending or running:
+        stopping = should_stop()
+        while pending and len(running) < max(1, workers) and not stopping:
+            day = pending.pop(0)
+            running[executor.submit(day_fn, day, str(run_root), snapshots_root)] = day
+            on_start(sorted(running.values()))
+        if not running:
+            break
+
+        done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+        for fut in done:
+            day = running.pop(fut)
+            try:
+                res = fut.result()
+            except Exception as e:  # worker died (e.g. BrokenProcessPool)
+                res = {"day": day, "status": "error", "error": str(e)}
+            results.append(res)
+            on_done(res, sorted(running.values()))
+    return results
+
+
+__all__ = [
+    "ASOF_INDEPENDENT_PHASES",
+    "StageCache",
+    "apply_sandbox",
+    "compute_parallel_eta",
+    "mount_snapshot",
+    "run_day_isolated",
+    "run_days_parallel",
+    "run_root_for",
+    "sandbox_paths",
+    "workers_default",
+]
@@ -11,6 +11,19 @@ Keeps:
   - accuracy_engine writes calibration map
   - post-brain policy UI refresh (append_ledger=False)
   - fail-loud checks for "no valid horizons" and "preds_total==0"
+
+Phase DAG:
+  - PIPELINE phases run as a dependency DAG (backend.jobs.pipeline_dag).
+    PHASE_SPECS declares what each phase reads/writes; independent phases
+    (the fetchers, context/regime, ...) run concurrently within per-pool
+    worker limits. The PIPELINE order is kept as the tie-breaker.
+  - Completed phases are checkpointed (logs/nightly/nightly_checkpoint.json);
+    a crashed run resumes from the phases that did not complete.
+  - summary["phases"] gets start/end offsets + wait times per phase and
+    summary["critical_path"] the critical-path report.
+  - AION_NIGHTLY_DAG=0 runs one phase at a time (old sequential order),
+    AION_NIGHTLY_DAG_WORKERS caps concurrency (default 6),
+    AION_NIGHTLY_RESUME=0 / --no-resume ignores the checkpoint.
 """
 
 from __future__ import annotations
@@ -21,13 +34,15 @@ import json
 import numpy as np
 import subprocess
 import sys
+import threading
 import time
 import traceback
 import argparse
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from statistics import pstdev
-from typing import Any, Dict, Optional, List, Tuple
+from typing import Any, Callable, Dict, Optional, List, Tuple
 
 try:
     from config import ROOT  # unified project root
@@ -42,11 +57,16 @@ except Exception:  # pragma: no cover
 # Always-available core imports
 # -----------------------------
 from backend.core.config import PATHS, TIMEZONE
-from backend.core.data_pipeline import _read_rolling, save_rolling, safe_float, _read_rolling_nervous, save_rolling_nervous
+from backend.core.data_pipeline import _read_rolling, save_rolling, safe_float, _read_rolling_nervous, save_rolling_nervous, sync_rolling_mirror
+from backend.jobs.pipeline_dag import DagExecutor, PhaseCheckpoint, PhaseNode
 from utils.logger import log
 
 LOCK_FILE = PATHS["nightly_lock"]
 SUMMARY_FILE = PATHS["logs"] / "nightly" / "last_nightly_summary.json"
+CHECKPOINT_FILE = PATHS["logs"] / "nightly" / "nightly_checkpoint.json"
+
+# Phases run on DAG worker threads; summary updates + writes go through this lock.
+_SUMMARY_LOCK = threading.RLock()
 
 # -----------------------------
 # Recent-run guard
@@ -191,6 +211,8 @@ log_predictions = _safe_import("backend.services.prediction_logger", "log_predic
 train_all_models = _safe_import("backend.core.ai_model.core_training", "train_all_models")
 train_all_sector_models = _safe_import("backend.core.sector_training.sector_trainer", "train_all_sector_models")
 predict_all = _safe_import("backend.core.ai_model.core_training", "predict_all")
+get_training_scheduler = _safe_import("backend.core.training_scheduler", "get_training_scheduler")
+shutdown_training_scheduler = _safe_import("backend.core.training_scheduler", "shutdown_training_scheduler")
 apply_policy = _safe_import("backend.core.policy_engine", "apply_policy")
 build_context = _safe_import("backend.core.context_state", "build_context")
 detect_regime = _safe_import("backend.core.regime_detector", "detect_regime")
@@ -268,17 +290,19 @@ def _phase(title: str, idx: int, total: int) -> None:
 
 
 def _record_ok(summary: Dict[str, Any], key: str, payload: Any, t0: float) -> None:
-    summary["phases"][key] = {"status": "ok", "secs": round(time.time() - t0, 3), "result": payload}
+    with _SUMMARY_LOCK:
+        summary["phases"][key] = {"status": "ok", "secs": round(time.time() - t0, 3), "result": payload}
 
 
-def _record_err(summary: Dict[str, Any], key: str, err: Exception, t0: float) -> None:
+def _record_err(summary: Dict[str, Any], key: str, err: BaseException, t0: float) -> None:
     tb = traceback.format_exc()
-    summary["phases"][key] = {
-        "status": "error",
-        "secs": round(time.time() - t0, 3),
-        "error": str(err),
-        "traceback": tb,
-    }
+    with _SUMMARY_LOCK:
+        summary["phases"][key] = {
+            "status": "error",
+            "secs": round(time.time() - t0, 3),
+            "error": str(err),
+            "traceback": tb,
+        }
     log(f"[nightly_job] ❌ Phase '{key}' failed: {err}")
     log(tb)
 
@@ -286,7 +310,9 @@ def _record_err(summary: Dict[str, Any], key: str, err: Exception, t0: float) ->
 def _write_summary(summary: Dict[str, Any]) -> None:
     try:
         SUMMARY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        SUMMARY_FILE.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        with _SUMMARY_LOCK:
+            text = json.dumps(summary, indent=2)
+        SUMMARY_FILE.write_text(text, encoding="utf-8")
         log(f"✅ Summary written → {SUMMARY_FILE}")
     except Exception as e:
         log(f"⚠️ Failed to write summary: {e}")
@@ -323,6 +349,554 @@ def _fail_loud_training_check(train_res: Any) -> None:
     log(f"[nightly_job] 📌 Training horizon summary: ok={ok_count}, skipped={skipped}, rejected={rejected}, error={errors}")
 
 
+# ----------------------------------------------------------
+# Phase bodies (one per PIPELINE key; run as DAG nodes)
+# ----------------------------------------------------------
+@dataclass
+class _NightlyContext:
+    mode: str
+    as_of_date: Optional[str]
+    summary: Dict[str, Any]
+    rolling: Dict[str, Any] = field(default_factory=dict)
+    # JSON-safe values later phases need; checkpointed for resume.
+    state: Dict[str, Any] = field(default_factory=dict)
+
+    def annotate(self, key: str, value: Any) -> None:
+        with _SUMMARY_LOCK:
+            self.summary[key] = value
+
+    def universe(self) -> List[str]:
+        _require(load_universe, "backend.services.backfill_history.load_universe")
+        return load_universe() or [s for s in self.rolling.keys() if not str(s).startswith("_")]
+
+    def use_optuna(self) -> Tuple[bool, int]:
+        use_optuna = datetime.now(TIMEZONE).weekday() == 0  # Monday tuning
+        if self.mode == "replay":
+            use_optuna = False
+        return use_optuna, (100 if use_optuna else 0)
+
+
+def _run_load_rolling(ctx: _NightlyContext) -> Any:
+    ctx.rolling = _read_rolling_with_retry() or {}
+    log(f"✅ Load rolling cache — {len(ctx.rolling)} symbols loaded.")
+    return {"symbols": int(len(ctx.rolling))}
+
+
+def _run_backfill(ctx: _NightlyContext) -> Any:
+    _require(backfill_symbols, "backend.services.backfill_history.backfill_symbols")
+    universe = ctx.universe()
+    if not universe:
+        raise RuntimeError("Universe empty — nothing to backfill.")
+    updated = backfill_symbols(universe, min_days=180, max_workers=8)
+    ctx.rolling = _read_rolling() or ctx.rolling
+    log(f"✅ Heal/backfill complete — {updated}/{len(universe)} updated.")
+    return {"updated": int(updated), "universe_size": int(len(universe))}
+
+
+def _run_fundamentals(ctx: _NightlyContext) -> Any:
+    _require(update_fundamentals, "backend.services.fundamentals_fetcher.update_fundamentals")
+    res = update_fundamentals()
+    log("✅ Fundamentals complete.")
+    return res
+
+
+def _run_metrics(ctx: _NightlyContext) -> Any:
+    _require(build_metrics, "backend.services.metrics_fetcher.build_metrics")
+    # rolling=None: merge into a fresh read under the rolling update lock
+    res = build_metrics()
+    log("✅ Metrics complete.")
+    return res
+
+
+def _run_macro(ctx: _NightlyContext) -> Any:
+    _require(build_macro_features, "backend.services.macro_fetcher.build_macro_features")
+    res = build_macro_features()
+    log("✅ Macro ready.")
+    return res
+
+
+def _run_social(ctx: _NightlyContext) -> Any:
+    _require(build_social_sentiment, "backend.services.social_sentiment_fetcher.build_social_sentiment")
+    res = build_social_sentiment()
+    log("✅ Social sentiment complete.")
+    return res
+
+
+def _run_news_intel(ctx: _NightlyContext) -> Any:
+    _require(write_news_brain_snapshots, "backend.services.news_brain_builder.write_news_brain_snapshots")
+    _require(build_nightly_news_intel, "backend.services.news_intel.build_nightly_news_intel")
+
+    universe = ctx.universe()
+
+    brain_summary = None
+    intel_path = None
+
+    try:
+        brain_summary = write_news_brain_snapshots()
+    except Exception as e_brain:
+        log(f"[nightly_job] ⚠️ write_news_brain_snapshots failed (continuing): {e_brain}")
+        brain_summary = {"status": "error", "error": str(e_brain)}
+
+    try:
+        intel_path = build_nightly_news_intel(universe)
+    except Exception as e_intel:
+        log(f"[nightly_job] ⚠️ build_nightly_news_intel failed (continuing): {e_intel}")
+        intel_path = None
+
+    log("✅ News brain + intel complete.")
+    return {
+        "brain": brain_summary,
+        "intel_file": str(intel_path) if intel_path else None,
+        "universe_size": int(len(universe)),
+        "note": "Nightly does NOT call Marketaux. News comes from cache→brain.",
+    }
+
+
+def _run_dataset(ctx: _NightlyContext) -> Any:
+    _require(build_daily_dataset, "backend.services.ml_data_builder.build_daily_dataset")
+
+    mp_env = str(os.getenv("AION_ML_MP", "0")).strip().lower()
+    use_mp = mp_env in ("1", "true", "yes", "y", "on")
+
+    if ctx.mode == "replay":
+        use_mp = False
+
+    log(f"[nightly_job] [ml_data_builder] mp={use_mp} (set AION_ML_MP=1 to enable)")
+
+    ds = build_daily_dataset(
+        as_of_date=ctx.as_of_date,
+        strict=(ctx.mode == "replay"),
+        use_multiprocessing=use_mp,
+        debug=False,
+        chunk_symbols=50,
+        corr_sample_rows=50_000,
+        rewrite_final=True,
+        return_dataframe="none",
+    )
+    log(f"✅ Dataset built — rows={ds.get('rows', 0)} → {ds.get('file')}")
+    return ds
+
+
+def _run_training_sector(ctx: _NightlyContext) -> Any:
+    ctx.state.setdefault("training_started_at", time.time())
+    t0 = time.time()
+    try:
+        _require(train_all_sector_models, "backend.core.sector_training.sector_trainer.train_all_sector_models")
+        max_workers = max(1, int(os.getenv("AION_SECTOR_TRAIN_WORKERS", "1") or "1"))
+        log(f"[nightly_job] 🧭 Sector training starting — workers={max_workers} (set AION_SECTOR_TRAIN_WORKERS to override)")
+
+        use_optuna, n_trials = ctx.use_optuna()
+
+        sector_res = (train_all_sector_models(
+            dataset_name="training_data_daily.parquet",
+            use_optuna=use_optuna,
+            n_trials=n_trials,
+            max_workers=max_workers,
+        ) or {})
+    except Exception as e:
+        log(f"[nightly_job] ⚠️ Sector training failed (continuing with global): {e}")
+        raise
+
+    if not isinstance(sector_res, dict):
+        sector_res = {"status": "error", "error": "unexpected_result"}
+
+    log(f"✅ Sector training complete — {time.time() - t0:.1f}s")
+    return sector_res
+
+
+def _run_training_global(ctx: _NightlyContext) -> Any:
+    ctx.state.setdefault("training_started_at", time.time())
+    t0 = time.time()
+    try:
+        _require(train_all_models, "backend.core.ai_model.core_training.train_all_models")
+
+        use_optuna, n_trials = ctx.use_optuna()
+        log(f"[nightly_job] 🌍 Global training starting — optuna={use_optuna} n_trials={n_trials}")
+
+        res = train_all_models(
+            dataset_name="training_data_daily.parquet",
+            use_optuna=use_optuna,
+            n_trials=n_trials,
+            as_of_date=ctx.as_of_date,
+        )
+        _fail_loud_training_check(res)
+    finally:
+        # Per-job queue/wall times for both training phases, then free the pool.
+        if get_training_scheduler is not None:
+            try:
+                ctx.annotate(
+                    "training_scheduler",
+                    get_training_scheduler().report(since=float(ctx.state["training_started_at"])),
+                )
+                if shutdown_training_scheduler is not None:
+                    shutdown_training_scheduler()
+            except Exception as e:
+                log(f"[nightly_job] ⚠️ Training scheduler report failed: {e}")
+
+    log(f"✅ Global training complete — {time.time() - t0:.1f}s")
+    return res
+
+
+def _run_predictions(ctx: _NightlyContext) -> Any:
+    _require(predict_all, "backend.core.ai_model.core_training.predict_all")
+    prediction_run_ts = datetime.now(TIMEZONE).isoformat()
+
+    # Fetch phases saved their fields to disk; merge predictions into the fresh copy.
+    rolling = _read_rolling_with_retry() or ctx.rolling
+    ctx.rolling = rolling
+
+    preds_by_symbol = predict_all(rolling, write_diagnostics=False) or {}
+    if not isinstance(preds_by_symbol, dict):
+        raise RuntimeError("predict_all returned non-dict (unexpected).")
+
+    preds_total = int(len(preds_by_symbol))
+    if preds_total <= 0:
+        raise RuntimeError("preds_total==0 (predict_all returned empty).")
+
+    # CRITICAL: Validate predictions BEFORE persisting to rolling cache
+    # This prevents corrupting the rolling file with invalid/flat predictions
+    log("[nightly_job] 🔍 Validating predictions before persistence...")
+
+    # Fail-loud: ensure at least one horizon looks valid
+    valid_horizons = set()
+    for _sym, pred in preds_by_symbol.items():
+        if not isinstance(pred, dict):
+            continue
+        for h, blk in pred.items():
+            if not isinstance(blk, dict):
+                continue
+            if bool(blk.get("valid", True)):
+                valid_horizons.add(str(h))
+    if not valid_horizons:
+        raise RuntimeError("No valid horizons found in predictions output.")
+
+    # Check for flat predictions (model degeneracy)
+    flat_horizons = []
+    for h in valid_horizons:
+        pred_values = []
+        for _sym, pred in preds_by_symbol.items():
+            if isinstance(pred, dict) and h in pred:
+                blk = pred[h]
+                if isinstance(blk, dict):
+                    pred_ret = blk.get("predicted_return")
+                    if pred_ret is not None and not (np.isnan(pred_ret) or np.isinf(pred_ret)):
+                        pred_values.append(float(pred_ret))
+
+        if len(pred_values) > 10:  # Need sufficient samples
+            std = float(pstdev(pred_values))
+            if std < 0.002:  # <0.2% std indicates flat/degenerate model
+                flat_horizons.append(f"{h}(std={std:.6f})")
+                log(f"[nightly_job] ⚠️ Flat predictions detected for {h}: std={std:.6f} (threshold=0.002)")
+
+    if flat_horizons:
+        raise RuntimeError(
+            f"Flat predictions detected (model degeneracy) for horizons: {', '.join(flat_horizons)}. "
+            "Predictions have near-zero variance across symbols. "
+            "This indicates model failure - NOT persisting to prevent rolling cache corruption."
+        )
+
+    log(f"[nightly_job] ✅ Validation passed: {len(valid_horizons)} valid horizons, no flat predictions")
+
+    # Merge into rolling (keep existing node fields intact)
+    updated_syms = 0
+    for sym, node in list(rolling.items()):
+        if str(sym).startswith("_") or not isinstance(node, dict):
+            continue
+        su = str(sym).upper()
+        if su in preds_by_symbol:
+            node["predictions"] = preds_by_symbol[su]
+            node["predictions_ts"] = prediction_run_ts
+            rolling[sym] = node
+            updated_syms += 1
+
+    # Persist rolling with retry logic
+    try:
+        _save_rolling_with_retry(rolling, attempts=3, sleep_secs=1.0)
+        log(f"[nightly_job] ✓ Rolling file updated with {updated_syms} predictions")
+    except Exception as e_save:
+        log(f"[nightly_job] ❌ save_rolling failed after retries (CRITICAL): {e_save}")
+        # This is critical - predictions generated but not persisted
+        raise RuntimeError(f"Failed to persist predictions to rolling file: {e_save}") from e_save
+    ctx.state["prediction_run_ts"] = prediction_run_ts
+
+    # PASS 1: Immediate optimization with in-memory data (prevents race condition)
+    try:
+        _require(optimize_rolling_data, "backend.services.rolling_optimizer.optimize_rolling_data")
+        res_pass1 = optimize_rolling_data(section="swing", rolling_data=rolling)
+        log(f"✅ Pass 1 rolling optimization complete (in-memory): {res_pass1.get('status')}")
+    except Exception as e_opt:
+        log(f"⚠️ Pass 1 rolling optimizer failed (continuing): {e_opt}")
+
+    # Update rolling_nervous predictions history (best-effort)
+    try:
+        nervous = _read_rolling_nervous() or {}
+        nervous2 = _append_predictions_history(nervous, preds_by_symbol, prediction_run_ts, keep_days=30)
+        save_rolling_nervous(nervous2)
+    except Exception as e_hist:
+        log(f"[nightly_job] ⚠️ predictions_history update failed (continuing): {e_hist}")
+
+    log(f"✅ Predictions complete — symbols={preds_total} horizons={len(valid_horizons)}")
+
+    # Check if adaptive retraining should be triggered (new ML feedback loop)
+    try:
+        from backend.core.continuous_learning import should_retrain_models
+        should_retrain = should_retrain_models(rolling)
+        ctx.annotate("adaptive_retraining_check", {
+            "recommended": bool(should_retrain),
+            "checked_at": datetime.now(TIMEZONE).isoformat(),
+        })
+        if should_retrain:
+            log("[nightly_job] ⚠️ Adaptive retraining recommended based on model performance")
+    except Exception as e:
+        log(f"[nightly_job] ⚠️ Adaptive retraining check failed: {e}")
+        ctx.annotate("adaptive_retraining_check", {"error": str(e)})
+
+    return {
+        "preds_total": preds_total,
+        "rolling_updated": int(updated_syms),
+        "valid_horizons": sorted(valid_horizons),
+        "run_ts": prediction_run_ts,
+    }
+
+
+def _run_rolling_optimizer(ctx: _NightlyContext) -> Any:
+    _require(optimize_rolling_data, "backend.services.rolling_optimizer.optimize_rolling_data")
+
+    # Pass 2: Read from disk to catch any changes from intermediate phases
+    # (policy, execution, etc. may have modified rolling file)
+    # This ensures rolling_optimized.json.gz reflects final state
+    # (non-fatal node: an optimizer failure is recorded and the job continues)
+    res = optimize_rolling_data(section="swing")
+    log("✅ Pass 2 rolling optimization complete (final re-optimization from disk).")
+    return res
+
+
+def _run_prediction_logger(ctx: _NightlyContext) -> Any:
+    _require(log_predictions, "backend.services.prediction_logger.log_predictions")
+
+    res = log_predictions(
+        as_of_date=ctx.as_of_date,
+        save_to_file=True,
+        append_ledger=True,
+        apply_policy_first=False,  # policy happens later (brain-aligned)
+        write_timestamped=True,
+        run_ts_override=ctx.state.get("prediction_run_ts"),
+        entry_date_override=ctx.as_of_date,
+    )
+    log("✅ Prediction logging complete.")
+    return res
+
+
+def _run_accuracy_engine(ctx: _NightlyContext) -> Any:
+    _require(compute_accuracy, "backend.services.accuracy_engine.compute_accuracy")
+    res = compute_accuracy()
+    log("✅ Accuracy engine complete.")
+    return res
+
+
+def _run_context(ctx: _NightlyContext) -> Any:
+    _require(build_context, "backend.core.context_state.build_context")
+    res = build_context()
+    log("✅ Context state complete.")
+    return res
+
+
+def _run_regime(ctx: _NightlyContext) -> Any:
+    _require(detect_regime, "backend.core.regime_detector.detect_regime")
+    res = detect_regime(None)
+    log("✅ Regime detection complete.")
+    return res
+
+
+def _run_continuous_learning(ctx: _NightlyContext) -> Any:
+    _require(run_continuous_learning, "backend.core.continuous_learning.run_continuous_learning")
+    res = run_continuous_learning()
+    log("✅ Continuous learning complete.")
+    return res
+
+
+def _run_performance(ctx: _NightlyContext) -> Any:
+    if aggregate_system_performance is None:
+        res = {"status": "skipped", "reason": "import_failed"}
+    else:
+        res = aggregate_system_performance(lookback_days=14)
+    log("✅ Performance aggregation complete.")
+    return res
+
+
+def _run_aion_brain(ctx: _NightlyContext) -> Any:
+    if update_aion_brain is None:
+        res = {"status": "skipped", "reason": "import_failed"}
+    else:
+        res = update_aion_brain()
+    log("✅ AION brain update complete.")
+    return res
+
+
+def _run_policy(ctx: _NightlyContext) -> Any:
+    _require(apply_policy, "backend.core.policy_engine.apply_policy")
+    apply_policy()
+    log("✅ Policy engine complete.")
+    return {"status": "ok"}
+
+
+def _run_swing_bot_eod(ctx: _NightlyContext) -> Any:
+    bots = ["1w", "2w", "4w"]
+    results = {}
+
+    for bot in bots:
+        try:
+            cmd = [
+                sys.executable, "-u", "-m",
+                f"backend.bots.runner_{bot}",
+                "--mode", "full"
+            ]
+            proc = subprocess.run(
+                cmd,
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                timeout=600  # 10 min timeout per bot
+            )
+            results[bot] = {
+                "exit_code": proc.returncode,
+                "success": proc.returncode == 0,
+            }
+        except subprocess.TimeoutExpired:
+            results[bot] = {"exit_code": -1, "success": False, "error": "timeout"}
+        except Exception as e:
+            results[bot] = {"exit_code": -1, "success": False, "error": str(e)}
+
+    success_count = sum(1 for r in results.values() if r.get("success"))
+    log(f"✅ Swing bot EOD rebalance complete — {success_count}/{len(bots)} successful.")
+
+    # Post-policy UI refresh (latest_predictions.json) — do NOT append ledger twice
+    try:
+        if log_predictions is not None:
+            log("[nightly_job] 🔄 UI refresh after policy (append_ledger=False)")
+            log_predictions(
+                as_of_date=ctx.as_of_date,
+                save_to_file=True,
+                append_ledger=False,
+                apply_policy_first=False,
+                write_timestamped=False,
+                run_ts_override=ctx.state.get("prediction_run_ts"),
+                entry_date_override=ctx.as_of_date,
+            )
+    except Exception as e_refresh:
+        log(f"[nightly_job] ⚠️ post-policy UI refresh failed (continuing): {e_refresh}")
+
+    return {"rebalanced": success_count, "total": len(bots), "results": results}
+
+
+def _run_insights(ctx: _NightlyContext) -> Any:
+    _require(build_daily_insights, "backend.services.insights_builder.build_daily_insights")
+    res = build_daily_insights(limit=50)
+    log("✅ Insights complete.")
+    return res
+
+
+def _run_supervisor(ctx: _NightlyContext) -> Any:
+    _require(run_supervisor_agent, "backend.core.supervisor_agent.run_supervisor_agent")
+    res = run_supervisor_agent()
+    log("✅ Supervisor complete.")
+    return res
+
+
+# ----------------------------------------------------------
+# Phase DAG (inputs/outputs → dependencies)
+# ----------------------------------------------------------
+# Resources are dotted names: "rolling" covers every "rolling.<field>", so a
+# phase that reads/writes the whole rolling file orders against all field
+# writers, while the fetchers that only merge their own field (under the
+# rolling update lock) can run side by side.
+PHASE_SPECS: Dict[str, Dict[str, Any]] = {
+    "load_rolling": {"fn": _run_load_rolling, "reads": ("rolling",), "pool": "io", "always_run": True},
+    "backfill": {"fn": _run_backfill, "reads": ("universe", "rolling"), "writes": ("rolling",), "pool": "net"},
+    "fundamentals": {"fn": _run_fundamentals, "writes": ("rolling.fundamentals",), "pool": "net"},
+    "metrics": {"fn": _run_metrics, "writes": ("rolling.metrics",), "pool": "net"},
+    "macro": {"fn": _run_macro, "writes": ("macro", "market_state"), "pool": "net"},
+    "social": {"fn": _run_social, "writes": ("rolling.social", "social"), "pool": "net"},
+    "news_intel": {"fn": _run_news_intel, "reads": ("universe",), "writes": ("news",), "after": ("load_rolling",), "pool": "net"},
+    "dataset": {"fn": _run_dataset, "reads": ("rolling", "macro", "news", "social"), "writes": ("dataset",), "pool": "cpu"},
+    "training_sector": {"fn": _run_training_sector, "reads": ("dataset",), "writes": ("models.sector",), "pool": "train"},
+    "training_global": {"fn": _run_training_global, "reads": ("dataset",), "writes": ("models.global",), "pool": "train", "fatal": True},
+    "predictions": {"fn": _run_predictions, "reads": ("models", "rolling"), "writes": ("rolling", "rolling_nervous"), "pool": "cpu", "fatal": True},
+    "rolling_optimizer": {"fn": _run_rolling_optimizer, "reads": ("rolling",), "writes": ("rolling_optimized",), "pool": "io"},
+    "prediction_logger": {"fn": _run_prediction_logger, "reads": ("rolling",), "writes": ("rolling", "ledger", "latest_predictions"), "pool": "io"},
+    "accuracy_engine": {"fn": _run_accuracy_engine, "reads": ("ledger", "rolling.history"), "writes": ("accuracy",), "pool": "cpu"},
+    "context": {"fn": _run_context, "reads": ("rolling", "news", "social", "macro", "aion_brain"), "writes": ("rolling.context", "market_state"), "pool": "cpu"},
+    "regime": {"fn": _run_regime, "reads": ("macro", "market_state", "aion_brain"), "pool": "cpu"},
+    "continuous_learning": {"fn": _run_continuous_learning, "reads": ("rolling", "brain", "aion_brain"), "writes": ("brain", "aion_brain"), "pool": "cpu"},
+    "performance": {"fn": _run_performance, "reads": ("ledger", "accuracy"), "writes": ("performance",), "pool": "io"},
+    "aion_brain": {"fn": _run_aion_brain, "reads": ("performance", "aion_brain"), "writes": ("aion_brain",), "pool": "io"},
+    "policy": {"fn": _run_policy, "reads": ("rolling", "brain", "aion_brain"), "writes": ("rolling",), "pool": "cpu"},
+    "swing_bot_eod": {"fn": _run_swing_bot_eod, "reads": ("rolling",), "writes": ("bots", "latest_predictions"), "pool": "io"},
+    "insights": {"fn": _run_insights, "reads": ("rolling",), "writes": ("insights",), "pool": "io"},
+    "supervisor": {
+        "fn": _run_supervisor,
+        "reads": ("rolling", "brain", "aion_brain", "insights", "macro", "news", "social", "models", "accuracy"),
+        "writes": ("supervisor",),
+        "pool": "cpu",
+    },
+}
+
+
+def _dag_pools() -> Dict[str, int]:
+    return {
+        "net": max(1, int(os.getenv("AION_NIGHTLY_NET_WORKERS", "5") or "5")),
+        "io": 2,
+        "cpu": 2,
+        "train": 1,
+    }
+
+
+def _dag_max_workers() -> int:
+    """AION_NIGHTLY_DAG=0 runs phases one at a time in PIPELINE order."""
+    if str(os.getenv("AION_NIGHTLY_DAG", "1")).strip().lower() in ("0", "false", "no", "n", "off"):
+        return 1
+    return max(1, int(os.getenv("AION_NIGHTLY_DAG_WORKERS", "6") or "6"))
+
+
+def _resume_enabled() -> bool:
+    return str(os.getenv("AION_NIGHTLY_RESUME", "1")).strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def _build_phase_nodes(
+    ctx: _NightlyContext,
+    overrides: Optional[Dict[str, Callable[[_NightlyContext], Any]]] = None,
+) -> List[PhaseNode]:
+    """One PhaseNode per PIPELINE key; `overrides` swaps a phase body (same deps)."""
+    nodes: List[PhaseNode] = []
+    for key, title in PIPELINE:
+        spec = PHASE_SPECS[key]
+        fn = (overrides or {}).get(key) or spec["fn"]
+        nodes.append(
+            PhaseNode(
+                key=key,
+                title=title,
+                fn=(lambda fn=fn: fn(ctx)),
+                reads=tuple(spec.get("reads", ())),
+                writes=tuple(spec.get("writes", ())),
+                after=tuple(spec.get("after", ())),
+                pool=str(spec.get("pool", "cpu")),
+                fatal=bool(spec.get("fatal", False)),
+                always_run=bool(spec.get("always_run", False)),
+            )
+        )
+    return nodes
+
+
+def _attach_dag_report(summary: Dict[str, Any], report: Dict[str, Any]) -> None:
+    """Merge per-phase DAG timing into summary["phases"] and add the critical-path report."""
+    with _SUMMARY_LOCK:
+        for key, info in (report.get("nodes") or {}).items():
+            entry = summary["phases"].get(key)
+            if isinstance(entry, dict):
+                entry.update(info)
+        summary["critical_path"] = {k: v for k, v in report.items() if k != "nodes"}
+
+
 # ----------------------------------------------------------
 # Main nightly pipeline
 # ----------------------------------------------------------
@@ -330,7 +904,13 @@ def run_nightly_job(
     mode: str = "normal",
     as_of_date: Optional[str] = None,
     force: bool = False,
+    resume: bool = True,
+    phase_overrides: Optional[Dict[str, Callable[[_NightlyContext], Any]]] = None,
 ) -> Dict[str, Any]:
+    """
+    phase_overrides maps a PIPELINE key to a replacement phase body (e.g. the
+    swing replay's stage cache); dependencies still come from PHASE_SPECS.
+    """
     mode = str(mode or "normal").strip().lower()
     as_of_date = str(as_of_date).strip() if as_of_date else None
     if mode not in ("normal", "replay"):
@@ -388,583 +968,56 @@ def run_nightly_job(
         ],
     }
 
-    try:
-        prediction_run_ts: Optional[str] = None
-        rolling: Dict[str, Any] = {}
-
-        # 1) Load rolling
-        key, title = PIPELINE[0]
-        _phase(title, 1, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            rolling = _read_rolling_with_retry() or {}
-            _record_ok(summary, key, {"symbols": int(len(rolling))}, t0)
-            log(f"✅ Load rolling cache — {len(rolling)} symbols loaded.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            rolling = {}
-
-        # 2) Backfill
-        key, title = PIPELINE[1]
-        _phase(title, 2, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(load_universe, "backend.services.backfill_history.load_universe")
-            _require(backfill_symbols, "backend.services.backfill_history.backfill_symbols")
-
-            universe = load_universe() or [s for s in rolling.keys() if not str(s).startswith("_")]
-            if not universe:
-                raise RuntimeError("Universe empty — nothing to backfill.")
-            updated = backfill_symbols(universe, min_days=180, max_workers=8)
-            rolling = _read_rolling() or rolling
-            _record_ok(summary, key, {"updated": int(updated), "universe_size": int(len(universe))}, t0)
-            log(f"✅ Heal/backfill complete — {updated}/{len(universe)} updated.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-
-        # 3) Fundamentals
-        key, title = PIPELINE[2]
-        _phase(title, 3, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(update_fundamentals, "backend.services.fundamentals_fetcher.update_fundamentals")
-            res = update_fundamentals(rolling)
-            rolling = _read_rolling() or rolling
-            _record_ok(summary, key, res, t0)
-            log("✅ Fundamentals complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-
-        # 4) Metrics
-        key, title = PIPELINE[3]
-        _phase(title, 4, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(build_metrics, "backend.services.metrics_fetcher.build_metrics")
-            res = build_metrics(rolling)
-            rolling = _read_rolling() or rolling
-            _record_ok(summary, key, res, t0)
-            log("✅ Metrics complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
+    ctx = _NightlyContext(mode=mode, as_of_date=as_of_date, summary=summary)
+    executor: Optional[DagExecutor] = None
 
-        # 5) Macro
-        key, title = PIPELINE[4]
-        _phase(title, 5, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(build_macro_features, "backend.services.macro_fetcher.build_macro_features")
-            res = build_macro_features()
-            _record_ok(summary, key, res, t0)
-            log("✅ Macro ready.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-
-        # 6) Social
-        key, title = PIPELINE[5]
-        _phase(title, 6, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(build_social_sentiment, "backend.services.social_sentiment_fetcher.build_social_sentiment")
-            res = build_social_sentiment()
-            _record_ok(summary, key, res, t0)
-            log("✅ Social sentiment complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-
-        # 7) News brain + intel
-        key, title = PIPELINE[6]
-        _phase(title, 7, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(write_news_brain_snapshots, "backend.services.news_brain_builder.write_news_brain_snapshots")
-            _require(build_nightly_news_intel, "backend.services.news_intel.build_nightly_news_intel")
-            _require(load_universe, "backend.services.backfill_history.load_universe")
-
-            universe = load_universe() or [s for s in rolling.keys() if not str(s).startswith("_")]
-            if not universe:
-                universe = [s for s in rolling.keys() if not str(s).startswith("_")]
-
-            brain_summary = None
-            intel_path = None
-
-            try:
-                brain_summary = write_news_brain_snapshots()
-            except Exception as e_brain:
-                log(f"[nightly_job] ⚠️ write_news_brain_snapshots failed (continuing): {e_brain}")
-                brain_summary = {"status": "error", "error": str(e_brain)}
-
-            try:
-                intel_path = build_nightly_news_intel(universe)
-            except Exception as e_intel:
-                log(f"[nightly_job] ⚠️ build_nightly_news_intel failed (continuing): {e_intel}")
-                intel_path = None
-
-            payload = {
-                "brain": brain_summary,
-                "intel_file": str(intel_path) if intel_path else None,
-                "universe_size": int(len(universe)),
-                "note": "Nightly does NOT call Marketaux. News comes from cache→brain.",
-            }
-            _record_ok(summary, key, payload, t0)
-            log("✅ News brain + intel complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-
-        # 8) Dataset
-        key, title = PIPELINE[7]
-        _phase(title, 8, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(build_daily_dataset, "backend.services.ml_data_builder.build_daily_dataset")
-
-            mp_env = str(os.getenv("AION_ML_MP", "0")).strip().lower()
-            use_mp = mp_env in ("1", "true", "yes", "y", "on")
-
-            if mode == "replay":
-                use_mp = False
-
-            log(f"[nightly_job] [ml_data_builder] mp={use_mp} (set AION_ML_MP=1 to enable)")
-
-            ds = build_daily_dataset(
-                as_of_date=as_of_date,
-                strict=(mode=="replay"),
-                use_multiprocessing=use_mp,
-                debug=False,
-                chunk_symbols=50,
-                corr_sample_rows=50_000,
-                rewrite_final=True,
-                return_dataframe="none",
-            )
-            _record_ok(summary, key, ds, t0)
-            log(f"✅ Dataset built — rows={ds.get('rows', 0)} → {ds.get('file')}")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-
-        # 9A) Sector Training
-        key_sector, title_sector = PIPELINE[8]
-        _phase(title_sector, 9, TOTAL_PHASES)
-        t0_sector = time.time()
-        try:
-            _require(train_all_sector_models, "backend.core.sector_training.sector_trainer.train_all_sector_models")
-            max_workers = max(1, int(os.getenv("AION_SECTOR_TRAIN_WORKERS", "1") or "1"))
-            log(f"[nightly_job] 🧭 Sector training starting — workers={max_workers} (set AION_SECTOR_TRAIN_WORKERS to override)")
-            
-            today = datetime.now(TIMEZONE)
-            use_optuna = (today.weekday() == 0)  # Monday tuning
-            if mode == "replay":
-                use_optuna = False
-            n_trials = 100 if use_optuna else 0
-            
-            sector_res = (train_all_sector_models(
-                dataset_name="training_data_daily.parquet",
-                use_optuna=use_optuna,
-                n_trials=n_trials,
-                max_workers=max_workers,
-            ) or {})
-            
-            if not isinstance(sector_res, dict):
-                sector_res = {"status": "error", "error": "unexpected_result"}
-            
-            _record_ok(summary, key_sector, sector_res, t0_sector)
-            _write_summary(summary)
-            
-            sector_time = time.time() - t0_sector
-            log(f"✅ Sector training complete — {sector_time:.1f}s")
-            
-        except Exception as e:
-            _record_err(summary, key_sector, e, t0_sector)
-            _write_summary(summary)
-            log(f"[nightly_job] ⚠️ Sector training failed (continuing with global): {e}")
-
-        # 9B) Global Training
-        key_global, title_global = PIPELINE[9]
-        _phase(title_global, 10, TOTAL_PHASES)
-        t0_global = time.time()
-        try:
-            _require(train_all_models, "backend.core.ai_model.core_training.train_all_models")
-            
-            today = datetime.now(TIMEZONE)
-            use_optuna = (today.weekday() == 0)  # Monday tuning
-            if mode == "replay":
-                use_optuna = False
-            n_trials = 100 if use_optuna else 0
-            
-            log(f"[nightly_job] 🌍 Global training starting — optuna={use_optuna} n_trials={n_trials}")
-            
-            res = train_all_models(
-                dataset_name="training_data_daily.parquet",
-                use_optuna=use_optuna,
-                n_trials=n_trials,
-                as_of_date=as_of_date,
-            )
-            _fail_loud_training_check(res)
-            
-            _record_ok(summary, key_global, res, t0_global)
-            _write_summary(summary)
-            
-            global_time = time.time() - t0_global
-            log(f"✅ Global training complete — {global_time:.1f}s")
-            
-        except Exception as e:
-            _record_err(summary, key_global, e, t0_global)
-            _write_summary(summary)
-            raise
-
-        
-        # 10) Predictions
-        key, title = PIPELINE[10]
-        _phase(title, 11, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(predict_all, "backend.core.ai_model.core_training.predict_all")
-            prediction_run_ts = datetime.now(TIMEZONE).isoformat()
-
-            preds_by_symbol = predict_all(rolling, write_diagnostics=False) or {}
-            if not isinstance(preds_by_symbol, dict):
-                raise RuntimeError("predict_all returned non-dict (unexpected).")
-
-            preds_total = int(len(preds_by_symbol))
-            if preds_total <= 0:
-                raise RuntimeError("preds_total==0 (predict_all returned empty).")
-
-            # CRITICAL: Validate predictions BEFORE persisting to rolling cache
-            # This prevents corrupting the rolling file with invalid/flat predictions
-            log("[nightly_job] 🔍 Validating predictions before persistence...")
-            
-            # Fail-loud: ensure at least one horizon looks valid
-            valid_horizons = set()
-            for _sym, pred in preds_by_symbol.items():
-                if not isinstance(pred, dict):
-                    continue
-                for h, blk in pred.items():
-                    if not isinstance(blk, dict):
-                        continue
-                    if bool(blk.get("valid", True)):
-                        valid_horizons.add(str(h))
-            if not valid_horizons:
-                raise RuntimeError("No valid horizons found in predictions output.")
-            
-            # Check for flat predictions (model degeneracy)
-            flat_horizons = []
-            for h in valid_horizons:
-                pred_values = []
-                for _sym, pred in preds_by_symbol.items():
-                    if isinstance(pred, dict) and h in pred:
-                        blk = pred[h]
-                        if isinstance(blk, dict):
-                            pred_ret = blk.get("predicted_return")
-                            if pred_ret is not None and not (np.isnan(pred_ret) or np.isinf(pred_ret)):
-                                pred_values.append(float(pred_ret))
-                
-                if len(pred_values) > 10:  # Need sufficient samples
-                    std = float(pstdev(pred_values))
-                    if std < 0.002:  # <0.2% std indicates flat/degenerate model
-                        flat_horizons.append(f"{h}(std={std:.6f})")
-                        log(f"[nightly_job] ⚠️ Flat predictions detected for {h}: std={std:.6f} (threshold=0.002)")
-            
-            if flat_horizons:
-                raise RuntimeError(
-                    f"Flat predictions detected (model degeneracy) for horizons: {', '.join(flat_horizons)}. "
-                    "Predictions have near-zero variance across symbols. "
-                    "This indicates model failure - NOT persisting to prevent rolling cache corruption."
-                )
-            
-            log(f"[nightly_job] ✅ Validation passed: {len(valid_horizons)} valid horizons, no flat predictions")
-
-            # Merge into rolling (keep existing node fields intact)
-            updated_syms = 0
-            for sym, node in list(rolling.items()):
-                if str(sym).startswith("_") or not isinstance(node, dict):
-                    continue
-                su = str(sym).upper()
-                if su in preds_by_symbol:
-                    node["predictions"] = preds_by_symbol[su]
-                    node["predictions_ts"] = prediction_run_ts
-                    rolling[sym] = node
-                    updated_syms += 1
-
-            # Persist rolling with retry logic
-            try:
-                _save_rolling_with_retry(rolling, attempts=3, sleep_secs=1.0)
-                log(f"[nightly_job] ✓ Rolling file updated with {updated_syms} predictions")
-            except Exception as e_save:
-                log(f"[nightly_job] ❌ save_rolling failed after retries (CRITICAL): {e_save}")
-                # This is critical - predictions generated but not persisted
-                raise RuntimeError(f"Failed to persist predictions to rolling file: {e_save}") from e_save
-
-            # PASS 1: Immediate optimization with in-memory data (prevents race condition)
-            try:
-                _require(optimize_rolling_data, "backend.services.rolling_optimizer.optimize_rolling_data")
-                res_pass1 = optimize_rolling_data(section="swing", rolling_data=rolling)
-                log(f"✅ Pass 1 rolling optimization complete (in-memory): {res_pass1.get('status')}")
-            except Exception as e_opt:
-                log(f"⚠️ Pass 1 rolling optimizer failed (continuing): {e_opt}")
-
-            # Update rolling_nervous predictions history (best-effort)
-            try:
-                nervous = _read_rolling_nervous() or {}
-                nervous2 = _append_predictions_history(nervous, preds_by_symbol, prediction_run_ts, keep_days=30)
-                save_rolling_nervous(nervous2)
-            except Exception as e_hist:
-                log(f"[nightly_job] ⚠️ predictions_history update failed (continuing): {e_hist}")
-
-            payload = {
-                "preds_total": preds_total,
-                "rolling_updated": int(updated_syms),
-                "valid_horizons": sorted(valid_horizons),
-                "run_ts": prediction_run_ts,
-            }
-            _record_ok(summary, key, payload, t0)
-            _write_summary(summary)
-            log(f"✅ Predictions complete — symbols={preds_total} horizons={len(valid_horizons)}")
-            
-            # Check if adaptive retraining should be triggered (new ML feedback loop)
-            try:
-                from backend.core.continuous_learning import should_retrain_models
-                should_retrain = should_retrain_models(rolling)
-                summary["adaptive_retraining_check"] = {
-                    "recommended": bool(should_retrain),
-                    "checked_at": datetime.now(TIMEZONE).isoformat(),
-                }
-                if should_retrain:
-                    log("[nightly_job] ⚠️ Adaptive retraining recommended based on model performance")
-            except Exception as e:
-                log(f"[nightly_job] ⚠️ Adaptive retraining check failed: {e}")
-                summary["adaptive_retraining_check"] = {"error": str(e)}
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-            raise
-
-        # 11) Rolling optimizer - PASS 2 (safety re-optimization from disk)
-        key, title = PIPELINE[11]
-        _phase(title, 12, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(optimize_rolling_data, "backend.services.rolling_optimizer.optimize_rolling_data")
-            
-            # Pass 2: Read from disk to catch any changes from intermediate phases
-            # (policy, execution, etc. may have modified rolling file)
-            # This ensures rolling_optimized.json.gz reflects final state
-            res = optimize_rolling_data(section="swing")
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ Pass 2 rolling optimization complete (final re-optimization from disk).")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-            # Don't raise - optimizer failure shouldn't stop the job
-            log(f"⚠️ Rolling optimizer failed (continuing): {e}")
-
-        # 12) Prediction logger (UI feed + ledger)
-        key, title = PIPELINE[12]
-        _phase(title, 13, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(log_predictions, "backend.services.prediction_logger.log_predictions")
-
-            res = log_predictions(
-                as_of_date=as_of_date,
-                save_to_file=True,
-                append_ledger=True,
-                apply_policy_first=False,  # policy happens later (brain-aligned)
-                write_timestamped=True,
-                run_ts_override=prediction_run_ts,
-                entry_date_override=as_of_date,
-            )
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ Prediction logging complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-
-        # 13) Accuracy engine (calibration + windows)
-        key, title = PIPELINE[13]
-        _phase(title, 14, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(compute_accuracy, "backend.services.accuracy_engine.compute_accuracy")
-            res = compute_accuracy()
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ Accuracy engine complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-
-        # 14) Context state
-        key, title = PIPELINE[14]
-        _phase(title, 15, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(build_context, "backend.core.context_state.build_context")
-            res = build_context()
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ Context state complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-
-        # 15) Regime detection
-        key, title = PIPELINE[15]
-        _phase(title, 16, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(detect_regime, "backend.core.regime_detector.detect_regime")
-            res = detect_regime(None)
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ Regime detection complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-
-        # 16) Continuous learning (drift + memory)
-        key, title = PIPELINE[16]
-        _phase(title, 17, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(run_continuous_learning, "backend.core.continuous_learning.run_continuous_learning")
-            res = run_continuous_learning()
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ Continuous learning complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-
-        # 17) Performance aggregation (system metrics)
-        key, title = PIPELINE[17]
-        _phase(title, 18, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            if aggregate_system_performance is None:
-                res = {"status": "skipped", "reason": "import_failed"}
-            else:
-                res = aggregate_system_performance(lookback_days=14)
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ Performance aggregation complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-
-        # 18) AION brain update (behavioral memory)
-        key, title = PIPELINE[18]
-        _phase(title, 19, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            if update_aion_brain is None:
-                res = {"status": "skipped", "reason": "import_failed"}
-            else:
-                res = update_aion_brain()
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ AION brain update complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-
-        # 19) Policy engine (brain-aligned)
-        key, title = PIPELINE[19]
-        _phase(title, 20, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(apply_policy, "backend.core.policy_engine.apply_policy")
-            apply_policy()
-            _record_ok(summary, key, {"status": "ok"}, t0)
-            _write_summary(summary)
-            log("✅ Policy engine complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
-
-        # 20) Swing Bot EOD Rebalance (after policy)
-        key, title = PIPELINE[20]
-        _phase(title, 21, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            bots = ["1w", "2w", "4w"]
-            results = {}
-            
-            for bot in bots:
-                try:
-                    cmd = [
-                        sys.executable, "-u", "-m",
-                        f"backend.bots.runner_{bot}",
-                        "--mode", "full"
-                    ]
-                    proc = subprocess.run(
-                        cmd,
-                        cwd=ROOT,
-                        capture_output=True,
-                        text=True,
-                        timeout=600  # 10 min timeout per bot
-                    )
-                    results[bot] = {
-                        "exit_code": proc.returncode,
-                        "success": proc.returncode == 0,
-                    }
-                except subprocess.TimeoutExpired:
-                    results[bot] = {"exit_code": -1, "success": False, "error": "timeout"}
-                except Exception as e:
-                    results[bot] = {"exit_code": -1, "success": False, "error": str(e)}
-            
-            success_count = sum(1 for r in results.values() if r.get("success"))
-            _record_ok(summary, key, {"rebalanced": success_count, "total": len(bots), "results": results}, t0)
-            _write_summary(summary)
-            log(f"✅ Swing bot EOD rebalance complete — {success_count}/{len(bots)} successful.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
+    try:
+        # Phase DAG (independent phases run concurrently; completed ones are checkpointed)
+        run_day = as_of_date or datetime.now(TIMEZONE).date().isoformat()
+        checkpoint = PhaseCheckpoint(CHECKPOINT_FILE, f"{mode}:{run_day}")
+        completed: Dict[str, Any] = {}
+        if resume and _resume_enabled():
+            prev = checkpoint.load()
+            completed = prev["completed"]
+            ctx.state.update(prev["state"])
+            for key, entry in completed.items():
+                summary["phases"][key] = {**entry, "resumed": True} if isinstance(entry, dict) else {"status": "ok", "resumed": True}
+        else:
+            checkpoint.clear()
+
+        positions = {key: i + 1 for i, (key, _title) in enumerate(PIPELINE)}
+
+        def _on_start(node: PhaseNode) -> None:
+            _phase(node.title, positions[node.key], TOTAL_PHASES)
+
+        def _on_ok(node: PhaseNode, payload: Any, t0: float) -> Dict[str, Any]:
+            _record_ok(summary, node.key, payload, t0)
             _write_summary(summary)
-            log(f"⚠️ Swing bot rebalance failed (non-fatal, continuing): {e}")
+            return summary["phases"][node.key]
 
-        # Post-policy UI refresh (latest_predictions.json) — do NOT append ledger twice
-        try:
-            if log_predictions is not None:
-                log("[nightly_job] 🔄 UI refresh after policy (append_ledger=False)")
-                log_predictions(
-                    as_of_date=as_of_date,
-                    save_to_file=True,
-                    append_ledger=False,
-                    apply_policy_first=False,
-                    write_timestamped=False,
-                    run_ts_override=prediction_run_ts,
-                    entry_date_override=as_of_date,
-                )
-        except Exception as e_refresh:
-            log(f"[nightly_job] ⚠️ post-policy UI refresh failed (continuing): {e_refresh}")
-
-        # 21) Insights builder
-        key, title = PIPELINE[21]
-        _phase(title, 22, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(build_daily_insights, "backend.services.insights_builder.build_daily_insights")
-            res = build_daily_insights(limit=50)
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ Insights complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
+        def _on_error(node: PhaseNode, err: BaseException, t0: float) -> None:
+            _record_err(summary, node.key, err, t0)
             _write_summary(summary)
 
-        # 22) Supervisor agent
-        key, title = PIPELINE[22]
-        _phase(title, 23, TOTAL_PHASES)
-        t0 = time.time()
-        try:
-            _require(run_supervisor_agent, "backend.core.supervisor_agent.run_supervisor_agent")
-            res = run_supervisor_agent()
-            _record_ok(summary, key, res, t0)
-            _write_summary(summary)
-            log("✅ Supervisor complete.")
-        except Exception as e:
-            _record_err(summary, key, e, t0)
-            _write_summary(summary)
+        executor = DagExecutor(
+            _build_phase_nodes(ctx, phase_overrides),
+            pools=_dag_pools(),
+            max_workers=_dag_max_workers(),
+            checkpoint=checkpoint,
+            state=ctx.state,
+            on_start=_on_start,
+            on_ok=_on_ok,
+            on_error=_on_error,
+        )
+        log(f"[nightly_job] 🧩 Phase DAG — workers={executor.max_workers} pools={executor.pools}")
+        report = executor.run(completed)
+        _attach_dag_report(summary, report)
+        checkpoint.clear()
+        log(
+            f"[nightly_job] ⏱️ Phases done — wall={report['wall_secs']}s serial={report['serial_secs']}s "
+            f"critical_path={' → '.join(report['critical_path'])}"
+        )
+        _write_summary(summary)
 
         # Optional: auto knob tuner (best-effort; does not affect pipeline status)
         t0 = time.time()
@@ -1021,6 +1074,12 @@ def run_nightly_job(
                 log(f"[nightly] ⚠️ Snapshot capture failed (non-fatal): {e}")
             _write_summary(summary)
 
+        # put_node() shard writes leave rolling_body stale; mirror them once.
+        try:
+            sync_rolling_mirror()
+        except Exception as e:
+            log(f"[nightly] ⚠️ Rolling mirror sync failed (non-fatal): {e}")
+
         # Determine final status
         had_errors = any(
             isinstance(v, dict) and str(v.get("status")) == "error"
@@ -1090,6 +1149,9 @@ def run_nightly_job(
         summary["status"] = "crashed"
         summary["finished_at"] = datetime.now(TIMEZONE).isoformat()
         summary["phases"]["_fatal"] = {"error": str(e), "traceback": tb}
+        if executor is not None:
+            # Timing up to the failure; the checkpoint is kept so the next run resumes.
+            _attach_dag_report(summary, executor.report())
         _write_summary(summary)
         
         # Send error alert
@@ -1120,8 +1182,8 @@ def run() -> Dict[str, Any]:
     return run_nightly_job(mode="normal", as_of_date=None, force=False)
 
 
-def main(mode: str = "normal", as_of_date: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
-    return run_nightly_job(mode=mode, as_of_date=as_of_date, force=force)
+def main(mode: str = "normal", as_of_date: Optional[str] = None, force: bool = False, resume: bool = True) -> Dict[str, Any]:
+    return run_nightly_job(mode=mode, as_of_date=as_of_date, force=force, resume=resume)
 
 
 if __name__ == "__main__":
@@ -1129,6 +1191,7 @@ if __name__ == "__main__":
     parser.add_argument("--mode", default="normal", choices=["normal", "replay"], help="Run mode.")
     parser.add_argument("--as-of", dest="as_of", default=None, help="Replay cut-off date YYYY-MM-DD (replay mode).")
     parser.add_argument("--force", action="store_true", help="Run even if recent-run guard would skip.")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore the phase checkpoint and run every phase.")
     args = parser.parse_args()
-    out = run_nightly_job(mode=str(args.mode), as_of_date=args.as_of, force=bool(args.force))
+    out = run_nightly_job(mode=str(args.mode), as_of_date=args.as_of, force=bool(args.force), resume=not args.no_resume)
     print(json.dumps(out, indent=2))
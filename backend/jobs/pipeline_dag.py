@@ -0,0 +1,290 @@
+# backend/jobs/pipeline_dag.py
+"""
+Pipeline DAG — AION Analytics
+
+Small dependency-DAG executor for multi-phase jobs (used by nightly_job).
+
+    • Each PhaseNode declares the resources it reads and writes. Edges are
+      derived in declaration order from read/write hazards (read-after-write,
+      write-after-read, write-after-write), so the declared order is still
+      the tie-breaker and a sequential run (max_workers=1) is unchanged.
+      Resources are dotted names; "rolling" overlaps "rolling.metrics",
+      but "rolling.metrics" and "rolling.social" do not overlap.
+    • Ready nodes run concurrently on a thread pool, limited per node pool
+      (e.g. "net": 5, "train": 1) and overall by max_workers.
+    • Completed nodes are checkpointed (PhaseCheckpoint); a rerun with the
+      same run key skips them and resumes from the first node that did not
+      complete.
+    • A fatal node failure stops scheduling new nodes, lets running ones
+      finish and raises DagAborted.
+    • report() returns per-node offsets/wait times and the critical path.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from utils.logger import log
+
+
+class DagAborted(RuntimeError):
+    """A fatal node failed; `key` names it and __cause__ is its exception."""
+
+    def __init__(self, key: str, err: BaseException):
+        super().__init__(f"Phase '{key}' failed: {err}")
+        self.key = key
+
+
+@dataclass
+class PhaseNode:
+    key: str
+    title: str
+    fn: Callable[[], Any]
+    reads: Tuple[str, ...] = ()
+    writes: Tuple[str, ...] = ()
+    after: Tuple[str, ...] = ()  # explicit extra dependencies
+    pool: str = "default"
+    fatal: bool = False
+    always_run: bool = False  # re-run on resume (cheap in-memory state loaders)
+
+
+def _overlaps(a: str, b: str) -> bool:
+    return a == b or a.startswith(b + ".") or b.startswith(a + ".")
+
+
+def _conflicts(xs: Tuple[str, ...], ys: Tuple[str, ...]) -> bool:
+    return any(_overlaps(x, y) for x in xs for y in ys)
+
+
+def resolve_dependencies(nodes: List[PhaseNode]) -> Dict[str, Tuple[str, ...]]:
+    """Direct dependencies per node (hazard edges + `after`, transitively reduced)."""
+    ancestors: Dict[str, Set[str]] = {}
+    out: Dict[str, Tuple[str, ...]] = {}
+    for i, n in enumerate(nodes):
+        deps = [
+            m.key
+            for m in nodes[:i]
+            if m.key in n.after
+            or _conflicts(n.reads, m.writes)
+            or _conflicts(n.writes, m.reads)
+            or _conflicts(n.writes, m.writes)
+        ]
+        implied: Set[str] = set()
+        for d in deps:
+            implied |= ancestors[d]
+        direct = tuple(d for d in deps if d not in implied)
+        out[n.key] = direct
+        ancestors[n.key] = set(deps) | implied
+    return out
+
+
+class PhaseCheckpoint:
+    """Completed-phase checkpoint for one run key (JSON, atomically replaced)."""
+
+    def __init__(self, path: Path, run_key: str):
+        self.path = Path(path)
+        self.run_key = str(run_key)
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {"run_key": self.run_key, "completed": {}, "state": {}}
+
+    def load(self) -> Dict[str, Any]:
+        """Previous {completed, state} for this run key ({} parts otherwise)."""
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            raw = {}
+        if isinstance(raw, dict) and raw.get("run_key") == self.run_key:
+            self._data = {
+                "run_key": self.run_key,
+                "completed": dict(raw.get("completed") or {}),
+                "state": dict(raw.get("state") or {}),
+            }
+        return {"completed": dict(self._data["completed"]), "state": dict(self._data["state"])}
+
+    def mark(self, key: str, entry: Dict[str, Any], state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data["completed"][key] = entry
+            self._data["state"] = dict(state)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+                tmp.write_text(json.dumps(self._data, default=str), encoding="utf-8")
+                os.replace(tmp, self.path)
+            except Exception as e:
+                log(f"[pipeline_dag] ⚠️ Checkpoint write failed: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                log(f"[pipeline_dag] ⚠️ Checkpoint clear failed: {e}")
+
+
+class DagExecutor:
+    """Run PhaseNodes as a DAG.
+
+    on_start(node) is called before a node runs; on_ok(node, payload, t0) /
+    on_error(node, exc, t0) record its outcome (on_error runs inside the
+    except block, so traceback.format_exc() works there). Non-fatal errors
+    still release dependents, matching the old sequential pipeline.
+    """
+
+    def __init__(
+        self,
+        nodes: List[PhaseNode],
+        *,
+        pools: Optional[Dict[str, int]] = None,
+        max_workers: int = 4,
+        checkpoint: Optional[PhaseCheckpoint] = None,
+        state: Optional[Dict[str, Any]] = None,
+        on_start: Optional[Callable[[PhaseNode], None]] = None,
+        on_ok: Optional[Callable[[PhaseNode, Any, float], Optional[Dict[str, Any]]]] = None,
+        on_error: Optional[Callable[[PhaseNode, BaseException, float], None]] = None,
+    ):
+        self.nodes = list(nodes)
+        self.by_key = {n.key: n for n in self.nodes}
+        self.deps = resolve_dependencies(self.nodes)
+        self.pools = dict(pools or {})
+        self.max_workers = max(1, int(max_workers))
+        self.checkpoint = checkpoint
+        self.state: Dict[str, Any] = state if state is not None else {}
+        self.on_start = on_start
+        self.on_ok = on_ok
+        self.on_error = on_error
+        self.resumed: List[str] = []
+        self._timing: Dict[str, Dict[str, float]] = {}
+        self._t0 = 0.0
+        self._t1 = 0.0
+
+    def _pool_limit(self, pool: str) -> int:
+        # Pools without a configured limit are only capped by max_workers.
+        return max(1, int(self.pools.get(pool, self.max_workers)))
+
+    def _run_node(self, node: PhaseNode) -> Tuple[str, Any, Optional[BaseException]]:
+        t0 = time.time()
+        self._timing[node.key] = {"start": t0}
+        try:
+            if self.on_start is not None:
+                self.on_start(node)
+            payload = node.fn()
+        except BaseException as e:  # noqa: BLE001 - recorded, maybe re-raised by run()
+            self._timing[node.key]["end"] = time.time()
+            if self.on_error is not None:
+                self.on_error(node, e, t0)
+            else:
+                log(f"[pipeline_dag] ❌ {node.key} failed: {e}\n{traceback.format_exc()}")
+            return node.key, None, e
+        self._timing[node.key]["end"] = time.time()
+        entry = self.on_ok(node, payload, t0) if self.on_ok is not None else None
+        if self.checkpoint is not None and not node.always_run:
+            self.checkpoint.mark(node.key, entry if isinstance(entry, dict) else {"status": "ok"}, self.state)
+        return node.key, payload, None
+
+    def run(self, completed: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run every node not in `completed` (checkpointed entries); returns report()."""
+        completed = completed or {}
+        done: Set[str] = set()
+        for n in self.nodes:
+            if n.key in completed and not n.always_run:
+                done.add(n.key)
+                self.resumed.append(n.key)
+        if self.resumed:
+            log(f"[pipeline_dag] ⏩ Resuming — skipping {len(self.resumed)} completed phase(s): {', '.join(self.resumed)}")
+
+        pending = [n for n in self.nodes if n.key not in done]
+        running: Dict[Future, PhaseNode] = {}
+        pool_use: Dict[str, int] = {}
+        abort: Optional[DagAborted] = None
+        self._t0 = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="phase") as ex:
+            while pending or running:
+                if abort is None:
+                    for n in list(pending):
+                        if len(running) >= self.max_workers:
+                            break
+                        if not all(d in done for d in self.deps[n.key]):
+                            continue
+                        if pool_use.get(n.pool, 0) >= self._pool_limit(n.pool):
+                            continue
+                        pending.remove(n)
+                        pool_use[n.pool] = pool_use.get(n.pool, 0) + 1
+                        running[ex.submit(self._run_node, n)] = n
+
+                if not running:
+                    if pending and abort is None:
+                        raise RuntimeError(f"Pipeline DAG stalled with pending phases: {[n.key for n in pending]}")
+                    break
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for f in finished:
+                    n = running.pop(f)
+                    pool_use[n.pool] -= 1
+                    key, _payload, err = f.result()
+                    done.add(key)
+                    if err is not None and n.fatal and abort is None:
+                        abort = DagAborted(key, err)
+                        abort.__cause__ = err
+                        log(f"[pipeline_dag] 🛑 Fatal phase '{key}' failed — waiting for running phases, then aborting.")
+
+        self._t1 = time.time()
+        if abort is not None:
+            raise abort
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        """Per-node timing (offsets from run start) and the critical path."""
+        t0 = self._t0
+        nodes: Dict[str, Dict[str, Any]] = {}
+        for n in self.nodes:
+            info: Dict[str, Any] = {"deps": list(self.deps[n.key]), "pool": n.pool}
+            tm = self._timing.get(n.key)
+            if n.key in self.resumed:
+                info["resumed"] = True
+            elif tm and "end" in tm:
+                ready = max([t0] + [self._timing[d]["end"] for d in self.deps[n.key] if "end" in self._timing.get(d, {})])
+                info.update(
+                    {
+                        "start_offset_secs": round(tm["start"] - t0, 3),
+                        "end_offset_secs": round(tm["end"] - t0, 3),
+                        "wait_secs": round(max(0.0, tm["start"] - ready), 3),
+                    }
+                )
+            nodes[n.key] = info
+
+        timed = {k: v for k, v in self._timing.items() if "end" in v}
+        path: List[str] = []
+        if timed:
+            cur: Optional[str] = max(timed, key=lambda k: timed[k]["end"])
+            while cur is not None:
+                path.append(cur)
+                prev = [d for d in self.deps[cur] if d in timed]
+                cur = max(prev, key=lambda k: timed[k]["end"]) if prev else None
+            path.reverse()
+        for k in path:
+            nodes[k]["on_critical_path"] = True
+
+        serial = sum(v["end"] - v["start"] for v in timed.values())
+        wall = max(0.0, (self._t1 or time.time()) - t0)
+        return {
+            "wall_secs": round(wall, 3),
+            "serial_secs": round(serial, 3),
+            "parallelism": round(serial / wall, 3) if wall > 0 else 0.0,
+            "critical_path": path,
+            "critical_path_secs": round(sum(timed[k]["end"] - timed[k]["start"] for k in path), 3),
+            "max_workers": self.max_workers,
+            "pools": dict(self.pools),
+            "resumed": list(self.resumed),
+            "nodes": nodes,
+        }
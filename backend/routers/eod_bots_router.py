@@ -208,7 +208,17 @@ def _load_prices_from_rolling() -> Dict[str, float]:
         { "AAPL": {...}, "MSFT": {...}, ... }
 
     and picks price from: price / last / close / c
+
+    The rolling summary index (read_rolling_summary) is tried first so
+    this never decompresses full histories when the index is available.
     """
+    try:
+        from backend.core.data_pipeline import get_rolling_summary  # type: ignore
+
+        return {str(sym).upper(): px for sym, px in get_rolling_summary().prices().items()}
+    except Exception:
+        pass
+
     data: Dict[str, Any] = {}
 
     # Try to use core helper first
@@ -6,12 +6,19 @@ Endpoints:
 - GET /events/admin/logs - Stream live admin logs
 - GET /events/intraday - Stream intraday snapshot updates
 - GET /events/replay/status - Stream replay status updates
+- GET /events/stats - Broadcast hub subscriber counts and compute times
+
+Streams are served by the shared broadcast hub (backend.services.sse_hub):
+each topic is computed once per tick for all clients and only sent when it
+changed (`?delta=1` sends top-level key deltas as `event: delta`).
+AION_SSE_HUB=0 falls back to one polling generator per client.
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
+import os
 from datetime import datetime
 from typing import AsyncGenerator, Dict, Any
 
@@ -23,8 +30,16 @@ try:
 except ImportError:
     from backend.config import TIMEZONE  # type: ignore
 
+from backend.services.sse_hub import get_broadcast_hub
+
 router = APIRouter(prefix="/api/events", tags=["events"])
 
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
 
 async def _safe_call(func, *args, **kwargs) -> Dict[str, Any]:
     """Call a function safely and return error dict on failure."""
@@ -36,16 +51,81 @@ async def _safe_call(func, *args, **kwargs) -> Dict[str, Any]:
         return {"error": str(e), "error_type": type(e).__name__}
 
 
+def _hub_enabled() -> bool:
+    return os.getenv("AION_SSE_HUB", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+async def _bots_payload() -> Dict[str, Any]:
+    from backend.routers.bots_page_router import bots_page_bundle
+    return await bots_page_bundle()
+
+
+def _admin_logs_payload() -> Dict[str, Any]:
+    from backend.admin.admin_tools_router import get_live_logs
+    return get_live_logs()
+
+
+def _intraday_payload() -> Dict[str, Any]:
+    from backend.intraday_service import get_intraday_snapshot
+    return get_intraday_snapshot(limit=120)
+
+
+# topic -> (payload function, tick seconds)
+_TOPICS = {
+    "bots": (_bots_payload, 5.0),
+    "admin_logs": (_admin_logs_payload, 2.0),
+    "intraday": (_intraday_payload, 5.0),
+}
+
+
+def _sse_response(gen: AsyncGenerator[str, None]) -> StreamingResponse:
+    return StreamingResponse(gen, media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+async def _hub_stream(request: Request, topic: str, delta: bool) -> AsyncGenerator[str, None]:
+    """One client's view of a shared topic (frames come from its hub queue)."""
+    hub = get_broadcast_hub()
+    if topic not in hub.topics():
+        fn, interval = _TOPICS[topic]
+        hub.register(topic, fn, interval)
+    sub = hub.subscribe(topic, delta=delta)
+    try:
+        while True:
+            if await request.is_disconnected():
+                break
+            yield await sub.next_frame()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        hub.unsubscribe(sub)
+
+
+async def _poll_stream(request: Request, fn, interval: float) -> AsyncGenerator[str, None]:
+    """Legacy per-client polling generator (AION_SSE_HUB=0)."""
+    try:
+        while True:
+            if await request.is_disconnected():
+                break
+
+            data = await _safe_call(fn)
+            yield f"data: {json.dumps(data)}\n\n"
+
+            await asyncio.sleep(interval)
+    except asyncio.CancelledError:
+        pass
+
+
 @router.get("/bots")
-async def stream_bots(request: Request):
+async def stream_bots(request: Request, delta: bool = False):
     """
     Server-Sent Events stream for bots page data.
-    Updates every 5 seconds.
+    Updates every 5 seconds (only when the bundle changed).
     Enhanced error handling to keep stream alive even if data fetch fails.
     """
+    if _hub_enabled():
+        return _sse_response(_hub_stream(request, "bots", delta))
+
     async def event_generator() -> AsyncGenerator[str, None]:
-        from backend.routers.bots_page_router import bots_page_bundle
-        
         consecutive_errors = 0
         max_consecutive_errors = 10
         
@@ -57,7 +137,7 @@ async def stream_bots(request: Request):
                 
                 try:
                     # Fetch latest data (cached internally)
-                    data = await _safe_call(bots_page_bundle)
+                    data = await _safe_call(_bots_payload)
                     
                     # Reset error count on success
                     if "error" not in data:
@@ -96,76 +176,32 @@ async def stream_bots(request: Request):
             except Exception:
                 pass
     
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        }
-    )
+    return _sse_response(event_generator())
 
 
 @router.get("/admin/logs")
-async def stream_admin_logs(request: Request):
+async def stream_admin_logs(request: Request, delta: bool = False):
     """
     Server-Sent Events stream for admin live logs.
-    Updates every 2 seconds.
+    Updates every 2 seconds (only when the logs changed).
     """
-    async def event_generator() -> AsyncGenerator[str, None]:
-        from backend.admin.admin_tools_router import get_live_logs
-        
-        try:
-            while True:
-                if await request.is_disconnected():
-                    break
-                
-                logs = await _safe_call(get_live_logs)
-                yield f"data: {json.dumps(logs)}\n\n"
-                
-                await asyncio.sleep(2)
-        except asyncio.CancelledError:
-            pass
-    
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        }
-    )
+    if _hub_enabled():
+        return _sse_response(_hub_stream(request, "admin_logs", delta))
+    return _sse_response(_poll_stream(request, _admin_logs_payload, 2))
 
 
 @router.get("/intraday")
-async def stream_intraday(request: Request):
+async def stream_intraday(request: Request, delta: bool = False):
     """
     Server-Sent Events stream for intraday snapshot.
-    Updates every 5 seconds.
+    Updates every 5 seconds (only when the snapshot changed).
     """
-    async def event_generator() -> AsyncGenerator[str, None]:
-        from backend.intraday_service import get_intraday_snapshot
-        
-        try:
-            while True:
-                if await request.is_disconnected():
-                    break
-                
-                data = await _safe_call(get_intraday_snapshot, limit=120)
-                yield f"data: {json.dumps(data)}\n\n"
-                
-                await asyncio.sleep(5)
-        except asyncio.CancelledError:
-            pass
-    
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        }
-    )
+    if _hub_enabled():
+        return _sse_response(_hub_stream(request, "intraday", delta))
+    return _sse_response(_poll_stream(request, _intraday_payload, 5))
+
+
+@router.get("/stats")
+async def events_stats() -> Dict[str, Any]:
+    """Broadcast hub subscriber counts and per-topic compute times."""
+    return get_broadcast_hub().stats()
@@ -34,7 +34,7 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Query
 
 from backend.core.config import PATHS, TIMEZONE
-from backend.core.data_pipeline import _read_rolling, log
+from backend.core.data_pipeline import log, read_rolling_summary
 from backend.services.insights_builder import build_daily_insights
 
 router = APIRouter(prefix="/api/insights", tags=["Insights"])
@@ -204,7 +204,7 @@ async def get_insights(
     # 3) If still missing → Rolling fallback (never fails)
     if js is None:
         log(f"[insights_router] ⚠️ Fallback to Rolling for board {board_key}")
-        rolling = _read_rolling() or {}
+        rolling = read_rolling_summary() or {}
 
         sec = _norm_sector(sector)
 
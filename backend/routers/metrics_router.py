@@ -35,7 +35,7 @@ from backend.services import accuracy_engine as ae
 from backend.core.data_pipeline import (
     log,
     safe_float,
-    _read_rolling,
+    read_rolling_summary,
     _read_brain,
 )
 from backend.core.config import PATHS, TIMEZONE
@@ -185,7 +185,7 @@ def get_drift() -> Dict[str, Any]:
 @router.get("/sector-drift", summary="Sector-level drift + hit ratios")
 def get_sector_drift() -> Dict[str, Any]:
     brain = _read_brain() or {}
-    rolling = _read_rolling() or {}
+    rolling = read_rolling_summary() or {}
 
     sectors = {}
 
@@ -256,7 +256,7 @@ def get_overview() -> Dict[str, Any]:
 
     # Sector quick count
     brain = _read_brain() or {}
-    rolling = _read_rolling() or {}
+    rolling = read_rolling_summary() or {}
     sectors = set()
 
     for sym in brain.keys():
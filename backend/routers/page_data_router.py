@@ -390,11 +390,11 @@ async def get_predict_page_data() -> Dict[str, Any]:
     except Exception as e:
         log(f"[page_data] Warning: latest_predictions.json failed: {e}")
     
-    # Try 3: rolling.json.gz directly (raw data fallback)
+    # Try 3: rolling summary index (raw data fallback, no history decompression)
     try:
-        from backend.core.data_pipeline import _read_rolling
+        from backend.core.data_pipeline import read_rolling_summary
         
-        rolling = _read_rolling()
+        rolling = read_rolling_summary()
         if rolling and isinstance(rolling, dict):
             predictions = []
             
@@ -422,7 +422,7 @@ async def get_predict_page_data() -> Dict[str, Any]:
                 _populate_result_with_predictions(result, predictions)
                 return result
     except Exception as e:
-        log(f"[page_data] Warning: rolling.json.gz fallback failed: {e}")
+        log(f"[page_data] Warning: rolling summary fallback failed: {e}")
     
     # Return empty result if all sources fail (graceful degradation)
     return result
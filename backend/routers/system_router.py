@@ -33,7 +33,7 @@ from fastapi import APIRouter, HTTPException, Depends
 
 # Core imports
 from backend.core.config import PATHS
-from backend.core.data_pipeline import _read_rolling, _read_brain, log
+from backend.core.data_pipeline import _read_rolling, _read_brain, log, read_rolling_summary, rolling_cache_stats
 from backend.core.supervisor_agent import supervisor_verdict
 from backend.admin.auth import require_admin
 from config import ROOT, DT_PATHS
@@ -420,7 +420,7 @@ def get_system_status():
     supervisor = supervisor_verdict()
 
     # Rolling coverage summary
-    rolling = _read_rolling() or {}
+    rolling = read_rolling_summary() or {}
     total = len([s for s in rolling.keys() if not s.startswith("_")])
     missing_preds = sum(1 for _, n in rolling.items()
                         if not n.get("predictions") and not _.startswith("_"))
@@ -555,6 +555,7 @@ def diagnostics() -> Dict[str, Any]:
             "sim_summary": str(dt_sim_summary_path.resolve()),
             "updated_at": dt_sim_updated,
         },
+        "rolling_cache": rolling_cache_stats(),
     }
 
 
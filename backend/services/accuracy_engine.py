@@ -1,9 +1,26 @@
 """
-accuracy_engine.py — v1.2.1 (Trading-Day Step Alignment + Sorted History + Calibration Map + HIT Buckets)
+accuracy_engine.py — v1.4.0 (Trading-Day Step Alignment + Sorted History + Calibration Map + HIT Buckets + Indexed Lookups + Incremental Ledger)
 
 Reads:
-  - nightly_predictions/predictions_ledger.jsonl  (durable prediction log)
-  - rolling history from _read_rolling()
+  - nightly_predictions/ledger/run_date=*/part-*.parquet  (columnar ledger, default)
+  - nightly_predictions/predictions_ledger.jsonl  (durable prediction log;
+    AION_COLUMNAR_LEDGER=0 re-scores all of it every pass)
+  - rolling history from read_rolling_view()
+
+v1.3.0:
+  - ledger is streamed into NumPy columns (no list of row dicts)
+  - HistoryIndex parses each symbol's history once per run into sorted
+    date/close arrays; entry lookups are binary searches
+  - realized returns are computed per symbol group and window metrics
+    per horizon with array masks, so cost scales with ledger size
+    instead of ledger × history
+
+v1.4.0:
+  - scored rows are folded into additive per-(horizon, entry_date) stats;
+    window metrics, confidence buckets and sector hit-rates are sums of those
+  - columnar path keeps a watermark of settled (run, horizon) pairs and the
+    per-day stats in metrics/accuracy/accuracy_incremental_state.json; each
+    pass only reads runs with a horizon that may have matured since
 
 Computes per horizon, rolling windows:
   - directional_accuracy
@@ -21,12 +38,16 @@ from __future__ import annotations
 
 import json
 import math
+import os
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from backend.core.config import PATHS, TIMEZONE
-from backend.core.data_pipeline import _read_rolling, log, safe_float
+from backend.core.data_pipeline import log, read_rolling_view, safe_float
+from backend.services import prediction_ledger
 
 # ---------------------------------------------------------------------
 # Paths
@@ -43,6 +64,10 @@ CALIBRATION_PATH: Path = ACCURACY_DIR / "confidence_calibration.json"
 
 SECTOR_ACCURACY_PATH: Path = PATHS.get('ml_data', Path('ml_data')) / 'metrics' / 'accuracy_by_sector.json'
 
+# Scored-run watermark + per-day running aggregates (columnar ledger path)
+INCREMENTAL_STATE_PATH: Path = ACCURACY_DIR / "accuracy_incremental_state.json"
+INCREMENTAL_STATE_VERSION = 1
+
 def _build_symbol_to_sector_map() -> dict[str, str]:
     """Infer sector label per symbol from latest features snapshot (sector_* one-hot)."""
     try:
@@ -87,6 +112,11 @@ CAL_WINDOW_DAYS = 30  # calibration map uses 30d by default
 # "reaches target" by requiring realized magnitude >= HIT_MAG_FRACTION * |predicted|.
 HIT_MAG_FRACTION = 0.50
 
+# Incremental settling (calendar days)
+ENTRY_DATE_SLACK_DAYS = 3   # entry_date may precede the run date
+SETTLE_GRACE_DAYS = 5       # past nominal maturity, stop waiting for lagging symbols
+STALE_HISTORY_DAYS = 5      # symbols without a bar this recent are not waited for
+
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
@@ -103,14 +133,6 @@ def _today() -> date:
     return datetime.now(TIMEZONE).date()
 
 
-def _sign(x: float, tol: float = 1e-12) -> int:
-    if x > tol:
-        return 1
-    if x < -tol:
-        return -1
-    return 0
-
-
 def _bucket_label(lo: float, hi: float) -> str:
     return f"{lo:.2f}-{hi:.2f}"
 
@@ -174,63 +196,104 @@ def _extract_history_series(node: Dict[str, Any]) -> Tuple[List[str], List[float
     return dates, closes
 
 
-def _find_entry_index(dates: List[str], entry_ymd: str) -> Optional[int]:
+class HistoryIndex:
     """
-    Find exact match first; if not found, find closest date <= entry_ymd.
-    """
-    if not dates:
-        return None
-
-    try:
-        return dates.index(entry_ymd)
-    except Exception:
-        pass
-
-    for i in range(len(dates) - 1, -1, -1):
-        if dates[i] <= entry_ymd:
-            return i
-    return None
-
+    Per-symbol close-price index, built once per run.
 
-def _realized_return_from_history(
-    node: Dict[str, Any],
-    entry_date: str,
-    entry_close: float,
-    horizon: str,
-) -> Optional[Tuple[float, float]]:
+    Each symbol's history is parsed/sorted/de-duped once (on first use) into
+    NumPy arrays: dates (datetime64[D], ascending, unique) and closes. Entry
+    lookups are a binary search: exact date match, else the closest date
+    <= entry date (same rule as the old linear scan).
     """
-    Uses history index stepping (trading-day approximation).
-    Returns (exit_close, realized_return) or None if insufficient future data.
-    """
-    steps = HORIZON_STEPS.get(horizon)
-    if steps is None:
-        return None
-
-    dates, closes = _extract_history_series(node)
-    if not dates or len(closes) != len(dates):
-        return None
-
-    entry_idx = _find_entry_index(dates, entry_date)
-    if entry_idx is None:
-        return None
 
-    exit_idx = entry_idx + steps
-    if exit_idx >= len(closes):
-        return None
-
-    exit_close = closes[exit_idx]
-    if not entry_close or entry_close == 0.0:
-        return None
-
-    realized = (exit_close / float(entry_close)) - 1.0
-    return float(exit_close), float(realized)
+    def __init__(self, rolling: Dict[str, Any]):
+        self._rolling = rolling
+        self._keys: Dict[str, Any] = {}
+        for sym in rolling:
+            if not str(sym).startswith("_"):
+                self._keys[str(sym).upper()] = sym
+        self._series: Dict[str, Optional[Tuple[np.ndarray, np.ndarray]]] = {}
+
+    def __contains__(self, sym: str) -> bool:
+        return str(sym).upper() in self._keys
+
+    def series(self, sym: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        su = str(sym).upper()
+        if su in self._series:
+            return self._series[su]
+        out: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        key = self._keys.get(su)
+        node = self._rolling.get(key) if key is not None else None
+        if isinstance(node, dict):
+            dates, closes = _extract_history_series(node)
+            if dates and len(dates) == len(closes):
+                out = (np.array(dates, dtype="datetime64[D]"), np.asarray(closes, dtype=float))
+        self._series[su] = out
+        return out
+
+    def realized(
+        self,
+        sym: str,
+        entry_dates: np.ndarray,
+        entry_close: np.ndarray,
+        steps: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized trading-day stepping for one symbol's ledger rows.
+        Returns (ok mask, exit_close, realized_return); rows without enough
+        future history (or no entry match) have ok=False.
+        """
+        n = len(entry_dates)
+        ok = np.zeros(n, dtype=bool)
+        exit_close = np.full(n, np.nan)
+        realized = np.full(n, np.nan)
+
+        s = self.series(sym)
+        if s is None:
+            return ok, exit_close, realized
+        dates, closes = s
+
+        entry_idx = np.searchsorted(dates, entry_dates, side="right") - 1
+        exit_idx = entry_idx + steps
+        ok = (entry_idx >= 0) & (exit_idx < len(closes)) & (entry_close != 0.0)
+        exit_close[ok] = closes[exit_idx[ok]]
+        realized[ok] = exit_close[ok] / entry_close[ok] - 1.0
+        return ok, exit_close, realized
+
+
+class LedgerColumns:
+    """Ledger rows with a known horizon, stored column-wise (no per-row dicts)."""
+
+    def __init__(self) -> None:
+        self.horizon: List[str] = []
+        self.symbol: List[str] = []
+        self.entry_date: List[Any] = []
+        self.entry_close: List[float] = []
+        self.predicted_return: List[float] = []
+        self.confidence: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.horizon)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "horizon": np.asarray(self.horizon, dtype=object),
+            "symbol": np.asarray(self.symbol, dtype=object),
+            "entry_date": np.asarray(self.entry_date, dtype="datetime64[D]"),
+            "entry_close": np.asarray(self.entry_close, dtype=float),
+            "predicted_return": np.asarray(self.predicted_return, dtype=float),
+            "confidence": np.asarray(self.confidence, dtype=float),
+        }
 
 
-def _read_ledger(max_lines: int = 2_000_000) -> List[Dict[str, Any]]:
+def _read_ledger(max_lines: int = 2_000_000) -> LedgerColumns:
+    """Stream the ledger into columns, keeping only rows with a known horizon."""
+    cols = LedgerColumns()
     if not LEDGER_PATH.exists():
-        return []
+        return cols
 
-    out: List[Dict[str, Any]] = []
+    date_cache: Dict[str, Any] = {}
+    nat = np.datetime64("NaT", "D")
     try:
         with LEDGER_PATH.open("r", encoding="utf-8") as f:
             for i, line in enumerate(f):
@@ -241,15 +304,71 @@ def _read_ledger(max_lines: int = 2_000_000) -> List[Dict[str, Any]]:
                     continue
                 try:
                     obj = json.loads(line)
-                    if isinstance(obj, dict):
-                        out.append(obj)
                 except Exception:
                     continue
+                if not isinstance(obj, dict):
+                    continue
+
+                h = str(obj.get("horizon") or "")
+                if h not in HORIZON_STEPS:
+                    continue
+
+                d10 = str(obj.get("entry_date") or "")[:10]
+                d = date_cache.get(d10)
+                if d is None:
+                    parsed = _parse_ymd(d10)
+                    d = np.datetime64(parsed, "D") if parsed is not None else nat
+                    date_cache[d10] = d
+
+                cols.horizon.append(h)
+                cols.symbol.append(str(obj.get("symbol") or "").upper())
+                cols.entry_date.append(d)
+                cols.entry_close.append(safe_float(obj.get("entry_close", 0.0)))
+                cols.predicted_return.append(safe_float(obj.get("predicted_return", 0.0)))
+                cols.confidence.append(safe_float(obj.get("confidence", 0.0)))
     except Exception as e:
         log(f"[accuracy_engine] ❌ Failed reading ledger: {e}")
-        return []
+        return LedgerColumns()
+
+    return cols
+
+
+def _score_ledger(ledger: Dict[str, np.ndarray], index: HistoryIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Realized returns for every ledger row, one binary search per symbol group.
+    Returns (ok mask, realized_return).
+    """
+    n = len(ledger["horizon"])
+    ok = np.zeros(n, dtype=bool)
+    realized = np.full(n, np.nan)
+    if n == 0:
+        return ok, realized
+
+    steps = np.array([HORIZON_STEPS[h] for h in ledger["horizon"]], dtype=np.int64)
+    usable = ~np.isnat(ledger["entry_date"]) & (ledger["entry_close"] != 0.0)
+
+    syms, inverse = np.unique(ledger["symbol"].astype(str), return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(len(syms) + 1))
+    for k, sym in enumerate(syms):
+        rows = order[bounds[k]:bounds[k + 1]]
+        rows = rows[usable[rows]]
+        if rows.size == 0 or sym not in index:
+            continue
+        g_ok, _exit, g_real = index.realized(
+            sym,
+            ledger["entry_date"][rows],
+            ledger["entry_close"][rows],
+            steps[rows],
+        )
+        ok[rows] = g_ok
+        realized[rows] = g_real
+    return ok, realized
+
 
-    return out
+def _signs(x: np.ndarray, tol: float = 1e-12) -> np.ndarray:
+    """Elementwise sign with a dead zone of +/- tol (as int8)."""
+    return (x > tol).astype(np.int8) - (x < -tol).astype(np.int8)
 
 
 def _write_json(path: Path, payload: Dict[str, Any]) -> None:
@@ -261,41 +380,135 @@ def _write_json(path: Path, payload: Dict[str, Any]) -> None:
 
 
 # ---------------------------------------------------------------------
-# Main compute
+# Per-day running aggregates
 # ---------------------------------------------------------------------
-def compute_accuracy() -> Dict[str, Any]:
-    log("[accuracy_engine] 🧪 Computing accuracy + calibration… (v1.2.1)")
+# Every window metric is a ratio of sums, so scored rows are folded into
+# additive per-(horizon, entry_date) stats once; windows are re-summed from
+# those on every pass. The incremental (columnar) path persists them
+# together with the scored-run watermark in INCREMENTAL_STATE_PATH.
+
+def _hit_threshold(h: str) -> float:
+    # Hit-rate threshold: avoid counting tiny moves as meaningful
+    if h in ("1d", "3d"):
+        return 0.003
+    if h in ("1w", "2w"):
+        return 0.008
+    if h == "4w":
+        return 0.015
+    return 0.025
+
+
+def _new_day() -> Dict[str, Any]:
+    return {
+        "n": 0,
+        "dir_ok": 0,
+        "abs_err": 0.0,
+        "sq_err": 0.0,
+        "meaningful": 0,
+        "hits": 0,
+        "brier": 0.0,
+        "buckets": {},  # label -> [meaningful, hits]
+        "sectors": {},  # sector -> [meaningful, hits]
+    }
 
-    ledger = _read_ledger()
-    if not ledger:
-        log("[accuracy_engine] ⚠️ No ledger rows. Run prediction_logger first.")
-        return {"status": "no_ledger"}
 
-    rolling = _read_rolling() or {}
-    if not rolling:
-        log("[accuracy_engine] ⚠️ No rolling. Cannot compute realized returns.")
-        return {"status": "no_rolling"}
+def _new_horizon_agg() -> Dict[str, Any]:
+    return {"rows_total": 0, "rows_scored": 0, "days": {}}
+
+
+def _accumulate(
+    days: Dict[str, Dict[str, Any]],
+    h: str,
+    entry_dates: np.ndarray,
+    pr: np.ndarray,
+    ar: np.ndarray,
+    conf: np.ndarray,
+    sectors: np.ndarray,
+) -> None:
+    """Fold scored rows of one horizon into per-entry-date stats."""
+    if not len(entry_dates):
+        return
+    thr = _hit_threshold(h)
+
+    sp = _signs(pr)
+    ok_dir = (sp == _signs(ar)) & (sp != 0)
+    err = ar - pr
+
+    # "Hit" definition (magnitude-aware):
+    #  - meaningful predicted move (abs(pr) >= thr)
+    #  - correct direction
+    #  - realized magnitude reaches at least a fraction of predicted magnitude
+    meaningful = np.abs(pr) >= thr
+    is_hit = meaningful & ok_dir & (np.abs(ar) >= (HIT_MAG_FRACTION * np.abs(pr)))
+    brier = (conf - is_hit) ** 2
 
-    # Sector labels for per-sector accuracy (best-effort)
-    symbol_to_sector = _build_symbol_to_sector_map()
-    accuracy_by_sector: Dict[str, Dict[str, Any]] = {}
-
-    rolling_map: Dict[str, Dict[str, Any]] = {}
-    for sym, node in rolling.items():
-        if str(sym).startswith("_"):
+    buckets = _confidence_buckets()
+    day_keys, day_idx = np.unique(entry_dates, return_inverse=True)
+    for k, d in enumerate(day_keys):
+        m = day_idx == k
+        day = days.setdefault(str(d), _new_day())
+        mm = m & meaningful
+        day["n"] += int(m.sum())
+        day["dir_ok"] += int(ok_dir[m].sum())
+        day["abs_err"] += float(np.abs(err[m]).sum())
+        day["sq_err"] += float((err[m] * err[m]).sum())
+        day["meaningful"] += int(mm.sum())
+        day["hits"] += int(is_hit[m].sum())
+        day["brier"] += float(brier[mm].sum())
+        if not mm.any():
             continue
-        if isinstance(node, dict):
-            rolling_map[str(sym).upper()] = node
 
+        # ✅ 2.5 FIX: bucket hit-rates must match the SAME "hit" definition
+        for lo, hi in buckets:
+            b = mm & (conf >= lo) & (conf < hi)
+            b_total = int(b.sum())
+            if b_total:
+                cell = day["buckets"].setdefault(_bucket_label(lo, min(hi, 1.0)), [0, 0])
+                cell[0] += b_total
+                cell[1] += int(is_hit[b].sum())
+
+        secs, sec_idx = np.unique(sectors[mm].astype(str), return_inverse=True)
+        sec_total = np.bincount(sec_idx, minlength=len(secs))
+        sec_hits = np.bincount(sec_idx, weights=is_hit[mm], minlength=len(secs))
+        for sec, tot, hits in zip(secs, sec_total, sec_hits):
+            cell = day["sectors"].setdefault(str(sec).upper(), [0, 0])
+            cell[0] += int(tot)
+            cell[1] += int(hits)
+
+
+def _sum_days(days: Dict[str, Dict[str, Any]], since: str) -> Dict[str, Any]:
+    tot = _new_day()
+    for d, day in days.items():
+        if d < since:
+            continue
+        for k in ("n", "dir_ok", "abs_err", "sq_err", "meaningful", "hits", "brier"):
+            tot[k] += day[k]
+        for field in ("buckets", "sectors"):
+            for key, (t, hits) in day[field].items():
+                cell = tot[field].setdefault(key, [0, 0])
+                cell[0] += t
+                cell[1] += hits
+    return tot
+
+
+def _prune_days(agg: Dict[str, Any], today: date) -> None:
+    """Drop entry dates that no window can include any more."""
+    oldest = (today - timedelta(days=max(WINDOWS_DAYS))).isoformat()
+    for h_agg in agg.values():
+        days = h_agg["days"]
+        for d in [d for d in days if d < oldest]:
+            del days[d]
+
+
+def _write_accuracy_outputs(
+    agg: Dict[str, Dict[str, Any]],
+    horizons: List[str],
+    pending_rows: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """Window files, accuracy_latest.json, calibration map and sector accuracy from `agg`."""
     today = _today()
     buckets = _confidence_buckets()
-
-    by_h: Dict[str, List[Dict[str, Any]]] = {}
-    for row in ledger:
-        h = str(row.get("horizon") or "")
-        if h not in HORIZON_STEPS:
-            continue
-        by_h.setdefault(h, []).append(row)
+    accuracy_by_sector: Dict[str, Dict[str, Any]] = {}
 
     outputs: Dict[str, Any] = {
         "status": "ok",
@@ -309,168 +522,54 @@ def compute_accuracy() -> Dict[str, Any]:
         "horizons": {},
     }
 
-    for h, rows in by_h.items():
-        realized_rows: List[Dict[str, Any]] = []
-
-        for r in rows:
-            sym = str(r.get("symbol") or "").upper()
-            node = rolling_map.get(sym)
-            if node is None:
-                continue
-
-            entry_date = str(r.get("entry_date") or "")[:10]
-            entry_dt = _parse_ymd(entry_date)
-            if entry_dt is None:
-                continue
-
-            entry_close = safe_float(r.get("entry_close", 0.0))
-            if entry_close == 0.0:
-                continue
-
-            realized = _realized_return_from_history(node, entry_date, entry_close, h)
-            if realized is None:
-                continue
-
-            exit_close, real_ret = realized
-
-            pred_ret = safe_float(r.get("predicted_return", 0.0))
-            conf = safe_float(r.get("confidence", 0.0))
-            score = r.get("score", None)
-
-            realized_rows.append(
-                {
-                    "symbol": sym,
-                    "entry_date": entry_date,
-                    "entry_close": float(entry_close),
-                    "exit_close": float(exit_close),
-                    "predicted_return": float(pred_ret),
-                    "realized_return": float(real_ret),
-                    "confidence": float(conf),
-                    "score": float(score) if score is not None else None,
-                }
-            )
-
+    for h in horizons:
+        h_agg = agg.get(h) or _new_horizon_agg()
+        thr = _hit_threshold(h)
         h_out: Dict[str, Any] = {
-            "rows_total": len(rows),
-            "rows_scored": len(realized_rows),
+            "rows_total": int(h_agg["rows_total"]) + int((pending_rows or {}).get(h, 0)),
+            "rows_scored": int(h_agg["rows_scored"]),
             "windows": {},
         }
 
         for w in WINDOWS_DAYS:
-            cutoff = today - timedelta(days=int(w))
-            window_rows = [
-                rr
-                for rr in realized_rows
-                if (_parse_ymd(rr["entry_date"]) or date(1970, 1, 1)) >= cutoff
-            ]
-
-            if not window_rows:
+            st = _sum_days(h_agg["days"], (today - timedelta(days=int(w))).isoformat())
+            n = int(st["n"])
+
+            if not n:
                 h_out["windows"][str(w)] = {"status": "no_data", "n": 0}
                 continue
 
-            dir_hits = 0
-            abs_errs: List[float] = []
-            sq_errs: List[float] = []
-
-            # Hit-rate threshold: avoid counting tiny moves as meaningful
-            if h in ("1d", "3d"):
-                thr = 0.003
-            elif h in ("1w", "2w"):
-                thr = 0.008
-            elif h == "4w":
-                thr = 0.015
-            else:
-                thr = 0.025
-
-            hit_rate_hits = 0
-            hit_rate_total = 0
-
-            sec_hits: Dict[str, int] = {}
-            sec_total: Dict[str, int] = {}
+            hit_rate_total = int(st["meaningful"])
+            directional_accuracy = float(st["dir_ok"]) / n
+            mae = float(st["abs_err"]) / n
+            rmse = math.sqrt(float(st["sq_err"]) / n)
+            hit_rate = (int(st["hits"]) / hit_rate_total) if hit_rate_total else None
 
             # Magnitude-aware calibration quality (Brier score)
             # Computed over the same set of "meaningful" predictions.
-            brier_sum = 0.0
-            brier_n = 0
-
-            for rr in window_rows:
-                pr = float(rr["predicted_return"])
-                ar = float(rr["realized_return"])
-
-                if _sign(pr) == _sign(ar) and _sign(pr) != 0:
-                    dir_hits += 1
-
-                err = ar - pr
-                abs_errs.append(abs(err))
-                sq_errs.append(err * err)
-
-                # "Hit" definition (magnitude-aware):
-                #  - meaningful predicted move (abs(pr) >= thr)
-                #  - correct direction
-                #  - realized magnitude reaches at least a fraction of predicted magnitude
-                if abs(pr) >= thr:
-                    hit_rate_total += 1
-                    # sector-level hit tracking
-                    sec = symbol_to_sector.get(str(rr.get('symbol','')).upper(), 'UNKNOWN')
-                    sec_total[sec] = sec_total.get(sec, 0) + 1
-                    ok_dir = (_sign(pr) == _sign(ar) and _sign(pr) != 0)
-                    ok_mag = (abs(ar) >= (HIT_MAG_FRACTION * abs(pr)))
-                    is_hit = bool(ok_dir and ok_mag)
-                    if is_hit:
-                        hit_rate_hits += 1
-                        sec = symbol_to_sector.get(str(rr.get('symbol','')).upper(), 'UNKNOWN')
-                        sec_hits[sec] = sec_hits.get(sec, 0) + 1
-
-                    # Brier score uses probability forecast vs binary outcome
-                    c = float(rr.get("confidence", 0.5))
-                    brier_sum += (c - (1.0 if is_hit else 0.0)) ** 2
-                    brier_n += 1
-
-            n = len(window_rows)
-            directional_accuracy = dir_hits / n if n else 0.0
-            mae = sum(abs_errs) / n if n else 0.0
-            rmse = math.sqrt(sum(sq_errs) / n) if n else 0.0
-            hit_rate = (hit_rate_hits / hit_rate_total) if hit_rate_total else None
-            brier = (brier_sum / brier_n) if brier_n else None
+            brier = float(st["brier"]) / hit_rate_total if hit_rate_total else None
 
             # Persist sector-level hit-rate for confidence calibration (calibration window only)
-            if int(w) == int(CAL_WINDOW_DAYS):
-                for sec, tot in sec_total.items():
-                    if tot <= 0:
-                        continue
-                    hits = int(sec_hits.get(sec, 0) or 0)
-                    accuracy_by_sector.setdefault(str(sec).upper(), {})[h] = {
+            if int(w) == int(CAL_WINDOW_DAYS) and hit_rate_total:
+                for sec in sorted(st["sectors"]):
+                    tot, hits = st["sectors"][sec]
+                    accuracy_by_sector.setdefault(sec, {})[h] = {
                         'hit_rate': float(hits / tot),
                         'n': int(tot),
                     }
 
-            # ✅ 2.5 FIX: bucket hit-rates must match the SAME "hit" definition
             bucket_rows: List[Dict[str, Any]] = []
             for lo, hi in buckets:
-                b = [rr for rr in window_rows if lo <= float(rr["confidence"]) < hi]
-                if not b:
-                    continue
-
-                b_hits = 0
-                b_total = 0
-                for rr in b:
-                    pr = float(rr["predicted_return"])
-                    ar = float(rr["realized_return"])
-
-                    if abs(pr) >= thr:
-                        b_total += 1
-                        if _sign(pr) == _sign(ar) and _sign(pr) != 0:
-                            if abs(ar) >= (HIT_MAG_FRACTION * abs(pr)):
-                                b_hits += 1
-
+                label = _bucket_label(lo, min(hi, 1.0))
                 # If bucket has no meaningful predicted moves, skip it (keeps map sane)
+                b_total, b_hits = st["buckets"].get(label, (0, 0))
                 if b_total <= 0:
                     continue
 
                 bucket_rows.append(
                     {
-                        "range": _bucket_label(lo, min(hi, 1.0)),
-                        "hit_rate": float(b_hits / b_total) if b_total else 0.0,
+                        "range": label,
+                        "hit_rate": float(b_hits / b_total),
                         "n": int(b_total),
                         "hit_threshold": float(thr),
                         "hit_mag_fraction": float(HIT_MAG_FRACTION),
@@ -530,7 +629,6 @@ def compute_accuracy() -> Dict[str, Any]:
     _write_json(CALIBRATION_PATH, calibration_payload)
     outputs["calibration_file"] = str(CALIBRATION_PATH)
 
-    
     try:
         SECTOR_ACCURACY_PATH.parent.mkdir(parents=True, exist_ok=True)
         SECTOR_ACCURACY_PATH.write_text(json.dumps(accuracy_by_sector, indent=2), encoding='utf-8')
@@ -542,6 +640,269 @@ def compute_accuracy() -> Dict[str, Any]:
     return outputs
 
 
+# ---------------------------------------------------------------------
+# Incremental pass over the columnar ledger
+# ---------------------------------------------------------------------
+def _load_incremental_state() -> Dict[str, Any]:
+    try:
+        raw = json.loads(INCREMENTAL_STATE_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        raw = {}
+    if not isinstance(raw, dict) or raw.get("version") != INCREMENTAL_STATE_VERSION:
+        raw = {}
+    return {
+        "version": INCREMENTAL_STATE_VERSION,
+        "jsonl_offset": int(raw.get("jsonl_offset") or 0),
+        "runs": dict(raw.get("runs") or {}),
+        "horizons": dict(raw.get("horizons") or {}),
+    }
+
+
+def _save_incremental_state(state: Dict[str, Any]) -> None:
+    """Watermark + aggregates in one file, replaced atomically so they never disagree."""
+    try:
+        INCREMENTAL_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = INCREMENTAL_STATE_PATH.with_suffix(INCREMENTAL_STATE_PATH.suffix + ".tmp")
+        tmp.write_text(json.dumps(state, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, INCREMENTAL_STATE_PATH)
+    except Exception as e:
+        log(f"[accuracy_engine] ❌ Failed writing {INCREMENTAL_STATE_PATH}: {e}")
+
+
+def _earliest_maturity(run_day: date, h: str) -> date:
+    """
+    First calendar day a (run, horizon) pair can possibly be scored: N trading
+    days span at least N + 2*(N//5) calendar days (holidays only add), less a
+    small allowance for entry dates that precede the run date.
+    """
+    steps = HORIZON_STEPS[h]
+    return run_day + timedelta(days=max(0, steps + 2 * (steps // 5) - ENTRY_DATE_SLACK_DAYS))
+
+
+def _settle_deadline(run_day: date, h: str) -> date:
+    """After this day a pair is settled even if some symbols still wait for bars."""
+    return run_day + timedelta(days=HORIZON_STEPS[h] * 7 // 5 + SETTLE_GRACE_DAYS)
+
+
+def _waiting_rows(
+    ledger: Dict[str, np.ndarray],
+    ok: np.ndarray,
+    index: HistoryIndex,
+    today: np.datetime64,
+) -> np.ndarray:
+    """
+    Unscored rows that should still score later: the symbol's history covers
+    the entry date and is current (updated within STALE_HISTORY_DAYS), so only
+    the exit bar is missing. Rows of unknown/stale symbols never wait.
+    """
+    waiting = np.zeros(len(ok), dtype=bool)
+    cand = np.flatnonzero(
+        ~ok & ~np.isnat(ledger["entry_date"]) & (ledger["entry_close"] != 0.0)
+    )
+    fresh_after = today - np.timedelta64(STALE_HISTORY_DAYS, "D")
+    for sym in set(ledger["symbol"][cand].tolist()):
+        s = index.series(sym)
+        if s is None or s[0][-1] < fresh_after:
+            continue
+        rows = cand[ledger["symbol"][cand] == sym]
+        waiting[rows] = ledger["entry_date"][rows] >= s[0][0]
+    return waiting
+
+
+_RUN_COLUMNS = ("symbol", "horizon", "entry_date", "entry_close", "predicted_return", "confidence")
+
+
+def _run_arrays(table: Any) -> Dict[str, np.ndarray]:
+    conf = table.column("confidence").to_numpy(zero_copy_only=False)
+    entry_close = table.column("entry_close").to_numpy(zero_copy_only=False)
+    return {
+        "horizon": np.asarray(table.column("horizon").to_pylist(), dtype=object),
+        "symbol": np.asarray([str(s or "").upper() for s in table.column("symbol").to_pylist()], dtype=object),
+        "entry_date": table.column("entry_date").to_numpy(zero_copy_only=False).astype("datetime64[D]"),
+        "entry_close": np.nan_to_num(entry_close.astype(float), nan=0.0),
+        "predicted_return": np.nan_to_num(
+            table.column("predicted_return").to_numpy(zero_copy_only=False).astype(float), nan=0.0
+        ),
+        "confidence": np.nan_to_num(conf.astype(float), nan=0.0),
+    }
+
+
+def _compute_incremental(rolling: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Score only (run, horizon) pairs that matured since the last pass and fold
+    them into the persisted per-day aggregates.
+
+    A pair settles once none of its rows is waiting for an exit bar (or after
+    its settle deadline); settled pairs are never read again. Sector labels
+    are the ones current when a pair settles.
+    """
+    state = _load_incremental_state()
+    _imported, state["jsonl_offset"] = prediction_ledger.import_jsonl(
+        LEDGER_PATH, start_offset=state["jsonl_offset"]
+    )
+
+    files = prediction_ledger.list_run_files()
+    if not files:
+        log("[accuracy_engine] ⚠️ No ledger rows. Run prediction_logger first.")
+        return {"status": "no_ledger"}
+
+    today = _today()
+    today64 = np.datetime64(today, "D")
+    index = HistoryIndex(rolling)
+    symbol_to_sector: Optional[Dict[str, str]] = None
+    agg: Dict[str, Dict[str, Any]] = state["horizons"]
+    runs: Dict[str, Dict[str, Any]] = {}
+    pending_rows: Dict[str, int] = {}
+    runs_read = 0
+    pairs_settled = 0
+
+    for path in files:
+        key = prediction_ledger.run_key(path)
+        entry = state["runs"].get(key) or {"pending": None}
+        runs[key] = entry
+        pending = entry.get("pending")
+        if pending == {}:
+            continue  # every horizon of this run is settled
+
+        run_day = prediction_ledger.run_date_of(key) or today
+        if pending is not None and all(_earliest_maturity(run_day, h) > today for h in pending):
+            for h, n in pending.items():
+                pending_rows[h] = pending_rows.get(h, 0) + int(n)
+            continue
+
+        try:
+            table = prediction_ledger.read_run(
+                path,
+                columns=_RUN_COLUMNS,
+                horizons=list(pending) if pending is not None else None,
+            )
+        except Exception as e:
+            log(f"[accuracy_engine] ⚠️ Skipping unreadable ledger run {key}: {e}")
+            continue
+        runs_read += 1
+
+        ledger = _run_arrays(table)
+        known = np.isin(ledger["horizon"], list(HORIZON_STEPS))
+        if not known.all():
+            ledger = {k: v[known] for k, v in ledger.items()}
+        scored, realized_all = _score_ledger(ledger, index)
+        waiting = _waiting_rows(ledger, scored, index, today64)
+
+        still_pending: Dict[str, int] = {}
+        for h in dict.fromkeys(ledger["horizon"].tolist()):
+            in_h = ledger["horizon"] == h
+            n_rows = int(in_h.sum())
+            if _earliest_maturity(run_day, h) > today or (
+                (waiting & in_h).any() and today <= _settle_deadline(run_day, h)
+            ):
+                still_pending[h] = n_rows
+                pending_rows[h] = pending_rows.get(h, 0) + n_rows
+                continue
+
+            if symbol_to_sector is None:
+                symbol_to_sector = _build_symbol_to_sector_map()
+            sel = in_h & scored
+            h_agg = agg.setdefault(h, _new_horizon_agg())
+            h_agg["rows_total"] += n_rows
+            h_agg["rows_scored"] += int(sel.sum())
+            _accumulate(
+                h_agg["days"],
+                h,
+                ledger["entry_date"][sel],
+                ledger["predicted_return"][sel],
+                realized_all[sel],
+                ledger["confidence"][sel],
+                np.array([symbol_to_sector.get(s, "UNKNOWN") for s in ledger["symbol"][sel]], dtype=object),
+            )
+            pairs_settled += 1
+        entry["pending"] = still_pending
+
+    # Runs whose files are gone drop out of the watermark.
+    state["runs"] = runs
+    _prune_days(agg, today)
+
+    horizons = [h for h in HORIZON_STEPS if h in agg or h in pending_rows]
+    outputs = _write_accuracy_outputs(agg, horizons, pending_rows)
+    _save_incremental_state(state)
+
+    outputs["ledger"] = {
+        "mode": "columnar",
+        "runs_total": len(files),
+        "runs_read": runs_read,
+        "pairs_settled": pairs_settled,
+        "pairs_pending": sum(len(e.get("pending") or {}) for e in runs.values()),
+        "state_file": str(INCREMENTAL_STATE_PATH),
+    }
+    log(
+        f"[accuracy_engine] 📒 Incremental pass: read {runs_read}/{len(files)} runs, "
+        f"settled {pairs_settled} (run, horizon) pairs"
+    )
+    return outputs
+
+
+# ---------------------------------------------------------------------
+# Main compute
+# ---------------------------------------------------------------------
+def _compute_full(rolling: Dict[str, Any]) -> Dict[str, Any]:
+    """Re-score the whole JSONL ledger (AION_COLUMNAR_LEDGER=0)."""
+    ledger_cols = _read_ledger()
+    if not len(ledger_cols):
+        log("[accuracy_engine] ⚠️ No ledger rows. Run prediction_logger first.")
+        return {"status": "no_ledger"}
+
+    # Sector labels for per-sector accuracy (best-effort)
+    symbol_to_sector = _build_symbol_to_sector_map()
+
+    # One pass over the ledger: realized returns for every row, grouped by symbol
+    ledger = ledger_cols.arrays()
+    del ledger_cols
+    scored, realized_all = _score_ledger(ledger, HistoryIndex(rolling))
+    sectors_all = np.array(
+        [symbol_to_sector.get(s, "UNKNOWN") for s in ledger["symbol"]], dtype=object
+    )
+
+    agg: Dict[str, Dict[str, Any]] = {}
+    # Horizons in first-seen ledger order
+    horizons = list(dict.fromkeys(ledger["horizon"].tolist()))
+    for h in horizons:
+        in_h = ledger["horizon"] == h
+        sel = in_h & scored
+        h_agg = agg.setdefault(h, _new_horizon_agg())
+        h_agg["rows_total"] = int(in_h.sum())
+        h_agg["rows_scored"] = int(sel.sum())
+        _accumulate(
+            h_agg["days"],
+            h,
+            ledger["entry_date"][sel],
+            ledger["predicted_return"][sel],
+            realized_all[sel],
+            ledger["confidence"][sel],
+            sectors_all[sel],
+        )
+
+    outputs = _write_accuracy_outputs(agg, horizons)
+    outputs["ledger"] = {"mode": "jsonl", "rows": int(len(ledger["horizon"]))}
+    return outputs
+
+
+def compute_accuracy() -> Dict[str, Any]:
+    log("[accuracy_engine] 🧪 Computing accuracy + calibration… (v1.4.0)")
+
+    columnar = prediction_ledger.columnar_ledger_enabled()
+    if not LEDGER_PATH.exists() and not (columnar and prediction_ledger.list_run_files()):
+        log("[accuracy_engine] ⚠️ No ledger rows. Run prediction_logger first.")
+        return {"status": "no_ledger"}
+
+    rolling = read_rolling_view()
+    if not rolling:
+        log("[accuracy_engine] ⚠️ No rolling. Cannot compute realized returns.")
+        return {"status": "no_rolling"}
+
+    if columnar:
+        return _compute_incremental(rolling)
+    return _compute_full(rolling)
+
+
 if __name__ == "__main__":
     out = compute_accuracy()
     print(json.dumps(out, indent=2))
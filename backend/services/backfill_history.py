@@ -17,6 +17,14 @@ History bootstrap (when history is too short)
   but does NOT depend on that repository/package.
 - Fallback: yfinance with a hard global rate limiter (default ~20 calls/min) + retry backoff.
 
+Async fetch engine (default; AION_ASYNC_FETCH=0 keeps requests/yfinance threads)
+- StockAnalysis /s/i + all /s/d/<metric> tables are fetched concurrently through
+  backend.services.fetch_engine (keep-alive pool, token bucket, jittered retry,
+  short-lived disk cache so reruns do not refetch).
+- Bootstrap/patch histories are prefetched before the per-symbol pass: HF first
+  (DuckDB threads), then one async batch of Yahoo chart requests for the misses,
+  rate-limited by the same AION_YF_* settings. Duplicate symbols coalesce.
+
 Notes
 - History is append-only with per-date dedupe (never wipes existing history).
 - StockAnalysis is still used to write a "today" bar and fresh snapshot fields.
@@ -28,6 +36,7 @@ Requirements (only if you enable HF bootstrap)
 
 from __future__ import annotations
 
+import asyncio
 import gzip
 import json
 import math
@@ -37,13 +46,20 @@ import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import requests
 import yfinance as yf
 
 from backend.core.config import PATHS
 from backend.core.data_pipeline import _read_rolling, log, save_rolling
+from backend.services.fetch_engine import (
+    FetchEngine,
+    FetchError,
+    ProviderConfig,
+    async_fetch_enabled,
+    run_sync,
+)
 from backend.services.metrics_fetcher import build_latest_metrics
 from utils.progress_bar import progress_bar
 
@@ -77,6 +93,13 @@ YF_MIN_SECONDS_BETWEEN_CALLS = float(os.getenv("AION_YF_MIN_SECONDS_BETWEEN_CALL
 YF_MAX_RETRIES = int(os.getenv("AION_YF_MAX_RETRIES", "4"))
 YF_BACKOFF_BASE_SECONDS = float(os.getenv("AION_YF_BACKOFF_BASE_SECONDS", "6.0"))
 
+# Async engine: Yahoo chart endpoint used instead of yfinance.download, and disk
+# cache lifetimes (seconds) for SA screener tables / Yahoo histories.
+YF_CHART_BASE = os.getenv("AION_YF_CHART_BASE", "https://query1.finance.yahoo.com/v8/finance/chart").rstrip("/")
+YF_HISTORY_CACHE_TTL = float(os.getenv("AION_YF_CACHE_TTL_SECS", "43200"))
+SA_CACHE_TTL = float(os.getenv("AION_SA_CACHE_TTL_SECS", "1800"))
+SA_RATE_PER_SEC = float(os.getenv("AION_SA_RATE_PER_SEC", "8"))
+
 # Optional: patch the most recent N calendar days with yfinance when HF data is stale.
 # WARNING: doing this for thousands of symbols will take hours at ~20 calls/min.
 YF_PATCH_RECENT_DAYS = int(os.getenv("AION_YF_PATCH_RECENT_DAYS", "0"))  # 0 = off
@@ -185,15 +208,17 @@ def _fetch_from_stockanalysis(sym: str) -> Dict[str, Any] | None:
     return _INDEX_CACHE.get(sym)
 
 
-def _fetch_sa_index_batch() -> Dict[str, Dict[str, Any]]:
-    payload = {
+def _sa_index_payload() -> Dict[str, Any]:
+    return {
         "fields": SA_INDEX_FIELDS,
         "filter": {"exchange": "all"},
         "order": ["marketCap", "desc"],
         "offset": 0,
         "limit": 10000,
     }
-    js = _sa_post_json("s/i", payload)
+
+
+def _parse_sa_index(js: dict | None) -> Dict[str, Dict[str, Any]]:
     out: Dict[str, Dict[str, Any]] = {}
     try:
         rows = (js or {}).get("data", {}).get("data", [])
@@ -216,8 +241,11 @@ def _fetch_sa_index_batch() -> Dict[str, Dict[str, Any]]:
     return out
 
 
-def _fetch_sa_metric(metric: str, timeout: int = 20) -> Dict[str, Any]:
-    js = _sa_post_json(f"s/d/{metric}", timeout=timeout)
+def _fetch_sa_index_batch() -> Dict[str, Dict[str, Any]]:
+    return _parse_sa_index(_sa_post_json("s/i", _sa_index_payload()))
+
+
+def _parse_sa_metric(js: dict | None, metric: str) -> Dict[str, Any]:
     out: Dict[str, Any] = {}
     try:
         rows = (js or {}).get("data", {}).get("data", [])
@@ -234,6 +262,10 @@ def _fetch_sa_metric(metric: str, timeout: int = 20) -> Dict[str, Any]:
     return out
 
 
+def _fetch_sa_metric(metric: str, timeout: int = 20) -> Dict[str, Any]:
+    return _parse_sa_metric(_sa_post_json(f"s/d/{metric}", timeout=timeout), metric)
+
+
 def _fetch_sa_metrics_bulk(metrics: Iterable[str], max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
     result: Dict[str, Dict[str, Any]] = {}
     metrics = list(metrics)
@@ -249,6 +281,132 @@ def _fetch_sa_metrics_bulk(metrics: Iterable[str], max_workers: int = 8) -> Dict
     return result
 
 
+# -------------------------------------------------------------------
+# Async fetch engine (SA tables + Yahoo chart histories)
+# -------------------------------------------------------------------
+def _fetch_providers() -> Dict[str, ProviderConfig]:
+    return {
+        "stockanalysis": ProviderConfig(
+            "stockanalysis",
+            rate_per_sec=max(0.1, SA_RATE_PER_SEC),
+            burst=max(1, int(SA_RATE_PER_SEC)),
+            max_connections=8,
+            max_retries=2,
+            backoff_base=1.0,
+            timeout=20.0,
+            cache_ttl=SA_CACHE_TTL,
+        ),
+        "yahoo": ProviderConfig(
+            "yahoo",
+            rate_per_sec=1.0 / max(0.05, YF_MIN_SECONDS_BETWEEN_CALLS),
+            burst=1,
+            max_connections=4,
+            max_retries=max(0, YF_MAX_RETRIES - 1),
+            backoff_base=YF_BACKOFF_BASE_SECONDS,
+            backoff_max=120.0,
+            timeout=30.0,
+            cache_ttl=YF_HISTORY_CACHE_TTL,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; aion-backfill)"},
+        ),
+    }
+
+
+def _new_fetch_engine() -> FetchEngine:
+    return FetchEngine(_fetch_providers())
+
+
+def _log_fetch_stats(eng: FetchEngine) -> None:
+    for name, st in eng.stats().items():
+        if st["requests"] or st["cache_hits"]:
+            log(
+                f"🌐 {name}: {int(st['requests'])} requests, {int(st['cache_hits'])} cached, "
+                f"{int(st['coalesced'])} coalesced, {int(st['retries'])} retries, {int(st['errors'])} errors, "
+                f"rate wait {st['rate_wait_secs']:.1f}s"
+            )
+
+
+async def _sa_json_async(eng: FetchEngine, path: str, payload: dict | None = None) -> dict | None:
+    """Async _sa_post_json: POST (if payload) then GET, None on failure."""
+    url = f"{SA_BASE}/{path.strip('/')}"
+    if payload is not None:
+        try:
+            return await eng.post_json("stockanalysis", url, payload)
+        except FetchError:
+            pass
+    try:
+        return await eng.get_json("stockanalysis", url)
+    except FetchError as e:
+        log(f"⚠️ SA request failed for {url}: {e}")
+        return None
+
+
+async def _fetch_sa_tables_async(metrics: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """/s/i index and every /s/d/<metric> table, concurrently."""
+    metrics = list(metrics)
+    async with _new_fetch_engine() as eng:
+        results = await asyncio.gather(
+            _sa_json_async(eng, "s/i", _sa_index_payload()),
+            *[_sa_json_async(eng, f"s/d/{m}") for m in metrics],
+        )
+        _log_fetch_stats(eng)
+    index_map = _parse_sa_index(results[0])
+    metrics_map = {m: _parse_sa_metric(js, m) for m, js in zip(metrics, results[1:])}
+    return index_map, metrics_map
+
+
+def _yf_chart_params(days: int) -> Dict[str, str]:
+    now = int(time.time())
+    return {
+        "period1": str(now - max(1, int(days)) * 86400),
+        "period2": str(now),
+        "interval": "1d",
+        "includePrePost": "false",
+    }
+
+
+def _parse_yf_chart(js: dict | None, max_days: int = MAX_HISTORY_DAYS) -> List[Dict[str, Any]]:
+    """Yahoo chart JSON → [{date, open, high, low, close, volume}] (same shape as _bootstrap_history_yf)."""
+    try:
+        res = ((js or {}).get("chart") or {}).get("result") or []
+        if not res:
+            return []
+        res = res[0]
+        ts = res.get("timestamp") or []
+        q = ((res.get("indicators") or {}).get("quote") or [{}])[0]
+        offset = int((res.get("meta") or {}).get("gmtoffset") or 0)
+    except Exception:
+        return []
+
+    cols = [q.get(k) or [] for k in ("open", "high", "low", "close", "volume")]
+    bars: List[Dict[str, Any]] = []
+    for i, t in enumerate(ts):
+        vals = [c[i] if i < len(c) else None for c in cols]
+        if all(v is None for v in vals):
+            continue  # same as dropna(how="all")
+        d = datetime.fromtimestamp(int(t) + offset, tz=timezone.utc).strftime("%Y-%m-%d")
+        open_, high, low, close, volume = (float(v or 0.0) for v in vals)
+        bars.append({"date": d, "open": open_, "high": high, "low": low, "close": close, "volume": volume})
+    return bars[-max_days:] if bars else []
+
+
+async def _fetch_yf_histories_async(
+    eng: FetchEngine, symbols: Iterable[str], days: int
+) -> Dict[str, List[Dict[str, Any]]]:
+    syms = [str(s).upper() for s in symbols]
+
+    async def _one(sym: str) -> List[Dict[str, Any]]:
+        try:
+            js = await eng.get_json("yahoo", f"{YF_CHART_BASE}/{sym}", params=_yf_chart_params(days))
+        except FetchError as e:
+            if VERBOSE_BOOTSTRAP_ERRORS:
+                log(f"⚠️ YF chart fetch failed for {sym}: {e}")
+            return []
+        return _parse_yf_chart(js)
+
+    results = await asyncio.gather(*[_one(s) for s in syms])
+    return {s: bars for s, bars in zip(syms, results) if bars}
+
+
 # -------------------------------------------------------------------
 # Normalization helper
 # -------------------------------------------------------------------
@@ -325,12 +483,18 @@ def _save_sa_bundle_snapshot(bundle: Dict[str, Any]) -> str | None:
 
 
 def fetch_sa_bundle_parallel(max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
-    base = _fetch_sa_index_batch()
-    if not base:
-        log("⚠️ /s/i returned no rows.")
-        return {}
+    if async_fetch_enabled():
+        base, metrics_map = run_sync(_fetch_sa_tables_async(SA_METRICS))
+        if not base:
+            log("⚠️ /s/i returned no rows.")
+            return {}
+    else:
+        base = _fetch_sa_index_batch()
+        if not base:
+            log("⚠️ /s/i returned no rows.")
+            return {}
+        metrics_map = _fetch_sa_metrics_bulk(SA_METRICS, max_workers=max_workers)
 
-    metrics_map = _fetch_sa_metrics_bulk(SA_METRICS, max_workers=max_workers)
     bundle = _merge_index_and_metrics(base, metrics_map)
     bundle = _normalize_bundle(bundle)
     _save_sa_bundle_snapshot(bundle)
@@ -567,21 +731,35 @@ def _merge_histories_prefer_existing(base: List[Dict[str, Any]], existing: List[
     return merged[-MAX_HISTORY_DAYS:]
 
 
-def _patch_recent_days_yf(symbol: str, hist: List[Dict[str, Any]], days: int) -> List[Dict[str, Any]]:
+def _patch_recent_days_yf(
+    symbol: str,
+    hist: List[Dict[str, Any]],
+    days: int,
+    bars: Optional[List[Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
     """
     Optional: patch the last N calendar days using yfinance (rate-limited).
-    Only useful if your HF snapshot is stale.
+    Only useful if your HF snapshot is stale. `bars` are prefetched patch
+    bars (no fetch when given).
     """
     if days <= 0:
         return hist
-    period = f"{max(1, int(days))}d"
-    yf_bars = _bootstrap_history_yf(symbol, max_days=MAX_HISTORY_DAYS, period=period)
+    if bars is None:
+        period = f"{max(1, int(days))}d"
+        yf_bars = _bootstrap_history_yf(symbol, max_days=MAX_HISTORY_DAYS, period=period)
+    else:
+        yf_bars = bars
     if not yf_bars:
         return hist
     return _merge_histories_prefer_existing(base=yf_bars, existing=hist)
 
 
-def _ensure_bootstrap_history_if_needed(symbol: str, hist: List[Dict[str, Any]], min_days: int) -> List[Dict[str, Any]]:
+def _ensure_bootstrap_history_if_needed(
+    symbol: str,
+    hist: List[Dict[str, Any]],
+    min_days: int,
+    prefetched: Optional[Dict[str, Dict[str, List[Dict[str, Any]]]]] = None,
+) -> List[Dict[str, Any]]:
     """
     If history is too short (< min_days unique dates), bootstrap.
 
@@ -589,6 +767,9 @@ def _ensure_bootstrap_history_if_needed(symbol: str, hist: List[Dict[str, Any]],
       1) HF dataset via DuckDB/Parquet (if enabled)
       2) yfinance (rate-limited) fallback
       3) Optional recent-day patching via yfinance (OFF by default)
+
+    With `prefetched` (see _prefetch_histories) no network calls are made
+    here; a symbol missing from it had no bars from any source.
     """
     symbol = symbol.upper()
     existing_dates = _unique_history_dates(hist)
@@ -596,11 +777,14 @@ def _ensure_bootstrap_history_if_needed(symbol: str, hist: List[Dict[str, Any]],
         return hist
 
     bootstrap_bars: List[Dict[str, Any]] = []
-    if USE_HF_BOOTSTRAP:
-        bootstrap_bars = _bootstrap_history_hf(symbol, max_days=MAX_HISTORY_DAYS)
+    if prefetched is not None:
+        bootstrap_bars = prefetched["bootstrap"].get(symbol) or []
+    else:
+        if USE_HF_BOOTSTRAP:
+            bootstrap_bars = _bootstrap_history_hf(symbol, max_days=MAX_HISTORY_DAYS)
 
-    if not bootstrap_bars:
-        bootstrap_bars = _bootstrap_history_yf(symbol, max_days=MAX_HISTORY_DAYS, period="3y")
+        if not bootstrap_bars:
+            bootstrap_bars = _bootstrap_history_yf(symbol, max_days=MAX_HISTORY_DAYS, period="3y")
 
     if not bootstrap_bars:
         return hist
@@ -608,7 +792,8 @@ def _ensure_bootstrap_history_if_needed(symbol: str, hist: List[Dict[str, Any]],
     merged = _merge_histories_prefer_existing(base=bootstrap_bars, existing=hist)
 
     if YF_PATCH_RECENT_DAYS > 0:
-        merged = _patch_recent_days_yf(symbol, merged, days=YF_PATCH_RECENT_DAYS)
+        patch = prefetched["patch"].get(symbol, []) if prefetched is not None else None
+        merged = _patch_recent_days_yf(symbol, merged, days=YF_PATCH_RECENT_DAYS, bars=patch)
 
     if VERBOSE_BOOTSTRAP:
         log(f"🧪 Bootstrapped history for {symbol}: {len(merged)} days.")
@@ -616,6 +801,56 @@ def _ensure_bootstrap_history_if_needed(symbol: str, hist: List[Dict[str, Any]],
     return merged
 
 
+def _prefetch_histories(
+    rolling: Dict[str, Any],
+    symbols: Iterable[str],
+    min_days: int,
+    patch_symbols: Iterable[str] = (),
+    max_workers: int = 8,
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Fetch every bootstrap/patch history the per-symbol pass will need, up front:
+    HF (DuckDB threads) for short histories, then one async Yahoo batch for
+    the HF misses, then recent-day patch bars. Returns
+    {"bootstrap": {sym: bars}, "patch": {sym: bars}}.
+    """
+    short: List[str] = []
+    for sym in dict.fromkeys(str(s).upper() for s in symbols):
+        node = rolling.get(sym)
+        hist = node.get("history") if isinstance(node, dict) else None
+        if len(_unique_history_dates(hist or [])) < min_days:
+            short.append(sym)
+
+    boot: Dict[str, List[Dict[str, Any]]] = {}
+    if USE_HF_BOOTSTRAP and short:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            for sym, bars in zip(short, ex.map(lambda s: _bootstrap_history_hf(s, max_days=MAX_HISTORY_DAYS), short)):
+                if bars:
+                    boot[sym] = bars
+    yf_syms = [s for s in short if s not in boot]
+
+    async def _go() -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]:
+        async with _new_fetch_engine() as eng:
+            yf_boot = await _fetch_yf_histories_async(eng, yf_syms, days=3 * 365) if yf_syms else {}
+            patch: Dict[str, List[Dict[str, Any]]] = {}
+            if YF_PATCH_RECENT_DAYS > 0:
+                wanted = list(dict.fromkeys([*boot, *yf_boot, *(str(s).upper() for s in patch_symbols)]))
+                patch = await _fetch_yf_histories_async(eng, wanted, days=YF_PATCH_RECENT_DAYS)
+            _log_fetch_stats(eng)
+        return yf_boot, patch
+
+    yf_boot: Dict[str, List[Dict[str, Any]]] = {}
+    patch: Dict[str, List[Dict[str, Any]]] = {}
+    if yf_syms or (YF_PATCH_RECENT_DAYS > 0 and (boot or patch_symbols)):
+        yf_boot, patch = run_sync(_go())
+    boot.update(yf_boot)
+    log(
+        f"📥 Prefetched histories: {len(short)} short → {len(boot)} bootstrapped "
+        f"({len(yf_boot)} via Yahoo), {len(patch)} patched."
+    )
+    return {"bootstrap": boot, "patch": patch}
+
+
 # -------------------------------------------------------------------
 # Local node helper (replaces ensure_symbol_fields)
 # -------------------------------------------------------------------
@@ -695,15 +930,22 @@ def backfill_symbols(symbols: List[str], min_days: int = 180, max_workers: int =
                 patch_symbols.add(str(s).upper())
             log(f"🩹 YF recent patch enabled: days={YF_PATCH_RECENT_DAYS}, max_symbols={len(patch_symbols)}")
 
+        prefetched = (
+            _prefetch_histories(rolling, symbols, min_days, patch_symbols, max_workers=max_workers)
+            if async_fetch_enabled()
+            else None
+        )
+
         def _process(sym: str) -> int:
             sym_u = str(sym).upper()
             node = _ensure_symbol_node(rolling, sym_u)
 
             hist = node.get("history") or []
-            hist = _ensure_bootstrap_history_if_needed(sym_u, hist, min_days=min_days)
+            hist = _ensure_bootstrap_history_if_needed(sym_u, hist, min_days=min_days, prefetched=prefetched)
 
             if sym_u in patch_symbols:
-                hist = _patch_recent_days_yf(sym_u, hist, days=YF_PATCH_RECENT_DAYS)
+                patch = prefetched["patch"].get(sym_u, []) if prefetched is not None else None
+                hist = _patch_recent_days_yf(sym_u, hist, days=YF_PATCH_RECENT_DAYS, bars=patch)
 
             sa = sa_bundle.get(sym_u) if sa_bundle else None
             if not sa:
@@ -752,12 +994,18 @@ def backfill_symbols(symbols: List[str], min_days: int = 180, max_workers: int =
 
     # INCREMENTAL MODE — per-symbol repair (kept for compatibility)
     else:
+        prefetched = (
+            _prefetch_histories(rolling, symbols, min_days, max_workers=max_workers)
+            if async_fetch_enabled()
+            else None
+        )
+
         def _process(sym: str) -> int:
             sym_u = str(sym).upper()
             node = _ensure_symbol_node(rolling, sym_u)
 
             hist = node.get("history") or []
-            hist = _ensure_bootstrap_history_if_needed(sym_u, hist, min_days=min_days)
+            hist = _ensure_bootstrap_history_if_needed(sym_u, hist, min_days=min_days, prefetched=prefetched)
 
             if hist and str(hist[-1].get("date")) == today:
                 node["history"] = hist
@@ -0,0 +1,303 @@
+# backend/services/fetch_engine.py
+"""
+Async Fetch Engine — AION Analytics
+
+asyncio/aiohttp HTTP client for bulk nightly fetches (history backfill,
+StockAnalysis screener tables):
+
+    • one keep-alive connection pool (aiohttp ClientSession) per host;
+    • a token-bucket rate limiter per provider (e.g. "stockanalysis",
+      "yahoo"), shared by every request to that provider;
+    • retries with exponential backoff and full jitter on connection
+      errors, timeouts, 429 and 5xx (Retry-After is honoured);
+    • request coalescing: identical in-flight requests (same method, URL
+      and body) share one network call, so duplicate symbols cost nothing;
+    • an on-disk JSON response cache (gzip, per-request TTL).
+
+Providers are plain ProviderConfig values; base URLs are not baked in, so
+tests can point a provider at a local stub server.
+
+Usage (sync callers):
+
+    async def _go():
+        async with FetchEngine({"sa": ProviderConfig("sa", rate_per_sec=8)}) as eng:
+            return await eng.get_json("sa", url)
+
+    data = run_sync(_go())
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp  # type: ignore
+except Exception:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+from backend.core.config import PATHS
+from backend.core.data_pipeline import log
+
+T = TypeVar("T")
+
+HTTP_CACHE_DIR: Path = Path(PATHS.get("http_cache") or (Path("data") / "data_cache" / "http"))
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def async_fetch_enabled() -> bool:
+    if aiohttp is None:
+        return False
+    return os.getenv("AION_ASYNC_FETCH", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+class FetchError(RuntimeError):
+    """A request failed after all retries (status is None for transport errors)."""
+
+    def __init__(self, url: str, status: Optional[int], detail: str):
+        super().__init__(f"{url}: {status or 'transport error'} {detail}".strip())
+        self.url = url
+        self.status = status
+
+
+@dataclass
+class ProviderConfig:
+    name: str
+    rate_per_sec: float = 5.0        # token refill rate
+    burst: int = 1                   # bucket size
+    max_connections: int = 8         # keep-alive pool size per host
+    max_retries: int = 3             # retries after the first attempt
+    backoff_base: float = 1.0        # seconds; attempt n sleeps ~ base * 2**n (jittered)
+    backoff_max: float = 60.0
+    timeout: float = 20.0
+    cache_ttl: float = 0.0           # seconds; 0 disables the disk cache by default
+    headers: Optional[Dict[str, str]] = None
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens/sec, at most `burst` stored."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = max(1e-6, float(rate))
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                delay = (1.0 - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class ResponseCache:
+    """gzip JSON response bodies keyed by request digest, with fetch time."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def get(self, key: str, ttl: float) -> Optional[Any]:
+        if ttl <= 0:
+            return None
+        p = self._path(key)
+        try:
+            if time.time() - p.stat().st_mtime > ttl:
+                return None
+            with gzip.open(p, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def put(self, key: str, body: Any) -> None:
+        p = self._path(key)
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_name(p.name + f".{os.getpid()}.tmp")
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(body, f)
+            os.replace(tmp, p)
+        except Exception as e:
+            log(f"[fetch_engine] ⚠️ Cache write failed for {p}: {e}")
+
+
+def _request_key(method: str, url: str, body: Any) -> str:
+    raw = json.dumps([method.upper(), url, body], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _retry_after(headers: Any) -> Optional[float]:
+    try:
+        v = headers.get("Retry-After")
+        return float(v) if v is not None else None
+    except Exception:
+        return None
+
+
+class FetchEngine:
+    """Per-host pooled sessions, per-provider rate limits, coalescing, disk cache."""
+
+    def __init__(
+        self,
+        providers: Dict[str, ProviderConfig],
+        *,
+        cache_dir: Optional[Path] = None,
+        jitter: Optional[random.Random] = None,
+    ):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for the async fetch engine. Install with: pip install aiohttp")
+        self.providers = dict(providers)
+        self.cache = ResponseCache(cache_dir or HTTP_CACHE_DIR)
+        self._rng = jitter or random.Random()
+        self._buckets = {n: TokenBucket(p.rate_per_sec, p.burst) for n, p in self.providers.items()}
+        self._sessions: Dict[Tuple[str, str], "aiohttp.ClientSession"] = {}
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._stats: Dict[str, Dict[str, float]] = {
+            n: {"requests": 0, "cache_hits": 0, "coalesced": 0, "retries": 0, "errors": 0, "rate_wait_secs": 0.0}
+            for n in self.providers
+        }
+
+    async def __aenter__(self) -> "FetchEngine":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        sessions, self._sessions = list(self._sessions.values()), {}
+        for s in sessions:
+            await s.close()
+
+    def _session(self, provider: ProviderConfig, url: str) -> "aiohttp.ClientSession":
+        host = urlsplit(url).netloc
+        key = (provider.name, host)
+        s = self._sessions.get(key)
+        if s is None or s.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=max(1, provider.max_connections), keepalive_timeout=60)
+            s = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=provider.timeout),
+                headers=provider.headers or None,
+            )
+            self._sessions[key] = s
+        return s
+
+    def _backoff(self, provider: ProviderConfig, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(provider.backoff_max, max(0.0, retry_after))
+        cap = min(provider.backoff_max, provider.backoff_base * (2 ** attempt))
+        return self._rng.uniform(0.0, cap)
+
+    async def request_json(
+        self,
+        provider_name: str,
+        method: str,
+        url: str,
+        *,
+        json_body: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        cache_ttl: Optional[float] = None,
+    ) -> Any:
+        """Decoded JSON body of a 200 response; raises FetchError otherwise."""
+        provider = self.providers[provider_name]
+        stats = self._stats[provider_name]
+        key = _request_key(method, url, [json_body, params])
+        ttl = provider.cache_ttl if cache_ttl is None else float(cache_ttl)
+
+        cached = self.cache.get(key, ttl)
+        if cached is not None:
+            stats["cache_hits"] += 1
+            return cached
+
+        fut = self._inflight.get(key)
+        if fut is not None:
+            stats["coalesced"] += 1
+            return await asyncio.shield(fut)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            body = await self._send(provider, method, url, json_body, params)
+            if ttl > 0:
+                self.cache.put(key, body)
+            fut.set_result(body)
+            return body
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def get_json(self, provider_name: str, url: str, **kw: Any) -> Any:
+        return await self.request_json(provider_name, "GET", url, **kw)
+
+    async def post_json(self, provider_name: str, url: str, payload: Any, **kw: Any) -> Any:
+        return await self.request_json(provider_name, "POST", url, json_body=payload, **kw)
+
+    async def _send(
+        self,
+        provider: ProviderConfig,
+        method: str,
+        url: str,
+        json_body: Any,
+        params: Optional[Dict[str, Any]],
+    ) -> Any:
+        stats = self._stats[provider.name]
+        bucket = self._buckets[provider.name]
+        last: Optional[FetchError] = None
+        for attempt in range(max(0, provider.max_retries) + 1):
+            if attempt:
+                stats["retries"] += 1
+            stats["rate_wait_secs"] += await bucket.acquire()
+            stats["requests"] += 1
+            retry_after: Optional[float] = None
+            try:
+                session = self._session(provider, url)
+                async with session.request(method, url, json=json_body, params=params) as r:
+                    if r.status == 200:
+                        return await r.json(content_type=None)
+                    detail = (await r.text())[:200]
+                    last = FetchError(url, r.status, detail)
+                    if r.status not in RETRY_STATUSES:
+                        break
+                    retry_after = _retry_after(r.headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                last = FetchError(url, None, f"{type(e).__name__}: {e}")
+            if attempt < provider.max_retries:
+                await asyncio.sleep(self._backoff(provider, attempt, retry_after))
+        stats["errors"] += 1
+        raise last or FetchError(url, None, "no attempt made")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {n: dict(s) for n, s in self._stats.items()}
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine from sync code (backfill runs in worker threads, not in a loop)."""
+    return asyncio.run(coro)  # type: ignore[arg-type]
@@ -31,6 +31,7 @@ import requests
 
 from backend.core.data_pipeline import (
     _read_rolling,
+    rolling_update_lock,
     save_rolling,
     safe_float,
     log,
@@ -230,37 +231,43 @@ def enrich_fundamentals() -> Dict[str, Any]:
         try:
             fundamentals = load_fundamentals_for_replay(replay_date)
             
-            # Apply to rolling
-            rolling = _read_rolling()
-            if not rolling:
-                log("⚠️ No rolling.json.gz in replay mode")
-                return {"status": "error", "error": "no_rolling"}
+            with rolling_update_lock():
+                # Apply to rolling
+                rolling = _read_rolling()
+                if not rolling:
+                    log("⚠️ No rolling.json.gz in replay mode")
+                    return {"status": "error", "error": "no_rolling"}
             
-            updated = 0
-            for sym, fund_data in fundamentals.items():
-                if sym in rolling:
-                    node = rolling[sym]
-                    if isinstance(node, dict):
-                        node["fundamentals"] = fund_data
-                        rolling[sym] = node
-                        updated += 1
+                updated = 0
+                for sym, fund_data in fundamentals.items():
+                    if sym in rolling:
+                        node = rolling[sym]
+                        if isinstance(node, dict):
+                            node["fundamentals"] = fund_data
+                            rolling[sym] = node
+                            updated += 1
             
-            save_rolling(rolling)
-            log(f"✅ Replay mode: loaded fundamentals for {updated} symbols from snapshot")
-            return {"status": "ok", "updated": updated, "total": len(fundamentals)}
+                save_rolling(rolling)
+                log(f"✅ Replay mode: loaded fundamentals for {updated} symbols from snapshot")
+                return {"status": "ok", "updated": updated, "total": len(fundamentals)}
         except Exception as e:
             log(f"❌ Replay mode: failed to load fundamentals: {e}")
             return {"status": "error", "error": str(e)}
     
-    # Live mode: continue with normal fetch logic
+    # Live mode: fetch first, then merge into a fresh rolling under the update lock
+    log("📘 Fetching fundamental metrics from StockAnalysis...")
+    sa_bundle = _fetch_sa_fundamentals()
+
+    with rolling_update_lock():
+        return _merge_fundamentals(sa_bundle)
+
+
+def _merge_fundamentals(sa_bundle: Dict[str, Any]) -> Dict[str, Any]:
     rolling = _read_rolling()
     if not rolling:
         log("⚠️ No rolling.json.gz — fundamentals enrichment aborted.")
         return {"status": "no_rolling"}
 
-    log("📘 Fetching fundamental metrics from StockAnalysis...")
-    sa_bundle = _fetch_sa_fundamentals()
-
     updated = 0
     total = len(rolling)
 
@@ -37,6 +37,7 @@ import requests
 
 from backend.core.data_pipeline import (
     _read_rolling,
+    rolling_update_lock,
     save_rolling,
     safe_float,
     log,
@@ -135,20 +136,35 @@ def build_latest_metrics(rolling: Optional[Dict[str, Any]] = None, *, persist: b
     """
     in_memory = rolling is not None
 
-    if rolling is None:
-        rolling = _read_rolling()
-
-    if not rolling:
+    if in_memory and not rolling:
         log(f"⚠️ No rolling cache at {_rolling_path_str()} — skipping metrics fetch.")
-        return {"status": "no_rolling", "in_memory": bool(in_memory)}
+        return {"status": "no_rolling", "in_memory": True}
 
     log("📊 Fetching latest StockAnalysis metrics…")
 
-    # Step 1 — fetch each table
+    # Step 1 — fetch each table (before reading rolling, so the merge below
+    # works on a fresh copy and the update lock is never held across I/O)
     metric_tables: Dict[str, Dict[str, Any]] = {}
     for metric in METRIC_LIST:
         metric_tables[metric] = _sa_get_metric_table(metric)
 
+    if in_memory:
+        return _merge_metrics(rolling, metric_tables, persist=persist, in_memory=True)
+    with rolling_update_lock():
+        rolling = _read_rolling()
+        if not rolling:
+            log(f"⚠️ No rolling cache at {_rolling_path_str()} — skipping metrics fetch.")
+            return {"status": "no_rolling", "in_memory": False}
+        return _merge_metrics(rolling, metric_tables, persist=persist, in_memory=False)
+
+
+def _merge_metrics(
+    rolling: Dict[str, Any],
+    metric_tables: Dict[str, Dict[str, Any]],
+    *,
+    persist: bool,
+    in_memory: bool,
+) -> Dict[str, Any]:
     updated = 0
     total_symbols = 0
 
@@ -1,7 +1,23 @@
 # ===============================================================
-# ml_data_builder.py — v2.7.0 (Windows-safe atomic parquet + price sanity + parquet integrity gates)
+# ml_data_builder.py — v2.10.0 (incremental partitioned build + columnar row builder + atomic parquet)
 # backend/services/ml_data_builder
 #
+# Key upgrades in v2.10.0:
+#   ✅ Latest-row index sidecar (training_data_daily.latest_rows.parquet): symbol →
+#      row group/offset of its newest row, so the prediction fallback never scans
+#      the FINAL parquet. AION_LATEST_ROW_INDEX=0 skips it.
+#
+# Key upgrades in v2.9.0:
+#   ✅ Incremental mode (ML_BUILDER_INCREMENTAL=1 / incremental=True): RAW is kept as
+#      asof_day partitions; nightly runs append only new as-of rows and backfill
+#      matured target_ret_* values. Full rebuild only when the column plan changes.
+#
+# Key upgrades in v2.8.0:
+#   ✅ Columnar row builder: the static per-symbol block (fund_/met_/ctx_, macro,
+#      brain, sector one-hot) is broadcast across vectorized per-date columns and
+#      written as Arrow record batches (no dict per date, no DataFrame rebuild).
+#      ML_BUILDER_COLUMNAR=0 restores the legacy dict-row path.
+#
 # Key upgrades in v2.7.0 (fixes “FINAL parquet corrupt / WinError 32 / target explosions”):
 #   ✅ Atomic parquet writes on Windows (write → .tmp → validate → os.replace)
 #   ✅ Raw parquet is also written atomically (prevents partial/corrupt RAW on crash)
@@ -23,6 +39,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import platform
@@ -45,6 +62,8 @@ from backend.core.data_pipeline import (
 )
 
 from utils.progress_bar import progress_bar
+from backend.core.latest_row_index import build_index as _build_latest_row_index
+from backend.core.latest_row_index import index_path_for, latest_row_index_enabled
 
 # ---------------------------------------------------------------
 # Platform flags
@@ -71,6 +90,11 @@ NEWS_FEATURES_DIR: Path = ML_ROOT / "news_features"
 CSV_CHUNKS_DIR: Path = DATASET_DIR / "_csv_chunks"
 CSV_CHUNKS_DIR.mkdir(parents=True, exist_ok=True)
 
+
+def _latest_row_index_file() -> Path:
+    """Latest-row sidecar next to whatever DATASET_FILE points at right now."""
+    return index_path_for(DATASET_FILE)
+
 _GLOBAL: Dict[str, Any] = {}
 
 MAX_RETURN_ROWS = int(os.getenv("ML_BUILDER_MAX_RETURN_ROWS", "200000") or "200000")
@@ -435,22 +459,33 @@ def _sector_one_hot(sector: str, all_sectors: List[str]) -> Dict[str, float]:
 # ===============================================================
 # Row Builder
 # ===============================================================
-def _build_rows_for_symbol(
-    sym: str,
-    node: Dict[str, Any],
-    macro: Dict[str, float],
-    brain: Dict[str, Any],
-    news_intel: Dict[str, Dict[str, Any]],
-    all_sectors: List[str],
-    as_of_date: Optional[str] = None,
-) -> List[Dict[str, Any]]:
+# Per-date columns produced by _add_vectorized_stats (copied onto every row).
+_STAT_COLS: Tuple[str, ...] = (
+    "roll_vol",
+    "roll_skew",
+    "roll_kurt",
+    "roll_atr",
+    "velocity",
+    "acceleration",
+    "tech_ret_1",
+    "tech_ret_5",
+    "tech_ret_10",
+    "tech_volatility_10d",
+    "tech_momentum_5d",
+)
+
+_ROW_START_IDX = 10
+
+
+def _prepare_history(node: Dict[str, Any]) -> Optional[pd.DataFrame]:
+    """Sorted, sanitized daily history with stats + forward-return targets (or None)."""
     history = node.get("history") or []
     if len(history) < 15:
-        return []
+        return None
 
     hist_df = pd.DataFrame(history).copy()
     if "date" not in hist_df.columns or "close" not in hist_df.columns:
-        return []
+        return None
 
     hist_df["date"] = pd.to_datetime(hist_df["date"], errors="coerce")
     hist_df = hist_df.sort_values("date").reset_index(drop=True)
@@ -463,7 +498,7 @@ def _build_rows_for_symbol(
     hist_df = hist_df[hist_df["close"] > 0.0]
 
     if len(hist_df) < 15:
-        return []
+        return None
 
     if "high" not in hist_df.columns:
         hist_df["high"] = hist_df["close"]
@@ -472,7 +507,18 @@ def _build_rows_for_symbol(
 
     hist_df = _add_vectorized_stats(hist_df)
     hist_df = _add_forward_returns(hist_df)
+    return hist_df
 
+
+def _static_feature_block(
+    sym: str,
+    node: Dict[str, Any],
+    macro: Dict[str, float],
+    brain: Dict[str, Any],
+    news_intel: Dict[str, Dict[str, Any]],
+    all_sectors: List[str],
+) -> Dict[str, Any]:
+    """Per-symbol values shared by every date row (ids, sector, fund_/met_/ctx_, news, macro, brain)."""
     sector = node.get("sector") or (node.get("fundamentals") or {}).get("sector") or ""
     if not isinstance(sector, str):
         sector = ""
@@ -505,10 +551,27 @@ def _build_rows_for_symbol(
 
     base_row.update(macro)
     base_row.update(_extract_brain_features_for_symbol(sym, brain))
+    return base_row
+
+
+def _build_rows_for_symbol(
+    sym: str,
+    node: Dict[str, Any],
+    macro: Dict[str, float],
+    brain: Dict[str, Any],
+    news_intel: Dict[str, Dict[str, Any]],
+    all_sectors: List[str],
+    as_of_date: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    hist_df = _prepare_history(node)
+    if hist_df is None:
+        return []
+
+    base_row = _static_feature_block(sym, node, macro, brain, news_intel, all_sectors)
 
     rows: List[Dict[str, Any]] = []
     n = len(hist_df)
-    start_idx = 10
+    start_idx = _ROW_START_IDX
     last_date = hist_df["date"].iloc[-1]
 
     for idx in range(start_idx, n):
@@ -527,18 +590,8 @@ def _build_rows_for_symbol(
         row["close"] = close_val
         row["volume"] = safe_float(bar.get("volume"))
 
-        row["roll_vol"] = float(bar.get("roll_vol", 0.0) or 0.0)
-        row["roll_skew"] = float(bar.get("roll_skew", 0.0) or 0.0)
-        row["roll_kurt"] = float(bar.get("roll_kurt", 0.0) or 0.0)
-        row["roll_atr"] = float(bar.get("roll_atr", 0.0) or 0.0)
-        row["velocity"] = float(bar.get("velocity", 0.0) or 0.0)
-        row["acceleration"] = float(bar.get("acceleration", 0.0) or 0.0)
-
-        row["tech_ret_1"] = float(bar.get("tech_ret_1", 0.0) or 0.0)
-        row["tech_ret_5"] = float(bar.get("tech_ret_5", 0.0) or 0.0)
-        row["tech_ret_10"] = float(bar.get("tech_ret_10", 0.0) or 0.0)
-        row["tech_volatility_10d"] = float(bar.get("tech_volatility_10d", 0.0) or 0.0)
-        row["tech_momentum_5d"] = float(bar.get("tech_momentum_5d", 0.0) or 0.0)
+        for col in _STAT_COLS:
+            row[col] = float(bar.get(col, 0.0) or 0.0)
 
         for label in HORIZON_STEPS.keys():
             col = f"target_ret_{label}"
@@ -558,6 +611,305 @@ def _build_rows_for_symbol(
     return rows
 
 
+# ===============================================================
+# Columnar builder (static block broadcast over per-date columns)
+# ===============================================================
+class _SymbolBlock:
+    """
+    One symbol's dataset rows in columnar form:
+      static  : {col: value} shared by every row (fund_/met_/ctx_/macro/brain/sector…)
+      dynamic : {col: ndarray} one value per row (close/volume/stats/targets)
+
+    Produces exactly the rows _build_rows_for_symbol would, without a dict per date.
+    """
+
+    __slots__ = ("symbol", "name", "asof", "static", "dynamic")
+
+    def __init__(self, symbol: str, name: Any, asof: np.ndarray, static: Dict[str, float], dynamic: Dict[str, np.ndarray]):
+        self.symbol = symbol
+        self.name = name
+        self.asof = asof
+        self.static = static
+        self.dynamic = dynamic
+
+    def __len__(self) -> int:
+        return int(len(self.asof))
+
+    def take(self, idx: np.ndarray) -> "_SymbolBlock":
+        """Sub-block with the rows at positions `idx` (static block shared)."""
+        return _SymbolBlock(
+            self.symbol,
+            self.name,
+            self.asof[idx],
+            self.static,
+            {c: arr[idx] for c, arr in self.dynamic.items()},
+        )
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for i in range(len(self)):
+            row: Dict[str, Any] = {"symbol": self.symbol, "name": self.name}
+            row.update(self.static)
+            row["asof_date"] = str(self.asof[i])
+            for c, arr in self.dynamic.items():
+                row[c] = float(arr[i])
+            out.append(row)
+        return out
+
+
+def _iso_dates(dates: pd.Series) -> np.ndarray:
+    """Vectorized Timestamp.isoformat() for a datetime Series."""
+    try:
+        if getattr(dates.dt, "tz", None) is None:
+            vals = dates.to_numpy(dtype="datetime64[ns]")
+            if not (vals.astype("int64") % 1_000_000_000).any():
+                return np.datetime_as_string(vals, unit="s")
+    except Exception:
+        pass
+    return np.array([d.isoformat() for d in dates], dtype=object).astype(str)
+
+
+def _shift(a: np.ndarray, k: int) -> np.ndarray:
+    """Series.shift(k) for a float array (NaN fill)."""
+    out = np.full_like(a, np.nan)
+    if k > 0:
+        out[k:] = a[:-k]
+    elif k < 0:
+        out[:k] = a[-k:]
+    else:
+        out[:] = a
+    return out
+
+
+def _nan_inf(a: np.ndarray) -> np.ndarray:
+    a[~np.isfinite(a)] = np.nan
+    return a
+
+
+def _history_columns(node: Dict[str, Any]) -> Optional[Tuple[pd.Series, Dict[str, np.ndarray]]]:
+    """
+    NumPy version of _prepare_history (+ _add_vectorized_stats/_add_forward_returns):
+    returns (dates, {col: array}) with the same values, without building a
+    DataFrame per symbol. Windowed stats still use pandas' Series kernels.
+    """
+    history = node.get("history") or []
+    if len(history) < 15:
+        return None
+    if not all(isinstance(b, dict) for b in history):
+        return None
+    if not any("date" in b for b in history) or not any("close" in b for b in history):
+        return None
+
+    def _num(key: str) -> np.ndarray:
+        raw = pd.to_numeric(pd.Series([b.get(key) for b in history], dtype=object), errors="coerce")
+        return _nan_inf(raw.to_numpy(dtype=float))
+
+    dates = pd.Series(pd.to_datetime(pd.Series([b.get("date") for b in history], dtype=object), errors="coerce"))
+    order = dates.sort_values().index.to_numpy()
+    dates = dates.iloc[order].reset_index(drop=True)
+
+    close = _num("close")[order]
+    volume = _num("volume")[order] if any("volume" in b for b in history) else np.zeros(len(history))
+    volume = np.where(np.isnan(volume), 0.0, volume)
+    high = _num("high")[order] if any("high" in b for b in history) else None
+    low = _num("low")[order] if any("low" in b for b in history) else None
+
+    keep = dates.notna().to_numpy() & ~np.isnan(close)
+    keep &= np.where(keep, close, 0.0) > 0.0
+    if int(keep.sum()) < 15:
+        return None
+    dates = dates[keep].reset_index(drop=True)
+    close = close[keep]
+    volume = volume[keep]
+    high = close if high is None else high[keep]
+    low = close if low is None else low[keep]
+
+    cols: Dict[str, np.ndarray] = {"close": close, "volume": volume}
+
+    # _add_vectorized_stats
+    ret1 = close / _shift(close, 1) - 1.0
+    ret5 = close / _shift(close, 5) - 1.0
+    ret10 = close / _shift(close, 10) - 1.0
+    r1 = pd.Series(ret1)
+    exp = r1.expanding(min_periods=3)
+    cols["roll_vol"] = exp.std().to_numpy()
+    cols["roll_skew"] = exp.skew().to_numpy()
+    cols["roll_kurt"] = exp.kurt().to_numpy()
+    hl_range = _nan_inf(high - low)
+    cols["roll_atr"] = pd.Series(hl_range).expanding(min_periods=2).mean().to_numpy()
+    cols["velocity"] = _nan_inf(close / _shift(close, 3) - 1.0)
+    cols["acceleration"] = ret1 - _shift(ret1, 2)
+    cols["tech_ret_1"] = ret1.copy()
+    cols["tech_ret_5"] = ret5
+    cols["tech_ret_10"] = ret10
+    cols["tech_volatility_10d"] = r1.rolling(10, min_periods=2).std().to_numpy()
+    cols["tech_momentum_5d"] = _nan_inf(close / _shift(close, 5) - 1.0)
+    for c in _STAT_COLS:
+        a = _nan_inf(np.array(cols[c], dtype=float))
+        a[np.isnan(a)] = 0.0
+        cols[c] = a
+
+    # _add_forward_returns
+    denom = np.where(close > 0.0, close, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        denom_ok = denom >= float(MIN_VALID_CLOSE)
+        for label, steps in HORIZON_STEPS.items():
+            tgt = (_shift(denom, -int(steps)) - denom) / denom
+            tgt = np.where(denom_ok, tgt, np.nan)
+            tgt = np.where(np.abs(tgt) <= float(MAX_ABS_TARGET_RET), tgt, np.nan)
+            cols[f"target_ret_{label}"] = tgt
+
+    return dates, cols
+
+
+def _build_block_for_symbol(
+    sym: str,
+    node: Dict[str, Any],
+    macro: Dict[str, float],
+    brain: Dict[str, Any],
+    news_intel: Dict[str, Dict[str, Any]],
+    all_sectors: List[str],
+    as_of_date: Optional[str] = None,
+) -> Optional[_SymbolBlock]:
+    hist = _history_columns(node)
+    if hist is None:
+        return None
+    dates, cols = hist
+
+    base_row = _static_feature_block(sym, node, macro, brain, news_intel, all_sectors)
+    symbol = base_row.pop("symbol")
+    name = base_row.pop("name")
+
+    n = len(dates)
+    start = _ROW_START_IDX
+    asof = _iso_dates(dates)
+
+    # Same row window as the row loop: stop before the first date past
+    # as_of_date, and after the first bar within a day of the last one.
+    stop = n
+    if as_of_date:
+        over = np.flatnonzero(asof[start:] > str(as_of_date))
+        if over.size:
+            stop = start + int(over[0])
+    near = np.flatnonzero(((dates.iloc[-1] - dates.iloc[start:]).dt.days < 1).to_numpy())
+    if near.size:
+        stop = min(stop, start + int(near[0]) + 1)
+    if stop <= start:
+        return None
+
+    sl = slice(start, stop)
+    dynamic: Dict[str, np.ndarray] = {"close": cols["close"][sl], "volume": cols["volume"][sl]}
+    for col in _STAT_COLS:
+        dynamic[col] = cols[col][sl]
+    for label in HORIZON_STEPS.keys():
+        col = f"target_ret_{label}"
+        dynamic[col] = cols[col][sl]
+
+    return _SymbolBlock(symbol, name, asof[sl], base_row, dynamic)
+
+
+def _blocks_to_matrix(
+    blocks: List[_SymbolBlock],
+    num_cols: List[str],
+    col_index: Dict[str, int],
+) -> Tuple[List[str], List[str], np.ndarray, np.ndarray]:
+    """
+    Assemble blocks into (symbols, names, asof, M) with M float64 (rows × num_cols,
+    Fortran order so each column is contiguous). Missing values are NaN, inf → NaN.
+    """
+    n = sum(len(b) for b in blocks)
+    mat = np.full((n, len(num_cols)), np.nan, dtype=np.float64, order="F")
+    symbols: List[str] = []
+    names: List[str] = []
+    asof_parts: List[np.ndarray] = []
+
+    off = 0
+    for b in blocks:
+        m = len(b)
+        rows = slice(off, off + m)
+        idx = [col_index[c] for c in b.static if c in col_index]
+        if idx:
+            vals = np.array([b.static[c] for c in b.static if c in col_index], dtype=np.float64)
+            mat[rows, idx] = vals
+        for c, arr in b.dynamic.items():
+            j = col_index.get(c)
+            if j is not None:
+                mat[rows, j] = arr
+        symbols.extend([str(b.symbol)] * m)
+        names.extend([str(b.name)] * m)
+        asof_parts.append(b.asof.astype(str))
+        off += m
+
+    mat[~np.isfinite(mat)] = np.nan
+    asof = np.concatenate(asof_parts) if asof_parts else np.array([], dtype=str)
+    return symbols, names, asof, mat
+
+
+def _finalize_matrix(mat: np.ndarray, n_feat: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Artifact dtypes: features NaN → 0 float32, targets float32 (NaN kept)."""
+    feats_m = mat[:, :n_feat]
+    feats_out = np.asfortranarray(np.where(np.isnan(feats_m), 0.0, feats_m), dtype=np.float32)
+    targets_out = np.asfortranarray(mat[:, n_feat:], dtype=np.float32)
+    return feats_out, targets_out
+
+
+def _arrow_batch(pa, schema, symbols: List[str], names: List[str], asof: np.ndarray, feats_out: np.ndarray, targets_out: np.ndarray):
+    arrays = [
+        pa.array(symbols, type=pa.string()),
+        pa.array(names, type=pa.string()),
+        pa.array(np.asarray(asof).tolist(), type=pa.string()),
+    ]
+    arrays.extend(pa.array(feats_out[:, j]) for j in range(feats_out.shape[1]))
+    # NaN targets are stored as nulls, as Table.from_pandas did
+    arrays.extend(pa.array(targets_out[:, j], from_pandas=True) for j in range(targets_out.shape[1]))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _iter_blocks(
+    symbols: List[str],
+    rolling: Dict[str, Any],
+    macro: Dict[str, float],
+    brain: Dict[str, Any],
+    news_intel: Dict[str, Dict[str, Any]],
+    all_sectors: List[str],
+    *,
+    use_multiprocessing: bool,
+    debug: bool = False,
+):
+    """Yield one _SymbolBlock (or None) per symbol, in-process or from a worker pool."""
+    if not use_multiprocessing:
+        log("[ml_data_builder] 🪫 Multiprocessing disabled — running single-process mode.")
+        for sym in progress_bar(
+            symbols,
+            desc="[ml_data_builder] Building symbol blocks (single)",
+            unit="sym",
+            total=len(symbols),
+        ):
+            node = rolling.get(sym)
+            if node is None:
+                continue
+            yield _build_block_for_symbol(sym, node, macro, brain, news_intel, all_sectors)
+        return
+
+    raw_cpus = max(cpu_count(), 1)
+    workers = min(max(raw_cpus // 2, 2), 8)
+    log(f"[ml_data_builder] 🧵 Using {workers} workers for {len(symbols)} symbols (host CPUs={raw_cpus})")
+
+    chunksize = max(1, len(symbols) // (workers * 4))
+
+    with Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(rolling, macro, brain, news_intel, all_sectors, debug),
+    ) as pool:
+        yield from progress_bar(
+            pool.imap_unordered(_worker_build_block, symbols, chunksize=chunksize),
+            desc="[ml_data_builder] Building symbol blocks",
+            unit="sym",
+            total=len(symbols),
+        )
+
+
 # ===============================================================
 # Feature Filtering (protected)
 # ===============================================================
@@ -645,6 +997,64 @@ class _RunningStats:
             self.mean[c] = mu
             self.m2[c] = m2
 
+    def update_from_array(self, mat: np.ndarray, feature_cols: List[str]) -> None:
+        """Same as update_from_df for a float matrix (rows × feature_cols, NaN = missing)."""
+        if mat is None or mat.shape[0] == 0:
+            return
+
+        self.total_rows += int(mat.shape[0])
+
+        isna = np.isnan(mat)
+        na_cnt = isna.sum(axis=0)
+        k1_all = mat.shape[0] - na_cnt
+        zero_cnt = (mat == 0.0).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mu1_all = np.nansum(mat, axis=0) / k1_all
+            m21_all = np.nansum((mat - mu1_all) ** 2, axis=0)
+
+        for j, c in enumerate(feature_cols):
+            self.na[c] = self.na.get(c, 0) + int(na_cnt[j])
+            k1 = int(k1_all[j])
+            if k1 == 0:
+                continue
+
+            self.zero[c] = self.zero.get(c, 0) + int(zero_cnt[j])
+
+            k0 = self.n.get(c, 0)
+            mu1 = float(mu1_all[j])
+            m21 = float(m21_all[j])
+
+            if k0 == 0:
+                self.n[c] = k1
+                self.mean[c] = mu1
+                self.m2[c] = m21
+                continue
+
+            mu0 = self.mean.get(c, 0.0)
+            k = k0 + k1
+            delta = mu1 - mu0
+            self.n[c] = k
+            self.mean[c] = mu0 + delta * (k1 / k)
+            self.m2[c] = self.m2.get(c, 0.0) + m21 + (delta ** 2) * (k0 * k1 / k)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_rows": self.total_rows,
+            "na": self.na,
+            "zero": self.zero,
+            "n": self.n,
+            "mean": self.mean,
+            "m2": self.m2,
+        }
+
+    def load_dict(self, d: Dict[str, Any]) -> None:
+        self.total_rows = int(d.get("total_rows", 0) or 0)
+        self.na = {str(k): int(v) for k, v in (d.get("na") or {}).items()}
+        self.zero = {str(k): int(v) for k, v in (d.get("zero") or {}).items()}
+        self.n = {str(k): int(v) for k, v in (d.get("n") or {}).items()}
+        self.mean = {str(k): float(v) for k, v in (d.get("mean") or {}).items()}
+        self.m2 = {str(k): float(v) for k, v in (d.get("m2") or {}).items()}
+
     def std(self, c: str) -> float:
         k = self.n.get(c, 0)
         if k <= 1:
@@ -853,14 +1263,325 @@ def _worker_build_rows(sym: str) -> List[Dict[str, Any]]:
         return []
 
 
+def _worker_build_block(sym: str) -> Optional[_SymbolBlock]:
+    try:
+        rolling = _GLOBAL.get("rolling") or {}
+        macro = _GLOBAL.get("macro") or {}
+        brain = _GLOBAL.get("brain") or {}
+        news_intel = _GLOBAL.get("news_intel") or {}
+        all_sectors = _GLOBAL.get("all_sectors") or []
+        node = rolling.get(sym)
+        if node is None:
+            return None
+        return _build_block_for_symbol(sym, node, macro, brain, news_intel, all_sectors)
+    except Exception as e:
+        log(f"[ml_data_builder] ⚠️ Worker error for {sym}: {e}")
+        return None
+
+
+# ===============================================================
+# Incremental build (date-partitioned RAW dataset)
+# ===============================================================
+# Layout (pyarrow only):
+#   training_data_daily.raw.parts/asof_day=YYYY-MM-DD/part-0.parquet
+#   training_data_daily.incremental.json    column-plan signature, last asof per
+#                                           symbol, running feature stats, n_rows
+#   training_data_daily.corr_sample.parquet correlation sample from the full build
+#
+# A nightly incremental run appends rows newer than each symbol's last asof,
+# backfills target_ret_* values whose horizon has elapsed since the previous
+# run (rewriting only the affected date partitions) and then rewrites FINAL
+# from the partitions. Symbols no longer in rolling are pruned from every
+# partition, and n_rows is counted from the partition footers.
+#
+# Rows already written are not recomputed: they keep the static block
+# (fund_/met_/macro…) they were built with, and their expanding-window
+# features keep the history start they saw, which drifts from a full
+# rebuild once rolling's history window slides. To bound that drift a full
+# rebuild is forced when the last one is older than
+# ML_BUILDER_FULL_REBUILD_DAYS (default 7; 0 = never). Any change to the
+# column plan (or horizons / target guards) also triggers a full rebuild.
+RAW_PARTS_DIR: Path = DATASET_DIR / "training_data_daily.raw.parts"
+INCREMENTAL_STATE_FILE: Path = DATASET_DIR / "training_data_daily.incremental.json"
+CORR_SAMPLE_FILE: Path = DATASET_DIR / "training_data_daily.corr_sample.parquet"
+
+_PART_COL = "asof_day"
+_PART_FILE = "part-0.parquet"
+
+
+def _incremental_enabled() -> bool:
+    """ML_BUILDER_INCREMENTAL=1: append new as-of dates instead of rebuilding (default 0)."""
+    return str(os.getenv("ML_BUILDER_INCREMENTAL", "0")).strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def _full_rebuild_days() -> int:
+    """ML_BUILDER_FULL_REBUILD_DAYS: max age of the last full rebuild before appends stop (default 7)."""
+    try:
+        return max(0, int(os.getenv("ML_BUILDER_FULL_REBUILD_DAYS", "7") or "0"))
+    except ValueError:
+        return 7
+
+
+def _full_rebuild_due(state: Dict[str, Any], now: datetime) -> bool:
+    days = _full_rebuild_days()
+    if days <= 0:
+        return False
+    try:
+        built = datetime.fromisoformat(str(state.get("full_built_at")))
+    except (TypeError, ValueError):
+        return True
+    if built.tzinfo is None:
+        built = built.replace(tzinfo=now.tzinfo)
+    return (now - built).total_seconds() >= days * 86400
+
+
+def _plan_signature(id_cols: List[str], feature_cols: List[str], target_cols: List[str]) -> str:
+    payload = json.dumps(
+        {
+            "id_cols": id_cols,
+            "feature_cols": feature_cols,
+            "target_cols": target_cols,
+            "horizon_steps": HORIZON_STEPS,
+            "min_valid_close": MIN_VALID_CLOSE,
+            "max_abs_target_ret": MAX_ABS_TARGET_RET,
+            "row_start_idx": _ROW_START_IDX,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _load_incremental_state() -> Dict[str, Any]:
+    try:
+        if INCREMENTAL_STATE_FILE.exists():
+            raw = json.loads(INCREMENTAL_STATE_FILE.read_text(encoding="utf-8"))
+            return raw if isinstance(raw, dict) else {}
+    except Exception as e:
+        log(f"[ml_data_builder] ⚠️ Failed reading incremental state: {e}")
+    return {}
+
+
+def _save_incremental_state(state: Dict[str, Any]) -> None:
+    tmp = INCREMENTAL_STATE_FILE.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    _atomic_replace(tmp, INCREMENTAL_STATE_FILE)
+
+
+def _part_dir(day: str) -> Path:
+    return RAW_PARTS_DIR / f"{_PART_COL}={day}"
+
+
+def _read_partition(pq, day: str, schema):
+    files = sorted(_part_dir(day).glob("*.parquet"))
+    if not files:
+        return None
+    import pyarrow as pa  # type: ignore
+    tables = [pq.read_table(str(f), columns=schema.names).cast(schema) for f in files]
+    return pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+
+
+def _write_partition(pq, day: str, table) -> None:
+    d = _part_dir(day)
+    d.mkdir(parents=True, exist_ok=True)
+    tmp = d / (_PART_FILE + ".tmp")
+    pq.write_table(table, str(tmp), compression="snappy")
+    _atomic_replace(tmp, d / _PART_FILE)
+    for f in d.glob("*.parquet"):
+        if f.name != _PART_FILE:
+            _safe_unlink(f)
+
+
+def _partition_files() -> List[Path]:
+    return sorted(RAW_PARTS_DIR.glob(f"{_PART_COL}=*/*.parquet"))
+
+
+def _partition_rows(pq) -> int:
+    """Rows currently in the partitioned RAW dataset (parquet footers only)."""
+    return int(sum(pq.read_metadata(str(f)).num_rows for f in _partition_files()))
+
+
+def _prune_partitions(pa, pq, schema, dropped: set) -> int:
+    """Remove every row of `dropped` symbols from the partitions. Returns rows removed."""
+    import shutil
+    import pyarrow.compute as pc  # type: ignore
+
+    removed = 0
+    value_set = pa.array(sorted(dropped), type=pa.string())
+    for d in sorted({f.parent for f in _partition_files()}):
+        day = d.name.split("=", 1)[1]
+        syms = pa.concat_arrays([
+            pq.read_table(str(f), columns=["symbol"]).column("symbol").combine_chunks()
+            for f in sorted(d.glob("*.parquet"))
+        ])
+        hit = pc.is_in(syms, value_set=value_set)
+        n_hit = int(pc.sum(hit).as_py() or 0)
+        if not n_hit:
+            continue
+        table = _read_partition(pq, day, schema)
+        kept = table.filter(pc.invert(pc.is_in(table.column("symbol"), value_set=value_set)))
+        if kept.num_rows:
+            _write_partition(pq, day, kept)
+        else:
+            shutil.rmtree(d, ignore_errors=True)
+        removed += n_hit
+    return removed
+
+
+def _raw_to_partitions(pa, ds, raw_path: Path) -> None:
+    """Split a freshly built RAW parquet into asof_day partitions (streaming)."""
+    import shutil
+    import pyarrow.compute as pc  # type: ignore
+
+    tmp_dir = RAW_PARTS_DIR.with_name(RAW_PARTS_DIR.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    dataset = ds.dataset(str(raw_path), format="parquet")
+    cols = {c: ds.field(c) for c in dataset.schema.names}
+    cols[_PART_COL] = pc.utf8_slice_codeunits(ds.field("asof_date"), 0, 10)
+    ds.write_dataset(
+        dataset.scanner(columns=cols, batch_size=64_000),
+        str(tmp_dir),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([(_PART_COL, pa.string())]), flavor="hive"),
+        basename_template="part-{i}.parquet",
+        max_partitions=1_000_000,
+        max_open_files=256,
+    )
+    shutil.rmtree(RAW_PARTS_DIR, ignore_errors=True)
+    _atomic_replace(tmp_dir, RAW_PARTS_DIR)
+
+
+def _incremental_append(
+    blocks,
+    state: Dict[str, Any],
+    *,
+    pa,
+    pq,
+    schema,
+    num_cols: List[str],
+    feature_cols: List[str],
+    stats: "_RunningStats",
+    universe: List[str],
+) -> Dict[str, Any]:
+    """
+    Fold one night's symbol blocks into the partitioned RAW dataset.
+
+    For a symbol whose previous last row is at position p, rows after p are
+    new; for horizon k, rows in (p-k, p] had no target before (t+k was in the
+    future) and get one now if it became computable. Symbols of earlier runs
+    that are not in `universe` any more are pruned from all partitions.
+    """
+    col_index = {c: j for j, c in enumerate(num_cols)}
+    n_feat = len(feature_cols)
+    steps = {f"target_ret_{h}": int(k) for h, k in HORIZON_STEPS.items()}
+
+    last_asof: Dict[str, str] = dict(state.get("last_asof") or {})
+    dropped = set(last_asof) - {str(s) for s in universe}
+    pruned = _prune_partitions(pa, pq, schema, dropped) if dropped else 0
+    for sym in dropped:
+        last_asof.pop(sym, None)
+
+    new_by_day: Dict[str, List[_SymbolBlock]] = {}
+    updates: Dict[str, Dict[Tuple[str, str], Dict[str, float]]] = {}
+    latest_blocks: List[_SymbolBlock] = []
+
+    for block in blocks:
+        if block is None or len(block) == 0:
+            continue
+        sym = str(block.symbol)
+        n = len(block)
+        latest_blocks.append(block.take(np.array([n - 1])))
+
+        prev = last_asof.get(sym)
+        p_last = -1 if prev is None else int(np.searchsorted(block.asof, prev, side="right")) - 1
+
+        if p_last + 1 < n:
+            new = block.take(np.arange(p_last + 1, n))
+            days = np.array([str(a)[:10] for a in new.asof])
+            for day in np.unique(days):
+                new_by_day.setdefault(str(day), []).append(new.take(np.flatnonzero(days == day)))
+
+        if p_last >= 0:
+            for col, k in steps.items():
+                lo = max(0, p_last - k + 1)
+                vals = block.dynamic[col][lo: p_last + 1]
+                for i in (lo + np.flatnonzero(np.isfinite(vals))).tolist():
+                    asof = str(block.asof[i])
+                    updates.setdefault(asof[:10], {}).setdefault((sym, asof), {})[col] = float(block.dynamic[col][i])
+
+        last_asof[sym] = str(block.asof[-1])
+
+    new_rows = 0
+    backfilled = 0
+    for day in sorted(set(new_by_day) | set(updates)):
+        existing = _read_partition(pq, day, schema)
+        new_tbl = None
+
+        if day in new_by_day:
+            syms_b, names_b, asof_b, mat = _blocks_to_matrix(new_by_day[day], num_cols, col_index)
+            stats.update_from_array(mat[:, :n_feat], feature_cols)
+            feats_out, targets_out = _finalize_matrix(mat, n_feat)
+            new_tbl = pa.Table.from_batches([_arrow_batch(pa, schema, syms_b, names_b, asof_b, feats_out, targets_out)])
+            new_rows += new_tbl.num_rows
+            if existing is not None:
+                # same-day re-run: replace rows instead of duplicating them
+                new_keys = set(zip(syms_b, asof_b.tolist()))
+                old_keys = zip(existing.column("symbol").to_pylist(), existing.column("asof_date").to_pylist())
+                existing = existing.filter(pa.array([k not in new_keys for k in old_keys]))
+
+        if existing is not None and day in updates:
+            day_updates = updates[day]
+            keys = list(zip(existing.column("symbol").to_pylist(), existing.column("asof_date").to_pylist()))
+            rows = {k: i for i, k in enumerate(keys) if k in day_updates}
+            if rows:
+                by_col: Dict[str, List[Tuple[int, float]]] = {}
+                for key, i in rows.items():
+                    for col, v in day_updates[key].items():
+                        by_col.setdefault(col, []).append((i, v))
+                for col, pairs in by_col.items():
+                    j = existing.schema.get_field_index(col)
+                    arr = existing.column(col).to_numpy(zero_copy_only=False).astype(np.float32, copy=True)
+                    for i, v in pairs:
+                        arr[i] = v
+                    existing = existing.set_column(j, schema.field(col), pa.array(arr, from_pandas=True))
+                    backfilled += len(pairs)
+
+        parts = [t for t in (existing, new_tbl) if t is not None and t.num_rows > 0]
+        if parts:
+            _write_partition(pq, day, pa.concat_tables(parts) if len(parts) > 1 else parts[0])
+
+    latest_ids: List[Tuple[str, str]] = []
+    latest_vals: List[np.ndarray] = []
+    if latest_blocks:
+        _, _, asof_l, mat_l = _blocks_to_matrix(latest_blocks, num_cols, col_index)
+        latest_ids = [(str(b.symbol), str(a)) for b, a in zip(latest_blocks, asof_l)]
+        latest_vals = [mat_l[i, :n_feat].copy() for i in range(mat_l.shape[0])]
+
+    return {
+        "new_rows": int(new_rows),
+        "backfilled_targets": int(backfilled),
+        "partitions_touched": int(len(set(new_by_day) | set(updates))),
+        "pruned_symbols": int(len(dropped)),
+        "pruned_rows": int(pruned),
+        "last_asof": last_asof,
+        "latest_ids": latest_ids,
+        "latest_vals": latest_vals,
+    }
+
+
 # ===============================================================
 # PUBLIC — Build Dataset (streaming)
 # ===============================================================
 ReturnMode = Literal["auto", "full", "sample", "none"]
 
 
+def _columnar_enabled() -> bool:
+    """ML_BUILDER_COLUMNAR=1 (default): columnar blocks → Arrow record batches; 0 = legacy dict rows."""
+    return str(os.getenv("ML_BUILDER_COLUMNAR", "1")).strip().lower() in ("1", "true", "yes", "y", "on")
+
+
 def _wipe_old_outputs():
-    for p in (RAW_DATASET_FILE, DATASET_FILE, LATEST_FEATURES_FILE, LATEST_FEATURES_CSV):
+    for p in (RAW_DATASET_FILE, DATASET_FILE, LATEST_FEATURES_FILE, LATEST_FEATURES_CSV, _latest_row_index_file()):
         _safe_unlink(p)
     try:
         if CSV_CHUNKS_DIR.exists():
@@ -880,9 +1601,10 @@ def build_ml_dataset(
     corr_sample_rows: int = 50_000,
     rewrite_final: bool = True,
     return_dataframe: ReturnMode = "auto",
+    incremental: Optional[bool] = None,
 ) -> pd.DataFrame:
     log("=======================================================")
-    log(f"[ml_data_builder] 🚀 Starting ML dataset build… v2.7.0 (mp={use_multiprocessing}, debug={debug}, chunk_symbols={chunk_symbols})")
+    log(f"[ml_data_builder] 🚀 Starting ML dataset build… v2.9.0 (mp={use_multiprocessing}, debug={debug}, chunk_symbols={chunk_symbols})")
 
     pa, pq, ds = _try_import_pyarrow()
     have_pyarrow = pa is not None and pq is not None and ds is not None
@@ -930,10 +1652,50 @@ def build_ml_dataset(
     id_cols, feature_cols_all, target_cols = _full_column_plan(rolling, macro, brain, news_intel, all_sectors)
     all_cols = id_cols + feature_cols_all + target_cols
 
-    _wipe_old_outputs()
+    # ---------------------------
+    # Incremental mode: "append" to the partitioned RAW, or "full" rebuild that seeds it
+    # ---------------------------
+    if incremental is None:
+        incremental = _incremental_enabled()
+    inc_mode = "off"
+    inc_state: Dict[str, Any] = {}
+    plan_sig = _plan_signature(id_cols, feature_cols_all, target_cols)
+    if incremental:
+        reason = ""
+        if not have_pyarrow:
+            reason = "pyarrow missing"
+        elif not _columnar_enabled():
+            reason = "ML_BUILDER_COLUMNAR=0"
+        elif strict:
+            reason = "strict build"
+        elif max_symbols:
+            reason = "symbol cap"
+        if reason:
+            log(f"[ml_data_builder] ℹ️ Incremental build disabled ({reason}) — full rebuild.")
+        else:
+            inc_state = _load_incremental_state()
+            if not inc_state or not RAW_PARTS_DIR.exists():
+                inc_mode = "full"
+                log("[ml_data_builder] 🧩 Incremental: no previous partitioned dataset — full rebuild.")
+            elif inc_state.get("signature") != plan_sig:
+                inc_mode = "full"
+                log("[ml_data_builder] 🧩 Incremental: column plan changed — full rebuild.")
+            elif _full_rebuild_due(inc_state, datetime.now(TIMEZONE)):
+                inc_mode = "full"
+                log(f"[ml_data_builder] 🧩 Incremental: last full rebuild older than {_full_rebuild_days()}d — full rebuild.")
+            else:
+                inc_mode = "append"
+                log(f"[ml_data_builder] 🧩 Incremental: appending to {RAW_PARTS_DIR} (rows so far={inc_state.get('n_rows', 0)})")
+    if inc_mode == "off":
+        # a plain full build invalidates any partitioned dataset from earlier runs
+        _safe_unlink(INCREMENTAL_STATE_FILE)
+
+    if inc_mode != "append":
+        _wipe_old_outputs()
 
     stats = _RunningStats()
     total_rows_written = 0
+    inc_result: Dict[str, Any] = {}
 
     sample_frames: List[pd.DataFrame] = []
     sample_rows_count = 0
@@ -1009,11 +1771,115 @@ def build_ml_dataset(
 
         total_rows_written += int(len(df_out))
 
+    # Columnar path: static per-symbol block broadcast into a float matrix,
+    # written as one Arrow record batch per chunk of symbols.
+    num_cols = feature_cols_all + target_cols
+    col_index = {c: j for j, c in enumerate(num_cols)}
+    n_feat = len(feature_cols_all)
+    arrow_schema = None
+    if have_pyarrow:
+        arrow_schema = pa.schema(
+            [(c, pa.string()) for c in id_cols] + [(c, pa.float32()) for c in num_cols]
+        )
+
+    latest_ids: List[Tuple[str, str]] = []
+    latest_vals: List[np.ndarray] = []
+
+    def _write_blocks(blocks: List[_SymbolBlock]) -> None:
+        nonlocal parquet_writer, total_rows_written, csv_chunk_idx
+
+        blocks = [b for b in blocks if b is not None and len(b) > 0]
+        if not blocks:
+            return
+
+        symbols_b, names_b, asof_b, mat = _blocks_to_matrix(blocks, num_cols, col_index)
+        feats_m = mat[:, :n_feat]
+
+        # stats / sample / latest BEFORE filling NaNs (same as _normalize_batch)
+        stats.update_from_array(feats_m, feature_cols_all)
+        if corr_sample_rows > 0 and sample_rows_count < corr_sample_rows:
+            take = min(corr_sample_rows - sample_rows_count, mat.shape[0])
+            df_s = pd.DataFrame(mat[:take], columns=num_cols)
+            df_s.insert(0, "symbol", symbols_b[:take])
+            df_s.insert(1, "name", names_b[:take])
+            df_s.insert(2, "asof_date", asof_b[:take])
+            _append_sample(df_s)
+
+        end = 0
+        for b in blocks:
+            end += len(b)
+            latest_ids.append((str(b.symbol), str(b.asof[-1])))
+            latest_vals.append(feats_m[end - 1].copy())
+
+        feats_out, targets_out = _finalize_matrix(mat, n_feat)
+
+        if have_pyarrow:
+            batch = _arrow_batch(pa, arrow_schema, symbols_b, names_b, asof_b, feats_out, targets_out)
+            if parquet_writer is None:
+                parquet_writer = pq.ParquetWriter(str(raw_tmp), arrow_schema, compression="snappy")
+            parquet_writer.write_batch(batch)
+        else:
+            df_out = pd.DataFrame(feats_out, columns=feature_cols_all)
+            df_out[target_cols] = targets_out
+            df_out.insert(0, "symbol", symbols_b)
+            df_out.insert(1, "name", names_b)
+            df_out.insert(2, "asof_date", asof_b)
+            chunk_path = CSV_CHUNKS_DIR / f"chunk_{csv_chunk_idx:05d}.csv"
+            df_out[all_cols].to_csv(chunk_path, index=False)
+            csv_chunk_idx += 1
+
+        total_rows_written += int(mat.shape[0])
+
+    columnar = _columnar_enabled()
+    chunk_n = max(1, int(chunk_symbols))
+
     # ---------------------------
     # Build rows
     # ---------------------------
     try:
-        if not use_multiprocessing:
+        if inc_mode == "append":
+            stats.load_dict(inc_state.get("stats") or {})
+            try:
+                if corr_sample_rows > 0 and CORR_SAMPLE_FILE.exists():
+                    _append_sample(pd.read_parquet(CORR_SAMPLE_FILE))
+            except Exception as e:
+                log(f"[ml_data_builder] ⚠️ Failed loading correlation sample: {e}")
+
+            inc_result = _incremental_append(
+                _iter_blocks(symbols, rolling, macro, brain, news_intel, all_sectors, use_multiprocessing=use_multiprocessing, debug=debug),
+                inc_state,
+                pa=pa,
+                pq=pq,
+                schema=arrow_schema,
+                num_cols=num_cols,
+                feature_cols=feature_cols_all,
+                stats=stats,
+                universe=symbols,
+            )
+            latest_ids.extend(inc_result["latest_ids"])
+            latest_vals.extend(inc_result["latest_vals"])
+            total_rows_written = _partition_rows(pq)
+            log(
+                f"[ml_data_builder] 🧩 Incremental: +{inc_result['new_rows']} rows, "
+                f"{inc_result['backfilled_targets']} targets backfilled, "
+                f"{inc_result['partitions_touched']} partitions rewritten, "
+                f"{inc_result['pruned_symbols']} dropped symbols pruned ({inc_result['pruned_rows']} rows)"
+            )
+
+        elif columnar:
+            log(f"[ml_data_builder] 🧱 Columnar row builder (Arrow record batches, chunk_symbols={chunk_n})")
+            buf_blocks: List[_SymbolBlock] = []
+
+            for block in _iter_blocks(symbols, rolling, macro, brain, news_intel, all_sectors, use_multiprocessing=use_multiprocessing, debug=debug):
+                if block is not None:
+                    buf_blocks.append(block)
+                if len(buf_blocks) >= chunk_n:
+                    _write_blocks(buf_blocks)
+                    buf_blocks = []
+
+            _write_blocks(buf_blocks)
+
+        elif not use_multiprocessing:
             log("[ml_data_builder] 🪫 Multiprocessing disabled — running single-process mode.")
             buf_rows: List[Dict[str, Any]] = []
             buf_syms = 0
@@ -1081,7 +1947,10 @@ def build_ml_dataset(
         return pd.DataFrame()
 
     # publish RAW atomically (pyarrow)
-    if have_pyarrow:
+    raw_source: Path = RAW_DATASET_FILE
+    if inc_mode == "append":
+        raw_source = RAW_PARTS_DIR
+    elif have_pyarrow:
         try:
             # preflight tmp raw before publish
             _parquet_preflight_or_raise(raw_tmp, columns=["symbol"])
@@ -1099,6 +1968,17 @@ def build_ml_dataset(
     else:
         log(f"[ml_data_builder] ✅ CSV chunks written: rows={total_rows_written} → {CSV_CHUNKS_DIR}")
 
+    if inc_mode == "full":
+        try:
+            _raw_to_partitions(pa, ds, RAW_DATASET_FILE)
+            _safe_unlink(RAW_DATASET_FILE)
+            raw_source = RAW_PARTS_DIR
+            log(f"[ml_data_builder] 🧩 RAW split into date partitions → {RAW_PARTS_DIR}")
+        except Exception as e:
+            log(f"[ml_data_builder] ⚠️ Partitioning RAW failed; incremental state not saved: {e}")
+            inc_mode = "off"
+            _safe_unlink(INCREMENTAL_STATE_FILE)
+
     # ---------------------------
     # Feature filtering
     # ---------------------------
@@ -1158,25 +2038,38 @@ def build_ml_dataset(
     # Final dataset artifact (atomic)
     # ---------------------------
     if have_pyarrow:
-        if rewrite_final:
+        if rewrite_final or raw_source != RAW_DATASET_FILE:
             log(f"[ml_data_builder] 🔁 Rewriting FINAL parquet with {len(feats)} features… (atomic)")
             final_tmp = DATASET_FILE.with_suffix(".tmp.parquet")
             _safe_unlink(final_tmp)
             try:
-                dataset = ds.dataset(str(RAW_DATASET_FILE), format="parquet")
+                if raw_source.is_dir():
+                    dataset = ds.dataset(str(raw_source), format="parquet", partitioning="hive")
+                else:
+                    dataset = ds.dataset(str(raw_source), format="parquet")
                 scanner = dataset.scanner(columns=final_cols, batch_size=64_000)
                 final_writer = None
                 final_rows = 0
 
+                # partitions yield one small batch per file: coalesce into ~64k-row groups
+                pending: List[Any] = []
+                pending_rows = 0
                 for batch in scanner.to_batches():
                     if batch.num_rows == 0:
                         continue
                     if final_writer is None:
                         final_writer = pq.ParquetWriter(str(final_tmp), batch.schema, compression="snappy")
-                    final_writer.write_table(pa.Table.from_batches([batch]))
-                    final_rows += batch.num_rows
+                    pending.append(batch)
+                    pending_rows += batch.num_rows
+                    if pending_rows >= 64_000:
+                        final_writer.write_table(pa.Table.from_batches(pending))
+                        final_rows += pending_rows
+                        pending, pending_rows = [], 0
 
                 if final_writer is not None:
+                    if pending:
+                        final_writer.write_table(pa.Table.from_batches(pending))
+                        final_rows += pending_rows
                     final_writer.close()
 
                 # validate tmp parquet before publish
@@ -1221,6 +2114,19 @@ def build_ml_dataset(
     else:
         log("[ml_data_builder] ⚠️ pyarrow missing: parquet final not created. CSV chunks are your dataset artifact for now.")
 
+    # ---------------------------
+    # Latest-row index (prediction fallback reads only these rows)
+    # ---------------------------
+    latest_index_symbols = 0
+    latest_index_file = _latest_row_index_file()
+    if have_pyarrow and latest_row_index_enabled() and DATASET_FILE.exists():
+        try:
+            latest_index_symbols = _build_latest_row_index(DATASET_FILE, latest_index_file)
+            log(f"[ml_data_builder] 🗂️ Latest-row index written → {latest_index_file} (symbols={latest_index_symbols})")
+        except Exception as e:
+            log(f"[ml_data_builder] ⚠️ Failed writing latest-row index: {e}")
+            _safe_unlink(latest_index_file)
+
     # ---------------------------
     # Latest-features artifact (no 'name' to avoid object-dtype spikes)
     # ---------------------------
@@ -1228,8 +2134,13 @@ def build_ml_dataset(
     latest_count = 0
     latest_format = "none"
     try:
-        if latest_rows:
-            df_latest = pd.DataFrame.from_records(latest_rows)
+        if latest_rows or latest_vals:
+            if latest_vals:
+                df_latest = pd.DataFrame(np.vstack(latest_vals), columns=feature_cols_all)
+                df_latest.insert(0, "symbol", [s for s, _ in latest_ids])
+                df_latest.insert(1, "asof_date", [d for _, d in latest_ids])
+            else:
+                df_latest = pd.DataFrame.from_records(latest_rows)
 
             # Snapshot columns: symbol, asof_date, feats (NO name)
             keep_cols = ["symbol", "asof_date"] + feats
@@ -1295,7 +2206,14 @@ def build_ml_dataset(
         "n_features": int(len(feats)),
         "n_targets": int(len(target_cols)),
         "final_file": str(DATASET_FILE),
-        "raw_file": str(RAW_DATASET_FILE),
+        "raw_file": str(raw_source),
+        "incremental": {
+            "mode": inc_mode,
+            "new_rows": int(inc_result.get("new_rows", total_rows_written if inc_mode == "full" else 0)),
+            "backfilled_targets": int(inc_result.get("backfilled_targets", 0)),
+            "partitions_touched": int(inc_result.get("partitions_touched", 0)),
+            "pruned_symbols": int(inc_result.get("pruned_symbols", 0)),
+        },
         "csv_chunks_dir": str(CSV_CHUNKS_DIR),
         "has_pyarrow": bool(have_pyarrow),
         "sector_dummy_count": int(len(_collect_sectors(rolling))),
@@ -1308,6 +2226,8 @@ def build_ml_dataset(
         "latest_features_written": bool(latest_written),
         "latest_features_symbols": int(latest_count),
         "latest_features_format": str(latest_format),
+        "latest_row_index_file": str(latest_index_file),
+        "latest_row_index_symbols": int(latest_index_symbols),
         "dtype_features": "float32",
         "dtype_targets": "float32",
         "horizon_steps": dict(HORIZON_STEPS),
@@ -1321,6 +2241,31 @@ def build_ml_dataset(
     except Exception as e:
         log(f"[ml_data_builder] ⚠️ Failed saving feature list: {e}")
 
+    if inc_mode in ("full", "append"):
+        try:
+            if inc_mode == "full":
+                _safe_unlink(CORR_SAMPLE_FILE)
+                if sample_frames:
+                    sample_tmp = CORR_SAMPLE_FILE.with_suffix(".tmp.parquet")
+                    pd.concat(sample_frames, axis=0, ignore_index=True).to_parquet(sample_tmp, index=False)
+                    _atomic_replace(sample_tmp, CORR_SAMPLE_FILE)
+                last_asof = {sym: day for sym, day in latest_ids}
+                full_built_at = datetime.now(TIMEZONE).isoformat()
+            else:
+                last_asof = inc_result.get("last_asof") or {}
+                full_built_at = inc_state.get("full_built_at")
+            _save_incremental_state({
+                "signature": plan_sig,
+                "generated_at": datetime.now(TIMEZONE).isoformat(),
+                "full_built_at": full_built_at,
+                "n_rows": int(total_rows_written),
+                "last_asof": last_asof,
+                "stats": stats.to_dict(),
+            })
+        except Exception as e:
+            log(f"[ml_data_builder] ⚠️ Failed saving incremental state (next run rebuilds): {e}")
+            _safe_unlink(INCREMENTAL_STATE_FILE)
+
     log("[ml_data_builder] ✅ Build complete (streaming)")
     log("=======================================================")
 
@@ -1383,6 +2328,7 @@ def build_daily_dataset(*args, **kwargs):
         corr_sample_rows=kwargs.get("corr_sample_rows", 50_000),
         rewrite_final=kwargs.get("rewrite_final", True),
         return_dataframe=return_mode,
+        incremental=kwargs.get("incremental"),
     )
 
     rows = 0
@@ -1413,6 +2359,7 @@ if __name__ == "__main__":
     parser.add_argument("--chunk-symbols", type=int, default=50, help="Symbols per write chunk (single-process)")
     parser.add_argument("--corr-sample-rows", type=int, default=50000, help="Max rows kept for correlation sample")
     parser.add_argument("--no-rewrite", action="store_true", help="Skip final rewrite; use raw as final")
+    parser.add_argument("--incremental", action="store_true", help="Append new as-of dates to the partitioned RAW dataset")
     parser.add_argument(
         "--return-df",
         type=str,
@@ -1439,4 +2386,5 @@ if __name__ == "__main__":
         corr_sample_rows=max(0, int(args.corr_sample_rows)),
         rewrite_final=not args.no_rewrite,
         return_dataframe=args.return_df,
+        incremental=True if args.incremental else None,
     )
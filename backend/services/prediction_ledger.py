@@ -0,0 +1,227 @@
+# backend/services/prediction_ledger.py
+"""
+Columnar Prediction Ledger — AION Analytics
+
+predictions_ledger.jsonl grows by one line per symbol × horizon every night,
+and the accuracy engine had to re-parse all of it on every pass. The same
+rows are now also written as typed parquet, one file per prediction run,
+partitioned by run date:
+
+    <root>/run_date=YYYY-MM-DD/part-<run_ts>.parquet
+
+A run file is written once (tmp + os.replace) and never modified, so the
+accuracy engine can remember which (run file, horizon) pairs it already
+scored and only read the runs that still have unsettled horizons.
+
+The JSONL ledger is still appended (it stays the durable, human-readable
+log); import_jsonl() back-fills runs missing from the columnar ledger,
+reading the JSONL only from the last imported byte offset.
+
+AION_COLUMNAR_LEDGER=0 disables the columnar ledger (JSONL only; the
+accuracy engine then re-scores the whole JSONL every pass).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+from backend.core.config import PATHS
+from backend.core.data_pipeline import log, safe_float
+
+LEDGER_DIR: Path = Path(
+    PATHS.get("prediction_ledger_dir") or (Path(PATHS["nightly_predictions"]) / "ledger")
+)
+
+PART_PREFIX = "part-"
+PART_SUFFIX = ".parquet"
+
+# Column order/types of every run file.
+LEDGER_FIELDS = (
+    ("run_ts", "string"),
+    ("run_date", "date32"),
+    ("symbol", "string"),
+    ("horizon", "string"),
+    ("entry_date", "date32"),
+    ("entry_close", "float64"),
+    ("predicted_return", "float64"),
+    ("ev", "float64"),
+    ("confidence", "float64"),
+    ("score", "float64"),
+    ("direction", "string"),
+    ("target_price", "float64"),
+    ("no_signal", "bool_"),
+    ("no_signal_threshold", "float64"),
+)
+
+
+def columnar_ledger_enabled() -> bool:
+    if pa is None or pq is None:
+        return False
+    return os.getenv("AION_COLUMNAR_LEDGER", "1").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def ledger_schema() -> "pa.Schema":
+    return pa.schema([(name, getattr(pa, typ)()) for name, typ in LEDGER_FIELDS])
+
+
+def _parse_date(v: Any) -> Optional[date]:
+    if not v:
+        return None
+    try:
+        return datetime.strptime(str(v)[:10], "%Y-%m-%d").date()
+    except Exception:
+        return None
+
+
+def _opt_float(v: Any) -> Optional[float]:
+    if v is None or v == "":
+        return None
+    try:
+        f = float(v)
+    except Exception:
+        return None
+    return f if f == f else None
+
+
+def _run_file_name(run_ts: str) -> str:
+    """part-<run_ts>.parquet with filesystem-unsafe characters replaced."""
+    return PART_PREFIX + re.sub(r"[^0-9A-Za-z_.-]", "_", str(run_ts)) + PART_SUFFIX
+
+
+def run_file_path(run_ts: str, root: Optional[Path] = None) -> Path:
+    run_day = _parse_date(run_ts)
+    day = run_day.isoformat() if run_day else "unknown"
+    return Path(root or LEDGER_DIR) / f"run_date={day}" / _run_file_name(run_ts)
+
+
+def _rows_to_table(rows: Sequence[Dict[str, Any]]) -> "pa.Table":
+    cols: Dict[str, List[Any]] = {name: [] for name, _ in LEDGER_FIELDS}
+    for r in rows:
+        cols["run_ts"].append(str(r.get("run_ts") or ""))
+        cols["run_date"].append(_parse_date(r.get("run_ts")))
+        cols["symbol"].append(str(r.get("symbol") or "").upper())
+        cols["horizon"].append(str(r.get("horizon") or ""))
+        cols["entry_date"].append(_parse_date(r.get("entry_date")))
+        cols["entry_close"].append(safe_float(r.get("entry_close", 0.0)))
+        cols["predicted_return"].append(safe_float(r.get("predicted_return", 0.0)))
+        cols["ev"].append(safe_float(r.get("ev", 0.0)))
+        cols["confidence"].append(safe_float(r.get("confidence", 0.0)))
+        cols["score"].append(_opt_float(r.get("score")))
+        d = r.get("direction")
+        cols["direction"].append(None if d is None else str(d))
+        cols["target_price"].append(_opt_float(r.get("target_price")))
+        cols["no_signal"].append(bool(r.get("no_signal", False)))
+        cols["no_signal_threshold"].append(safe_float(r.get("no_signal_threshold", 0.0)))
+    return pa.Table.from_pydict(cols, schema=ledger_schema())
+
+
+def write_run(rows: Sequence[Dict[str, Any]], root: Optional[Path] = None) -> Optional[Path]:
+    """
+    Write one prediction run (ledger row dicts sharing a run_ts) as its own
+    run file. An existing file for the same run_ts is replaced.
+    """
+    if not rows:
+        return None
+    path = run_file_path(str(rows[0].get("run_ts") or ""), root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        pq.write_table(_rows_to_table(rows), tmp, compression="zstd")
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            try:
+                tmp.unlink()
+            except Exception:
+                pass
+    return path
+
+
+def list_run_files(root: Optional[Path] = None) -> List[Path]:
+    """All run files, oldest run date first."""
+    base = Path(root or LEDGER_DIR)
+    if not base.is_dir():
+        return []
+    return sorted(base.glob(f"run_date=*/{PART_PREFIX}*{PART_SUFFIX}"))
+
+
+def run_key(path: Path, root: Optional[Path] = None) -> str:
+    """Stable id of a run file ("run_date=YYYY-MM-DD/part-....parquet")."""
+    return Path(path).relative_to(Path(root or LEDGER_DIR)).as_posix()
+
+
+def run_date_of(key: str) -> Optional[date]:
+    m = re.match(r"run_date=(\d{4}-\d{2}-\d{2})/", str(key))
+    return _parse_date(m.group(1)) if m else None
+
+
+def read_run(
+    path: Path,
+    columns: Optional[Iterable[str]] = None,
+    horizons: Optional[Iterable[str]] = None,
+) -> "pa.Table":
+    """Read one run file, optionally only some columns / horizons."""
+    filters = None
+    if horizons is not None:
+        filters = [("horizon", "in", sorted(set(horizons)))]
+    return pq.read_table(
+        path,
+        columns=list(columns) if columns is not None else None,
+        filters=filters,
+        partitioning=None,
+    )
+
+
+def import_jsonl(jsonl_path: Path, root: Optional[Path] = None, start_offset: int = 0) -> Tuple[int, int]:
+    """
+    Back-fill the columnar ledger from the JSONL ledger, starting at byte
+    `start_offset` (one run file per run_ts). Runs that already have a run
+    file are left alone. Returns (rows written, offset after the last
+    complete line) so callers can resume from there next time.
+    """
+    jsonl_path = Path(jsonl_path)
+    if not jsonl_path.exists():
+        return 0, 0
+    offset = int(start_offset or 0)
+    if offset > jsonl_path.stat().st_size:
+        offset = 0  # ledger was truncated/rotated
+
+    runs: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    with jsonl_path.open("rb") as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # partial line still being appended
+            offset += len(raw)
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(obj, dict):
+                runs.setdefault(str(obj.get("run_ts") or ""), []).append(obj)
+
+    written = 0
+    for run_ts, rows in runs.items():
+        if run_file_path(run_ts, root).exists():
+            continue
+        write_run(rows, root)
+        written += len(rows)
+    if written:
+        log(f"[prediction_ledger] 📥 Imported {written} JSONL ledger rows → {Path(root or LEDGER_DIR)}")
+    return written, offset
@@ -55,6 +55,7 @@ from backend.core.data_pipeline import (
 from backend.core.ai_model.core_training import predict_all
 from backend.core.ai_model.target_builder import HORIZONS
 from backend.core.policy_engine import apply_policy
+from backend.services import prediction_ledger
 
 # ---------------------------------------------------------------------
 # Paths
@@ -583,8 +584,9 @@ def _append_ledger(
     Step 3: do NOT append invalid horizons to ledger.
     This prevents polluted calibration / accuracy metrics.
     Includes retry logic for transient file system failures.
+    The same rows also go to the columnar ledger (one run file per run_ts).
     """
-    lines: List[str] = []
+    rows: List[Dict[str, Any]] = []
 
     for sym, block in symbols_payload.items():
         if not isinstance(block, dict):
@@ -624,10 +626,11 @@ def _append_ledger(
                 "no_signal": bool(t.get("no_signal", False)),
                 "no_signal_threshold": float(t.get("no_signal_threshold", 0.0) or 0.0),
             }
-            lines.append(json.dumps(line_obj))
+            rows.append(line_obj)
 
-    if not lines:
+    if not rows:
         return 0
+    lines = [json.dumps(r) for r in rows]
 
     # Check disk space before writing
     if not check_disk_space(LEDGER_PATH):
@@ -647,6 +650,7 @@ def _append_ledger(
             
             if attempt > 1:
                 log(f"[prediction_logger] ✓ Ledger write succeeded on attempt {attempt}/{max_attempts}")
+            _write_columnar_ledger(rows)
             return len(lines)
             
         except Exception as e:
@@ -665,6 +669,17 @@ def _append_ledger(
     return 0
 
 
+def _write_columnar_ledger(rows: List[Dict[str, Any]]) -> None:
+    """Best-effort: the JSONL ledger is the durable copy (import_jsonl back-fills)."""
+    if not prediction_ledger.columnar_ledger_enabled():
+        return
+    try:
+        path = prediction_ledger.write_run(rows)
+        log(f"[prediction_logger] 🧱 Columnar ledger run → {path}")
+    except Exception as e:
+        log(f"[prediction_logger] ⚠️ Columnar ledger write failed (JSONL ledger kept): {e}")
+
+
 # ---------------------------------------------------------------------
 # MAIN ENTRY
 # ---------------------------------------------------------------------
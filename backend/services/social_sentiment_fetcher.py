@@ -18,6 +18,7 @@ import requests
 from backend.core.config import PATHS, TIMEZONE
 from backend.core.data_pipeline import (
     _read_rolling,
+    rolling_update_lock,
     save_rolling,
     safe_float,
     log,
@@ -417,52 +418,54 @@ def build_social_sentiment() -> Dict[str, Any]:
             sym_u = sym.upper()
             clusters.setdefault(sym_u, []).append(p)
 
-    rolling = _read_rolling()
-    if not rolling:
-        log("[social] ⚠️ No rolling.json.gz — cannot store symbol intel.")
-        return {"status": "no_rolling"}
+    # Merge under the update lock (other nightly fetchers may be saving rolling)
+    with rolling_update_lock():
+        rolling = _read_rolling()
+        if not rolling:
+            log("[social] ⚠️ No rolling.json.gz — cannot store symbol intel.")
+            return {"status": "no_rolling"}
 
-    updated = 0
+        updated = 0
 
-    for sym, node in rolling.items():
-        if sym.startswith("_"):
-            continue
+        for sym, node in rolling.items():
+            if sym.startswith("_"):
+                continue
+
+            sym_u = sym.upper()
+            plist = clusters.get(sym_u) or []
+
+            if not plist:
+                node["social"] = {
+                    "sentiment": 0.0,
+                    "buzz": 0,
+                    "novelty": 0.0,
+                    "heat_score": 0.0,
+                    "last_updated": datetime.now(TIMEZONE).isoformat(),
+                }
+                rolling[sym] = node
+                updated += 1
+                continue
+
+            sentiments = [p["sentiment"] for p in plist]
+            buzzes = [safe_float(p.get("buzz", 1)) for p in plist]
+            novs = [novelty(p.get("timestamp")) for p in plist]
 
-        sym_u = sym.upper()
-        plist = clusters.get(sym_u) or []
+            avg_sent = statistics.mean(sentiments) if sentiments else 0.0
+            total_buzz = sum(buzzes)
+            avg_nov = statistics.mean(novs) if novs else 0.0
+            heat = avg_sent * math.log1p(total_buzz) * (1 + avg_nov)
 
-        if not plist:
             node["social"] = {
-                "sentiment": 0.0,
-                "buzz": 0,
-                "novelty": 0.0,
-                "heat_score": 0.0,
+                "sentiment": float(avg_sent),
+                "buzz": int(total_buzz),
+                "novelty": float(avg_nov),
+                "heat_score": float(round(heat, 4)),
                 "last_updated": datetime.now(TIMEZONE).isoformat(),
             }
             rolling[sym] = node
             updated += 1
-            continue
-
-        sentiments = [p["sentiment"] for p in plist]
-        buzzes = [safe_float(p.get("buzz", 1)) for p in plist]
-        novs = [novelty(p.get("timestamp")) for p in plist]
-
-        avg_sent = statistics.mean(sentiments) if sentiments else 0.0
-        total_buzz = sum(buzzes)
-        avg_nov = statistics.mean(novs) if novs else 0.0
-        heat = avg_sent * math.log1p(total_buzz) * (1 + avg_nov)
-
-        node["social"] = {
-            "sentiment": float(avg_sent),
-            "buzz": int(total_buzz),
-            "novelty": float(avg_nov),
-            "heat_score": float(round(heat, 4)),
-            "last_updated": datetime.now(TIMEZONE).isoformat(),
-        }
-        rolling[sym] = node
-        updated += 1
 
-    save_rolling(rolling)
+        save_rolling(rolling)
     log(f"[social] Updated social sentiment for {updated} symbols.")
 
     # =====================================================================
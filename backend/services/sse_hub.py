@@ -0,0 +1,243 @@
+# backend/services/sse_hub.py
+"""
+SSE Broadcast Hub — AION Analytics
+
+Every /api/events client used to run its own polling generator, so N open
+dashboards recomputed the bots bundle N times every 5 s. The hub runs one
+producer task per topic instead:
+
+    • each tick the topic payload is computed once and serialized once;
+    • if the serialized payload is unchanged, nothing is sent;
+    • otherwise the message is fanned out to every subscriber through a
+      per-client bounded queue. A slow client whose queue is full loses its
+      older messages, keeps only the newest one and is resynced with a full
+      snapshot.
+
+Subscribers get the full JSON payload by default (what useSSE expects).
+Delta subscribers get one full snapshot, then `event: delta` messages with
+{"set": {top-level key: value}, "unset": [key, ...]}.
+
+A topic's producer starts with its first subscriber and stops when the
+last one leaves. stats() reports subscriber counts and compute times.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from utils.logger import log
+
+KEEPALIVE_SECS = 15.0
+DEFAULT_QUEUE_SIZE = 8
+
+
+def _json(payload: Any) -> str:
+    return json.dumps(payload, default=str)
+
+
+def _delta(prev: Any, cur: Any) -> Optional[Dict[str, Any]]:
+    """Top-level key delta between two dict payloads (None if not both dicts)."""
+    if not isinstance(prev, dict) or not isinstance(cur, dict):
+        return None
+    changed = {k: v for k, v in cur.items() if k not in prev or _json(prev[k]) != _json(v)}
+    removed = [k for k in prev if k not in cur]
+    return {"set": changed, "unset": removed}
+
+
+@dataclass
+class HubMessage:
+    seq: int
+    full: str                   # serialized payload
+    delta: Optional[str] = None  # serialized delta vs. seq - 1 (None: send full)
+
+
+class Subscription:
+    """One connected client: a bounded queue of HubMessages."""
+
+    def __init__(self, topic: "Topic", *, delta: bool = False, maxsize: int = DEFAULT_QUEUE_SIZE):
+        self.topic = topic
+        self.delta = bool(delta)
+        self.queue: "asyncio.Queue[HubMessage]" = asyncio.Queue(maxsize=max(1, int(maxsize)))
+        self.needs_full = True
+        self.last_seq = 0
+        self.dropped = 0
+
+    def offer(self, msg: HubMessage) -> None:
+        try:
+            self.queue.put_nowait(msg)
+            return
+        except asyncio.QueueFull:
+            pass
+        while True:
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                break
+        self.needs_full = True
+        self.queue.put_nowait(msg)
+        self.topic.dropped += 1
+
+    def render(self, msg: HubMessage) -> str:
+        """SSE frame for msg (full snapshot or delta event)."""
+        gap = msg.seq != self.last_seq + 1
+        self.last_seq = msg.seq
+        if self.delta and msg.delta is not None and not self.needs_full and not gap:
+            return f"event: delta\ndata: {msg.delta}\n\n"
+        self.needs_full = False
+        return f"data: {msg.full}\n\n"
+
+    async def next_frame(self, timeout: float = KEEPALIVE_SECS) -> str:
+        """Next SSE frame, or a keep-alive comment after `timeout` seconds."""
+        try:
+            msg = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return ": keepalive\n\n"
+        return self.render(msg)
+
+
+@dataclass
+class Topic:
+    name: str
+    fetch: Callable[[], Any]
+    interval: float
+    subscribers: Set[Subscription] = field(default_factory=set)
+    task: Optional["asyncio.Task[None]"] = None
+    seq: int = 0
+    last_text: Optional[str] = None
+    ticks: int = 0
+    broadcasts: int = 0
+    errors: int = 0
+    dropped: int = 0
+    compute_last: float = 0.0
+    compute_total: float = 0.0
+    compute_max: float = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "running": self.task is not None and not self.task.done(),
+            "interval_secs": self.interval,
+            "ticks": self.ticks,
+            "broadcasts": self.broadcasts,
+            "unchanged_ticks": self.ticks - self.broadcasts,
+            "errors": self.errors,
+            "dropped_messages": self.dropped,
+            "compute_last_ms": round(self.compute_last * 1000.0, 3),
+            "compute_avg_ms": round(self.compute_total / self.ticks * 1000.0, 3) if self.ticks else 0.0,
+            "compute_max_ms": round(self.compute_max * 1000.0, 3),
+            "payload_bytes": len(self.last_text) if self.last_text is not None else 0,
+        }
+
+
+class BroadcastHub:
+    """Topic registry + per-topic producer tasks (one event loop)."""
+
+    def __init__(self) -> None:
+        self._topics: Dict[str, Topic] = {}
+
+    def register(self, name: str, fetch: Callable[[], Any], interval: float) -> Topic:
+        """Register (or re-point) a topic; fetch may be sync or async."""
+        t = self._topics.get(name)
+        if t is None:
+            t = Topic(name=name, fetch=fetch, interval=float(interval))
+            self._topics[name] = t
+        else:
+            t.fetch, t.interval = fetch, float(interval)
+        return t
+
+    def topics(self) -> List[str]:
+        return list(self._topics)
+
+    def subscribe(self, name: str, *, delta: bool = False, maxsize: int = DEFAULT_QUEUE_SIZE) -> Subscription:
+        topic = self._topics[name]
+        sub = Subscription(topic, delta=delta, maxsize=maxsize)
+        topic.subscribers.add(sub)
+        if topic.last_text is not None:
+            # Late joiner: start from the current snapshot instead of waiting a tick.
+            sub.last_seq = topic.seq - 1
+            sub.offer(HubMessage(seq=topic.seq, full=topic.last_text))
+        if topic.task is None or topic.task.done():
+            topic.task = asyncio.get_running_loop().create_task(self._run(topic), name=f"sse:{name}")
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        sub.topic.subscribers.discard(sub)
+
+    async def _compute(self, topic: Topic) -> Any:
+        try:
+            if asyncio.iscoroutinefunction(topic.fetch):
+                return await topic.fetch()
+            res = await asyncio.to_thread(topic.fetch)
+            if inspect.isawaitable(res):
+                res = await res
+            return res
+        except Exception as e:
+            topic.errors += 1
+            return {"error": str(e), "error_type": type(e).__name__}
+
+    async def tick(self, topic: Topic) -> bool:
+        """Compute the topic once; broadcast if it changed. Returns True if broadcast."""
+        t0 = time.perf_counter()
+        payload = await self._compute(topic)
+        text = _json(payload)
+        dt = time.perf_counter() - t0
+        topic.ticks += 1
+        topic.compute_last = dt
+        topic.compute_total += dt
+        topic.compute_max = max(topic.compute_max, dt)
+
+        if text == topic.last_text:
+            return False
+        delta = None
+        if topic.last_text is not None and any(s.delta for s in topic.subscribers):
+            # Diff against the previously *sent* text: fetchers may hand back
+            # a cached dict that has been mutated in place since.
+            delta = _delta(json.loads(topic.last_text), payload)
+        topic.seq += 1
+        topic.last_text = text
+        msg = HubMessage(seq=topic.seq, full=text, delta=_json(delta) if delta is not None else None)
+        for sub in list(topic.subscribers):
+            sub.offer(msg)
+        topic.broadcasts += 1
+        return True
+
+    async def _run(self, topic: Topic) -> None:
+        log(f"[sse_hub] ▶️ Topic '{topic.name}' started")
+        try:
+            while topic.subscribers:
+                await self.tick(topic)
+                await asyncio.sleep(topic.interval)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            log(f"[sse_hub] ❌ Topic '{topic.name}' producer failed: {e}")
+        finally:
+            # Nobody is listening: a later subscriber must not be handed a stale snapshot.
+            topic.last_text = None
+            log(f"[sse_hub] ⏹️ Topic '{topic.name}' stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        topics = {name: t.stats() for name, t in self._topics.items()}
+        return {
+            "subscribers": sum(s["subscribers"] for s in topics.values()),
+            "topics": topics,
+        }
+
+
+_HUB: Optional[BroadcastHub] = None
+_HUB_LOCK = threading.Lock()
+
+
+def get_broadcast_hub() -> BroadcastHub:
+    global _HUB
+    with _HUB_LOCK:
+        if _HUB is None:
+            _HUB = BroadcastHub()
+        return _HUB
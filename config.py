@@ -71,6 +71,10 @@ STOCK_CACHE_MASTER = STOCK_CACHE_ROOT / "master"
 
 ROLLING_BODY_PATH = BRAINS_ROOT / "rolling_body.json.gz"
 ROLLING_NERVOUS_PATH = BRAINS_ROOT / "rolling_nervous.json.gz"
+# Sharded rolling backend (manifest.json + shards/<SYM>.json.gz)
+ROLLING_SHARDS_DIR = BRAINS_ROOT / "rolling_shards"
+# Compact per-symbol summary (name/sector/price/predictions) written by save_rolling
+ROLLING_SUMMARY_PATH = BRAINS_ROOT / "rolling_summary.npz"
 # Backward-compat alias (old name)
 ROLLING_PATH = ROLLING_BODY_PATH
 ROLLING_BACKUPS = STOCK_CACHE_MASTER / "backups"
@@ -178,9 +182,13 @@ PATHS: Dict[str, Path] = {
     "universe_dt_file": UNIVERSE_ROOT / "dt_universe.json",
 
     "stock_cache": STOCK_CACHE_ROOT,
+    # On-disk HTTP response cache (backend.services.fetch_engine)
+    "http_cache": CACHE_ROOT / "http",
     "stock_cache_master": STOCK_CACHE_MASTER,
     "rolling_body": ROLLING_BODY_PATH,
     "rolling_nervous": ROLLING_NERVOUS_PATH,
+    "rolling_shards": ROLLING_SHARDS_DIR,
+    "rolling_summary": ROLLING_SUMMARY_PATH,
 
     "rolling": ROLLING_BODY_PATH,
     "rolling_backups": ROLLING_BACKUPS,
@@ -243,6 +251,8 @@ PATHS: Dict[str, Path] = {
     "scheduler_logs": LOGS_SCHEDULER,
     "intraday_logs": LOGS_INTRADAY,
     "nightly_predictions": NIGHTLY_PREDICTIONS_DIR,
+    # Columnar prediction ledger (run_date=YYYY-MM-DD/*.parquet)
+    "prediction_ledger_dir": NIGHTLY_PREDICTIONS_DIR / "ledger",
 
     "news_cache": NEWS_CACHE,
     "news_dashboard_json": NEWS_DASHBOARD_JSON,
@@ -357,6 +367,8 @@ DT_PATHS: Dict[str, Path] = {
 
     "bars_intraday_dir": ML_DATA_DT / "bars" / "intraday",
     "bars_daily_dir": ML_DATA_DT / "bars" / "daily",
+    # Append-only columnar OHLCV store (bar_store_dt)
+    "bars_columnar_dir": ML_DATA_DT / "bars" / "columnar",
 
     "rolling_intraday_dir": DA_BRAINS / "intraday",
     # DT engine rolling (context/features/predictions/policy/execution)
@@ -0,0 +1,377 @@
+"""dt_backend/core/bar_store_dt.py
+
+Append-only columnar OHLCV bar store for the intraday engine.
+
+Why
+---
+`rolling[sym]["bars_intraday"]` keeps bars as lists of {"ts","o","h",...}
+dicts inside the rolling JSON, so every consumer re-parses ISO timestamps
+and re-sorts every bar on every cycle. This store keeps the same bars as
+flat little-endian binary columns that can be memory-mapped straight into
+NumPy:
+
+    <root>/<timeframe>/<SYMBOL>/<YYYY-MM-DD>/
+        ts.i8            int64 epoch seconds (UTC)
+        o.f8 h.f8 l.f8 c.f8 v.f8 vw.f8   float64
+
+Partitions are per symbol per NY session date. Appends are monotonic:
+bars at or before the last stored timestamp are ignored (the live fetcher
+always re-requests a small overlap window).
+
+Crash safety
+------------
+Columns are appended value-columns first, ts last. Readers use the
+shortest column length, and the next append truncates any torn tail, so a
+crash mid-append never exposes a half-written bar. Appends hold an flock on
+<SYMBOL>/_append.lock, so concurrent writer processes never interleave
+their column writes.
+
+Configured by env:
+    DT_BAR_STORE      = "1" (default) enable appends/reads, "0" disables
+    DT_BAR_STORE_DIR  = override root (replay sandboxes)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from zoneinfo import ZoneInfo  # py3.9+
+except Exception:  # pragma: no cover
+    ZoneInfo = None  # type: ignore
+
+from .config_dt import DT_PATHS
+from .file_locking import AcquireLock
+from .logger_dt import log
+
+VALUE_COLUMNS: Tuple[str, ...] = ("o", "h", "l", "c", "v", "vw")
+_TS_FILE = "ts.i8"
+_TS_DTYPE = np.dtype("<i8")
+_VAL_DTYPE = np.dtype("<f8")
+
+
+def bar_store_enabled() -> bool:
+    return str(os.getenv("DT_BAR_STORE", "1")).strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def _store_root() -> Path:
+    override = os.getenv("DT_BAR_STORE_DIR", "").strip()
+    if override:
+        return Path(override)
+    return Path(
+        DT_PATHS.get("bars_columnar_dir")
+        or (Path(DT_PATHS.get("ml_data_dt") or "ml_data_dt") / "bars" / "columnar")
+    )
+
+
+def _ny_tz():
+    if ZoneInfo is not None:
+        return ZoneInfo("America/New_York")
+    return timezone.utc
+
+
+def _session_day(epoch_s: int) -> str:
+    return datetime.fromtimestamp(int(epoch_s), tz=_ny_tz()).date().isoformat()
+
+
+def parse_ts_epoch(value: Any) -> Optional[int]:
+    """ISO8601 / RFC3339 string (or epoch number) → int epoch seconds (UTC)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(value)
+    try:
+        txt = str(value).strip()
+        if txt.endswith("Z"):
+            txt = txt[:-1] + "+00:00"
+        dt = datetime.fromisoformat(txt)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+    except Exception:
+        return None
+
+
+def _f(x: Any, default: float) -> float:
+    try:
+        return float(x) if x is not None else default
+    except Exception:
+        return default
+
+
+@dataclass
+class BarArrays:
+    """Column views for one symbol/timeframe window (oldest → newest)."""
+
+    ts: np.ndarray
+    o: np.ndarray
+    h: np.ndarray
+    lo: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+    vw: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    def as_tuple(self) -> Tuple[np.ndarray, ...]:
+        """(o, h, l, c, v, vw, ts) — same order as feature_engineering._ohlcv_from_bars."""
+        return self.o, self.h, self.lo, self.c, self.v, self.vw, self.ts
+
+    def columns(self) -> Tuple[np.ndarray, ...]:
+        """(ts, o, h, l, c, v, vw) — field order, i.e. ("ts",) + VALUE_COLUMNS."""
+        return self.ts, self.o, self.h, self.lo, self.c, self.v, self.vw
+
+    @classmethod
+    def empty(cls) -> "BarArrays":
+        z = np.empty((0,), dtype=_VAL_DTYPE)
+        return cls(np.empty((0,), dtype=_TS_DTYPE), z, z, z, z, z, z)
+
+
+def bars_to_columns(bars: Iterable[Dict[str, Any]]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Rolling-format bar dicts → (ts, {col: values}), sorted and de-duplicated by ts.
+
+    Bars with a missing ts or non-numeric o/h/l/c are dropped, matching the
+    rules in feature_engineering._ohlcv_from_bars (v → 0.0, vw → NaN).
+    """
+    rows: Dict[int, Tuple[float, ...]] = {}
+    for b in bars or []:
+        if not isinstance(b, dict):
+            continue
+        t = parse_ts_epoch(b.get("ts") or b.get("t"))
+        if t is None:
+            continue
+        try:
+            o = float(b.get("o"))
+            h = float(b.get("h"))
+            lo = float(b.get("l"))
+            c = float(b.get("c"))
+        except Exception:
+            continue
+        v = _f(b.get("v") or 0.0, 0.0)
+        vw = _f(b.get("vw"), float("nan"))
+        rows[t] = (o, h, lo, c, v, vw)
+
+    if not rows:
+        return np.empty((0,), dtype=_TS_DTYPE), {k: np.empty((0,), dtype=_VAL_DTYPE) for k in VALUE_COLUMNS}
+
+    ts_sorted = sorted(rows)
+    mat = np.array([rows[t] for t in ts_sorted], dtype=_VAL_DTYPE)
+    cols = {k: np.ascontiguousarray(mat[:, i]) for i, k in enumerate(VALUE_COLUMNS)}
+    return np.asarray(ts_sorted, dtype=_TS_DTYPE), cols
+
+
+class ColumnarBarStore:
+    """Append-only, memory-mapped per-symbol/per-day bar columns."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.RLock()
+        # (sym, tf) -> last stored epoch second
+        self._last_ts: Dict[Tuple[str, str], Optional[int]] = {}
+
+    # ---------------------------------------------------------
+    # Layout helpers
+    # ---------------------------------------------------------
+
+    def _sym_dir(self, sym: str, tf: str) -> Path:
+        return self.root / str(tf) / str(sym).strip().upper()
+
+    def _day_dir(self, sym: str, tf: str, day: str) -> Path:
+        return self._sym_dir(sym, tf) / day
+
+    def days(self, sym: str, tf: str) -> List[str]:
+        d = self._sym_dir(sym, tf)
+        if not d.exists():
+            return []
+        return sorted(p.name for p in d.iterdir() if p.is_dir())
+
+    @staticmethod
+    def _col_len(path: Path, dtype: np.dtype) -> int:
+        try:
+            return int(path.stat().st_size // dtype.itemsize)
+        except FileNotFoundError:
+            return 0
+
+    def _day_len(self, day_dir: Path) -> int:
+        n = self._col_len(day_dir / _TS_FILE, _TS_DTYPE)
+        for k in VALUE_COLUMNS:
+            n = min(n, self._col_len(day_dir / f"{k}.f8", _VAL_DTYPE))
+        return n
+
+    def _repair_day(self, day_dir: Path) -> int:
+        """Truncate every column to the common length (drops torn tails)."""
+        n = self._day_len(day_dir)
+        for name, dtype in [(_TS_FILE, _TS_DTYPE)] + [(f"{k}.f8", _VAL_DTYPE) for k in VALUE_COLUMNS]:
+            p = day_dir / name
+            if self._col_len(p, dtype) > n:
+                with open(p, "r+b") as f:
+                    f.truncate(n * dtype.itemsize)
+        return n
+
+    # ---------------------------------------------------------
+    # Write path
+    # ---------------------------------------------------------
+
+    def last_ts(self, sym: str, tf: str) -> Optional[int]:
+        key = (str(sym).strip().upper(), str(tf))
+        with self._lock:
+            if key in self._last_ts:
+                return self._last_ts[key]
+            last: Optional[int] = None
+            for day in reversed(self.days(*key)):
+                day_dir = self._day_dir(key[0], key[1], day)
+                n = self._day_len(day_dir)
+                if n > 0:
+                    with open(day_dir / _TS_FILE, "rb") as f:
+                        f.seek((n - 1) * _TS_DTYPE.itemsize)
+                        last = int(np.frombuffer(f.read(_TS_DTYPE.itemsize), dtype=_TS_DTYPE)[0])
+                    break
+            self._last_ts[key] = last
+            return last
+
+    def append_columns(self, sym: str, tf: str, ts: np.ndarray, cols: Dict[str, np.ndarray]) -> int:
+        """Append sorted columns; rows at/before the last stored ts are skipped."""
+        sym_u = str(sym).strip().upper()
+        ts = np.asarray(ts, dtype=_TS_DTYPE)
+        if ts.size == 0:
+            return 0
+
+        lock_path = self._sym_dir(sym_u, tf) / "_append.lock"
+        with self._lock, AcquireLock(lock_path, timeout=5.0) as acquired:
+            if not acquired:
+                # The fetcher re-requests an overlap window, so the bars come back next cycle.
+                log(f"[bar_store] ⚠️ append lock busy for {sym_u}/{tf}; skipped {int(ts.size)} bars")
+                return 0
+            # Re-read from disk: another process may have appended since.
+            self._last_ts.pop((sym_u, str(tf)), None)
+            last = self.last_ts(sym_u, tf)
+            keep = ts > last if last is not None else np.ones(ts.shape, dtype=bool)
+            if not keep.any():
+                return 0
+            ts = ts[keep]
+            vals = {k: np.asarray(cols[k], dtype=_VAL_DTYPE)[keep] for k in VALUE_COLUMNS}
+
+            days = np.array([_session_day(t) for t in ts])
+            for day in sorted(set(days.tolist())):
+                m = days == day
+                day_dir = self._day_dir(sym_u, tf, day)
+                day_dir.mkdir(parents=True, exist_ok=True)
+                self._repair_day(day_dir)
+                for k in VALUE_COLUMNS:
+                    with open(day_dir / f"{k}.f8", "ab") as f:
+                        vals[k][m].tofile(f)
+                with open(day_dir / _TS_FILE, "ab") as f:
+                    ts[m].tofile(f)
+
+            self._last_ts[(sym_u, str(tf))] = int(ts[-1])
+            return int(ts.size)
+
+    def append_bars(self, sym: str, tf: str, bars: Iterable[Dict[str, Any]]) -> int:
+        """Append rolling-format bar dicts (as produced by intraday_bars_fetcher)."""
+        ts, cols = bars_to_columns(bars)
+        return self.append_columns(sym, tf, ts, cols)
+
+    # ---------------------------------------------------------
+    # Read path
+    # ---------------------------------------------------------
+
+    def read_day(self, sym: str, tf: str, day: str, *, start: int = 0, mmap: bool = False) -> BarArrays:
+        """Columns of one day partition, from row `start` to the end.
+
+        Partitions are small (<= ~400 rows), so a plain read is cheaper than
+        setting up seven memory maps; pass mmap=True for read-only views.
+        """
+        day_dir = self._day_dir(sym, tf, day)
+        start = max(0, int(start))
+        n = self._day_len(day_dir) - start
+        if n <= 0:
+            return BarArrays.empty()
+
+        def _mm(name: str, dtype: np.dtype) -> np.ndarray:
+            off = start * dtype.itemsize
+            if mmap:
+                return np.memmap(day_dir / name, dtype=dtype, mode="r", offset=off, shape=(n,))
+            return np.fromfile(day_dir / name, dtype=dtype, count=n, offset=off)
+
+        return BarArrays(_mm(_TS_FILE, _TS_DTYPE), *(_mm(f"{k}.f8", _VAL_DTYPE) for k in VALUE_COLUMNS))
+
+    def tail(self, sym: str, tf: str, n: int, *, end_ts: Optional[int] = None) -> BarArrays:
+        """Last `n` bars (optionally at/before `end_ts`) across day partitions.
+
+        A window inside one partition is returned as slices of that
+        partition's columns; windows spanning partitions are concatenated.
+        """
+        n = int(n)
+        if n <= 0:
+            return BarArrays.empty()
+
+        pieces: List[BarArrays] = []
+        need = n
+        for day in reversed(self.days(sym, tf)):
+            if end_ts is not None and day > _session_day(end_ts):
+                continue
+            arr = self.read_day(sym, tf, day)
+            stop = len(arr)
+            if end_ts is not None and stop:
+                stop = int(np.searchsorted(arr.ts, end_ts, side="right"))
+            start = max(0, stop - need)
+            if stop > start:
+                pieces.append(BarArrays(*(col[start:stop] for col in arr.columns())))
+                need -= stop - start
+            if need <= 0:
+                break
+
+        if not pieces:
+            return BarArrays.empty()
+        if len(pieces) == 1:
+            return pieces[0]
+        pieces.reverse()
+        return BarArrays(*(np.concatenate(cols) for cols in zip(*(p.columns() for p in pieces))))
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._last_ts.clear()
+
+
+# -------------------------------------------------------------
+# Singleton access
+# -------------------------------------------------------------
+
+_stores: Dict[str, ColumnarBarStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_bar_store(root: Optional[Path] = None) -> ColumnarBarStore:
+    """Process-wide store for `root` (defaults to DT_BAR_STORE_DIR / DT_PATHS)."""
+    path = Path(root) if root is not None else _store_root()
+    key = str(path.resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ColumnarBarStore(path)
+            _stores[key] = store
+        return store
+
+
+def append_fetched_bars(fetched: Dict[str, List[Dict[str, Any]]], tf: str) -> Dict[str, int]:
+    """Best-effort append of a fetch_bars_batch() result. Returns {sym: bars appended}."""
+    out: Dict[str, int] = {}
+    if not fetched or not bar_store_enabled():
+        return out
+    store = get_bar_store()
+    for sym, bars in fetched.items():
+        try:
+            n = store.append_bars(sym, tf, bars)
+            if n:
+                out[sym] = n
+        except Exception as e:
+            log(f"[bar_store] ⚠️ append failed for {sym} ({tf}): {e}")
+    return out
@@ -254,9 +254,10 @@ def _write_candidate_universe(rolling: Dict[str, Any], scored: List[Tuple[str, f
     rolling["_GLOBAL_DT"] = g
 
 
-def _fetch_vix_level() -> float:
+def _fetch_vix_level(rolling: Optional[Dict[str, Any]] = None) -> float:
     """Fetch current VIX level from market data.
     
+    Uses `rolling` when the caller already holds it (avoids a re-read).
     Returns 0.0 if unavailable (safe default).
     """
     try:
@@ -265,7 +266,8 @@ def _fetch_vix_level() -> float:
         # If broker_api is available, we could fetch it there
         
         # Attempt 1: Check if VIX is in rolling cache
-        rolling = _read_rolling()
+        if not isinstance(rolling, dict):
+            rolling = _read_rolling()
         if rolling and isinstance(rolling, dict):
             vix_node = rolling.get("VIX") or rolling.get("^VIX")
             if isinstance(vix_node, dict):
@@ -307,8 +309,10 @@ def build_intraday_context(
     symbols: Optional[List[str]] = None,
     max_symbols: Optional[int] = None,
     build_candidates: bool = True,
+    rolling_override: Optional[Dict[str, Any]] = None,
+    save: bool = True,
 ) -> Dict[str, Any]:
-    rolling = _read_rolling()
+    rolling = rolling_override if isinstance(rolling_override, dict) else _read_rolling()
     if not rolling:
         log("[context_dt] ⚠️ rolling empty.")
         return {"symbols": 0, "updated": 0}
@@ -365,7 +369,7 @@ def build_intraday_context(
         _write_candidate_universe(rolling, scored, now_utc=now_utc)
     
     # Add VIX level to global context (NEW in Phase 3)
-    vix_level = _fetch_vix_level()
+    vix_level = _fetch_vix_level(rolling)
     vix_threshold = _env_float("DT_VIX_SPIKE_THRESHOLD", 35.0)
     gdt = rolling.get("_GLOBAL_DT") if isinstance(rolling.get("_GLOBAL_DT"), dict) else {}
     gdt["vix_level"] = float(vix_level)
@@ -374,6 +378,7 @@ def build_intraday_context(
     gdt["vix_ts"] = _utc_now_iso(now_utc)
     rolling["_GLOBAL_DT"] = gdt
 
-    save_rolling(rolling)
+    if save:
+        save_rolling(rolling)
     log(f"[context_dt] ✅ updated {updated} symbols. VIX={vix_level:.2f}")
     return {"symbols": len(keys), "updated": updated, "vix_level": vix_level}
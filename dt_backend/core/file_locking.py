@@ -96,6 +96,7 @@ def AcquireLock(
     """
     lock = FileLock(path=_safe_path(file_path), lock_type="shared" if shared else "exclusive")
     fd = None
+    yielded = False
     
     try:
         # Open file for locking (create if doesn't exist)
@@ -129,9 +130,13 @@ def AcquireLock(
         else:
             log(f"[file_locking] ⚠️ Timeout acquiring {lock.lock_type} lock: {lock.path.name}")
         
+        yielded = True
         yield acquired
         
     except Exception as e:
+        if yielded:
+            # Raised by the caller's block: propagate, don't yield twice.
+            raise
         log(f"[file_locking] ⚠️ Error in lock context for {lock.path}: {e}")
         yield False
         
@@ -429,12 +429,19 @@ def build_daily_plan(*, rolling: Dict[str, Any], date_override: Optional[str] =
     }
 
 
-def ensure_daily_plan(*, force: bool = False, date_override: Optional[str] = None) -> Dict[str, Any]:
+def ensure_daily_plan(
+    *,
+    force: bool = False,
+    date_override: Optional[str] = None,
+    rolling_override: Optional[Dict[str, Any]] = None,
+    save: bool = True,
+) -> Dict[str, Any]:
     """Ensure rolling contains today's daily_plan_dt.
 
-    If it's a new date or force=True, recompute.
+    If it's a new date or force=True, recompute. rolling_override/save let
+    the step replay keep the plan on its in-memory rolling.
     """
-    rolling = _read_rolling() or {}
+    rolling = rolling_override if isinstance(rolling_override, dict) else (_read_rolling() or {})
     if not isinstance(rolling, dict) or not rolling:
         return {}
 
@@ -450,6 +457,7 @@ def ensure_daily_plan(*, force: bool = False, date_override: Optional[str] = Non
     plan = build_daily_plan(rolling=rolling, date_override=today)
     g["daily_plan_dt"] = plan
     rolling["_GLOBAL_DT"] = g
-    save_rolling(rolling)
+    if save:
+        save_rolling(rolling)
     log(f"[meta_dt] 🧠 daily plan set: {plan.get('reason')}")
     return plan
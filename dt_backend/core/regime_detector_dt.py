@@ -216,8 +216,13 @@ def _legacy_map(label: str) -> str:
     return "unknown"
 
 
-def classify_intraday_regime(*, now_utc: Optional[datetime] = None) -> Dict[str, Any]:
-    rolling = _read_rolling() or {}
+def classify_intraday_regime(
+    *,
+    now_utc: Optional[datetime] = None,
+    rolling_override: Optional[Dict[str, Any]] = None,
+    save: bool = True,
+) -> Dict[str, Any]:
+    rolling = rolling_override if isinstance(rolling_override, dict) else (_read_rolling() or {})
     if not isinstance(rolling, dict) or not rolling:
         log("[regime_dt] ⚠️ rolling empty.")
         return {"label": "UNKNOWN", "confidence": 0.0}
@@ -274,7 +279,8 @@ def classify_intraday_regime(*, now_utc: Optional[datetime] = None) -> Dict[str,
     g["_levels_meta"] = levels_meta
 
     rolling["_GLOBAL_DT"] = g
-    save_rolling(rolling)
+    if save:
+        save_rolling(rolling)
 
     log(f"[regime_dt] ✅ {stable} (day={day_type}, conf={conf:.2f}, micro={micro.get('label')})")
     return regime_dt
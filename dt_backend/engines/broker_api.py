@@ -25,7 +25,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 import json
 import os
@@ -559,12 +559,31 @@ def _ownership_on_fill(sym: str, side: str, filled_qty: float) -> None:
         pass
 
 
+def _ownership_on_fills(fills: List[Tuple[str, str, float]]) -> None:
+    """Batch variant of _ownership_on_fill: one registry load/save for a cycle."""
+    try:
+        from dt_backend.core.position_registry import load_registry, save_registry, reserve_on_fill
+
+        reg = load_registry()
+        owner = _strategy_owner()
+        for sym, side, filled_qty in fills:
+            reserve_on_fill(reg, sym, side, float(filled_qty), owner)
+        save_registry(reg)
+    except Exception:
+        pass
+
+
 # =========================
 # Order submission
 # =========================
 
 
-def submit_order(order: Order, last_price: float | None = None) -> Dict[str, Any]:
+def _prepare_order(order: Order, last_price: float | None, state: Dict[str, Any], cash: float) -> Dict[str, Any]:
+    """Local allowance checks shared by submit_order / submit_orders.
+
+    Returns a rejection dict, or {"status": "ok", ...} with the validated
+    symbol/side/qty, the position's avg price and the BUY reference price.
+    """
     sym = str(order.symbol).upper().strip()
     side = str(order.side).upper().strip()
     qty_req = _safe_float(order.qty, 0.0)
@@ -576,8 +595,6 @@ def submit_order(order: Order, last_price: float | None = None) -> Dict[str, Any
     if qty_req <= 0:
         return {"status": "rejected", "reason": "bad_qty"}
 
-    state = _read_ledger()
-    cash = _safe_float(state.get("cash", 0.0), 0.0)
     buckets = _ensure_positions_schema(state)
     positions = buckets.get("ACTIVE", {})
     if not isinstance(positions, dict):
@@ -619,26 +636,155 @@ def submit_order(order: Order, last_price: float | None = None) -> Dict[str, Any
         if qty_req > pos_qty:
             qty_req = pos_qty
 
-    # ===== Execute on Alpaca if enabled =====
-    if _alpaca_enabled():
-        if order.limit_price is not None and last_price is None:
-            return {"status": "rejected", "reason": "no_price_for_limit"}
+    if _alpaca_enabled() and order.limit_price is not None and last_price is None:
+        return {"status": "rejected", "reason": "no_price_for_limit"}
 
-        alpaca_side = "buy" if side == "BUY" else "sell"
-        payload: Dict[str, Any] = {
-            "symbol": sym,
-            "side": alpaca_side,
-            "time_in_force": "day",
-            "client_order_id": _client_order_id(),
-        }
+    return {"status": "ok", "symbol": sym, "side": side, "qty": qty_req, "pos_avg": pos_avg, "ref_price": ref_price}
 
-        if order.limit_price is not None:
-            payload["type"] = "limit"
-            payload["limit_price"] = str(_safe_float(order.limit_price, 0.0))
-            payload["qty"] = _fmt_qty(qty_req)
-        else:
-            payload["type"] = "market"
-            payload["qty"] = _fmt_qty(qty_req)
+
+def _alpaca_order_payload(order: Order, sym: str, side: str, qty: float) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "symbol": sym,
+        "side": "buy" if side == "BUY" else "sell",
+        "time_in_force": "day",
+        "client_order_id": _client_order_id(),
+    }
+    if order.limit_price is not None:
+        payload["type"] = "limit"
+        payload["limit_price"] = str(_safe_float(order.limit_price, 0.0))
+    else:
+        payload["type"] = "market"
+    payload["qty"] = _fmt_qty(qty)
+    return payload
+
+
+def _alpaca_not_filled(sym: str, side: str, qty: float, oid: str, final: Dict[str, Any]) -> Dict[str, Any]:
+    status = str(final.get("status", "")).lower()
+    # Capture Alpaca rejection details
+    alpaca_reason = str(final.get("reason") or "")
+    alpaca_message = str(final.get("message") or "")
+    # Log detailed rejection information
+    log(f"[broker_alpaca] ❌ Order rejected: {sym} {side} {qty} - status={status}, reason={alpaca_reason}, message={alpaca_message}")
+    return {
+        "status": "rejected",
+        "reason": "alpaca_not_filled_fast",
+        "id": oid,
+        "alpaca_status": status,
+        "alpaca_reason": alpaca_reason,
+        "alpaca_message": alpaca_message,
+        "alpaca_response": final,
+    }
+
+
+def _alpaca_filled(sym: str, side: str, oid: str, final: Dict[str, Any], pos_avg: float, client_order_id: Any) -> Dict[str, Any]:
+    filled_qty = _safe_float(final.get("filled_qty") or 0.0, 0.0)
+    fill_price = _safe_float(final.get("filled_avg_price"), 0.0)
+
+    realized_pnl = 0.0
+    if side == "SELL":
+        realized_pnl = (fill_price - pos_avg) * filled_qty
+
+    log(f"[broker_alpaca] ✅ filled {side} {filled_qty} {sym} @ {fill_price} (bot={_bot_id()})")
+    return {
+        "status": "filled",
+        "id": oid,
+        "t": str(final.get("filled_at") or final.get("submitted_at") or _utc_iso()),
+        "symbol": sym,
+        "side": side,
+        "qty": float(filled_qty),
+        "price": float(fill_price),
+        "realized_pnl": float(realized_pnl),
+        "venue": "alpaca_paper",
+        "bot_id": _bot_id(),
+        "client_order_id": client_order_id,
+    }
+
+
+def _alpaca_error(sym: str, e: BaseException) -> Dict[str, Any]:
+    error_detail = str(e)[:500]
+    # Try to extract Alpaca error details from exception message
+    alpaca_reason = ""
+    alpaca_message = ""
+    try:
+        # The RuntimeError from _http_json includes the response body
+        # Try to parse it as JSON to extract reason/message
+        # Look for JSON pattern after the HTTP status code (e.g., "403: {...}")
+        error_str = str(e)
+        # Match JSON after status code pattern like "403: {...}"
+        json_match = re.search(r'\d{3}:\s*(\{.*\})\s*$', error_str)
+        if json_match:
+            json_str = json_match.group(1)
+            error_json = json.loads(json_str)
+            if isinstance(error_json, dict):
+                # Alpaca uses 'reason' field primarily, 'code' is numeric error code
+                alpaca_reason = str(error_json.get("reason") or "")
+                alpaca_message = str(error_json.get("message") or "")
+    except Exception:
+        pass
+
+    rejection_dict = {
+        "status": "rejected",
+        "reason": "alpaca_error",
+        "detail": error_detail,
+        "bot_id": _bot_id(),
+    }
+    if alpaca_reason:
+        rejection_dict["alpaca_reason"] = alpaca_reason
+    if alpaca_message:
+        rejection_dict["alpaca_message"] = alpaca_message
+
+    log(f"[broker_alpaca] ❌ submit failed for {sym}: {error_detail}" +
+        (f" (reason={alpaca_reason}, message={alpaca_message})" if alpaca_reason or alpaca_message else ""))
+    return rejection_dict
+
+
+def _local_fill(order: Order, last_price: float | None, side: str) -> tuple[float | None, Dict[str, Any] | None]:
+    """Local simulation price for an order: (fill_price, None) or (None, rejection)."""
+    if last_price is None:
+        return None, {"status": "rejected", "reason": "no_price_local"}
+
+    fill_price = _safe_float(last_price, 0.0)
+    if order.limit_price is not None:
+        lp = _safe_float(order.limit_price, 0.0)
+        if side == "BUY" and fill_price > lp:
+            return None, {"status": "rejected", "reason": "limit_not_reached"}
+        if side == "SELL" and fill_price < lp:
+            return None, {"status": "rejected", "reason": "limit_not_reached"}
+        fill_price = lp
+    return fill_price, None
+
+
+def _local_filled(sym: str, side: str, filled_qty: float, fill_price: float, pos_avg: float) -> Dict[str, Any]:
+    realized_pnl = 0.0
+    if side == "SELL":
+        realized_pnl = (fill_price - pos_avg) * filled_qty
+
+    log(f"[broker_local] ✅ filled {side} {filled_qty} {sym} @ {fill_price} (bot={_bot_id()})")
+    return {
+        "status": "filled",
+        "t": _utc_iso(),
+        "symbol": sym,
+        "side": side,
+        "qty": float(filled_qty),
+        "price": float(fill_price),
+        "realized_pnl": float(realized_pnl),
+        "venue": "local",
+        "bot_id": _bot_id(),
+    }
+
+
+def submit_order(order: Order, last_price: float | None = None) -> Dict[str, Any]:
+    state = _read_ledger()
+    cash = _safe_float(state.get("cash", 0.0), 0.0)
+
+    prep = _prepare_order(order, last_price, state, cash)
+    if prep["status"] != "ok":
+        return prep
+    sym, side, qty_req, pos_avg = prep["symbol"], prep["side"], prep["qty"], prep["pos_avg"]
+
+    # ===== Execute on Alpaca if enabled =====
+    if _alpaca_enabled():
+        payload = _alpaca_order_payload(order, sym, side, qty_req)
 
         try:
             created = _alpaca_post("/orders", payload)
@@ -654,21 +800,7 @@ def submit_order(order: Order, last_price: float | None = None) -> Dict[str, Any
 
             if filled_qty <= 0:
                 _cancel_order(oid)
-                # Capture Alpaca rejection details
-                alpaca_reason = str(final.get("reason") or "")
-                alpaca_message = str(final.get("message") or "")
-                rejection_info = {
-                    "status": "rejected",
-                    "reason": "alpaca_not_filled_fast",
-                    "id": oid,
-                    "alpaca_status": status,
-                    "alpaca_reason": alpaca_reason,
-                    "alpaca_message": alpaca_message,
-                    "alpaca_response": final,
-                }
-                # Log detailed rejection information
-                log(f"[broker_alpaca] ❌ Order rejected: {sym} {side} {qty_req} - status={status}, reason={alpaca_reason}, message={alpaca_message}")
-                return rejection_info
+                return _alpaca_not_filled(sym, side, qty_req, oid, final)
 
             if status != "filled":
                 _cancel_order(oid)
@@ -679,75 +811,15 @@ def submit_order(order: Order, last_price: float | None = None) -> Dict[str, Any
             # Update shared strategy ownership registry (filled qty only).
             _ownership_on_fill(sym, side, filled_qty)
 
-            realized_pnl = 0.0
-            if side == "SELL":
-                realized_pnl = (fill_price - pos_avg) * filled_qty
-
-            out = {
-                "status": "filled",
-                "id": oid,
-                "t": str(final.get("filled_at") or final.get("submitted_at") or _utc_iso()),
-                "symbol": sym,
-                "side": side,
-                "qty": float(filled_qty),
-                "price": float(fill_price),
-                "realized_pnl": float(realized_pnl),
-                "venue": "alpaca_paper",
-                "bot_id": _bot_id(),
-                "client_order_id": payload.get("client_order_id"),
-            }
-            log(f"[broker_alpaca] ✅ filled {side} {filled_qty} {sym} @ {fill_price} (bot={_bot_id()})")
-            return out
+            return _alpaca_filled(sym, side, oid, final, pos_avg, payload.get("client_order_id"))
 
         except Exception as e:
-            error_detail = str(e)[:500]
-            # Try to extract Alpaca error details from exception message
-            alpaca_reason = ""
-            alpaca_message = ""
-            try:
-                # The RuntimeError from _http_json includes the response body
-                # Try to parse it as JSON to extract reason/message
-                # Look for JSON pattern after the HTTP status code (e.g., "403: {...}")
-                error_str = str(e)
-                # Match JSON after status code pattern like "403: {...}"
-                json_match = re.search(r'\d{3}:\s*(\{.*\})\s*$', error_str)
-                if json_match:
-                    json_str = json_match.group(1)
-                    error_json = json.loads(json_str)
-                    if isinstance(error_json, dict):
-                        # Alpaca uses 'reason' field primarily, 'code' is numeric error code
-                        alpaca_reason = str(error_json.get("reason") or "")
-                        alpaca_message = str(error_json.get("message") or "")
-            except Exception:
-                pass
-            
-            rejection_dict = {
-                "status": "rejected",
-                "reason": "alpaca_error",
-                "detail": error_detail,
-                "bot_id": _bot_id(),
-            }
-            if alpaca_reason:
-                rejection_dict["alpaca_reason"] = alpaca_reason
-            if alpaca_message:
-                rejection_dict["alpaca_message"] = alpaca_message
-            
-            log(f"[broker_alpaca] ❌ submit failed for {sym}: {error_detail}" + 
-                (f" (reason={alpaca_reason}, message={alpaca_message})" if alpaca_reason or alpaca_message else ""))
-            return rejection_dict
+            return _alpaca_error(sym, e)
 
     # ===== Local simulation fallback =====
-    if last_price is None:
-        return {"status": "rejected", "reason": "no_price_local"}
-
-    fill_price = _safe_float(last_price, 0.0)
-    if order.limit_price is not None:
-        lp = _safe_float(order.limit_price, 0.0)
-        if side == "BUY" and fill_price > lp:
-            return {"status": "rejected", "reason": "limit_not_reached"}
-        if side == "SELL" and fill_price < lp:
-            return {"status": "rejected", "reason": "limit_not_reached"}
-        fill_price = lp
+    fill_price, rejected = _local_fill(order, last_price, side)
+    if rejected is not None:
+        return rejected
 
     filled_qty = qty_req
 
@@ -756,22 +828,97 @@ def submit_order(order: Order, last_price: float | None = None) -> Dict[str, Any
 
     _ownership_on_fill(sym, side, filled_qty)
 
-    realized_pnl = 0.0
-    if side == "SELL":
-        realized_pnl = (fill_price - pos_avg) * filled_qty
+    return _local_filled(sym, side, filled_qty, fill_price, pos_avg)
 
-    log(f"[broker_local] ✅ filled {side} {filled_qty} {sym} @ {fill_price} (bot={_bot_id()})")
-    return {
-        "status": "filled",
-        "t": _utc_iso(),
-        "symbol": sym,
-        "side": side,
-        "qty": float(filled_qty),
-        "price": float(fill_price),
-        "realized_pnl": float(realized_pnl),
-        "venue": "local",
-        "bot_id": _bot_id(),
-    }
+
+# =========================
+# Batched submission (one cycle)
+# =========================
+
+
+def order_pipeline_enabled() -> bool:
+    """DT_ORDER_PIPELINE=1 routes submit_orders through the concurrent pipeline."""
+    return _env("DT_ORDER_PIPELINE", "0").lower() in {"1", "true", "yes", "y", "on"}
+
+
+def submit_orders(items: List[Tuple[Order, float | None]]) -> List[Dict[str, Any]]:
+    """Submit one cycle's orders together; results line up with `items`.
+
+    Same checks and result dicts as submit_order, but the ledger is read
+    once, BUY cash is reserved across the batch, Alpaca orders go out
+    concurrently (dt_backend.engines.order_pipeline) and every fill is
+    applied to the ledger and ownership registry in a single save.
+
+    With DT_ORDER_PIPELINE off (default), or without aiohttp for Alpaca
+    routing, this is submit_order in a loop.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    pipeline = None
+    if order_pipeline_enabled():
+        try:
+            from dt_backend.engines import order_pipeline as pipeline  # lazy: keeps this module light
+
+            if _alpaca_enabled() and not pipeline.available():
+                pipeline = None
+        except Exception as e:
+            log(f"[broker_alpaca] ⚠️ order pipeline unavailable: {e}")
+            pipeline = None
+    if pipeline is None:
+        return [submit_order(order, last_price=lp) for order, lp in items]
+
+    state = _read_ledger()
+    cash = _safe_float(state.get("cash", 0.0), 0.0)
+    results: List[Dict[str, Any] | None] = [None] * len(items)
+    tickets: List[Tuple[int, Dict[str, Any]]] = []
+
+    for i, (order, lp) in enumerate(items):
+        prep = _prepare_order(order, lp, state, cash)
+        if prep["status"] != "ok":
+            results[i] = prep
+            continue
+        if prep["side"] == "BUY":
+            cash -= _safe_float(prep["ref_price"], 0.0) * prep["qty"]
+        tickets.append((i, prep))
+
+    fills: List[Tuple[str, str, float, float]] = []
+
+    if _alpaca_enabled():
+        payloads = [_alpaca_order_payload(items[i][0], p["symbol"], p["side"], p["qty"]) for i, p in tickets]
+        outcomes = pipeline.submit_concurrently(payloads, base_url=_alpaca_base_v2(), headers=_alpaca_headers())
+        for (i, p), payload, oc in zip(tickets, payloads, outcomes):
+            sym, side = p["symbol"], p["side"]
+            if oc.error is not None:
+                results[i] = _alpaca_error(sym, oc.error)
+                continue
+            if not isinstance(oc.created, dict) or not oc.created.get("id"):
+                results[i] = {"status": "rejected", "reason": "alpaca_no_order_id", "raw": oc.created}
+                continue
+            oid = str(oc.created["id"])
+            filled_qty = _safe_float(oc.final.get("filled_qty") or 0.0, 0.0)
+            if filled_qty <= 0:
+                results[i] = _alpaca_not_filled(sym, side, p["qty"], oid, oc.final)
+                continue
+            fills.append((sym, side, filled_qty, _safe_float(oc.final.get("filled_avg_price"), 0.0)))
+            results[i] = _alpaca_filled(sym, side, oid, oc.final, p["pos_avg"], payload.get("client_order_id"))
+    else:
+        for i, p in tickets:
+            fill_price, rejected = _local_fill(items[i][0], items[i][1], p["side"])
+            if rejected is not None:
+                results[i] = rejected
+                continue
+            fills.append((p["symbol"], p["side"], p["qty"], fill_price))
+            results[i] = _local_filled(p["symbol"], p["side"], p["qty"], fill_price, p["pos_avg"])
+
+    if fills:
+        for sym, side, filled_qty, fill_price in fills:
+            state = _ledger_apply_fill(state, sym, side, filled_qty, fill_price)
+        _save_ledger(state)
+        _ownership_on_fills([(sym, side, q) for sym, side, q, _ in fills])
+
+    return [r if r is not None else {"status": "rejected", "reason": "not_submitted"} for r in results]
 
 
 # =========================
@@ -1022,6 +1169,9 @@ class BrokerAPI:
     def submit_order(self, order: Order, last_price: float | None = None) -> Dict[str, Any]:
         return submit_order(order, last_price=last_price)
 
+    def submit_orders(self, items: List[Tuple[Order, float | None]]) -> List[Dict[str, Any]]:
+        return submit_orders(items)
+
     def get_account_cached(self, *, ttl_sec: int = 180, force: bool = False) -> Dict[str, Any]:
         return get_account_cached(ttl_sec=ttl_sec, force=force)
 
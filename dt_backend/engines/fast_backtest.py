@@ -0,0 +1,699 @@
+# dt_backend/engines/fast_backtest.py — v1.0
+"""
+Vectorized intraday backtester for knob sweeps.
+
+The step replay (historical_replay.step_replay_engine_dt) and the Phase-6
+runner push every bar through the full pipeline. That is faithful, but one
+knob combination costs a full replay of the day. Most of that work does not
+depend on the execution knobs: context, features, model scores, policy and
+execution plans come out the same for every ExecutionConfig.
+
+So this module splits the work in two:
+
+  1) record_day_arrays() replays a raw day ONCE through the signal stages
+     (plan → regime → context → features → predictions → policy →
+     execution_dt) and stores per-step, per-symbol arrays [T, S]: last
+     price, ATR, intent side/size/confidence, p_hit, the execution plan's
+     risk block and the executor's ranking order. load_day_arrays() caches
+     them as .npz under <replay>/fast_arrays/.
+  2) simulate() runs the trade_executor / position_manager_dt rules as
+     array operations over [K knob combinations, S symbols], stepping
+     through T. The rules covered are conf / p_hit gates, flip cooldown,
+     max orders per cycle in ranking order, _size_from_phit_with_conviction
+     (with the executor's default_qty × size fallback when it returns 0),
+     _plan_risk with ATR fallbacks, EOD flatten, time stop, scratch, trail,
+     TP partials, hard stop and full TP.
+
+Known simplifications vs the slow path (validate() measures the gap):
+  • signals are recorded without positions, so policy/execution_dt state
+    that reacts to our own fills is not reproduced;
+  • sizing uses a fixed start equity (no broker account refresh);
+  • a SELL intent closes a long once min_hold_time_minutes has passed (or
+    the loss exceeds hard_stop_loss_pct). The executor's breakeven-wait
+    gates are not modelled;
+  • drawdown is measured on the realized-PnL curve at step granularity.
+
+Sweeps take ExecutionConfig field names, so any knob that dt_knobs.env or
+the knob tuner feeds through _cfg_from_env() can be swept:
+
+    base = _cfg_from_env()
+    days = [load_day_arrays(d) for d in ("2025-01-02", "2025-01-03")]
+    top = sweep(days, expand_grid({"min_confidence": [0.3, 0.4, 0.5],
+                                   "fallback_stop_atr": [1.0, 1.5]}, base))
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from dt_backend.core.config_dt import DT_PATHS
+from dt_backend.core.logger_dt import log
+from dt_backend.engines.trade_executor import ExecutionConfig, _extract_intent, _safe_float
+
+try:
+    from zoneinfo import ZoneInfo
+except Exception:  # pragma: no cover
+    ZoneInfo = None  # type: ignore
+
+ARRAYS_VERSION = 1
+
+# Per-step, per-symbol float arrays stored in the .npz (NaN = not set).
+_FLOAT_FIELDS = (
+    "last",
+    "atr",
+    "size",
+    "conf",
+    "phit",
+    "plan_stop",
+    "plan_tp",
+    "plan_time_stop",
+    "plan_trail_mult",
+    "plan_scratch_min",
+    "plan_scratch_frac",
+)
+_INT_FIELDS = ("side", "plan_trail", "plan_partials", "rank")
+
+# ExecutionConfig fields simulate() reads.
+KNOB_FIELDS = (
+    "allow_shorts",
+    "min_confidence",
+    "max_orders_per_cycle",
+    "enable_brackets",
+    "eod_flatten",
+    "eod_flatten_minutes",
+    "min_flip_minutes",
+    "min_hold_time_minutes",
+    "hard_stop_loss_pct",
+    "fallback_stop_atr",
+    "fallback_tp_atr",
+    "trail_atr_mult",
+    "scratch_min",
+    "scratch_atr_frac",
+    "min_phit",
+    "max_symbol_fraction",
+    "default_qty",
+)
+
+
+# ---------------------------------------------------------------------------
+# Precomputed day arrays
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class DayArrays:
+    """Knob-independent inputs for one replay day.
+
+    minutes: [T] minutes since midnight UTC, mins_to_close: [T] minutes to
+    the 16:00 New York close. Every other array is [T, S]. side is +1 BUY,
+    -1 SELL, 0 flat. rank is the executor's visiting order at that step
+    (0 = first).
+    """
+
+    date: str
+    symbols: List[str]
+    minutes: np.ndarray
+    mins_to_close: np.ndarray
+    last: np.ndarray
+    atr: np.ndarray
+    side: np.ndarray
+    size: np.ndarray
+    conf: np.ndarray
+    phit: np.ndarray
+    plan_stop: np.ndarray
+    plan_tp: np.ndarray
+    plan_time_stop: np.ndarray
+    plan_trail: np.ndarray
+    plan_partials: np.ndarray
+    plan_trail_mult: np.ndarray
+    plan_scratch_min: np.ndarray
+    plan_scratch_frac: np.ndarray
+    rank: np.ndarray
+
+    @property
+    def steps(self) -> int:
+        return int(self.last.shape[0])
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp.npz")
+        np.savez_compressed(
+            tmp,
+            version=np.int32(ARRAYS_VERSION),
+            date=np.array(self.date),
+            symbols=np.array(self.symbols),
+            minutes=self.minutes,
+            mins_to_close=self.mins_to_close,
+            **{k: getattr(self, k) for k in _FLOAT_FIELDS + _INT_FIELDS},
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "DayArrays":
+        with np.load(Path(path), allow_pickle=False) as z:
+            if int(z["version"]) != ARRAYS_VERSION:
+                raise ValueError(f"{path}: arrays version {int(z['version'])} != {ARRAYS_VERSION}")
+            return cls(
+                date=str(z["date"]),
+                symbols=[str(s) for s in z["symbols"]],
+                minutes=z["minutes"],
+                mins_to_close=z["mins_to_close"],
+                **{k: z[k] for k in _FLOAT_FIELDS + _INT_FIELDS},
+            )
+
+
+def _mins_to_close(ts: datetime) -> float:
+    ny = ZoneInfo("America/New_York") if ZoneInfo is not None else timezone.utc
+    now_ny = ts.astimezone(ny)
+    close_ny = now_ny.replace(hour=16, minute=0, second=0, microsecond=0)
+    return (close_ny - now_ny).total_seconds() / 60.0
+
+
+def _risk_value(risk: Dict[str, Any], key: str) -> float:
+    v = risk.get(key)
+    try:
+        return float(v) if v is not None else np.nan
+    except Exception:
+        return np.nan
+
+
+def _record_step(out: Dict[str, np.ndarray], t: int, rolling: Dict[str, Any], symbols: List[str]) -> None:
+    from dt_backend.utils.trading_utils_dt import sort_by_ranking_metric
+
+    order = sort_by_ranking_metric(list(symbols), rolling)
+    pos = {s: i for i, s in enumerate(order)}
+    for j, sym in enumerate(symbols):
+        node = rolling.get(sym)
+        node = node if isinstance(node, dict) else {}
+        feats = node.get("features_dt") if isinstance(node.get("features_dt"), dict) else {}
+        side, size, conf = _extract_intent(node)
+        pol = node.get("policy_dt") if isinstance(node.get("policy_dt"), dict) else {}
+        plan = node.get("execution_plan_dt") if isinstance(node.get("execution_plan_dt"), dict) else {}
+        risk = plan.get("risk") if isinstance(plan.get("risk"), dict) else {}
+
+        out["last"][t, j] = _safe_float(feats.get("last_price"), 0.0)
+        out["atr"][t, j] = _safe_float(feats.get("atr_14"), 0.0)
+        out["side"][t, j] = {"BUY": 1, "SELL": -1}.get(side, 0)
+        out["size"][t, j] = size
+        out["conf"][t, j] = conf
+        out["phit"][t, j] = _safe_float(pol.get("p_hit"), conf)
+        out["plan_stop"][t, j] = _risk_value(risk, "stop")
+        out["plan_tp"][t, j] = _risk_value(risk, "take_profit")
+        out["plan_time_stop"][t, j] = _risk_value(risk, "time_stop_min")
+        out["plan_trail"][t, j] = int(risk.get("trail") is True)
+        out["plan_partials"][t, j] = int(risk.get("partials") is True)
+        out["plan_trail_mult"][t, j] = _risk_value(risk, "trail_atr_mult")
+        out["plan_scratch_min"][t, j] = _risk_value(risk, "scratch_min")
+        out["plan_scratch_frac"][t, j] = _risk_value(risk, "scratch_atr_frac")
+        out["rank"][t, j] = pos.get(sym, len(symbols))
+
+
+def record_day_arrays(date_str: str, *, step_minutes: int = 5, max_symbols: Optional[int] = None) -> DayArrays:
+    """Replay one raw day through the signal stages (no trading) and capture arrays.
+
+    Runs the same in-memory stages as the step replay, minus
+    execute_from_policy. The caller should point DT_TRUTH_DIR /
+    DT_ROLLING_PATH at a sandbox like any replay.
+    """
+    from dt_backend.historical_replay import step_replay_engine_dt as sre
+
+    raw_day = sre._load_raw_day(date_str)
+    if max_symbols is not None:
+        raw_day = raw_day[: max(0, int(max_symbols))]
+    per_sym = sre._parse_day(raw_day)
+    times = sre._subsample_times(sre._select_time_index(raw_day), step_minutes=step_minutes)
+    symbols = sorted(per_sym)
+    T, S = len(times), len(symbols)
+
+    out: Dict[str, np.ndarray] = {k: np.full((T, S), np.nan) for k in _FLOAT_FIELDS}
+    out.update({k: np.zeros((T, S), dtype=np.int32) for k in _INT_FIELDS})
+
+    models = sre.load_intraday_models()
+    rolling: Dict[str, Any] = {}
+    for sym in symbols:
+        node = sre.ensure_symbol_node(rolling, sym)
+        node["bars_intraday"] = []
+        rolling[sym] = node
+
+    t0 = time.time()
+    for t, step_dt in enumerate(times):
+        for sym, cur in per_sym.items():
+            start = cur.advance(step_dt)
+            if cur.i != start:
+                rolling[sym]["bars_intraday"].extend(b for _, b in cur.parsed[start:cur.i])
+                sre._set_last_price(rolling[sym])
+
+        sre.ensure_daily_plan(date_override=date_str, rolling_override=rolling, save=False)
+        sre.classify_intraday_regime(now_utc=step_dt, rolling_override=rolling, save=False)
+        sre.build_intraday_context(target_date=date_str, now_utc=step_dt, rolling_override=rolling, save=False)
+        sre.build_intraday_features(now_utc=step_dt, rolling_override=rolling, save=False)
+        sre._attach_predictions_to_rolling(rolling, models=models, now_utc=step_dt)
+        sre.apply_intraday_policy(rolling_override=rolling, save=False)
+        sre.run_execution_intraday(now_utc=step_dt, rolling_override=rolling, save=False)
+        _record_step(out, t, rolling, symbols)
+
+    log(f"[fast_backtest] 📼 recorded {date_str}: {T} steps × {S} symbols ({time.time() - t0:.1f}s)")
+    return DayArrays(
+        date=date_str,
+        symbols=symbols,
+        minutes=np.array([ts.hour * 60 + ts.minute + ts.second / 60.0 for ts in times], dtype=np.float64),
+        mins_to_close=np.array([_mins_to_close(ts) for ts in times], dtype=np.float64),
+        **out,
+    )
+
+
+def _arrays_dir() -> Path:
+    root = DT_PATHS.get("dtml_data")
+    root = root if isinstance(root, Path) else Path("ml_data_dt")
+    return root / "intraday" / "replay" / "fast_arrays"
+
+
+def arrays_path_for(date_str: str, *, step_minutes: int = 5, max_symbols: Optional[int] = None) -> Path:
+    cap = f"_n{int(max_symbols)}" if max_symbols is not None else ""
+    return _arrays_dir() / f"{date_str}_{int(step_minutes)}m{cap}.npz"
+
+
+def load_day_arrays(
+    date_str: str,
+    *,
+    step_minutes: int = 5,
+    max_symbols: Optional[int] = None,
+    refresh: bool = False,
+) -> DayArrays:
+    """Cached DayArrays for a raw day (recorded on first use)."""
+    path = arrays_path_for(date_str, step_minutes=step_minutes, max_symbols=max_symbols)
+    if path.exists() and not refresh:
+        try:
+            return DayArrays.load(path)
+        except Exception as e:
+            log(f"[fast_backtest] ⚠️ {path.name} unreadable, re-recording: {e}")
+    day = record_day_arrays(date_str, step_minutes=step_minutes, max_symbols=max_symbols)
+    day.save(path)
+    return day
+
+
+# ---------------------------------------------------------------------------
+# Knob batches
+# ---------------------------------------------------------------------------
+
+
+def expand_grid(grid: Dict[str, Sequence[Any]], base: Optional[ExecutionConfig] = None) -> List[ExecutionConfig]:
+    """Cartesian product of `grid` (ExecutionConfig field → values) over `base`."""
+    base = base or ExecutionConfig()
+    valid = {f.name for f in fields(ExecutionConfig)}
+    unknown = sorted(set(grid) - valid)
+    if unknown:
+        raise ValueError(f"unknown ExecutionConfig knobs: {unknown}")
+    keys = list(grid)
+    return [replace(base, **dict(zip(keys, combo))) for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+def _knob_columns(configs: Sequence[ExecutionConfig]) -> Dict[str, np.ndarray]:
+    """One [K, 1] column per knob, ready to broadcast against [K, S]."""
+    return {k: np.array([float(getattr(c, k)) for c in configs], dtype=np.float64)[:, None] for k in KNOB_FIELDS}
+
+
+# ---------------------------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------------------------
+
+
+def _size_fraction(phit: np.ndarray, expected_r: np.ndarray, atr_pct: np.ndarray, kn: Dict[str, np.ndarray]) -> np.ndarray:
+    """_size_from_phit_with_conviction for flat entries (position_qty == 0)."""
+    edge = np.clip((phit - 0.5) / 0.5, 0.0, 1.0)
+    r_factor = 0.5 + 0.5 * (np.clip(expected_r, 0.5, 2.0) / 2.0)
+    vol_scale = np.where(atr_pct > 3.0, 0.4, np.where((atr_pct > 0) & (atr_pct < 1.5), 1.0, 0.7))
+    frac = np.clip(kn["max_symbol_fraction"] * edge * r_factor * vol_scale, 0.0, kn["max_symbol_fraction"])
+    return np.where(phit < kn["min_phit"], 0.0, frac)
+
+
+class _Book:
+    """Open-position state for K knob combinations × S symbols."""
+
+    def __init__(self, K: int, S: int):
+        z = lambda: np.zeros((K, S))  # noqa: E731
+        self.side = np.zeros((K, S), dtype=np.int8)
+        self.qty, self.entry, self.entry_t = z(), z(), z()
+        self.stop, self.tp, self.tstop = z(), z(), z()
+        self.scratch_min, self.scratch_frac, self.trail_mult = z(), z(), z()
+        self.trail = np.zeros((K, S), dtype=bool)
+        self.partials = np.zeros((K, S), dtype=bool)
+        self.managed = np.zeros((K, S), dtype=bool)
+        self.max_fav, self.min_fav = z(), z()
+        self.trade_pnl = z()
+        self.exit_t = np.full((K, S), -np.inf)
+        self.exit_side = np.zeros((K, S), dtype=np.int8)
+        self.realized = np.zeros(K)
+        self.closes = np.zeros(K, dtype=np.int64)
+        self.wins = np.zeros(K, dtype=np.int64)
+        self.reasons: Dict[str, np.ndarray] = {}
+
+    def close(self, mask: np.ndarray, last: np.ndarray, minute: float, reason: str) -> None:
+        if not mask.any():
+            return
+        pnl = np.where(mask, self.side * (last - self.entry) * self.qty, 0.0)
+        total = self.trade_pnl + pnl
+        self.realized += pnl.sum(axis=1)
+        self.closes += mask.sum(axis=1)
+        self.wins += (mask & (total > 0)).sum(axis=1)
+        self.reasons[reason] = self.reasons.get(reason, 0) + mask.sum(axis=1)
+        self.exit_t = np.where(mask, minute, self.exit_t)
+        self.exit_side = np.where(mask, self.side, self.exit_side)
+        self.side = np.where(mask, 0, self.side).astype(np.int8)
+        self.trade_pnl = np.where(mask, 0.0, self.trade_pnl)
+        self.managed &= ~mask
+
+
+def _process_exits(book: _Book, day: DayArrays, t: int, kn: Dict[str, np.ndarray]) -> None:
+    """position_manager_dt.process_exits, in its rule order."""
+    last = day.last[t][None, :]
+    atr = day.atr[t][None, :]
+    minute = float(day.minutes[t])
+    long_ = book.side > 0
+    live = book.managed & (book.side != 0) & (last > 0)
+    if not live.any():
+        return
+
+    book.max_fav = np.where(live, np.maximum(book.max_fav, last), book.max_fav)
+    book.min_fav = np.where(live, np.minimum(book.min_fav, last), book.min_fav)
+
+    mtc = float(day.mins_to_close[t])
+    eod = (kn["eod_flatten"] > 0) & (0 <= mtc) & (mtc <= np.maximum(0, kn["eod_flatten_minutes"]))
+    book.close(live & eod, last, minute, "eod_flatten")
+    live &= book.side != 0
+
+    held = minute - book.entry_t
+    book.close(live & (book.tstop > 0) & (held >= book.tstop), last, minute, "time_stop")
+    live &= book.side != 0
+
+    favorable = np.where(long_, last - book.entry, book.entry - last)
+    scratch = (book.scratch_min > 0) & (atr > 0) & (book.scratch_frac > 0) & (held >= book.scratch_min)
+    book.close(live & scratch & (favorable < book.scratch_frac * atr), last, minute, "scratch")
+    live &= book.side != 0
+
+    trail = live & book.trail & (atr > 0)
+    new_long = np.maximum(0.01, book.max_fav - book.trail_mult * atr)
+    new_short = np.maximum(0.01, book.min_fav + book.trail_mult * atr)
+    up = trail & long_ & ((book.stop <= 0) | (new_long > book.stop))
+    dn = trail & ~long_ & ((book.stop <= 0) | (new_short < book.stop))
+    book.stop = np.where(up, new_long, np.where(dn, new_short, book.stop))
+
+    hit_tp = np.where(long_, last >= book.tp, last <= book.tp) & (book.tp > 0)
+    part = live & book.partials & hit_tp
+    if part.any():
+        half = book.qty * 0.5
+        pnl = np.where(part, book.side * (last - book.entry) * half, 0.0)
+        book.realized += pnl.sum(axis=1)
+        book.trade_pnl += pnl
+        book.qty = np.where(part, book.qty - half, book.qty)
+        book.tp = np.where(part, 0.0, book.tp)
+        hit_tp &= ~part
+
+    hit_stop = np.where(long_, last <= book.stop, last >= book.stop) & (book.stop > 0)
+    book.close(live & hit_stop, last, minute, "stop_hit")
+    live &= book.side != 0
+
+    book.close(live & ~book.partials & hit_tp, last, minute, "take_profit")
+
+
+def _orders(book: _Book, day: DayArrays, t: int, kn: Dict[str, np.ndarray], equity: float) -> None:
+    """trade_executor's per-symbol intent loop: signal exits + entries, max_orders in rank order."""
+    last = day.last[t][None, :]
+    atr = day.atr[t][None, :]
+    minute = float(day.minutes[t])
+    sig = day.side[t][None, :].astype(np.int8)
+    conf = day.conf[t][None, :]
+
+    want = (sig != 0) & (day.size[t][None, :] > 0) & (conf >= kn["min_confidence"]) & (last > 0)
+    flip_block = (book.exit_side != 0) & (sig != book.exit_side) & (minute - book.exit_t < kn["min_flip_minutes"])
+    want &= ~flip_block
+
+    # Opposite intent on an open position → signal exit (SELL closes a long).
+    held = minute - book.entry_t
+    loss_pct = np.where(book.entry > 0, book.side * (last - book.entry) / np.where(book.entry > 0, book.entry, 1.0) * 100.0, 0.0)
+    can_exit = (held >= kn["min_hold_time_minutes"]) | (loss_pct <= -kn["hard_stop_loss_pct"])
+    exit_ = want & (book.side == -sig) & can_exit
+
+    # New entries from flat; SELL opens a short only with allow_shorts.
+    entry_ok = want & (book.side == 0) & ((sig > 0) | (kn["allow_shorts"] > 0))
+    stop_p = day.plan_stop[t][None, :]
+    tp_p = day.plan_tp[t][None, :]
+    has_r = np.isfinite(stop_p) & np.isfinite(tp_p) & (stop_p != 0) & (tp_p != 0) & (np.abs(last - stop_p) > 0)
+    expected_r = np.where(has_r, np.abs(tp_p - last) / np.where(has_r, np.abs(last - stop_p), 1.0), 1.0)
+    atr_pct = np.where(last > 0, atr / np.where(last > 0, last, 1.0) * 100.0, 0.0)
+    frac = _size_fraction(day.phit[t][None, :], expected_r, atr_pct, kn)
+    # A zero conviction size (e.g. p_hit < min_phit) falls back to
+    # _qty_from_size, exactly as execute_from_policy does.
+    fallback_qty = kn["default_qty"] * np.clip(day.size[t][None, :], 0.0, 1.0)
+    qty = np.where(frac > 0, np.maximum(1.0, np.floor(frac * equity / np.where(last > 0, last, 1.0))), fallback_qty)
+    entry_ok &= qty > 0
+
+    acts = exit_ | entry_ok
+    if not acts.any():
+        return
+    order = np.argsort(day.rank[t], kind="stable")
+    used = np.cumsum(acts[:, order], axis=1)
+    allowed = np.empty_like(acts)
+    allowed[:, order] = used <= kn["max_orders_per_cycle"]
+    acts &= allowed
+
+    book.close(acts & exit_, last, minute, "signal")
+
+    new = acts & entry_ok
+    if not new.any():
+        return
+    # _plan_risk: plan stop/tp first, ATR fallback when missing.
+    fb = (atr > 0) & (last > 0)
+    long_e = sig > 0
+    stop_fb = np.where(long_e, last - kn["fallback_stop_atr"] * atr, last + kn["fallback_stop_atr"] * atr)
+    tp_fb = np.where(long_e, last + kn["fallback_tp_atr"] * atr, last - kn["fallback_tp_atr"] * atr)
+    stop = np.where(np.isfinite(stop_p), stop_p, np.where(fb, np.maximum(0.01, stop_fb), 0.0))
+    tp = np.where(np.isfinite(tp_p), tp_p, np.where(fb, np.maximum(0.01, tp_fb), 0.0))
+
+    def _plan_or(arr: np.ndarray, knob: np.ndarray) -> np.ndarray:
+        return np.where(np.isfinite(arr[t][None, :]), arr[t][None, :], knob)
+
+    managed = new & (kn["enable_brackets"] > 0)
+    book.side = np.where(new, sig, book.side).astype(np.int8)
+    book.qty = np.where(new, qty, book.qty)
+    book.entry = np.where(new, last, book.entry)
+    book.entry_t = np.where(new, minute, book.entry_t)
+    book.max_fav = np.where(new, last, book.max_fav)
+    book.min_fav = np.where(new, last, book.min_fav)
+    book.trade_pnl = np.where(new, 0.0, book.trade_pnl)
+    book.managed = np.where(new, managed, book.managed)
+    book.stop = np.where(new, stop, book.stop)
+    book.tp = np.where(new, tp, book.tp)
+    book.tstop = np.where(new, np.nan_to_num(day.plan_time_stop[t][None, :], nan=0.0), book.tstop)
+    book.trail = np.where(new, day.plan_trail[t][None, :] > 0, book.trail)
+    book.partials = np.where(new, day.plan_partials[t][None, :] > 0, book.partials)
+    book.trail_mult = np.where(new, _plan_or(day.plan_trail_mult, kn["trail_atr_mult"]), book.trail_mult)
+    book.scratch_min = np.where(new, np.trunc(_plan_or(day.plan_scratch_min, kn["scratch_min"])), book.scratch_min)
+    book.scratch_frac = np.where(new, _plan_or(day.plan_scratch_frac, kn["scratch_atr_frac"]), book.scratch_frac)
+
+
+def simulate(
+    days: Sequence[DayArrays],
+    configs: Sequence[ExecutionConfig],
+    *,
+    equity: float = 100_000.0,
+) -> Dict[str, np.ndarray]:
+    """Run every config over `days` (in order). Returns per-config [K] arrays.
+
+    Keys: pnl, trades, wins, win_rate, expectancy, drawdown, plus
+    exits_<reason> counts. Positions still open after a day's last step
+    (no EOD flatten) are dropped, as the slow metrics only count closed
+    trades.
+    """
+    K = len(configs)
+    kn = _knob_columns(configs)
+    pnl = np.zeros(K)
+    trades = np.zeros(K, dtype=np.int64)
+    wins = np.zeros(K, dtype=np.int64)
+    reasons: Dict[str, np.ndarray] = {}
+    peak = np.zeros(K)
+    dd = np.zeros(K)
+
+    for day in days:
+        book = _Book(K, len(day.symbols))
+        for t in range(day.steps):
+            _process_exits(book, day, t, kn)
+            _orders(book, day, t, kn, float(equity))
+            curve = pnl + book.realized
+            peak = np.maximum(peak, curve)
+            dd = np.maximum(dd, peak - curve)
+        pnl += book.realized
+        trades += book.closes
+        wins += book.wins
+        for r, n in book.reasons.items():
+            reasons[r] = reasons.get(r, 0) + n
+
+    out = {
+        "pnl": pnl,
+        "trades": trades,
+        "wins": wins,
+        "win_rate": np.where(trades > 0, wins / np.maximum(trades, 1), 0.0),
+        "expectancy": np.where(trades > 0, pnl / np.maximum(trades, 1), 0.0),
+        "drawdown": dd,
+    }
+    out.update({f"exits_{r}": np.asarray(n, dtype=np.int64) for r, n in sorted(reasons.items())})
+    return out
+
+
+def sweep(
+    days: Sequence[DayArrays],
+    configs: Sequence[ExecutionConfig],
+    *,
+    equity: float = 100_000.0,
+    chunk: int = 1024,
+    sort_by: str = "pnl",
+) -> List[Dict[str, Any]]:
+    """simulate() in chunks of `chunk` configs; rows sorted by `sort_by` (desc)."""
+    rows: List[Dict[str, Any]] = []
+    t0 = time.time()
+    for i in range(0, len(configs), max(1, int(chunk))):
+        part = list(configs[i : i + max(1, int(chunk))])
+        res = simulate(days, part, equity=equity)
+        for k, cfg in enumerate(part):
+            row = {"index": i + k, "knobs": {f: getattr(cfg, f) for f in KNOB_FIELDS}}
+            row.update({name: arr[k].item() for name, arr in res.items()})
+            rows.append(row)
+    secs = time.time() - t0
+    rate = len(configs) / secs * 60.0 if secs > 0 else float("inf")
+    log(f"[fast_backtest] ⚡ {len(configs)} configs × {len(days)} days in {secs:.2f}s ({rate:,.0f}/min)")
+    rows.sort(key=lambda r: r.get(sort_by, 0.0), reverse=True)
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Validation against the slow path
+# ---------------------------------------------------------------------------
+
+
+def _slow_metrics(run_dir: Path, dates: Sequence[str], cfg: ExecutionConfig, step_minutes: int, max_symbols: Optional[int]) -> Dict[str, Any]:
+    from dt_backend.historical_replay.replay_metrics_dt import merge_metrics_from_trades
+    from dt_backend.historical_replay.replay_runner_dt import _configure_env, _trades_path
+    from dt_backend.historical_replay.step_replay_engine_dt import replay_intraday_day_step
+
+    paths: List[Path] = []
+    for day in dates:
+        env = _configure_env(run_dir, day)
+        old = {k: os.environ.get(k) for k in env}
+        os.environ.update(env)
+        try:
+            replay_intraday_day_step(date_str=day, step_minutes=step_minutes, max_symbols=max_symbols, exec_cfg=cfg)
+            paths.append(_trades_path(Path(env["DT_TRUTH_DIR"])))
+        finally:
+            for k, v in old.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+    return merge_metrics_from_trades(paths)
+
+
+def validate(
+    days: Sequence[DayArrays],
+    configs: Sequence[ExecutionConfig],
+    *,
+    sample: int = 3,
+    step_minutes: int = 5,
+    max_symbols: Optional[int] = None,
+    equity: float = 100_000.0,
+    seed: int = 0,
+    run_dir: Optional[Path] = None,
+    pnl_tolerance: float = 0.10,
+) -> Dict[str, Any]:
+    """Replay a random sample of `configs` through the slow step replay and compare.
+
+    A config passes when both paths close the same number of trades and the
+    PnL differs by at most pnl_tolerance × max(|slow pnl|, 1).
+    """
+    idx = sorted(random.Random(seed).sample(range(len(configs)), min(int(sample), len(configs))))
+    picked = [replace(configs[i], dry_run=False) for i in idx]
+    fast = simulate(days, picked, equity=equity)
+    dates = [d.date for d in days]
+    run_dir = Path(run_dir or (_arrays_dir().parent / "runs" / f"fast_validate_{int(time.time())}"))
+
+    rows: List[Dict[str, Any]] = []
+    for k, (i, cfg) in enumerate(zip(idx, picked)):
+        slow = _slow_metrics(run_dir / f"cfg_{i}", dates, cfg, step_minutes, max_symbols)
+        f_pnl, s_pnl = float(fast["pnl"][k]), float(slow.get("pnl") or 0.0)
+        f_n, s_n = int(fast["trades"][k]), int(slow.get("trades") or 0)
+        ok = f_n == s_n and abs(f_pnl - s_pnl) <= pnl_tolerance * max(abs(s_pnl), 1.0)
+        rows.append(
+            {
+                "index": i,
+                "knobs": {f: getattr(cfg, f) for f in KNOB_FIELDS},
+                "fast": {"pnl": f_pnl, "trades": f_n},
+                "slow": {"pnl": s_pnl, "trades": s_n},
+                "pnl_diff": f_pnl - s_pnl,
+                "ok": bool(ok),
+            }
+        )
+        log(f"[fast_backtest] 🔍 cfg {i}: fast pnl={f_pnl:.2f}/{f_n} slow pnl={s_pnl:.2f}/{s_n} {'✅' if ok else '⚠️'}")
+
+    report = {"dates": dates, "sampled": len(rows), "passed": sum(r["ok"] for r in rows), "rows": rows}
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / "validation.json").write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+    return report
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    import argparse
+    from datetime import date, timedelta
+
+    from dt_backend.engines.trade_executor import _cfg_from_env
+
+    ap = argparse.ArgumentParser(description="Vectorized intraday knob sweep over recorded replay days.")
+    ap.add_argument("--start", required=True, help="YYYY-MM-DD")
+    ap.add_argument("--end", required=True, help="YYYY-MM-DD")
+    ap.add_argument("--grid", required=True, help='JSON {"min_confidence": [0.3, 0.4], ...} or a path to one')
+    ap.add_argument("--step-minutes", type=int, default=5)
+    ap.add_argument("--max-symbols", type=int, default=None)
+    ap.add_argument("--equity", type=float, default=float(os.getenv("DT_BACKTEST_START_EQUITY", "100000") or 100000.0))
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--validate", type=int, default=0, help="replay N sampled configs through the slow path")
+    ap.add_argument("--refresh", action="store_true", help="re-record day arrays")
+    args = ap.parse_args(list(argv) if argv is not None else None)
+
+    grid_src = Path(args.grid)
+    grid = json.loads(grid_src.read_text(encoding="utf-8") if grid_src.exists() else args.grid)
+    configs = expand_grid(grid, _cfg_from_env())
+
+    days: List[DayArrays] = []
+    d, end = date.fromisoformat(args.start), date.fromisoformat(args.end)
+    while d <= end:
+        ds = d.isoformat()
+        try:
+            arr = load_day_arrays(ds, step_minutes=args.step_minutes, max_symbols=args.max_symbols, refresh=args.refresh)
+            if arr.steps:
+                days.append(arr)
+        except Exception as e:
+            log(f"[fast_backtest] ⚠️ {ds}: no arrays ({e})")
+        d += timedelta(days=1)
+    if not days:
+        raise SystemExit("no replay days with data in range")
+
+    rows = sweep(days, configs, equity=args.equity)
+    print(json.dumps(rows[: max(1, args.top)], indent=2, default=str))
+    if args.validate:
+        report = validate(
+            days, configs, sample=args.validate, step_minutes=args.step_minutes, max_symbols=args.max_symbols, equity=args.equity
+        )
+        print(json.dumps({k: v for k, v in report.items() if k != "rows"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-# dt_backend/engines/feature_engineering.py — v3.2
+# dt_backend/engines/feature_engineering.py — v3.3
 """Intraday feature engineering for AION dt_backend.
 
 Phase 1: "the bot's senses"
@@ -24,6 +24,22 @@ v3.2 additions
 • Candidate universe support:
     build_intraday_features(symbols=[...], max_symbols=...)
   so the fast-lane / slow-lane orchestrator can scope work per cycle.
+
+v3.3 additions
+--------------
+• _ohlcv_from_bars(bars, sym=..., tf=...) reads NumPy column views from the
+  columnar bar store (bar_store_dt) when it holds exactly the window the
+  rolling bars describe, skipping per-bar ISO parsing and re-sorting.
+  Falls back to the dict path otherwise (replay, backfills, DT_BAR_STORE=0).
+• Batched engine (_feature_snapshots_batch): stacks every symbol into padded
+  (S, T) arrays and computes all indicators in one vectorized pass via
+  indicators_batch. Output matches _feature_snapshot_for_symbol.
+    DT_FEATURES_BATCH = "1" (default) batched, "0" per-symbol scalar path
+• Streaming indicators (streaming_indicators): with DT_FEATURES_STREAMING=1,
+  vwap / vwap_slope / atr_14 / realized_vol / ema_9 / rsi_14 come from the
+  session-anchored state the live bars loop advances, when that state has
+  consumed exactly the bars being scored (same count, same last bar).
+  Other features still use bars.
 """
 
 from __future__ import annotations
@@ -38,7 +54,12 @@ try:
 except Exception:  # pragma: no cover
     ZoneInfo = None  # type: ignore
 
+import numpy as np
+
+from dt_backend.core.bar_store_dt import bar_store_enabled, get_bar_store, parse_ts_epoch
 from dt_backend.core.data_pipeline_dt import _read_rolling, save_rolling, ensure_symbol_node, log
+from dt_backend.engines import indicators_batch as vb
+from dt_backend.engines.streaming_indicators import current_features as _streaming_current
 from dt_backend.engines.indicators import (
     atr,
     bollinger_width,
@@ -116,9 +137,60 @@ def _extract_bars(node: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
     return bars if isinstance(bars, list) else []
 
 
+def _tf_for_key(key: str) -> str:
+    return "5Min" if key == "bars_intraday_5m" else "1Min"
+
+
+def _ohlcv_from_store(bars: List[Dict[str, Any]], sym: str, tf: str) -> Optional[Tuple[np.ndarray, ...]]:
+    """Column views from the bar store covering the same window as `bars`.
+
+    `bars` is the rolling list (kept sorted + de-duplicated by the fetcher).
+    Only its first and last timestamps are parsed; the store window is used
+    only when it matches exactly in length and both endpoints.
+    """
+    if not bars or not bar_store_enabled():
+        return None
+    first = bars[0] if isinstance(bars[0], dict) else {}
+    last = bars[-1] if isinstance(bars[-1], dict) else {}
+    t0 = parse_ts_epoch(first.get("ts") or first.get("t"))
+    t1 = parse_ts_epoch(last.get("ts") or last.get("t"))
+    if t0 is None or t1 is None:
+        return None
+    try:
+        arr = get_bar_store().tail(sym, tf, len(bars), end_ts=t1)
+    except Exception:
+        return None
+    if len(arr) != len(bars) or int(arr.ts[0]) != t0 or int(arr.ts[-1]) != t1:
+        return None
+    return arr.as_tuple()
+
+
+def _scalar_cols(cols: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Value columns → Python lists for the scalar indicator helpers.
+
+    The scalar helpers iterate element by element, which is much slower on
+    NumPy arrays than on lists; one bulk .tolist() per column is cheap.
+    `ts` (last element) is left as-is.
+    """
+    return tuple(x.tolist() if isinstance(x, np.ndarray) else x for x in cols[:-1]) + (cols[-1],)
+
+
 def _ohlcv_from_bars(
-    bars: List[Dict[str, Any]]
-) -> Tuple[List[float], List[float], List[float], List[float], List[float], List[float], List[datetime]]:
+    bars: List[Dict[str, Any]],
+    sym: Optional[str] = None,
+    tf: Optional[str] = None,
+) -> Tuple[Any, Any, Any, Any, Any, Any, Any]:
+    """(o, h, l, c, v, vw, ts) for a bar list, oldest → newest.
+
+    With `sym`/`tf` the columnar bar store is tried first; its columns are
+    NumPy float64 arrays and `ts` is int64 epoch seconds. The dict path
+    returns lists and `ts` as UTC datetimes.
+    """
+    if sym and tf:
+        cols = _ohlcv_from_store(bars, sym, tf)
+        if cols is not None:
+            return cols
+
     o: List[float] = []
     h: List[float] = []
     l: List[float] = []
@@ -188,11 +260,17 @@ def _session_vwap_series(highs: List[float], lows: List[float], closes: List[flo
     return out
 
 
-def _opening_range(ts: List[datetime], highs: List[float], lows: List[float], minutes: int, *, open_utc: datetime) -> Tuple[float, float]:
-    if not ts or not highs or not lows:
+def _opening_range(ts: Any, highs: Any, lows: Any, minutes: int, *, open_utc: datetime) -> Tuple[float, float]:
+    if len(ts) == 0 or len(highs) == 0 or len(lows) == 0:
         return 0.0, 0.0
     end_utc = open_utc + timedelta(minutes=max(1, int(minutes)))
 
+    if isinstance(ts, np.ndarray):
+        m = (ts >= open_utc.timestamp()) & (ts < end_utc.timestamp())
+        if not m.any():
+            return 0.0, 0.0
+        return float(np.max(np.asarray(highs)[m]) or 0.0), float(np.min(np.asarray(lows)[m]) or 0.0)
+
     or_high = None
     or_low = None
     for i, t in enumerate(ts):
@@ -241,7 +319,7 @@ def _market_proxy_features(rolling: Dict[str, Any], proxies: List[str], tf_key:
             continue
 
         bars = _extract_bars(node, bars_key)
-        o, h, l, c, v, vw, ts = _ohlcv_from_bars(bars)
+        o, h, l, c, v, vw, ts = _scalar_cols(_ohlcv_from_bars(bars, sym, _tf_for_key(bars_key)))
         if len(c) < 25:
             continue
 
@@ -318,26 +396,33 @@ def _feature_snapshot_for_symbol(
     else:
         used_tf = tf_key
 
-    o, h, l, c, v, vw, ts = _ohlcv_from_bars(bars)
+    o, h, l, c, v, vw, ts = _scalar_cols(_ohlcv_from_bars(bars, sym, used_tf))
     if len(c) < 15:
         return {}
 
-    rets = [pct_change(c[i], c[i - 1]) for i in range(1, len(c))]
-    rv = realized_vol(rets)
+    stream = _streaming_values(sym, used_tf, ts)
+    if stream is not None:
+        rv = stream["realized_vol"]
+        vwap_last = stream["vwap"]
+        vwap_slope = stream["vwap_slope"]
+        a14 = stream["atr_14"]
+    else:
+        rets = [pct_change(c[i], c[i - 1]) for i in range(1, len(c))]
+        rv = realized_vol(rets)
+
+        vwap_s = _session_vwap_series(h, l, c, v)
+        if not vwap_s:
+            return {}  # no meaningful vwap -> no meaningful features
 
-    vwap_s = _session_vwap_series(h, l, c, v)
-    if not vwap_s:
-        return {}  # no meaningful vwap -> no meaningful features
+        vwap_last = vwap_s[-1]
+        vwap_slope = lin_slope(vwap_s, window=min(20, len(vwap_s)))
 
-    vwap_last = vwap_s[-1]
+        a14 = atr(h, l, c, window=14)
     vwap_dist = pct_change(c[-1], vwap_last)
-    vwap_slope = lin_slope(vwap_s, window=min(20, len(vwap_s)))
-
-    a14 = atr(h, l, c, window=14)
 
     one_min_bars = _extract_bars(node, "bars_intraday")
     if one_min_bars:
-        o1, h1, l1, c1, v1, vw1, ts1 = _ohlcv_from_bars(one_min_bars)
+        o1, h1, l1, c1, v1, vw1, ts1 = _scalar_cols(_ohlcv_from_bars(one_min_bars, sym, "1Min"))
     else:
         o1, h1, l1, c1, v1, vw1, ts1 = ([], [], [], [], [], [], [])
 
@@ -345,7 +430,9 @@ def _feature_snapshot_for_symbol(
     use_h = h1 if len(h1) >= 30 else h
     use_l = l1 if len(l1) >= 30 else l
 
-    base_ts = use_ts[0] if use_ts else now_utc
+    base_ts = use_ts[0] if len(use_ts) else now_utc
+    if isinstance(base_ts, (int, np.integer)):
+        base_ts = datetime.fromtimestamp(int(base_ts), tz=timezone.utc)
     if base_ts.tzinfo is None:
         base_ts = base_ts.replace(tzinfo=timezone.utc)
     else:
@@ -368,8 +455,8 @@ def _feature_snapshot_for_symbol(
     rel_vol = (v[-1] / vol_avg) if vol_avg > 0 else 0.0
 
     sma_20 = sma(c, 20)
-    ema_9 = ema(c, 9)
-    rsi_14 = rsi(c, 14)
+    ema_9 = stream["ema_9"] if stream is not None else ema(c, 9)
+    rsi_14 = stream["rsi_14"] if stream is not None else rsi(c, 14)
     sd_20 = stddev(c[-20:]) if len(c) >= 20 else 0.0
 
     last_price = c[-1]
@@ -426,14 +513,233 @@ def _feature_snapshot_for_symbol(
     return feat
 
 
+def _streaming_values(sym: str, tf: str, ts: Any) -> Optional[Dict[str, float]]:
+    """Streaming indicator values for sym/tf if state covers exactly the bars in `ts`."""
+    if len(ts) == 0:
+        return None
+    t = ts[-1]
+    last = int(t) if isinstance(t, (int, np.integer)) else int(_as_utc_dt(t).timestamp())
+    return _streaming_current(sym, tf, last, len(ts))
+
+
+def _features_batch_enabled() -> bool:
+    return str(os.getenv("DT_FEATURES_BATCH", "1")).strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def _epoch_seq(ts: Any) -> Any:
+    if isinstance(ts, np.ndarray):
+        return ts.astype(np.float64)
+    return [t.timestamp() for t in ts]
+
+
+def _as_utc_dt(t: Any) -> datetime:
+    if isinstance(t, datetime):
+        return t if t.tzinfo is not None else t.replace(tzinfo=timezone.utc)
+    return datetime.fromtimestamp(int(t), tz=timezone.utc)
+
+
+def _feature_snapshots_batch(
+    entries: List[Tuple[str, Dict[str, Any]]],
+    *,
+    tf_key: str,
+    mkt: Dict[str, float],
+    now_utc: datetime,
+) -> Dict[str, Dict[str, Any]]:
+    """Vectorized _feature_snapshot_for_symbol over many symbols at once.
+
+    Bar selection (primary/fallback timeframe, 1Min opening-range source)
+    is per symbol; every indicator is then one pass over padded (S, T)
+    arrays. Symbols the scalar path would skip are omitted.
+    """
+    primary_key = "bars_intraday_5m" if tf_key == "5Min" else "bars_intraday"
+    fallback_key = "bars_intraday" if primary_key == "bars_intraday_5m" else "bars_intraday_5m"
+
+    syms: List[str] = []
+    streams: List[Optional[Dict[str, float]]] = []
+    ctxs: List[Any] = []
+    used_tfs: List[str] = []
+    H_s: List[Any] = []
+    L_s: List[Any] = []
+    C_s: List[Any] = []
+    V_s: List[Any] = []
+    or_ts: List[Any] = []
+    or_h: List[Any] = []
+    or_l: List[Any] = []
+    opens: List[float] = []
+
+    for sym, node in entries:
+        bars = _extract_bars(node, primary_key)
+        if len(bars) < 15:
+            bars = _extract_bars(node, fallback_key)
+            if len(bars) < 15:
+                continue
+            used_tf = "1Min" if fallback_key == "bars_intraday" else "5Min"
+        else:
+            used_tf = tf_key
+
+        o, h, l, c, v, vw, ts = _ohlcv_from_bars(bars, sym, used_tf)
+        if len(c) < 15:
+            continue
+
+        one_min_bars = _extract_bars(node, "bars_intraday")
+        if one_min_bars:
+            _o1, h1, l1, _c1, _v1, _vw1, ts1 = _ohlcv_from_bars(one_min_bars, sym, "1Min")
+        else:
+            h1, l1, ts1 = [], [], []
+        use_ts, use_h, use_l = (ts1, h1, l1) if len(ts1) >= 30 else (ts, h, l)
+
+        syms.append(sym)
+        streams.append(_streaming_values(sym, used_tf, ts))
+        ctxs.append(node.get("context_dt") or {})
+        used_tfs.append(used_tf)
+        H_s.append(h)
+        L_s.append(l)
+        C_s.append(c)
+        V_s.append(v)
+        or_ts.append(_epoch_seq(use_ts))
+        or_h.append(use_h)
+        or_l.append(use_l)
+        opens.append(_market_open_utc_for(_as_utc_dt(use_ts[0])).timestamp())
+
+    if not syms:
+        return {}
+
+    H, lens = vb.stack_padded(H_s)
+    Lo, _ = vb.stack_padded(L_s)
+    C, _ = vb.stack_padded(C_s)
+    V, _ = vb.stack_padded(V_s)
+    ORT, or_lens = vb.stack_padded(or_ts)
+    ORH, _ = vb.stack_padded(or_h)
+    ORL, _ = vb.stack_padded(or_l)
+    open_arr = np.asarray(opens, dtype=np.float64)
+
+    last_price = vb.last(C, lens)
+    open_price = vb.first(C)
+    TR = vb.true_range(H, Lo, C)
+
+    # Indicators the streaming state can serve are computed only for rows
+    # without current state.
+    rv = np.zeros(lens.shape, dtype=np.float64)
+    vwap_last = np.zeros(lens.shape, dtype=np.float64)
+    vwap_slope = np.zeros(lens.shape, dtype=np.float64)
+    a14 = np.zeros(lens.shape, dtype=np.float64)
+    ema_9 = np.zeros(lens.shape, dtype=np.float64)
+    rsi_14 = np.zeros(lens.shape, dtype=np.float64)
+    need = np.flatnonzero([st is None for st in streams])
+    if need.size:
+        sub: Any = slice(None) if need.size == len(syms) else need
+        Cn, ln = C[sub], lens[sub]
+        rv[sub] = vb.realized_vol(vb.returns(Cn), ln)
+        VW = vb.session_vwap_series(H[sub], Lo[sub], Cn, V[sub], ln)
+        vwap_last[sub] = vb.last(VW, ln)
+        vwap_slope[sub] = vb.lin_slope(VW, ln, np.minimum(20, ln))
+        a14[sub] = vb.atr(TR[sub], ln, 14)
+        ema_9[sub] = vb.ema(Cn, ln, 9)
+        rsi_14[sub] = vb.rsi(Cn, ln, 14)
+    for i, st in enumerate(streams):
+        if st is not None:
+            rv[i] = st["realized_vol"]
+            vwap_last[i] = st["vwap"]
+            vwap_slope[i] = st["vwap_slope"]
+            a14[i] = st["atr_14"]
+            ema_9[i] = st["ema_9"]
+            rsi_14[i] = st["rsi_14"]
+    vwap_dist = vb.pct_change(last_price, vwap_last)
+
+    or5_h, or5_l = vb.masked_range(ORT, ORH, ORL, or_lens, open_arr, open_arr + 5 * 60.0)
+    or15_h, or15_l = vb.masked_range(ORT, ORH, ORL, or_lens, open_arr, open_arr + 15 * 60.0)
+
+    # _trend_structure
+    has_trend = lens >= 25
+    sma_20 = vb.sma(C, lens, 20)
+    sma_20_prev = np.where(lens > 21, vb.sma(C, lens, 20, shift=1), sma_20)
+    ma_slope = np.where(has_trend, vb.pct_change(sma_20, sma_20_prev), 0.0)
+    hh = np.where(has_trend & (vb.last(H, lens) > vb.rolling_max_prior(H, lens, 10)), 1.0, 0.0)
+    hl = np.where(has_trend & (vb.last(Lo, lens) > vb.rolling_min_prior(Lo, lens, 10)), 1.0, 0.0)
+    trend_score = np.where(has_trend, np.where(ma_slope > 0, 1.0, -1.0) * (0.5 + 0.25 * hh + 0.25 * hl), 0.0)
+
+    bb_w = vb.bollinger_width(C, lens, 20, 2.0)
+    kc_w = vb.keltner_width(C, TR, lens, 20, 1.5)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        squeeze_ratio = np.where(kc_w > 0, bb_w / kc_w, 0.0)
+    squeeze_on = np.where((kc_w > 0) & (bb_w > 0) & (bb_w < kc_w), 1.0, 0.0)
+
+    vol_win = np.minimum(20, lens)
+    vol_avg = vb.window_sum(V, lens, vol_win) / np.maximum(vol_win, 1).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel_vol = np.where(vol_avg > 0, vb.last(V, lens) / vol_avg, 0.0)
+
+    sd_20 = vb.window_stddev(C, lens, 20)
+    sma20_dist = np.where(sma_20 != 0, vb.pct_change(last_price, sma_20), 0.0)
+    pct_from_open = vb.pct_change(last_price, open_price)
+
+    ts_txt = now_utc.isoformat(timespec="seconds").replace("+00:00", "Z")
+    out: Dict[str, Dict[str, Any]] = {}
+    for i, sym in enumerate(syms):
+        lp = float(last_price[i])
+        o5h, o5l, o15h, o15l = float(or5_h[i]), float(or5_l[i]), float(or15_h[i]), float(or15_l[i])
+        feat: Dict[str, Any] = {
+            "ts": ts_txt,
+            "tf": used_tfs[i],
+            "last_price": lp,
+            "pct_chg_from_open": float(pct_from_open[i]),
+
+            "vwap": float(vwap_last[i]),
+            "vwap_dist": float(vwap_dist[i]),
+            "vwap_slope": float(vwap_slope[i]),
+
+            "atr_14": float(a14[i]),
+            "realized_vol": float(rv[i]),
+
+            "or5_high": o5h,
+            "or5_low": o5l,
+            "or15_high": o15h,
+            "or15_low": o15l,
+            "or5_break": float(1.0 if (o5h and lp > o5h) else (-1.0 if (o5l and lp < o5l) else 0.0)),
+            "or15_break": float(1.0 if (o15h and lp > o15h) else (-1.0 if (o15l and lp < o15l) else 0.0)),
+
+            "ma_slope": float(ma_slope[i]),
+            "hh": float(hh[i]),
+            "hl": float(hl[i]),
+            "trend_score": float(trend_score[i]),
+
+            "bb_width": float(bb_w[i]),
+            "kc_width": float(kc_w[i]),
+            "squeeze_ratio": float(squeeze_ratio[i]),
+            "squeeze_on": float(squeeze_on[i]),
+
+            "rel_volume": float(rel_vol[i]),
+
+            "sma_20": float(sma_20[i]),
+            "ema_9": float(ema_9[i]),
+            "rsi_14": float(rsi_14[i]),
+            "sd_20": float(sd_20[i]),
+            "sma20_dist": float(sma20_dist[i]),
+
+            **mkt,
+        }
+
+        ctx = ctxs[i]
+        if isinstance(ctx, dict):
+            for k, v_ in ctx.items():
+                if k in feat:
+                    continue
+                feat[k] = v_
+
+        out[sym] = feat
+    return out
+
+
 def build_intraday_features(
     max_symbols: int | None = None,
     *,
     symbols: Any = None,
     now_utc: datetime | None = None,
-    ignore_min_interval: bool = False
+    ignore_min_interval: bool = False,
+    rolling_override: Dict[str, Any] | None = None,
+    save: bool = True,
 ) -> Dict[str, Any]:
-    rolling = _read_rolling() or {}
+    rolling = rolling_override if isinstance(rolling_override, dict) else (_read_rolling() or {})
     if not isinstance(rolling, dict) or not rolling:
         log("[dt_features] ⚠️ rolling empty, nothing to do.")
         return {"symbols": 0, "updated": 0}
@@ -455,6 +761,7 @@ def build_intraday_features(
 
     updated = 0
     skipped = 0
+    todo: List[Tuple[str, Dict[str, Any]]] = []
     for sym, node_raw in items:
         node = ensure_symbol_node(rolling, sym)
 
@@ -469,7 +776,28 @@ def build_intraday_features(
                     skipped += 1
                     continue
 
+        todo.append((sym, node))
+
+    feats: Dict[str, Dict[str, Any]] = {}
+    if _features_batch_enabled() and todo:
+        try:
+            feats = _feature_snapshots_batch(todo, tf_key=tf_key, mkt=mkt, now_utc=now_utc)
+        except Exception as e:
+            log(f"[dt_features] ⚠️ batch engine failed, falling back to per-symbol path: {e}")
+            feats = {}
+            todo_scalar = todo
+        else:
+            todo_scalar = []
+    else:
+        todo_scalar = todo
+
+    for sym, node in todo_scalar:
         feat = _feature_snapshot_for_symbol(sym, node, rolling=rolling, tf_key=tf_key, mkt=mkt, now_utc=now_utc)
+        if feat:
+            feats[sym] = feat
+
+    for sym, node in todo:
+        feat = feats.get(sym)
         if not feat:
             continue
 
@@ -478,6 +806,7 @@ def build_intraday_features(
         rolling[sym] = node
         updated += 1
 
-    save_rolling(rolling)
+    if save:
+        save_rolling(rolling)
     log(f"[dt_features] ✅ updated features_dt for {updated} symbols (skipped={skipped}) tf={tf_key}.")
     return {"symbols": len(items), "updated": updated, "skipped": skipped, "tf": tf_key}
@@ -0,0 +1,324 @@
+# dt_backend/engines/indicators_batch.py — v1.0
+"""
+Vectorized multi-symbol counterparts of dt_backend.engines.indicators.
+
+Layout:
+  • Series for S symbols are stacked LEFT-aligned into padded (S, T) float64
+    arrays (see `stack_padded`), with per-symbol lengths `lens` (S,).
+    Row r holds its bars in [0, lens[r]); the tail is NaN padding.
+  • Every function returns one value per symbol, shape (S,), and follows the
+    scalar helper it mirrors step for step: the same guards, the same
+    defaults, and the same left-to-right accumulation order, looping over
+    time/window positions while vectorizing across symbols.
+
+Accumulating in the scalar order (instead of np.sum's pairwise summation)
+is what keeps batch results numerically identical to the per-symbol path.
+"""
+from __future__ import annotations
+
+from typing import Any, List, Sequence, Tuple, Union
+
+import numpy as np
+
+IntLike = Union[int, np.ndarray]
+
+
+# ---------------------------------------------------------------------------
+# Layout helpers
+# ---------------------------------------------------------------------------
+
+def stack_padded(series: Sequence[Sequence[float]], *, dtype: Any = np.float64, fill: float = np.nan) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack ragged series into a left-aligned (S, T) array + lengths (S,)."""
+    lens = np.fromiter((len(s) for s in series), dtype=np.int64, count=len(series))
+    width = int(lens.max()) if lens.size else 0
+    out = np.full((len(series), max(1, width)), fill, dtype=dtype)
+    for r, s in enumerate(series):
+        n = int(lens[r])
+        if n:
+            out[r, :n] = np.asarray(s, dtype=dtype)
+    return out, lens
+
+
+def _rows(X: np.ndarray) -> np.ndarray:
+    return np.arange(X.shape[0])
+
+
+def take_at(X: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """X[r, idx[r]] with out-of-range indices clipped (callers mask them)."""
+    return X[_rows(X), np.clip(idx, 0, X.shape[1] - 1)]
+
+
+def last(X: np.ndarray, lens: np.ndarray) -> np.ndarray:
+    return take_at(X, lens - 1)
+
+
+def first(X: np.ndarray) -> np.ndarray:
+    return X[:, 0].copy()
+
+
+def pct_change(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(a / b - 1) with the same zero/non-finite guards as indicators.pct_change."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    ok = (b != 0.0) & np.isfinite(a) & np.isfinite(b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = (a / np.where(ok, b, 1.0)) - 1.0
+    return np.where(ok, out, 0.0)
+
+
+def window_sum(X: np.ndarray, lens: np.ndarray, window: IntLike, *, shift: int = 0) -> np.ndarray:
+    """Sequential sum of X[r, end-window : end] where end = lens[r] - shift."""
+    W = np.broadcast_to(np.asarray(window, dtype=np.int64), lens.shape)
+    end = lens - int(shift)
+    acc = np.zeros(lens.shape, dtype=np.float64)
+    kmax = int(W.max()) if W.size else 0
+    for k in range(kmax):
+        idx = end - W + k
+        ok = (k < W) & (idx >= 0)
+        acc += np.where(ok, take_at(X, idx), 0.0)
+    return acc
+
+
+def prefix_sum(X: np.ndarray, lens: np.ndarray, *, start: int = 0) -> np.ndarray:
+    """Sequential sum of X[r, start:lens[r]]."""
+    acc = np.zeros(lens.shape, dtype=np.float64)
+    for t in range(int(start), X.shape[1]):
+        acc += np.where(t < lens, X[:, t], 0.0)
+    return acc
+
+
+# ---------------------------------------------------------------------------
+# Moving averages
+# ---------------------------------------------------------------------------
+
+def sma(X: np.ndarray, lens: np.ndarray, window: int, *, shift: int = 0) -> np.ndarray:
+    """indicators.sma on X[r, :lens[r]-shift]; 0.0 when not enough data."""
+    n = lens - int(shift)
+    s = window_sum(X, lens, window, shift=shift)
+    return np.where((window > 0) & (n >= window), s / float(window), 0.0)
+
+
+def ema(X: np.ndarray, lens: np.ndarray, window: int) -> np.ndarray:
+    """indicators.ema: mean of all values if fewer than `window`, else recursive EMA."""
+    out = np.zeros(lens.shape, dtype=np.float64)
+    if window <= 0:
+        return out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_all = prefix_sum(X, lens) / lens.astype(np.float64)
+    alpha = 2.0 / (window + 1.0)
+    e = X[:, 0].copy()
+    for t in range(1, X.shape[1]):
+        e = np.where(t < lens, alpha * X[:, t] + (1.0 - alpha) * e, e)
+    out = np.where(lens < window, mean_all, e)
+    return np.where(lens > 0, out, 0.0)
+
+
+# ---------------------------------------------------------------------------
+# Volatility & returns
+# ---------------------------------------------------------------------------
+
+def window_stddev(X: np.ndarray, lens: np.ndarray, window: int) -> np.ndarray:
+    """indicators.stddev(values[-window:]) for rows with lens >= window (else 0.0)."""
+    if window < 2:
+        return np.zeros(lens.shape, dtype=np.float64)
+    mu = window_sum(X, lens, window) / float(window)
+    acc = np.zeros(lens.shape, dtype=np.float64)
+    for k in range(window):
+        idx = lens - window + k
+        x = take_at(X, idx)
+        acc += np.where(idx >= 0, (x - mu) ** 2, 0.0)
+    var = acc / float(max(window - 1, 1))
+    sd = np.sqrt(np.maximum(0.0, var))
+    return np.where(lens >= window, sd, 0.0)
+
+
+def returns(C: np.ndarray) -> np.ndarray:
+    """R[:, t] = pct_change(C[:, t], C[:, t-1]) for t >= 1; column 0 is NaN."""
+    R = np.full(C.shape, np.nan, dtype=np.float64)
+    if C.shape[1] > 1:
+        R[:, 1:] = pct_change(C[:, 1:], C[:, :-1])
+    return R
+
+
+def realized_vol(R: np.ndarray, lens: np.ndarray) -> np.ndarray:
+    """indicators.realized_vol over R[r, 1:lens[r]] (the returns of a close series)."""
+    n = lens - 1
+    nf = np.maximum(n, 1).astype(np.float64)
+    mu = prefix_sum(R, lens, start=1) / nf
+    acc = np.zeros(lens.shape, dtype=np.float64)
+    for t in range(1, R.shape[1]):
+        acc += np.where(t < lens, (R[:, t] - mu) ** 2, 0.0)
+    var = acc / np.maximum(n - 1, 1).astype(np.float64)
+    var = np.where(var < 0.0, 0.0, var)
+    return np.where(n >= 2, np.sqrt(var), 0.0)
+
+
+def true_range(H: np.ndarray, Lo: np.ndarray, C: np.ndarray) -> np.ndarray:
+    """TR[:, t] = max(h-l, |h-prev_c|, |l-prev_c|) for t >= 1; column 0 is NaN."""
+    TR = np.full(C.shape, np.nan, dtype=np.float64)
+    if C.shape[1] > 1:
+        h = H[:, 1:]
+        lo = Lo[:, 1:]
+        pc = C[:, :-1]
+        TR[:, 1:] = np.maximum(np.maximum(h - lo, np.abs(h - pc)), np.abs(lo - pc))
+    return TR
+
+
+def atr(TR: np.ndarray, lens: np.ndarray, window: int) -> np.ndarray:
+    """indicators.atr given a precomputed true-range matrix."""
+    n_tr = lens - 1
+    w = np.minimum(window, n_tr)
+    s = window_sum(TR, lens, np.maximum(w, 0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = s / np.maximum(w, 1).astype(np.float64)
+    return np.where((lens >= 2) & (window > 0) & (w > 0), out, 0.0)
+
+
+def lin_slope(Y: np.ndarray, lens: np.ndarray, window: IntLike) -> np.ndarray:
+    """indicators.lin_slope over the last `window` points (per-row window allowed)."""
+    W = np.broadcast_to(np.asarray(window, dtype=np.int64), lens.shape)
+    n = W.astype(np.float64)
+    sx = (n - 1) * n / 2.0
+    sxx = (n - 1) * n * (2 * n - 1) / 6.0
+    sy = window_sum(Y, lens, W)
+    sxy = np.zeros(lens.shape, dtype=np.float64)
+    kmax = int(W.max()) if W.size else 0
+    for k in range(kmax):
+        idx = lens - W + k
+        ok = (k < W) & (idx >= 0)
+        sxy += np.where(ok, k * take_at(Y, idx), 0.0)
+    denom = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = (n * sxy - sx * sy) / denom
+    valid = (W > 1) & (lens >= W) & (denom != 0.0)
+    return np.where(valid, out, 0.0)
+
+
+def bollinger_width(C: np.ndarray, lens: np.ndarray, window: int = 20, n_std: float = 2.0) -> np.ndarray:
+    if window <= 1:
+        return np.zeros(lens.shape, dtype=np.float64)
+    mid = window_sum(C, lens, window) / float(window)
+    sd = window_stddev(C, lens, window)
+    upper = mid + n_std * sd
+    lower = mid - n_std * sd
+    return np.where(lens >= window, np.maximum(0.0, upper - lower), 0.0)
+
+
+def keltner_width(C: np.ndarray, TR: np.ndarray, lens: np.ndarray, window: int = 20, atr_mult: float = 1.5) -> np.ndarray:
+    if window <= 1:
+        return np.zeros(lens.shape, dtype=np.float64)
+    mid = ema(C, lens, window)
+    a = atr(TR, lens, window)
+    upper = mid + atr_mult * a
+    lower = mid - atr_mult * a
+    return np.where(lens >= window, np.maximum(0.0, upper - lower), 0.0)
+
+
+def session_vwap_series(H: np.ndarray, Lo: np.ndarray, C: np.ndarray, V: np.ndarray, lens: np.ndarray) -> np.ndarray:
+    """feature_engineering._session_vwap_series for every row (cumulative typical-price VWAP)."""
+    S, T = C.shape
+    out = np.full((S, T), np.nan, dtype=np.float64)
+    cum_pv = np.zeros(S, dtype=np.float64)
+    cum_v = np.zeros(S, dtype=np.float64)
+    for t in range(T):
+        active = t < lens
+        vv = V[:, t]
+        tp = (H[:, t] + Lo[:, t] + C[:, t]) / 3.0
+        add = active & (vv > 0)
+        cum_pv = np.where(add, cum_pv + tp * vv, cum_pv)
+        cum_v = np.where(add, cum_v + vv, cum_v)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cur = np.where(cum_v > 0, cum_pv / cum_v, tp)
+        out[:, t] = np.where(active, cur, np.nan)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# RSI
+# ---------------------------------------------------------------------------
+
+def rsi(C: np.ndarray, lens: np.ndarray, window: int = 14) -> np.ndarray:
+    """indicators.rsi (Wilder) for every row; 50.0 when not enough data."""
+    S, T = C.shape
+    if window <= 0:
+        return np.full(S, 50.0)
+
+    D = np.zeros((S, T), dtype=np.float64)
+    if T > 1:
+        D[:, 1:] = C[:, 1:] - C[:, :-1]
+    G = np.where(D >= 0, D, 0.0)
+    Ls = np.where(D >= 0, 0.0, -D)
+
+    # gains[i] in the scalar code is the diff at t = i + 1.
+    ag = np.zeros(S, dtype=np.float64)
+    al = np.zeros(S, dtype=np.float64)
+    for t in range(1, min(window, T - 1) + 1):
+        ag += G[:, t]
+        al += Ls[:, t]
+    ag = ag / float(window)
+    al = al / float(window)
+
+    for t in range(window + 1, T):
+        active = t < lens
+        ag = np.where(active, (ag * (window - 1) + G[:, t]) / float(window), ag)
+        al = np.where(active, (al * (window - 1) + Ls[:, t]) / float(window), al)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = ag / al
+        val = 100.0 - (100.0 / (1.0 + rs))
+    val = np.clip(val, 0.0, 100.0)
+    val = np.where(al == 0.0, 100.0, val)
+    return np.where(lens <= window, 50.0, val)
+
+
+def rolling_max_prior(X: np.ndarray, lens: np.ndarray, window: int) -> np.ndarray:
+    """max(X[r, lens-window-1 : lens-1]) — the `window` bars before the last one."""
+    acc = np.full(lens.shape, -np.inf)
+    for k in range(window):
+        idx = lens - 1 - window + k
+        acc = np.where(idx >= 0, np.maximum(acc, take_at(X, idx)), acc)
+    return acc
+
+
+def rolling_min_prior(X: np.ndarray, lens: np.ndarray, window: int) -> np.ndarray:
+    acc = np.full(lens.shape, np.inf)
+    for k in range(window):
+        idx = lens - 1 - window + k
+        acc = np.where(idx >= 0, np.minimum(acc, take_at(X, idx)), acc)
+    return acc
+
+
+def masked_range(TS: np.ndarray, H: np.ndarray, Lo: np.ndarray, lens: np.ndarray, start: np.ndarray, end: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(max high, min low) over bars with start <= ts < end; (0.0, 0.0) when none."""
+    valid = np.arange(TS.shape[1])[None, :] < lens[:, None]
+    m = valid & (TS >= start[:, None]) & (TS < end[:, None])
+    any_m = m.any(axis=1)
+    hi = np.where(m, H, -np.inf).max(axis=1)
+    lo = np.where(m, Lo, np.inf).min(axis=1)
+    return np.where(any_m, hi, 0.0), np.where(any_m, lo, 0.0)
+
+
+__all__: List[str] = [
+    "stack_padded",
+    "take_at",
+    "last",
+    "first",
+    "pct_change",
+    "window_sum",
+    "prefix_sum",
+    "sma",
+    "ema",
+    "window_stddev",
+    "returns",
+    "realized_vol",
+    "true_range",
+    "atr",
+    "lin_slope",
+    "bollinger_width",
+    "keltner_width",
+    "session_vwap_series",
+    "rsi",
+    "rolling_max_prior",
+    "rolling_min_prior",
+    "masked_range",
+]
@@ -0,0 +1,328 @@
+"""dt_backend.engines.order_pipeline — concurrent order submission + fill tracking
+
+broker_api.submit_order is one blocking round trip per order: POST over a
+fresh urllib connection, then GET /orders/{id} every 0.35 s for up to 6 s.
+A cycle with 20 entries waits for them one after another.
+
+This module submits a whole cycle at once:
+
+- one aiohttp ClientSession (keep-alive pool) for the batch; all POSTs run
+  concurrently;
+- fills arrive from one trade_updates websocket stream, which is opened and
+  subscribed before the first POST so no event is missed;
+- when the stream is down (or never came up), pending orders are refreshed
+  with one batched GET /orders?status=all&symbols=... per poll interval
+  instead of one GET per order;
+- orders that are still unfilled or only partially filled at the deadline
+  are cancelled concurrently, as submit_order does.
+
+Ledger / ownership updates are NOT done here; broker_api.submit_orders
+applies every fill in one batch. The base URL, stream URL and headers are
+parameters, so tests run against a local mock broker.
+
+Knobs (env):
+    DT_ORDER_PIPELINE_CONNECTIONS  keep-alive pool size (default 8)
+    DT_ORDER_FILL_TIMEOUT          seconds to wait for fills (default 6.0)
+    DT_ORDER_POLL_INTERVAL         batched poll interval (default 0.35)
+    DT_ORDER_STREAM                use the trade_updates stream (default 1)
+    DT_ORDER_STREAM_URL            stream URL override
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    import aiohttp  # type: ignore
+except Exception:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+from dt_backend.engines.broker_api import _env, _safe_float, log
+
+SETTLED_STATUSES = frozenset({"filled", "canceled", "rejected"})
+OPEN_STATUSES = frozenset({"partially_filled", "accepted", "new"})
+
+
+def available() -> bool:
+    return aiohttp is not None
+
+
+def is_settled(order: Dict[str, Any]) -> bool:
+    """Same stop rule as broker_api._poll_order."""
+    status = str(order.get("status", "")).lower()
+    if status in SETTLED_STATUSES:
+        return True
+    return _safe_float(order.get("filled_qty") or 0.0, 0.0) > 0 and status in OPEN_STATUSES
+
+
+def stream_url_for(base_v2: str) -> str:
+    """https://paper-api.alpaca.markets/v2 -> wss://paper-api.alpaca.markets/stream"""
+    override = _env("DT_ORDER_STREAM_URL", "")
+    if override:
+        return override
+    parts = urlsplit(base_v2)
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    path = parts.path[: -len("/v2")] if parts.path.endswith("/v2") else parts.path
+    return urlunsplit((scheme, parts.netloc, path.rstrip("/") + "/stream", "", ""))
+
+
+@dataclass
+class OrderOutcome:
+    """One submitted payload: the POST reply (or error) and the last known order state."""
+
+    payload: Dict[str, Any]
+    created: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+    final: Dict[str, Any] = field(default_factory=dict)
+
+
+class FillTracker:
+    """Latest order state per client_order_id, fed by the stream and by polls.
+
+    Updates may arrive before the POST reply (stream events race the
+    response), so tracking is keyed on the client_order_id we generated.
+    """
+
+    def __init__(self, client_order_ids: Sequence[str]):
+        self.expected: Set[str] = {str(c) for c in client_order_ids}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.changed = asyncio.Event()
+        self.stream_live = False
+        self.stream_ready = asyncio.Event()
+
+    def update(self, order: Any) -> None:
+        if not isinstance(order, dict):
+            return
+        coid = str(order.get("client_order_id") or "")
+        if coid not in self.expected:
+            return
+        prev = self.orders.get(coid)
+        if prev is not None and is_settled(prev) and not is_settled(order):
+            return  # a late poll reply must not undo a settled stream event
+        self.orders[coid] = order
+        self.changed.set()
+
+    def pending(self, client_order_ids: Sequence[str]) -> List[str]:
+        return [c for c in client_order_ids if not is_settled(self.orders.get(c) or {})]
+
+    def set_stream(self, live: bool) -> None:
+        self.stream_live = live
+        self.stream_ready.set()
+        self.changed.set()
+
+
+class OrderPipeline:
+    """Submit a batch of Alpaca order payloads concurrently and wait for fills."""
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        *,
+        stream_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        fill_timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        stream_connect_timeout: float = 2.0,
+        stream_idle_poll: float = 1.0,
+        request_timeout: float = 20.0,
+    ):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for the order pipeline. Install with: pip install aiohttp")
+        self.base_url = base_url.rstrip("/")
+        self.headers = dict(headers)
+        self.stream_url = stream_url
+        self.max_connections = int(max_connections or _safe_float(_env("DT_ORDER_PIPELINE_CONNECTIONS", "8"), 8))
+        self.fill_timeout = float(fill_timeout if fill_timeout is not None else _safe_float(_env("DT_ORDER_FILL_TIMEOUT", "6.0"), 6.0))
+        self.poll_interval = float(poll_interval if poll_interval is not None else _safe_float(_env("DT_ORDER_POLL_INTERVAL", "0.35"), 0.35))
+        self.stream_connect_timeout = float(stream_connect_timeout)
+        self.stream_idle_poll = float(stream_idle_poll)
+        self.request_timeout = float(request_timeout)
+        self.stats: Dict[str, int] = {"posts": 0, "polls": 0, "stream_events": 0, "cancels": 0}
+
+    # ---- HTTP ----
+
+    async def _request(self, session: "aiohttp.ClientSession", method: str, path: str, payload: Any = None) -> Any:
+        async with session.request(method, self.base_url + path, json=payload) as resp:
+            raw = await resp.text()
+            if resp.status >= 400:
+                # Same message shape as broker_api._http_json, so _alpaca_error can parse it.
+                raise RuntimeError(f"alpaca {method} {path.split('?', 1)[0]} {resp.status}: {raw[:500]}")
+            if not raw:
+                return None
+            try:
+                return json.loads(raw)
+            except Exception:
+                return raw
+
+    async def _post(self, session: "aiohttp.ClientSession", payload: Dict[str, Any]) -> Any:
+        self.stats["posts"] += 1
+        return await self._request(session, "POST", "/orders", payload)
+
+    async def _poll(self, session: "aiohttp.ClientSession", tracker: FillTracker, symbols: Sequence[str], after: str) -> None:
+        self.stats["polls"] += 1
+        query = f"/orders?status=all&symbols={','.join(sorted(set(symbols)))}&after={after}&limit=500&direction=desc"
+        try:
+            rows = await self._request(session, "GET", query)
+        except Exception as e:
+            log(f"[broker_alpaca] ⚠️ batched order poll failed: {e}")
+            return
+        for row in rows if isinstance(rows, list) else []:
+            tracker.update(row)
+
+    async def _cancel(self, session: "aiohttp.ClientSession", order_id: str) -> None:
+        self.stats["cancels"] += 1
+        try:
+            await self._request(session, "DELETE", f"/orders/{order_id}")
+        except Exception as e:
+            log(f"[broker_alpaca] ⚠️ cancel failed for {order_id}: {e}")
+
+    # ---- trade_updates stream ----
+
+    async def _stream(self, session: "aiohttp.ClientSession", tracker: FillTracker) -> None:
+        try:
+            async with session.ws_connect(self.stream_url, heartbeat=20.0) as ws:
+                await ws.send_json(
+                    {
+                        "action": "auth",
+                        "key": self.headers.get("APCA-API-KEY-ID", ""),
+                        "secret": self.headers.get("APCA-API-SECRET-KEY", ""),
+                    }
+                )
+                async for msg in ws:
+                    if msg.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                        break
+                    raw = msg.data.decode("utf-8", errors="replace") if isinstance(msg.data, bytes) else msg.data
+                    try:
+                        data = json.loads(raw)
+                    except Exception:
+                        continue
+                    stream = str(data.get("stream") or "")
+                    body = data.get("data") if isinstance(data.get("data"), dict) else {}
+                    if stream == "authorization":
+                        if str(body.get("status") or "") != "authorized":
+                            log(f"[broker_alpaca] ⚠️ trade stream auth failed: {body}")
+                            break
+                        await ws.send_json({"action": "listen", "data": {"streams": ["trade_updates"]}})
+                    elif stream == "listening":
+                        tracker.set_stream("trade_updates" in (body.get("streams") or []))
+                    elif stream == "trade_updates":
+                        self.stats["stream_events"] += 1
+                        tracker.update(body.get("order"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log(f"[broker_alpaca] ⚠️ trade stream unavailable, polling instead: {e}")
+        finally:
+            tracker.set_stream(False)
+
+    # ---- batch ----
+
+    async def run(self, payloads: Sequence[Dict[str, Any]]) -> List[OrderOutcome]:
+        outcomes = [OrderOutcome(payload=dict(p)) for p in payloads]
+        if not outcomes:
+            return outcomes
+        coids = [str(p.get("client_order_id") or "") for p in payloads]
+        symbols = [str(p.get("symbol") or "") for p in payloads]
+        after = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+        connector = aiohttp.TCPConnector(limit=max(1, self.max_connections), keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=timeout) as session:
+            tracker = FillTracker(coids)
+            stream_task = None
+            if self.stream_url:
+                stream_task = asyncio.create_task(self._stream(session, tracker))
+                try:
+                    await asyncio.wait_for(tracker.stream_ready.wait(), timeout=self.stream_connect_timeout)
+                except asyncio.TimeoutError:
+                    pass
+            try:
+                replies = await asyncio.gather(*(self._post(session, p) for p in payloads), return_exceptions=True)
+                live: List[str] = []
+                for oc, coid, reply in zip(outcomes, coids, replies):
+                    if isinstance(reply, BaseException):
+                        oc.error = reply
+                        continue
+                    oc.created = reply if isinstance(reply, dict) else None
+                    if oc.created and oc.created.get("id"):
+                        tracker.update({"client_order_id": coid, **oc.created})
+                        live.append(coid)
+
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self.fill_timeout
+                while tracker.pending(live):
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    if tracker.stream_live:
+                        tracker.changed.clear()
+                        try:
+                            await asyncio.wait_for(tracker.changed.wait(), timeout=min(remaining, self.stream_idle_poll))
+                        except asyncio.TimeoutError:
+                            # Quiet stream: one batched poll covers any event it dropped.
+                            pending = tracker.pending(live)
+                            await self._poll(session, tracker, [symbols[coids.index(c)] for c in pending], after)
+                    else:
+                        pending = tracker.pending(live)
+                        await self._poll(session, tracker, [symbols[coids.index(c)] for c in pending], after)
+                        if tracker.pending(live):
+                            await asyncio.sleep(min(self.poll_interval, max(0.0, deadline - loop.time())))
+                if tracker.pending(live):
+                    # Last refresh so unfilled results carry the broker's latest status.
+                    pending = tracker.pending(live)
+                    await self._poll(session, tracker, [symbols[coids.index(c)] for c in pending], after)
+
+                cancels = []
+                for oc, coid in zip(outcomes, coids):
+                    if oc.created is None or not oc.created.get("id"):
+                        continue
+                    oc.final = tracker.orders.get(coid) or {"status": "unknown"}
+                    if str(oc.final.get("status", "")).lower() != "filled":
+                        cancels.append(self._cancel(session, str(oc.created["id"])))
+                if cancels:
+                    await asyncio.gather(*cancels)
+            finally:
+                if stream_task is not None:
+                    stream_task.cancel()
+                    try:
+                        await stream_task
+                    except (asyncio.CancelledError, Exception):
+                        pass
+        return outcomes
+
+
+def _run_sync(coro: Any) -> Any:
+    """asyncio.run, or on a worker thread when called from inside a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(asyncio.run, coro).result()
+
+
+def submit_concurrently(
+    payloads: Sequence[Dict[str, Any]],
+    *,
+    base_url: str,
+    headers: Dict[str, str],
+    stream_url: Optional[str] = None,
+    **kw: Any,
+) -> List[OrderOutcome]:
+    """Sync entry point used by broker_api.submit_orders."""
+    if stream_url is None and _env("DT_ORDER_STREAM", "1").lower() in {"1", "true", "yes", "y", "on"}:
+        stream_url = stream_url_for(base_url)
+    pipe = OrderPipeline(base_url, headers, stream_url=stream_url, **kw)
+    outcomes = _run_sync(pipe.run(payloads))
+    log(
+        f"[broker_alpaca] 📦 batch of {len(payloads)}: posts={pipe.stats['posts']} stream_events={pipe.stats['stream_events']} "
+        f"polls={pipe.stats['polls']} cancels={pipe.stats['cancels']}"
+    )
+    return outcomes
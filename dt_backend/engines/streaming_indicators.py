@@ -0,0 +1,354 @@
+"""dt_backend/engines/streaming_indicators.py
+
+Incremental (streaming-state) intraday indicators.
+
+Why
+---
+Every feature cycle recomputes EMA / ATR / RSI / VWAP / realized vol from
+the full bar window even when a single new bar arrived. This module keeps
+O(1)-update state per (symbol, timeframe) and advances it only with the
+bars appended to the columnar bar store since the last update, so the
+per-cycle cost grows with new bars, not with session length.
+
+Semantics
+---------
+State is anchored to the current NY session (the newest bar store day
+partition) and reset when a new session starts. Each value equals the
+scalar helper in indicators.py applied to that session's bars:
+
+    ema_9         ema(closes, 9)
+    rsi_14        rsi(closes, 14)          (Wilder)
+    atr_14        atr(highs, lows, closes, 14)
+    vwap          cumulative typical-price VWAP (_session_vwap_series)
+    vwap_slope    lin_slope(vwap series, min(20, n))
+    realized_vol  realized_vol(pct returns)  (Welford; equal up to rounding)
+
+The feature builder computes over the rolling window, which usually spans
+more than one session, so state values are served only when that window is
+exactly the bars the state consumed (same length, same last bar); other
+windows fall back to the bar computation.
+
+Persistence
+-----------
+One JSON file per symbol/timeframe next to that symbol's bar columns:
+
+    <bar store root>/<timeframe>/<SYMBOL>/_indicator_state.json
+
+Each state records the partition day and how many of its rows were
+consumed, so an update reads only the tail of the day's columns and
+rewrites only the files of symbols that received bars.
+
+Configured by env:
+    DT_FEATURES_STREAMING   = "0" (default) feature_engineering serves the
+                              indicators above from state when it is current;
+                              the live loop advances state only when this is on
+    DT_STREAMING_INDICATORS = "1" (default) kill switch for advancing state
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dt_backend.core.bar_store_dt import ColumnarBarStore, bar_store_enabled, get_bar_store
+from dt_backend.core.logger_dt import log
+from dt_backend.engines.indicators import lin_slope, pct_change, true_range
+
+EMA_WINDOW = 9
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+VWAP_SLOPE_WINDOW = 20
+
+_STATE_FILE = "_indicator_state.json"
+_STATE_VERSION = 1
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return str(os.getenv(name, default)).strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def streaming_features_enabled() -> bool:
+    return bar_store_enabled() and _env_bool("DT_FEATURES_STREAMING", "0")
+
+
+def streaming_indicators_enabled() -> bool:
+    """State is only advanced (and persisted) when features consume it."""
+    return streaming_features_enabled() and _env_bool("DT_STREAMING_INDICATORS", "1")
+
+
+@dataclass
+class IndicatorState:
+    """Running indicator state for one symbol/timeframe session."""
+
+    day: str = ""
+    rows: int = 0
+    last_ts: int = 0
+    n: int = 0
+    prev_close: float = 0.0
+
+    # EMA: running sum until the window fills, recursive value from bar 0
+    ema_sum: float = 0.0
+    ema_val: float = 0.0
+
+    # RSI (Wilder): seed sums over the first window diffs, then smoothed
+    rsi_gain: float = 0.0
+    rsi_loss: float = 0.0
+
+    # ATR: last ATR_WINDOW true ranges
+    trs: List[float] = field(default_factory=list)
+
+    # VWAP: cumulative sums + last VWAP_SLOPE_WINDOW values
+    cum_pv: float = 0.0
+    cum_v: float = 0.0
+    vwaps: List[float] = field(default_factory=list)
+
+    # Realized vol: Welford over close-to-close returns
+    ret_n: int = 0
+    ret_mean: float = 0.0
+    ret_m2: float = 0.0
+
+    def reset(self, day: str) -> None:
+        fresh = IndicatorState(day=day)
+        for f in fields(self):
+            setattr(self, f.name, getattr(fresh, f.name))
+
+    def update(self, ts: int, h: float, lo: float, c: float, v: float) -> None:
+        """Advance by one bar (must be newer than last_ts)."""
+        n = self.n
+        if n == 0:
+            self.ema_val = c
+        else:
+            alpha = 2.0 / (EMA_WINDOW + 1.0)
+            self.ema_val = alpha * c + (1.0 - alpha) * self.ema_val
+
+            diff = c - self.prev_close
+            gain, loss = (diff, 0.0) if diff >= 0 else (0.0, -diff)
+            k = n  # number of diffs including this one
+            if k <= RSI_WINDOW:
+                self.rsi_gain += gain
+                self.rsi_loss += loss
+                if k == RSI_WINDOW:
+                    self.rsi_gain /= float(RSI_WINDOW)
+                    self.rsi_loss /= float(RSI_WINDOW)
+            else:
+                self.rsi_gain = (self.rsi_gain * (RSI_WINDOW - 1) + gain) / float(RSI_WINDOW)
+                self.rsi_loss = (self.rsi_loss * (RSI_WINDOW - 1) + loss) / float(RSI_WINDOW)
+
+            self.trs.append(true_range(h, lo, self.prev_close))
+            if len(self.trs) > ATR_WINDOW:
+                del self.trs[0]
+
+            r = pct_change(c, self.prev_close)
+            self.ret_n += 1
+            delta = r - self.ret_mean
+            self.ret_mean += delta / float(self.ret_n)
+            self.ret_m2 += delta * (r - self.ret_mean)
+        self.ema_sum += c
+
+        tp = (h + lo + c) / 3.0
+        if v > 0:
+            self.cum_pv += tp * v
+            self.cum_v += v
+        self.vwaps.append((self.cum_pv / self.cum_v) if self.cum_v > 0 else tp)
+        if len(self.vwaps) > VWAP_SLOPE_WINDOW:
+            del self.vwaps[0]
+
+        self.prev_close = c
+        self.last_ts = int(ts)
+        self.n = n + 1
+
+    # ---------------------------------------------------------
+    # Values
+    # ---------------------------------------------------------
+
+    def ema(self) -> float:
+        if self.n <= 0:
+            return 0.0
+        if self.n < EMA_WINDOW:
+            return self.ema_sum / float(self.n)
+        return self.ema_val
+
+    def rsi(self) -> float:
+        if self.n <= RSI_WINDOW:
+            return 50.0
+        if self.rsi_loss == 0.0:
+            return 100.0
+        rs = self.rsi_gain / self.rsi_loss
+        return max(0.0, min(100.0, 100.0 - (100.0 / (1.0 + rs))))
+
+    def atr(self) -> float:
+        if not self.trs:
+            return 0.0
+        return sum(self.trs) / float(len(self.trs))
+
+    def realized_vol(self) -> float:
+        if self.ret_n < 2:
+            return 0.0
+        return math.sqrt(max(0.0, self.ret_m2 / float(self.ret_n - 1)))
+
+    def features(self) -> Dict[str, float]:
+        """Feature-name → value, matching feature_engineering's keys."""
+        vwap = self.vwaps[-1] if self.vwaps else 0.0
+        return {
+            "vwap": float(vwap),
+            "vwap_slope": float(lin_slope(self.vwaps, window=len(self.vwaps))),
+            "atr_14": float(self.atr()),
+            "realized_vol": float(self.realized_vol()),
+            "ema_9": float(self.ema()),
+            "rsi_14": float(self.rsi()),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "IndicatorState":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (raw or {}).items() if k in known})
+
+
+class IndicatorStateStore:
+    """Per-symbol indicator state persisted beside the bar store columns."""
+
+    def __init__(self, bar_store: ColumnarBarStore):
+        self.bar_store = bar_store
+        self._lock = threading.RLock()
+        # (sym, tf) -> (mtime_ns, state)
+        self._cache: Dict[Tuple[str, str], Tuple[int, Optional[IndicatorState]]] = {}
+
+    def _path(self, sym: str, tf: str) -> Path:
+        return self.bar_store.root / str(tf) / sym / _STATE_FILE
+
+    @staticmethod
+    def _mtime_ns(path: Path) -> int:
+        try:
+            return int(path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            return 0
+
+    def get(self, sym: str, tf: str) -> Optional[IndicatorState]:
+        """State for sym/tf (cached until its file changes on disk)."""
+        s = str(sym).strip().upper()
+        path = self._path(s, tf)
+        with self._lock:
+            mtime = self._mtime_ns(path)
+            hit = self._cache.get((s, tf))
+            if hit is not None and hit[0] == mtime:
+                return hit[1]
+
+            st: Optional[IndicatorState] = None
+            if mtime:
+                try:
+                    raw = json.loads(path.read_text(encoding="utf-8"))
+                    if isinstance(raw, dict) and raw.get("version") == _STATE_VERSION and isinstance(raw.get("state"), dict):
+                        st = IndicatorState.from_dict(raw["state"])
+                except Exception as e:
+                    log(f"[indicator_state] ⚠️ unreadable state {path}: {e}")
+            self._cache[(s, tf)] = (mtime, st)
+            return st
+
+    def save(self, sym: str, tf: str, st: IndicatorState) -> None:
+        s = str(sym).strip().upper()
+        path = self._path(s, tf)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        payload = {"version": _STATE_VERSION, "state": st.to_dict()}
+        with self._lock:
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, path)
+            self._cache[(s, tf)] = (self._mtime_ns(path), st)
+
+    def _advance_one(self, st: IndicatorState, sym: str, tf: str) -> int:
+        days = self.bar_store.days(sym, tf)
+        if not days:
+            return 0
+        day = days[-1]
+        if day != st.day:
+            st.reset(day)
+        arr = self.bar_store.read_day(sym, tf, day, start=st.rows)
+        n = len(arr)
+        if n <= 0:
+            return 0
+        ts, h, lo, c, v = arr.ts.tolist(), arr.h.tolist(), arr.lo.tolist(), arr.c.tolist(), arr.v.tolist()
+        for i in range(n):
+            if ts[i] > st.last_ts:
+                st.update(ts[i], h[i], lo[i], c[i], v[i])
+        st.rows += n
+        return n
+
+    def advance(self, symbols: Iterable[str], tf: str) -> Dict[str, int]:
+        """Consume newly stored bars for `symbols`. Returns {sym: bars consumed}.
+
+        Only symbols that consumed bars have their state file rewritten.
+        """
+        with self._lock:
+            out: Dict[str, int] = {}
+            for sym in symbols:
+                s = str(sym).strip().upper()
+                if not s:
+                    continue
+                cur = self.get(s, tf)
+                st = IndicatorState.from_dict(cur.to_dict()) if cur is not None else IndicatorState()
+                try:
+                    n = self._advance_one(st, s, tf)
+                    if n:
+                        self.save(s, tf, st)
+                except Exception as e:
+                    log(f"[indicator_state] ⚠️ advance failed for {s} ({tf}): {e}")
+                    continue
+                if n:
+                    out[s] = n
+            return out
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+# -------------------------------------------------------------
+# Singleton access
+# -------------------------------------------------------------
+
+_stores: Dict[str, IndicatorStateStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_indicator_state_store(bar_store: Optional[ColumnarBarStore] = None) -> IndicatorStateStore:
+    """Process-wide state store for `bar_store` (defaults to get_bar_store())."""
+    bs = bar_store or get_bar_store()
+    key = str(bs.root.resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None or store.bar_store is not bs:
+            store = IndicatorStateStore(bs)
+            _stores[key] = store
+        return store
+
+
+def advance_indicator_state(symbols: Iterable[str], tf: str) -> Dict[str, int]:
+    """Best-effort update after a live fetch. Returns {sym: bars consumed}."""
+    if not streaming_indicators_enabled():
+        return {}
+    try:
+        return get_indicator_state_store().advance(symbols, tf)
+    except Exception as e:
+        log(f"[indicator_state] ⚠️ advance failed ({tf}): {e}")
+        return {}
+
+
+def current_features(sym: str, tf: str, last_ts: Optional[int], n_bars: int) -> Optional[Dict[str, float]]:
+    """Streaming indicator values if state covers exactly the `n_bars` window ending at `last_ts`."""
+    if last_ts is None or not streaming_features_enabled():
+        return None
+    try:
+        st = get_indicator_state_store().get(sym, tf)
+    except Exception:
+        return None
+    if st is None or st.n < 2 or st.n != int(n_bars) or int(st.last_ts) != int(last_ts):
+        return None
+    return st.features()
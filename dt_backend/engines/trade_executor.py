@@ -52,7 +52,7 @@ except Exception:  # pragma: no cover
     read_dt_state = None  # type: ignore
     update_dt_state = None  # type: ignore
 
-from dt_backend.engines.broker_api import BrokerAPI, Order, get_positions_scoped
+from dt_backend.engines.broker_api import BrokerAPI, Order, get_positions_scoped, order_pipeline_enabled
 from dt_backend.services.position_manager_dt import (
     process_exits,
     record_entry,
@@ -655,6 +655,8 @@ def execute_from_policy(
     now_utc: Optional[datetime] = None,
     symbols: Optional[List[str]] = None,
     max_symbols: Optional[int] = None,
+    rolling_override: Optional[Dict[str, Any]] = None,
+    save: bool = True,
 ) -> Dict[str, Any]:
     """Execute one cycle worth of intents.
 
@@ -663,11 +665,13 @@ def execute_from_policy(
         now_utc: optional forced time (replay/backtest).
         symbols: optional explicit universe (lane-aware). If provided, only these symbols are considered.
         max_symbols: optional cap applied after symbol filtering.
+        rolling_override: use this rolling dict instead of reading the cache (in-memory replay).
+        save: persist position updates to the rolling cache at the end of the cycle.
 
     Returns a summary dict.
     """
     cfg = _cfg_from_env() if cfg is None else cfg
-    rolling = _read_rolling() or {}
+    rolling = rolling_override if isinstance(rolling_override, dict) else (_read_rolling() or {})
     
     # Build initial symbol list for cycle start logging
     if not isinstance(rolling, dict) or not rolling:
@@ -770,6 +774,239 @@ def execute_from_policy(
     except Exception as e:
         log(f"[dt_exec] ⚠️ Failed to record symbol selection: {e}")
 
+    def _settle_order(
+        *,
+        sym: str,
+        node: Dict[str, Any],
+        side: str,
+        qty: float,
+        conf: float,
+        pos: Any,
+        last_px: float,
+        atr: float,
+        exec_id: Optional[str],
+        res: Any,
+    ) -> None:
+        """Saga phases 2/3 for one broker result (shared by the serial and batched paths)."""
+        append_trade_event(
+            {
+                "type": "order_result",
+                "symbol": sym,
+                "side": side,
+                "qty": qty,
+                "result": res,
+                "execution_id": exec_id,  # Link to ledger
+            }
+        )
+
+        # Phase 5: on entry fills, record synthetic bracket state.
+        try:
+            if bool(cfg.enable_brackets) and isinstance(res, dict) and str(res.get("status") or "").lower() == "filled":
+                filled_qty = _safe_float(res.get("qty"), 0.0)
+                fill_price = _safe_float(res.get("price"), 0.0)
+
+                is_entry = side == "BUY" or (side == "SELL" and cfg.allow_shorts and (pos is None or getattr(pos, "qty", 0.0) <= 0))
+
+                if is_entry and filled_qty > 0 and fill_price > 0:
+                    # Phase 2: Record confirmed AFTER broker confirms fill
+                    broker_order_id = str(res.get("order_id") or res.get("id") or "unknown")
+                    execution_ledger.record_confirmed(
+                        execution_id=exec_id,
+                        broker_order_id=broker_order_id,
+                        fill_price=fill_price,
+                        now_utc=ts_now,
+                    )
+                    debug(f"[dt_exec] ✅ Phase 2 (confirmed): {exec_id} filled @ {fill_price}")
+                    
+                    risk = _plan_risk(node, side=side, last_price=fill_price, atr=atr, cfg=cfg)
+                    plan = node.get("execution_plan_dt") if isinstance(node.get("execution_plan_dt"), dict) else {}
+                    bot = str(plan.get("bot") or "") if isinstance(plan, dict) else ""
+                    reason = str(plan.get("reason") or "") if isinstance(plan, dict) else ""
+
+                    meta = _entry_meta_from_global(rolling, ts_now)
+                    try:
+                        meta["base_conf"] = float(conf)
+                        meta["confidence"] = float(conf)
+                        p = node.get("policy_dt") if isinstance(node.get("policy_dt"), dict) else {}
+                        if isinstance(p, dict) and p.get("p_hit") is not None:
+                            meta["p_hit"] = float(p.get("p_hit") or 0.0)
+                        
+                        # Send Slack alert for position entry
+                        if alert_dt is not None and not cfg.dry_run:
+                            try:
+                                feats = node.get("features_dt", {})
+                                signal_strength = _safe_float(feats.get("signal_strength"), 0.0) if isinstance(feats, dict) else 0.0
+                                alert_dt(
+                                    f"Position Opened: {sym}",
+                                    f"{side} {filled_qty} shares @ ${fill_price:.2f}",
+                                    level="info",
+                                    context={
+                                        "Bot": bot or "N/A",
+                                        "Confidence": f"{conf:.1%}",
+                                        "Signal Strength": f"{signal_strength:.3f}",
+                                        "Stop": f"${risk.get('stop', 0.0):.2f}" if risk.get('stop') else "N/A",
+                                        "Take Profit": f"${risk.get('take_profit', 0.0):.2f}" if risk.get('take_profit') else "N/A",
+                                        "Reason": reason[:100] if reason else "N/A",
+                                    }
+                                )
+                            except Exception:
+                                pass
+
+                        feats = node.get("features_dt") if isinstance(node.get("features_dt"), dict) else {}
+                        meta["entry_features"] = {
+                            "rel_volume": float(feats.get("rel_volume") or 0.0),
+                            "atr_14": float(feats.get("atr_14") or 0.0),
+                            "vwap_dist": float(feats.get("vwap_dist") or 0.0),
+                            "squeeze_on": float(feats.get("squeeze_on") or 0.0),
+                        }
+                        if bot:
+                            meta["bot"] = str(bot).upper()
+                    except Exception:
+                        pass
+
+                    # Phase 3: Record atomic update (position + truth store)
+                    # Note: record_entry now does atomic locking internally
+                    record_entry(
+                        symbol=sym,
+                        side=side,
+                        qty=float(filled_qty),
+                        entry_price=float(fill_price),
+                        risk=risk,
+                        bot=(bot or None),
+                        reason=(reason or None),
+                        trail_atr_mult=float(cfg.trail_atr_mult),
+                        scratch_min=int(cfg.scratch_min),
+                        scratch_atr_frac=float(cfg.scratch_atr_frac),
+                        now_utc=ts_now,
+                        meta=meta,
+                        confidence=float(conf),
+                    )
+                    
+                    # Mark as recorded in saga ledger
+                    position_snapshot = {
+                        "symbol": sym,
+                        "side": side,
+                        "qty": filled_qty,
+                        "entry_price": fill_price,
+                        "ts": ts_now.isoformat(timespec="seconds").replace("+00:00", "Z"),
+                    }
+                    execution_ledger.record_recorded(
+                        execution_id=exec_id,
+                        position_state=position_snapshot,
+                        now_utc=ts_now,
+                    )
+                    debug(f"[dt_exec] 🎉 Phase 3 (recorded): {exec_id} complete")
+
+                    # Record entry decision for replay
+                    try:
+                        if recorder is not None:
+                            recorder.record_entry(
+                                symbol=sym,
+                                side=side,
+                                qty=float(filled_qty),
+                                price=float(fill_price),
+                                reason=reason or "signal",
+                                confidence=float(conf),
+                                bot=bot,
+                                stop=risk.get("stop"),
+                                take_profit=risk.get("take_profit"),
+                            )
+                    except Exception as e:
+                        log(f"[dt_exec] ⚠️ Failed to record entry decision: {e}")
+
+                    # Update position_dt in rolling cache so policy sees the position
+                    try:
+                        # Determine signed qty: positive for LONG, negative for SHORT
+                        if isinstance(node, dict):
+                            position_qty = float(filled_qty) if side == "BUY" else -float(filled_qty)
+                            position_side = "LONG" if side == "BUY" else "SHORT"
+
+                            node["position_dt"] = {
+                                "qty": position_qty,
+                                "avg_price": float(fill_price),
+                                "side": position_side,
+                                "ts": ts_now.isoformat(timespec="seconds").replace("+00:00", "Z"),
+                            }
+                            rolling[sym] = node
+                    except Exception:
+                        pass
+                    
+                    # Mark symbol as recently acted upon
+                    try:
+                        from dt_backend.core.time_override_dt import now_utc
+                        if isinstance(node, dict):
+                            plan = node.get("execution_plan_dt") if isinstance(node.get("execution_plan_dt"), dict) else {}
+                            node["_last_action_ts"] = now_utc().isoformat().replace("+00:00", "Z")
+                            node["_last_action_bot"] = str(plan.get("bot") or "").upper() if isinstance(plan, dict) else ""
+                            rolling[sym] = node
+                    except Exception:
+                        pass
+                else:
+                    # Not an entry, mark as completed (exit)
+                    if side == "SELL" and (pos is not None and getattr(pos, "qty", 0.0) > 0) and filled_qty > 0:
+                        # Phase 2: Confirmed
+                        broker_order_id = str(res.get("order_id") or res.get("id") or "unknown")
+                        execution_ledger.record_confirmed(
+                            execution_id=exec_id,
+                            broker_order_id=broker_order_id,
+                            fill_price=fill_price if fill_price > 0 else last_px,
+                            now_utc=ts_now,
+                        )
+                        
+                        record_exit(sym, reason="manual_sell", now_utc=ts_now)
+                        
+                        # Phase 3: Recorded
+                        execution_ledger.record_recorded(
+                            execution_id=exec_id,
+                            position_state={"symbol": sym, "side": "FLAT", "qty": 0.0},
+                            now_utc=ts_now,
+                        )
+
+                        # Clear position_dt after exit
+                        try:
+                            if isinstance(node, dict):
+                                node["position_dt"] = {
+                                    "qty": 0.0,
+                                    "avg_price": 0.0,
+                                    "side": "FLAT",
+                                    "ts": ts_now.isoformat(timespec="seconds").replace("+00:00", "Z"),
+                                }
+                                rolling[sym] = node
+                        except Exception:
+                            pass
+                    else:
+                        # Order filled but not an entry or exit we track, mark as recorded
+                        execution_ledger.record_recorded(
+                            execution_id=exec_id,
+                            position_state={"info": "non-tracked fill"},
+                            now_utc=ts_now,
+                        )
+            else:
+                # Order not filled (rejected, pending, etc.)
+                # Mark as failed in saga ledger
+                status = str(res.get("status") or res.get("state") or "unknown").lower() if isinstance(res, dict) else "unknown"
+                if status not in {"filled", "partially_filled"}:
+                    execution_ledger.record_failed(
+                        execution_id=exec_id,
+                        error_msg=f"Order not filled: status={status}",
+                        now_utc=ts_now,
+                    )
+                    log(f"[dt_exec] ❌ Order not filled: {exec_id} status={status}")
+        except Exception as e:
+            # Something went wrong during position update, record failure
+            log(f"[dt_exec] ⚠️ Error in saga phase 2/3 for {exec_id}: {e}", level="error")
+            if get_aggregator is not None:
+                stack_trace = traceback.format_exc()
+                get_aggregator().forward_log("ERROR", f"Saga phase 2/3 error for {exec_id}: {e}\n{stack_trace}", "dt_exec")
+            execution_ledger.record_failed(
+                execution_id=exec_id,
+                error_msg=f"Phase 2/3 error: {str(e)[:200]}",
+                now_utc=ts_now,
+            )
+
+    # DT_ORDER_PIPELINE=1: queue this cycle's orders and submit them together.
+    batch: Optional[List[Dict[str, Any]]] = [] if (not cfg.dry_run and order_pipeline_enabled()) else None
+
     # Iterate symbols by ranking (highest conviction first).
     for sym in sym_list:
         if orders >= max(0, int(cfg.max_orders_per_cycle)):
@@ -1293,227 +1530,21 @@ def execute_from_policy(
             )
             debug(f"[dt_exec] 📝 Phase 1 (pending): {exec_id} {side} {qty} {sym}")
             
+            if batch is not None:
+                # DT_ORDER_PIPELINE: queue it; the cycle is submitted together after the loop.
+                batch.append(
+                    dict(sym=sym, node=node, side=side, qty=qty, conf=conf, pos=pos, order=order, last_px=last_px, atr=atr, exec_id=exec_id)
+                )
+                orders += 1
+                continue
+
             # Submit order to broker
             log(f"[dt_exec] 📤 Submitting order: {sym} {side} {qty} @ ${last_px:.2f}")
             res = broker.submit_order(order, last_price=(last_px if last_px > 0 else None))
             orders += 1
             bump_metric("orders_submitted", 1.0)
             log(f"[dt_exec] ✅ Order submitted: {sym} {side} {qty}")
-            append_trade_event(
-                {
-                    "type": "order_result",
-                    "symbol": sym,
-                    "side": side,
-                    "qty": qty,
-                    "result": res,
-                    "execution_id": exec_id,  # Link to ledger
-                }
-            )
-
-            # Phase 5: on entry fills, record synthetic bracket state.
-            try:
-                if bool(cfg.enable_brackets) and isinstance(res, dict) and str(res.get("status") or "").lower() == "filled":
-                    filled_qty = _safe_float(res.get("qty"), 0.0)
-                    fill_price = _safe_float(res.get("price"), 0.0)
-
-                    is_entry = side == "BUY" or (side == "SELL" and cfg.allow_shorts and (pos is None or getattr(pos, "qty", 0.0) <= 0))
-
-                    if is_entry and filled_qty > 0 and fill_price > 0:
-                        # Phase 2: Record confirmed AFTER broker confirms fill
-                        broker_order_id = str(res.get("order_id") or res.get("id") or "unknown")
-                        execution_ledger.record_confirmed(
-                            execution_id=exec_id,
-                            broker_order_id=broker_order_id,
-                            fill_price=fill_price,
-                            now_utc=ts_now,
-                        )
-                        debug(f"[dt_exec] ✅ Phase 2 (confirmed): {exec_id} filled @ {fill_price}")
-                        
-                        risk = _plan_risk(node, side=side, last_price=fill_price, atr=atr, cfg=cfg)
-                        plan = node.get("execution_plan_dt") if isinstance(node.get("execution_plan_dt"), dict) else {}
-                        bot = str(plan.get("bot") or "") if isinstance(plan, dict) else ""
-                        reason = str(plan.get("reason") or "") if isinstance(plan, dict) else ""
-
-                        meta = _entry_meta_from_global(rolling, ts_now)
-                        try:
-                            meta["base_conf"] = float(conf)
-                            meta["confidence"] = float(conf)
-                            p = node.get("policy_dt") if isinstance(node.get("policy_dt"), dict) else {}
-                            if isinstance(p, dict) and p.get("p_hit") is not None:
-                                meta["p_hit"] = float(p.get("p_hit") or 0.0)
-                            
-                            # Send Slack alert for position entry
-                            if alert_dt is not None and not cfg.dry_run:
-                                try:
-                                    feats = node.get("features_dt", {})
-                                    signal_strength = _safe_float(feats.get("signal_strength"), 0.0) if isinstance(feats, dict) else 0.0
-                                    alert_dt(
-                                        f"Position Opened: {sym}",
-                                        f"{side} {filled_qty} shares @ ${fill_price:.2f}",
-                                        level="info",
-                                        context={
-                                            "Bot": bot or "N/A",
-                                            "Confidence": f"{conf:.1%}",
-                                            "Signal Strength": f"{signal_strength:.3f}",
-                                            "Stop": f"${risk.get('stop', 0.0):.2f}" if risk.get('stop') else "N/A",
-                                            "Take Profit": f"${risk.get('take_profit', 0.0):.2f}" if risk.get('take_profit') else "N/A",
-                                            "Reason": reason[:100] if reason else "N/A",
-                                        }
-                                    )
-                                except Exception:
-                                    pass
-
-                            feats = node.get("features_dt") if isinstance(node.get("features_dt"), dict) else {}
-                            meta["entry_features"] = {
-                                "rel_volume": float(feats.get("rel_volume") or 0.0),
-                                "atr_14": float(feats.get("atr_14") or 0.0),
-                                "vwap_dist": float(feats.get("vwap_dist") or 0.0),
-                                "squeeze_on": float(feats.get("squeeze_on") or 0.0),
-                            }
-                            if bot:
-                                meta["bot"] = str(bot).upper()
-                        except Exception:
-                            pass
-
-                        # Phase 3: Record atomic update (position + truth store)
-                        # Note: record_entry now does atomic locking internally
-                        record_entry(
-                            symbol=sym,
-                            side=side,
-                            qty=float(filled_qty),
-                            entry_price=float(fill_price),
-                            risk=risk,
-                            bot=(bot or None),
-                            reason=(reason or None),
-                            trail_atr_mult=float(cfg.trail_atr_mult),
-                            scratch_min=int(cfg.scratch_min),
-                            scratch_atr_frac=float(cfg.scratch_atr_frac),
-                            now_utc=ts_now,
-                            meta=meta,
-                            confidence=float(conf),
-                        )
-                        
-                        # Mark as recorded in saga ledger
-                        position_snapshot = {
-                            "symbol": sym,
-                            "side": side,
-                            "qty": filled_qty,
-                            "entry_price": fill_price,
-                            "ts": ts_now.isoformat(timespec="seconds").replace("+00:00", "Z"),
-                        }
-                        execution_ledger.record_recorded(
-                            execution_id=exec_id,
-                            position_state=position_snapshot,
-                            now_utc=ts_now,
-                        )
-                        debug(f"[dt_exec] 🎉 Phase 3 (recorded): {exec_id} complete")
-
-                        # Record entry decision for replay
-                        try:
-                            if recorder is not None:
-                                recorder.record_entry(
-                                    symbol=sym,
-                                    side=side,
-                                    qty=float(filled_qty),
-                                    price=float(fill_price),
-                                    reason=reason or "signal",
-                                    confidence=float(conf),
-                                    bot=bot,
-                                    stop=risk.get("stop"),
-                                    take_profit=risk.get("take_profit"),
-                                )
-                        except Exception as e:
-                            log(f"[dt_exec] ⚠️ Failed to record entry decision: {e}")
-
-                        # Update position_dt in rolling cache so policy sees the position
-                        try:
-                            # Determine signed qty: positive for LONG, negative for SHORT
-                            if isinstance(node, dict):
-                                position_qty = float(filled_qty) if side == "BUY" else -float(filled_qty)
-                                position_side = "LONG" if side == "BUY" else "SHORT"
-
-                                node["position_dt"] = {
-                                    "qty": position_qty,
-                                    "avg_price": float(fill_price),
-                                    "side": position_side,
-                                    "ts": ts_now.isoformat(timespec="seconds").replace("+00:00", "Z"),
-                                }
-                                rolling[sym] = node
-                        except Exception:
-                            pass
-                        
-                        # Mark symbol as recently acted upon
-                        try:
-                            from dt_backend.core.time_override_dt import now_utc
-                            if isinstance(node, dict):
-                                plan = node.get("execution_plan_dt") if isinstance(node.get("execution_plan_dt"), dict) else {}
-                                node["_last_action_ts"] = now_utc().isoformat().replace("+00:00", "Z")
-                                node["_last_action_bot"] = str(plan.get("bot") or "").upper() if isinstance(plan, dict) else ""
-                                rolling[sym] = node
-                        except Exception:
-                            pass
-                    else:
-                        # Not an entry, mark as completed (exit)
-                        if side == "SELL" and (pos is not None and getattr(pos, "qty", 0.0) > 0) and filled_qty > 0:
-                            # Phase 2: Confirmed
-                            broker_order_id = str(res.get("order_id") or res.get("id") or "unknown")
-                            execution_ledger.record_confirmed(
-                                execution_id=exec_id,
-                                broker_order_id=broker_order_id,
-                                fill_price=fill_price if fill_price > 0 else last_px,
-                                now_utc=ts_now,
-                            )
-                            
-                            record_exit(sym, reason="manual_sell", now_utc=ts_now)
-                            
-                            # Phase 3: Recorded
-                            execution_ledger.record_recorded(
-                                execution_id=exec_id,
-                                position_state={"symbol": sym, "side": "FLAT", "qty": 0.0},
-                                now_utc=ts_now,
-                            )
-
-                            # Clear position_dt after exit
-                            try:
-                                if isinstance(node, dict):
-                                    node["position_dt"] = {
-                                        "qty": 0.0,
-                                        "avg_price": 0.0,
-                                        "side": "FLAT",
-                                        "ts": ts_now.isoformat(timespec="seconds").replace("+00:00", "Z"),
-                                    }
-                                    rolling[sym] = node
-                            except Exception:
-                                pass
-                        else:
-                            # Order filled but not an entry or exit we track, mark as recorded
-                            execution_ledger.record_recorded(
-                                execution_id=exec_id,
-                                position_state={"info": "non-tracked fill"},
-                                now_utc=ts_now,
-                            )
-                else:
-                    # Order not filled (rejected, pending, etc.)
-                    # Mark as failed in saga ledger
-                    status = str(res.get("status") or res.get("state") or "unknown").lower() if isinstance(res, dict) else "unknown"
-                    if status not in {"filled", "partially_filled"}:
-                        execution_ledger.record_failed(
-                            execution_id=exec_id,
-                            error_msg=f"Order not filled: status={status}",
-                            now_utc=ts_now,
-                        )
-                        log(f"[dt_exec] ❌ Order not filled: {exec_id} status={status}")
-            except Exception as e:
-                # Something went wrong during position update, record failure
-                log(f"[dt_exec] ⚠️ Error in saga phase 2/3 for {exec_id}: {e}", level="error")
-                if get_aggregator is not None:
-                    stack_trace = traceback.format_exc()
-                    get_aggregator().forward_log("ERROR", f"Saga phase 2/3 error for {exec_id}: {e}\n{stack_trace}", "dt_exec")
-                execution_ledger.record_failed(
-                    execution_id=exec_id,
-                    error_msg=f"Phase 2/3 error: {str(e)[:200]}",
-                    now_utc=ts_now,
-                )
+            _settle_order(sym=sym, node=node, side=side, qty=qty, conf=conf, pos=pos, last_px=last_px, atr=atr, exec_id=exec_id, res=res)
         except Exception as e:
             blocked += 1
             bump_metric("order_errors", 1.0)
@@ -1545,6 +1576,38 @@ def execute_from_policy(
                 }
             )
 
+    if batch:
+        log(f"[dt_exec] 📤 Submitting {len(batch)} orders concurrently")
+        try:
+            results = broker.submit_orders([(b["order"], b["last_px"] if b["last_px"] > 0 else None) for b in batch])
+        except Exception as e:
+            log(f"[dt_exec] ⚠️ Batched submit failed: {e}", level="error")
+            if get_aggregator is not None:
+                get_aggregator().forward_log("ERROR", f"Batched submit error: {e}\n{traceback.format_exc()}", "dt_exec")
+            results = []
+            for b in batch:
+                blocked += 1
+                orders -= 1
+                bump_metric("order_errors", 1.0)
+                try:
+                    execution_ledger.record_failed(
+                        execution_id=b["exec_id"],
+                        error_msg=f"Broker submit error: {str(e)[:200]}",
+                        now_utc=ts_now,
+                    )
+                except Exception:
+                    pass
+                append_trade_event({"type": "order_error", "symbol": b["sym"], "side": b["side"], "qty": b["qty"], "error": str(e)})
+        for b, res in zip(batch, results):
+            bump_metric("orders_submitted", 1.0)
+            log(f"[dt_exec] ✅ Order submitted: {b['sym']} {b['side']} {b['qty']}")
+            try:
+                _settle_order(**{k: v for k, v in b.items() if k != "order"}, res=res)
+            except Exception as e:
+                blocked += 1
+                bump_metric("order_errors", 1.0)
+                log(f"[dt_exec] ⚠️ Error processing {b['sym']}: {e}", level="error")
+
     out = {
         "status": "ok",
         "considered": int(considered),
@@ -1562,11 +1625,12 @@ def execute_from_policy(
     }
 
     # Save rolling cache with updated position_dt fields for next cycle
-    try:
-        save_rolling(rolling)
-        debug("[dt_exec] 💾 saved rolling cache with position updates")
-    except Exception as e:
-        log(f"[dt_exec] ⚠️ failed to save rolling cache: {e}")
+    if save:
+        try:
+            save_rolling(rolling)
+            debug("[dt_exec] 💾 saved rolling cache with position updates")
+        except Exception as e:
+            log(f"[dt_exec] ⚠️ failed to save rolling cache: {e}")
     
     # Check for feature importance drift (ML interpretability)
     try:
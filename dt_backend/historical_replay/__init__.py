@@ -7,36 +7,41 @@ Modern components:
   • sequence_builder           → deep-learning sequence datasets
   • replay_harness             → full pipeline (replay + sequences)
   • job_manager                → background replay jobs with progress
+
+Names below are resolved lazily on first access, so importing one
+submodule (e.g. replay_metrics_dt, step_replay_engine_dt) does not pull
+in the model stack the engine imports.
 """
 
-from .historical_replay_engine import (
-    replay_intraday_day,
-    ReplayResult,
-)
-
-from .historical_replay_manager import (
-    run_replay_range,
-    ReplaySummary,
-)
-
-from .sequence_builder import (
-    build_sequences_for_symbol,
-    write_sequence_dataset,
-)
-
-from .replay_harness import (
-    build_sequences_from_rolling,
-    run_full_replay_and_sequences,
-)
-
-from .job_manager import (
-    create_job,
-    start_job,
-    list_jobs,
-    get_job,
-    cancel_job,
-    JOBS,
-)
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "replay_intraday_day": "historical_replay_engine",
+    "ReplayResult": "historical_replay_engine",
+    "run_replay_range": "historical_replay_manager",
+    "ReplaySummary": "historical_replay_manager",
+    "build_sequences_for_symbol": "sequence_builder",
+    "write_sequence_dataset": "sequence_builder",
+    "build_sequences_from_rolling": "replay_harness",
+    "run_full_replay_and_sequences": "replay_harness",
+    "create_job": "job_manager",
+    "start_job": "job_manager",
+    "list_jobs": "job_manager",
+    "get_job": "job_manager",
+    "cancel_job": "job_manager",
+    "JOBS": "job_manager",
+}
+
+
+def __getattr__(name: str) -> Any:
+    mod = _EXPORTS.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{mod}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Engine
@@ -320,3 +320,24 @@ def metrics_from_dt_trades_file(dt_trades_path: Path) -> Dict[str, Any]:
         "gate": gate,
         "source": str(dt_trades_path),
     }
+
+
+def compute_metrics_from_trades(dt_trades_path: Path) -> Dict[str, Any]:
+    """Replay metrics (+ promotion gate) for one dt_trades.jsonl; no trade list."""
+    metrics = compute_replay_metrics(trades_from_events(_read_jsonl(Path(dt_trades_path))))
+    metrics["gate"] = promotion_gate(metrics)
+    return metrics
+
+
+def merge_metrics_from_trades(dt_trades_paths: Iterable[Path]) -> Dict[str, Any]:
+    """Metrics over several day files, concatenated in the given (date) order.
+
+    Per-day metrics are not additive (drawdown, equity curve), so the merge
+    recomputes from the trades of every day rather than summing reports.
+    """
+    trades: List[TradeRecord] = []
+    for p in dt_trades_paths:
+        trades.extend(trades_from_events(_read_jsonl(Path(p))))
+    metrics = compute_replay_metrics(trades)
+    metrics["gate"] = promotion_gate(metrics)
+    return metrics
@@ -9,7 +9,17 @@ Runs day-by-day step replays and writes:
 Usage (example):
   python -m dt_backend.historical_replay.replay_runner_dt \
     --start 2025-12-01 --end 2025-12-31 \
-    --step-minutes 5 --version dt_v1
+    --step-minutes 5 --version dt_v1 --workers 8
+
+Parallel mode
+-------------
+--workers N (or DT_REPLAY_WORKERS) replays days on a spawn process pool.
+Each day runs in a fresh worker process with its own per-day sandbox
+(truth dir, rolling cache, lock, broker ledger), so os.environ overrides
+and module-level singletons never leak between days. Days may finish out
+of order: replay_state.json keeps `next_date` as the first day not yet
+done and lists finished days beyond it in `done_ahead`, so a resume skips
+exactly the days that have reports.
 
 Important
 ---------
@@ -23,9 +33,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
 import os
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta, timezone, date
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from datetime import date, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -37,26 +49,18 @@ from dt_backend.historical_replay.step_replay_engine_dt import (
     replay_intraday_day_step,
     StepReplaySummary,
 )
-from dt_backend.historical_replay.replay_metrics_dt import compute_metrics_from_trades
-
-
-@dataclass
-class ReplayState:
-    version: str
-    status: str  # INCOMPLETE|COMPLETE
-    start_date: str
-    end_date: str
-    next_date: str
-    run_id: str
-    updated_at: str
-
-
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
-
-def _parse_date(s: str) -> date:
-    return date.fromisoformat(s.strip())
+from dt_backend.historical_replay.replay_metrics_dt import (
+    compute_metrics_from_trades,
+    merge_metrics_from_trades,
+)
+from dt_backend.historical_replay.replay_state_dt import (
+    _advance_checkpoint,
+    _init_run,
+    _load_state,
+    _parse_date,
+    _save_state,
+    _utc_now_iso,
+)
 
 
 def _date_range(start: date, end: date) -> List[date]:
@@ -73,34 +77,6 @@ def _runs_root() -> Path:
     return root / "intraday" / "replay" / "runs"
 
 
-def _load_state(state_path: Path) -> Optional[ReplayState]:
-    try:
-        if not state_path.exists():
-            return None
-        data = json.loads(state_path.read_text(encoding="utf-8"))
-        return ReplayState(**data)
-    except Exception:
-        return None
-
-
-def _save_state(state_path: Path, st: ReplayState) -> None:
-    state_path.parent.mkdir(parents=True, exist_ok=True)
-    state_path.write_text(json.dumps(asdict(st), indent=2, sort_keys=True), encoding="utf-8")
-
-
-def _init_run(start: str, end: str, version: str) -> ReplayState:
-    run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    return ReplayState(
-        version=version,
-        status="INCOMPLETE",
-        start_date=start,
-        end_date=end,
-        next_date=start,
-        run_id=run_id,
-        updated_at=_utc_now_iso(),
-    )
-
-
 def _configure_env(run_dir: Path, day: str) -> Dict[str, str]:
     """Set environment overrides for replay-safe artifacts."""
     # Everything per-day so logs stay human readable.
@@ -121,6 +97,80 @@ def _configure_env(run_dir: Path, day: str) -> Dict[str, str]:
     return env
 
 
+def _trades_path(truth_dir: Path) -> Path:
+    """dt_trades.jsonl for a day (truth store writes under <DT_TRUTH_DIR>/intraday)."""
+    p = truth_dir / "intraday" / "dt_trades.jsonl"
+    return p if p.exists() else truth_dir / "dt_trades.jsonl"
+
+
+def _workers_default() -> int:
+    try:
+        return max(1, int(os.getenv("DT_REPLAY_WORKERS", "1") or "1"))
+    except Exception:
+        return 1
+
+
+def _run_day(run_dir: str, day: str, step_minutes: int, max_symbols: Optional[int]) -> Dict[str, Any]:
+    """Replay one day inside its env sandbox and write reports/<day>.json.
+
+    Runs in the runner process (sequential) or in a pool worker (parallel).
+    """
+    run_path = Path(run_dir)
+    env = _configure_env(run_path, day)
+    old_env = {k: os.environ.get(k) for k in env.keys()}
+    os.environ.update(env)
+
+    try:
+        out: StepReplaySummary = replay_intraday_day_step(
+            date_str=day,
+            step_minutes=int(step_minutes),
+            max_symbols=max_symbols,
+            exec_cfg=None,  # let engine default ExecutionConfig(dry_run=False)
+        )
+
+        trades_path = _trades_path(Path(env["DT_TRUTH_DIR"]))
+        metrics = compute_metrics_from_trades(trades_path)
+
+        report = {"date": day, "engine": asdict(out), "metrics": metrics, "trades_file": str(trades_path)}
+
+        # Write per-day report
+        rep_dir = run_path / "reports"
+        rep_dir.mkdir(parents=True, exist_ok=True)
+        (rep_dir / f"{day}.json").write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+        return report
+
+    finally:
+        # Restore env
+        for k, v in old_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def _load_reports(run_dir: Path, start: str, end: str) -> List[Dict[str, Any]]:
+    """Every per-day report of the run inside [start, end], in date order."""
+    out: List[Dict[str, Any]] = []
+    for p in sorted((run_dir / "reports").glob("*.json")):
+        if not (start <= p.stem <= end):
+            continue
+        try:
+            out.append(json.loads(p.read_text(encoding="utf-8")))
+        except Exception as e:
+            log(f"[replay_runner] ⚠️ unreadable report {p}: {e}")
+    return out
+
+
+def _log_day(report: Dict[str, Any]) -> None:
+    eng = report.get("engine") or {}
+    metrics = report.get("metrics") or {}
+    log(
+        f"[replay_runner] ✅ {report.get('date')} done: "
+        f"steps={eng.get('steps', 0)} predicted_steps={eng.get('predicted_steps', 0)} "
+        f"trades={metrics.get('trades', 0)} avgR={metrics.get('avg_r', 0):.3f}"
+    )
+
+
 def run_replay(
     *,
     start: str,
@@ -131,6 +181,7 @@ def run_replay(
     force_restart: bool,
     max_days: Optional[int] = None,
     max_symbols: Optional[int] = None,
+    workers: Optional[int] = None,
 ) -> Dict[str, Any]:
     runs_root = _runs_root()
     runs_root.mkdir(parents=True, exist_ok=True)
@@ -162,65 +213,56 @@ def run_replay(
     dates = _date_range(_parse_date(st.next_date), _parse_date(st.end_date))
     if max_days is not None:
         dates = dates[: max(0, int(max_days))]
+    skip = set(st.done_ahead)
+    days = [d.isoformat() for d in dates if d.isoformat() not in skip]
 
-    day_reports: List[Dict[str, Any]] = []
-
-    for d in dates:
-        day = d.isoformat()
+    def _checkpoint(day: str) -> None:
+        _advance_checkpoint(st, [day])
+        _save_state(state_path, st)
+        _save_state(run_dir / "replay_state.json", st)
 
-        # Env overrides (replay-safe)
-        env = _configure_env(run_dir, day)
-        old_env = {k: os.environ.get(k) for k in env.keys()}
-        os.environ.update(env)
+    n_workers = _workers_default() if workers is None else max(1, int(workers))
+    failed: List[str] = []
 
-        try:
-            # ✅ FIX: call the real signature (keyword args)
-            out: StepReplaySummary = replay_intraday_day_step(
-                date_str=day,
-                step_minutes=int(step_minutes),
-                max_symbols=max_symbols,
-                exec_cfg=None,  # let engine default ExecutionConfig(dry_run=False)
-            )
-
-            trades_path = Path(env["DT_TRUTH_DIR"]) / "dt_trades.jsonl"
-            metrics = compute_metrics_from_trades(trades_path)
-
-            report = {"date": day, "engine": asdict(out), "metrics": metrics}
-            day_reports.append(report)
-
-            # Write per-day report
-            rep_dir = run_dir / "reports"
-            rep_dir.mkdir(parents=True, exist_ok=True)
-            (rep_dir / f"{day}.json").write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
-
-            # Advance checkpoint
-            st.next_date = (d + timedelta(days=1)).isoformat()
-            st.updated_at = _utc_now_iso()
-            _save_state(state_path, st)
-            _save_state(run_dir / "replay_state.json", st)
-
-            log(
-                f"[replay_runner] ✅ {day} done: "
-                f"steps={out.steps} predicted_steps={out.predicted_steps} "
-                f"trades={metrics.get('trades', 0)} avgR={metrics.get('avg_R', 0):.3f}"
-            )
-
-        finally:
-            # Restore env
-            for k, v in old_env.items():
-                if v is None:
-                    os.environ.pop(k, None)
-                else:
-                    os.environ[k] = v
-
-    # Final summary
+    if n_workers <= 1 or len(days) <= 1:
+        for day in days:
+            report = _run_day(str(run_dir), day, int(step_minutes), max_symbols)
+            _checkpoint(day)
+            _log_day(report)
+    else:
+        log(f"[replay_runner] 🧵 replaying {len(days)} days on {n_workers} worker processes")
+        ctx = multiprocessing.get_context("spawn")
+        # One task per child: every day gets a fresh interpreter (no leaked singletons/env).
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx, max_tasks_per_child=1) as pool:
+            futures = {
+                pool.submit(_run_day, str(run_dir), day, int(step_minutes), max_symbols): day for day in days
+            }
+            for fut in as_completed(futures):
+                day = futures[fut]
+                try:
+                    report = fut.result()
+                except Exception as e:
+                    failed.append(day)
+                    log(f"[replay_runner] ❌ {day} failed: {e}")
+                    continue
+                _checkpoint(day)
+                _log_day(report)
+
+    # Final summary: every day of this run so far (resumes included), merged in date order.
+    day_reports = _load_reports(run_dir, st.start_date, st.end_date)
+    merged = merge_metrics_from_trades(
+        Path(r["trades_file"]) for r in day_reports if isinstance(r.get("trades_file"), str)
+    )
     summary = {
         "run_id": st.run_id,
         "version": st.version,
         "start": st.start_date,
         "end": st.end_date,
         "step_minutes": int(step_minutes),
+        "workers": int(n_workers),
         "days": len(day_reports),
+        "failed_days": sorted(failed),
+        "metrics": merged,
         "reports": day_reports,
     }
 
@@ -233,7 +275,7 @@ def run_replay(
         _save_state(state_path, st)
         _save_state(run_dir / "replay_state.json", st)
 
-    return {"status": "ok", "run_id": st.run_id, "run_dir": str(run_dir)}
+    return {"status": "ok", "run_id": st.run_id, "run_dir": str(run_dir), "failed_days": sorted(failed)}
 
 
 def main() -> None:
@@ -246,6 +288,7 @@ def main() -> None:
     ap.add_argument("--force-restart", action="store_true")
     ap.add_argument("--max-days", type=int, default=None)
     ap.add_argument("--max-symbols", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=None, help="parallel day workers (default: DT_REPLAY_WORKERS or 1)")
 
     args = ap.parse_args()
 
@@ -258,6 +301,7 @@ def main() -> None:
         force_restart=bool(args.force_restart),
         max_days=args.max_days,
         max_symbols=args.max_symbols,
+        workers=args.workers,
     )
     log(f"[replay_runner] done: {out}")
 
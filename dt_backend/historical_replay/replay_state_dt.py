@@ -0,0 +1,79 @@
+# dt_backend/historical_replay/replay_state_dt.py
+"""Replay run checkpoint (replay_state.json) for replay_runner_dt.
+
+Kept apart from the runner so the checkpoint logic imports without the
+step replay engine and the model stack behind it.
+
+`next_date` is the first day not yet done; days that finished beyond it
+(parallel runs complete out of order) are listed in `done_ahead`, so a
+resume skips exactly the days that have reports.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timedelta, timezone, date
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+
+@dataclass
+class ReplayState:
+    version: str
+    status: str  # INCOMPLETE|COMPLETE
+    start_date: str
+    end_date: str
+    next_date: str
+    run_id: str
+    updated_at: str
+    # Days after next_date already finished (parallel runs complete out of order).
+    done_ahead: List[str] = field(default_factory=list)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _parse_date(s: str) -> date:
+    return date.fromisoformat(s.strip())
+
+
+def _load_state(state_path: Path) -> Optional[ReplayState]:
+    try:
+        if not state_path.exists():
+            return None
+        data = json.loads(state_path.read_text(encoding="utf-8"))
+        return ReplayState(**data)
+    except Exception:
+        return None
+
+
+def _save_state(state_path: Path, st: ReplayState) -> None:
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps(asdict(st), indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _init_run(start: str, end: str, version: str) -> ReplayState:
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    return ReplayState(
+        version=version,
+        status="INCOMPLETE",
+        start_date=start,
+        end_date=end,
+        next_date=start,
+        run_id=run_id,
+        updated_at=_utc_now_iso(),
+    )
+
+
+def _advance_checkpoint(st: ReplayState, finished: Iterable[str]) -> None:
+    """Move next_date over every contiguous finished day; remember the rest."""
+    done = set(st.done_ahead) | set(finished)
+    nxt = _parse_date(st.next_date)
+    while nxt.isoformat() in done:
+        done.discard(nxt.isoformat())
+        nxt = nxt + timedelta(days=1)
+    st.next_date = nxt.isoformat()
+    st.done_ahead = sorted(d for d in done if d > st.next_date)
+    st.updated_at = _utc_now_iso()
@@ -11,6 +11,10 @@ Design goals
 - Replay-safe: never touches live artifacts when DT_TRUTH_DIR/DT_ROLLING_PATH env overrides are set.
 - Deterministic enough for debugging: timestamps come from bar time (now_utc).
 - Compatible with live semantics: uses the same pipeline + position manager.
+- In-memory by default: every phase shares one rolling dict, bars are released
+  by per-symbol cursors (only new bars are appended each step) and the rolling
+  cache is written once at the end of the day. DT_REPLAY_IN_MEMORY=0 restores
+  the per-step save/re-read path.
 
 Inputs
 ------
@@ -23,7 +27,7 @@ Writes into the *override* directories configured by the caller (recommended):
   DT_TRUTH_DIR/<date>/dt_trades.jsonl
   DT_TRUTH_DIR/<date>/positions_dt.json
   DT_BOT_LEDGER_PATH (ledger file)
-  DT_ROLLING_PATH (rolling cache)
+  DT_ROLLING_PATH (rolling cache; end-of-day state in in-memory mode)
 
 The companion replay runner parses dt_trades.jsonl to compute metrics.
 """
@@ -32,6 +36,8 @@ from __future__ import annotations
 
 import gzip
 import json
+import os
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -40,7 +46,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import pandas as pd
 
 from dt_backend.core.config_dt import DT_PATHS
-from dt_backend.core.data_pipeline_dt import ensure_symbol_node, save_rolling
+from dt_backend.core.data_pipeline_dt import _read_rolling, ensure_symbol_node, save_rolling
 from dt_backend.core.logger_dt import log
 
 from dt_backend.core.meta_controller_dt import ensure_daily_plan
@@ -48,11 +54,16 @@ from dt_backend.core.context_state_dt import build_intraday_context
 from dt_backend.core.regime_detector_dt import classify_intraday_regime
 from dt_backend.engines.feature_engineering import build_intraday_features
 
-from dt_backend.ml.ai_model_intraday import load_intraday_models, score_intraday_batch
 from dt_backend.core.policy_engine_dt import apply_intraday_policy
 from dt_backend.core.execution_dt import run_execution_intraday
 from dt_backend.engines.trade_executor import execute_from_policy, ExecutionConfig
 
+# Intraday model stack (needs dt_backend.models); replay_intraday_day_step raises without it
+try:
+    from dt_backend.ml.ai_model_intraday import load_intraday_models, score_intraday_batch
+except ImportError:
+    load_intraday_models = None  # type: ignore
+    score_intraday_batch = None  # type: ignore
 
 _ALLOWED = ("BUY", "HOLD", "SELL")
 
@@ -242,6 +253,27 @@ def _subsample_times(times: List[datetime], *, step_minutes: int) -> List[dateti
     return out
 
 
+def _in_memory_enabled() -> bool:
+    """DT_REPLAY_IN_MEMORY=1 (default): one live rolling dict per day; 0 = per-step disk round-trips."""
+    return str(os.getenv("DT_REPLAY_IN_MEMORY", "1")).strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+@dataclass
+class _BarCursor:
+    """Per-symbol bars sorted by time plus a pointer to the first bar not yet released."""
+
+    parsed: List[Tuple[datetime, Dict[str, Any]]]
+    i: int = 0
+
+    def advance(self, step_dt: datetime) -> int:
+        """Move the pointer past every bar at or before step_dt; returns the old pointer."""
+        start = self.i
+        n = len(self.parsed)
+        while self.i < n and self.parsed[self.i][0] <= step_dt:
+            self.i += 1
+        return start
+
+
 @dataclass
 class StepReplaySummary:
     date: str
@@ -250,15 +282,95 @@ class StepReplaySummary:
     predicted_steps: int
 
 
+def _parse_day(raw_day: List[Dict[str, Any]]) -> Dict[str, _BarCursor]:
+    per_sym: Dict[str, _BarCursor] = {}
+    for entry in raw_day:
+        sym = str((entry or {}).get("symbol") or "").upper()
+        bars = (entry or {}).get("bars")
+        if not sym or not isinstance(bars, list):
+            continue
+        parsed: List[Tuple[datetime, Dict[str, Any]]] = []
+        for b in bars:
+            dt = _bar_ts(b)
+            if dt is None:
+                continue
+            parsed.append((dt, b))
+        parsed.sort(key=lambda x: x[0])
+        per_sym[sym] = _BarCursor(parsed)
+    return per_sym
+
+
+def _set_last_price(node: Dict[str, Any]) -> None:
+    # Ensure last_price is sane even before feature pass.
+    if node["bars_intraday"]:
+        px = _bar_close(node["bars_intraday"][-1])
+        if px is not None:
+            node.setdefault("features_dt", {})
+            if isinstance(node["features_dt"], dict):
+                node["features_dt"]["last_price"] = float(px)
+
+
+def _replay_steps_in_memory(
+    *,
+    date_str: str,
+    per_sym: Dict[str, _BarCursor],
+    times: List[datetime],
+    models: Any,
+    cfg: ExecutionConfig,
+) -> int:
+    """Drive every phase off one rolling dict; persist it once, after the last step.
+
+    Each step only appends the bars released since the previous step
+    (cursor deltas), so the day costs O(bars) instead of O(steps * bars).
+    Context, policy and position state carry over between steps as in live.
+    """
+    rolling: Dict[str, Any] = {}
+    for sym in per_sym:
+        node = ensure_symbol_node(rolling, sym)
+        node["bars_intraday"] = []
+        rolling[sym] = node
+
+    predicted_steps = 0
+    for step_dt in times:
+        for sym, cur in per_sym.items():
+            start = cur.advance(step_dt)
+            if cur.i == start:
+                continue
+            node = rolling[sym]
+            node["bars_intraday"].extend(b for _, b in cur.parsed[start:cur.i])
+            _set_last_price(node)
+
+        ensure_daily_plan(date_override=date_str, rolling_override=rolling, save=False)
+        classify_intraday_regime(now_utc=step_dt, rolling_override=rolling, save=False)
+
+        build_intraday_context(target_date=date_str, now_utc=step_dt, rolling_override=rolling, save=False)
+        build_intraday_features(now_utc=step_dt, rolling_override=rolling, save=False)
+
+        if _attach_predictions_to_rolling(rolling, models=models, now_utc=step_dt):
+            predicted_steps += 1
+
+        apply_intraday_policy(rolling_override=rolling, save=False)
+        run_execution_intraday(now_utc=step_dt, rolling_override=rolling, save=False)
+        execute_from_policy(cfg, now_utc=step_dt, rolling_override=rolling, save=False)
+
+    save_rolling(rolling)
+    return predicted_steps
+
+
 def replay_intraday_day_step(
     *,
     date_str: str,
     step_minutes: int = 5,
     max_symbols: Optional[int] = None,
     exec_cfg: Optional[ExecutionConfig] = None,
+    in_memory: Optional[bool] = None,
 ) -> StepReplaySummary:
     """Run a step-wise replay over a single day.
 
+    in_memory (default: DT_REPLAY_IN_MEMORY, on) keeps one live rolling dict
+    for the whole day and writes DT_ROLLING_PATH once at the end; False
+    rebuilds and round-trips the rolling file at every step.
+
     IMPORTANT: Caller should set env overrides so this doesn't touch live files:
       - DT_TRUTH_DIR
       - DT_ROLLING_PATH
@@ -275,68 +387,48 @@ def replay_intraday_day_step(
         raw_day = raw_day[: max(0, int(max_symbols))]
 
     # Pre-parse bar timestamps + maintain per-symbol progressive index.
-    per_sym: Dict[str, Dict[str, Any]] = {}
-    for entry in raw_day:
-        sym = str((entry or {}).get("symbol") or "").upper()
-        bars = (entry or {}).get("bars")
-        if not sym or not isinstance(bars, list):
-            continue
-        parsed: List[Tuple[datetime, Dict[str, Any]]] = []
-        for b in bars:
-            dt = _bar_ts(b)
-            if dt is None:
-                continue
-            parsed.append((dt, b))
-        parsed.sort(key=lambda x: x[0])
-        per_sym[sym] = {"parsed": parsed, "i": 0}
+    per_sym = _parse_day(raw_day)
 
     times = _select_time_index(raw_day)
     times = _subsample_times(times, step_minutes=step_minutes)
     if not times:
         return StepReplaySummary(date=date_str, steps=0, symbols=len(per_sym), predicted_steps=0)
 
+    if load_intraday_models is None or score_intraday_batch is None:
+        raise RuntimeError("intraday model stack unavailable (dt_backend.ml.ai_model_intraday failed to import)")
     models = load_intraday_models()
     cfg = exec_cfg or ExecutionConfig(dry_run=False)
 
+    if _in_memory_enabled() if in_memory is None else bool(in_memory):
+        t0 = time.time()
+        predicted_steps = _replay_steps_in_memory(
+            date_str=date_str, per_sym=per_sym, times=times, models=models, cfg=cfg
+        )
+        log(f"[dt_step_replay] ✅ {date_str}: {len(times)} steps × {len(per_sym)} symbols in-memory ({time.time() - t0:.1f}s)")
+        return StepReplaySummary(date=date_str, steps=len(times), symbols=len(per_sym), predicted_steps=predicted_steps)
+
     predicted_steps = 0
     for step_dt in times:
         # Build rolling snapshot at this step.
         rolling: Dict[str, Any] = {}
-        for sym, st in per_sym.items():
-            parsed = st["parsed"]
-            i = int(st["i"])
-            while i < len(parsed) and parsed[i][0] <= step_dt:
-                i += 1
-            st["i"] = i
-
+        for sym, cur in per_sym.items():
+            cur.advance(step_dt)
             node = ensure_symbol_node(rolling, sym)
-            node["bars_intraday"] = [b for _, b in parsed[:i]]
-            # Ensure last_price is sane even before feature pass.
-            if node["bars_intraday"]:
-                px = _bar_close(node["bars_intraday"][-1])
-                if px is not None:
-                    node.setdefault("features_dt", {})
-                    if isinstance(node["features_dt"], dict):
-                        node["features_dt"].setdefault("last_price", float(px))
+            node["bars_intraday"] = [b for _, b in cur.parsed[:cur.i]]
+            _set_last_price(node)
             rolling[sym] = node
 
         save_rolling(rolling)
 
         # Phase 2: daily plan + regime (time-aware)
-        ensure_daily_plan(now_utc=step_dt)
+        ensure_daily_plan(date_override=date_str)
         classify_intraday_regime(now_utc=step_dt)
 
-        # Phase 1/2: context + features
+        # Phase 1/2: context + features (each round-trips the rolling file)
         build_intraday_context(target_date=date_str, now_utc=step_dt)
         build_intraday_features(now_utc=step_dt)
 
         # Reload rolling (features attached) and attach predictions.
-        # build_intraday_features writes to rolling file.
-        # We read it back via save_rolling in feature engine; easiest is to re-open through file pipeline,
-        # but feature engine already saved. We'll pull from disk by reusing our in-memory rolling snapshot
-        # and merging feature/prediction steps via save_rolling again.
-        # For simplicity we re-read from file using json/gzip is inside data_pipeline_dt; avoid here.
-        from dt_backend.core.data_pipeline_dt import _read_rolling  # local import to avoid cycles
         rolling = _read_rolling()
 
         predicted = _attach_predictions_to_rolling(rolling, models=models, now_utc=step_dt)
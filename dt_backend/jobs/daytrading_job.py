@@ -60,6 +60,8 @@ from dt_backend.services.dt_truth_store import (
     update_dt_state,
     read_dt_state,
     write_metrics_snapshot,
+    get_metrics,
+    flush_metrics,
 )
 
 from dt_backend.core.data_pipeline_dt import _read_rolling, save_rolling
@@ -695,6 +697,15 @@ def run_daytrading_cycle(
         # Cycle completion logging
         cycle_duration = time.time() - cycle_start_time
         log(f"[dt_job] ✅ Cycle #{cycle_seq} complete: duration={cycle_duration:.1f}s")
+        try:
+            m = get_metrics()
+            m.inc("cycles_completed")
+            m.observe("cycle_duration_seconds", cycle_duration)
+            for stage in ("feat", "ml", "policy", "exec"):
+                if f"{stage}_duration" in locals():
+                    m.observe(f"{stage}_duration_seconds", locals()[f"{stage}_duration"])
+        except Exception:
+            pass
         
         # Performance metrics
         if 'feat_duration' in locals() and 'ml_duration' in locals() and 'policy_duration' in locals() and 'exec_duration' in locals():
@@ -760,6 +771,7 @@ def run_daytrading_cycle(
         
         raise
     finally:
+        flush_metrics()
         try:
             if lk is not None:
                 lk.release()
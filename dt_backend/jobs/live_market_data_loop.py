@@ -11,6 +11,9 @@ Design notes
 * Best-effort: never crashes the whole process on a bad symbol/batch.
 * Market-hour aware: sleeps until next open when closed.
 * Does not modify backend nightly-job code.
+* After each fetch, advances the streaming indicator state
+  (engines/streaming_indicators) with only the bars just stored, when
+  DT_FEATURES_STREAMING=1 has feature_engineering consume it.
 """
 
 from __future__ import annotations
@@ -22,6 +25,7 @@ from typing import Any, Dict, List, Optional
 
 from dt_backend.core import load_universe
 from dt_backend.core.logger_dt import log, warn
+from dt_backend.engines.streaming_indicators import advance_indicator_state
 from dt_backend.services.intraday_bars_fetcher import update_rolling_with_live_bars
 
 try:
@@ -128,6 +132,7 @@ def fetch_live_bars_once(
             lookback_minutes=lookback_minutes_1m,
             max_len=max_len_1m,
         )
+        _advance_state(out["results"]["1Min"], syms, "1Min")
 
     if fetch_5m:
         out["results"]["5Min"] = update_rolling_with_live_bars(
@@ -136,10 +141,20 @@ def fetch_live_bars_once(
             lookback_minutes=lookback_minutes_5m,
             max_len=max_len_5m,
         )
+        _advance_state(out["results"]["5Min"], syms, "5Min")
 
     return out
 
 
+def _advance_state(res: Dict[str, Any], syms: List[str], timeframe: str) -> None:
+    """Feed the bars this fetch stored into the streaming indicator state."""
+    if not isinstance(res, dict) or res.get("status") != "ok":
+        return
+    advanced = advance_indicator_state(syms, timeframe)
+    if advanced:
+        res["indicator_state"] = {"symbols": len(advanced), "bars": int(sum(advanced.values()))}
+
+
 def run_live_market_data_loop(
     *,
     interval_sec: int = 60,
@@ -126,10 +126,48 @@ def generate_prometheus_metrics() -> str:
     lines.append("# HELP dt_errors_total Total errors")
     lines.append("# TYPE dt_errors_total counter")
     lines.append(f'dt_errors_total {_metrics["errors_total"]}')
+
+    lines.extend(_registry_lines(_registry_snapshot()))
     
     return "\n".join(lines) + "\n"
 
 
+def _registry_snapshot() -> Dict[str, Any]:
+    """Merged counters/gauges/histograms from the dt metrics registry (no dt_metrics.json read)."""
+    try:
+        from dt_backend.services.dt_truth_store import metrics_snapshot
+        return metrics_snapshot(merged=True)
+    except Exception:
+        return {"counters": {}, "gauges": {}, "histograms": {}}
+
+
+def _prom_name(name: str) -> str:
+    return "dt_" + "".join(ch if ch.isalnum() else "_" for ch in str(name)).strip("_").lower()
+
+
+def _registry_lines(snap: Dict[str, Any]) -> list:
+    lines = []
+    for name, val in sorted((snap.get("counters") or {}).items()):
+        metric = _prom_name(name) + "_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {float(val):g}")
+    for name, val in sorted((snap.get("gauges") or {}).items()):
+        metric = _prom_name(name)
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {float(val[0]):g}")
+    for name, h in sorted((snap.get("histograms") or {}).items()):
+        metric = _prom_name(name)
+        lines.append(f"# TYPE {metric} histogram")
+        cum = 0
+        for le, n in zip(h.get("buckets") or [], h.get("counts") or []):
+            cum += int(n)
+            lines.append(f'{metric}_bucket{{le="{le:g}"}} {cum}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {int(h.get("count") or 0)}')
+        lines.append(f"{metric}_sum {float(h.get('sum') or 0.0):g}")
+        lines.append(f"{metric}_count {int(h.get('count') or 0)}")
+    return lines
+
+
 @router.get("/metrics")
 def prometheus_metrics():
     """Prometheus-compatible metrics endpoint."""
@@ -179,4 +217,5 @@ def metrics_summary():
         "errors": {
             "total": _metrics["errors_total"],
         },
+        "registry": _registry_snapshot(),
     }
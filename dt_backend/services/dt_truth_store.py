@@ -13,7 +13,9 @@ This module intentionally avoids external dependencies.
 Artifacts (append-only or atomic replace):
   • dt_state.json     — current regime/risk/bots/kill-switches snapshot
   • dt_trades.jsonl   — DEPRECATED: now forwards to shared store
+  • dt_trades_segments/<YYYY-MM-DD>.jsonl — indexed per-day journal (trade_journal_dt)
   • dt_metrics.json   — rolling metrics snapshot (equity, positions, realized pnl, counters)
+  • dt_metrics_shards/ — per-PID metrics registry shards (metrics_registry_dt)
 
 Shared artifacts (written under da_brains/shared):
   • shared_trades.jsonl — unified trades from swing + DT
@@ -39,6 +41,8 @@ from typing import Any, Dict, Iterable, Optional
 from dt_backend.core.logger_dt import log
 from dt_backend.core.time_override_dt import utc_iso
 from dt_backend.core.file_locking import AppendLocked
+from dt_backend.services.metrics_registry_dt import MetricsRegistry, get_metrics_registry
+from dt_backend.services.trade_journal_dt import get_trade_journal, trade_journal_enabled
 
 # Import shared truth store for unified logging
 try:
@@ -352,6 +356,14 @@ def append_trade_event(event: Dict[str, Any]) -> None:
                     **{k: v for k, v in event.items() if k not in _SHARED_STORE_NO_TRADE_FIELDS}
                 )
         
+        # Date-partitioned journal (indexed counts / P&L for the risk rails).
+        # Written before the legacy file so a first-run split of the legacy
+        # file never sees this event twice.
+        try:
+            get_trade_journal(trades_path()).append(event)
+        except Exception as e:
+            log(f"[dt_truth] ⚠️ trade journal append failed: {e}")
+
         # Also write to local file for backward compatibility
         p = trades_path()
         p.parent.mkdir(parents=True, exist_ok=True)
@@ -430,7 +442,8 @@ def write_metrics_snapshot(*, rolling: Optional[Dict[str, Any]] = None) -> Dict[
     """Write dt_metrics.json.
 
     Lightweight snapshot, not a full analytics engine.
-    Summarizes each bot ledger (cash, positions, equity estimate) + counters.
+    Summarizes each bot ledger (cash, positions, equity estimate) plus the
+    merged metrics registry (counters, gauges, histograms).
     """
     rolling = rolling if isinstance(rolling, dict) else {}
 
@@ -512,16 +525,46 @@ def write_metrics_snapshot(*, rolling: Optional[Dict[str, Any]] = None) -> Dict[
         except Exception:
             continue
 
+    flush_metrics()
+    reg = metrics_snapshot(merged=True)
     out = {
         "ts": _utc_iso(),
         "bots": bots,
+        "counters": reg.get("counters") or {},
+        "gauges": {k: v[0] for k, v in (reg.get("gauges") or {}).items()},
+        "histograms": reg.get("histograms") or {},
     }
     atomic_write_json(metrics_path(), out)
     return out
 
 
+def get_metrics() -> MetricsRegistry:
+    """Process-wide metrics registry; shards live beside dt_metrics.json."""
+    return get_metrics_registry(metrics_path().parent / "dt_metrics_shards")
+
+
+def metrics_snapshot(*, merged: bool = True) -> Dict[str, Any]:
+    """Counters / gauges / histograms without rewriting dt_metrics.json.
+
+    merged=False is this process only (no disk access); merged=True folds in
+    the other processes' shards (cached by shard mtime).
+    """
+    try:
+        return get_metrics().snapshot(merged=merged)
+    except Exception:
+        return {"counters": {}, "gauges": {}, "histograms": {}}
+
+
+def flush_metrics() -> None:
+    """Flush this process's metrics shard now (cycle end)."""
+    try:
+        get_metrics().flush(force=True)
+    except Exception as e:
+        log(f"[dt_truth] ⚠️ metrics flush failed: {e}")
+
+
 def bump_metric(name: str, amount: float = 1.0) -> None:
-    """Increment a lightweight counter inside dt_metrics.json."""
+    """Increment a lightweight counter (buffered; see metrics_registry_dt)."""
     try:
         if not isinstance(name, str) or not name.strip():
             return
@@ -529,23 +572,12 @@ def bump_metric(name: str, amount: float = 1.0) -> None:
     except Exception:
         return
 
-    m = read_json(metrics_path(), {})
-    if not isinstance(m, dict):
-        m = {}
-
-    counters = m.get("counters")
-    if not isinstance(counters, dict):
-        counters = {}
-
     try:
-        cur = float(counters.get(name) or 0.0)
-    except Exception:
-        cur = 0.0
-    counters[name] = cur + amt
+        get_metrics().inc(name, amt)
+    except Exception as e:
+        log(f"[dt_truth] ⚠️ bump_metric failed for {name}: {e}")
+
 
-    m["counters"] = counters
-    m["ts"] = _utc_iso()
-    atomic_write_json(metrics_path(), m)
 def _positions_bucket_view(positions: Any) -> Dict[str, Any]:
     """Normalize ledger positions to a flat {SYMBOL: {qty, avg_price}} dict.
 
@@ -576,8 +608,19 @@ def _positions_bucket_view(positions: Any) -> Dict[str, Any]:
 def count_trades_today(symbol: str) -> int:
     """Count how many trades (entries) we made on this symbol today.
     
-    Reads from dt_trades.jsonl for today's date.
+    Served from the indexed trade journal (trade_journal_dt); with
+    DT_TRADE_JOURNAL=0 (or on journal failure) scans dt_trades.jsonl.
     """
+    if trade_journal_enabled():
+        try:
+            return get_trade_journal(trades_path()).entries(symbol)
+        except Exception as e:
+            log(f"[dt_truth] ⚠️ trade journal read failed, scanning: {e}")
+    return _scan_trades_today(symbol)
+
+
+def _scan_trades_today(symbol: str) -> int:
+    """Legacy full scan of dt_trades.jsonl for today's entries."""
     try:
         from datetime import datetime, timezone
         import json
@@ -620,12 +663,22 @@ def count_trades_today(symbol: str) -> int:
 def get_symbol_pnl_today(symbol: str) -> float:
     """Calculate total realized P&L for symbol today (Phase 3).
     
-    Scans dt_trades.jsonl for today's exit events for the given symbol
-    and sums up the realized P&L.
+    Sums realized P&L of today's exit events for the given symbol, served
+    from the indexed trade journal (falls back to scanning dt_trades.jsonl).
     
     Returns:
         float: Total P&L for symbol today (negative = loss, positive = profit)
     """
+    if trade_journal_enabled():
+        try:
+            return get_trade_journal(trades_path()).realized_pnl(symbol)
+        except Exception as e:
+            log(f"[dt_truth] ⚠️ trade journal read failed, scanning: {e}")
+    return _scan_symbol_pnl_today(symbol)
+
+
+def _scan_symbol_pnl_today(symbol: str) -> float:
+    """Legacy full scan of dt_trades.jsonl for today's realized P&L."""
     try:
         from datetime import datetime, timezone
         import json
@@ -1,4 +1,4 @@
-"""dt_backend/services/execution_ledger.py — v1.0
+"""dt_backend/services/execution_ledger.py — v1.1
 
 Execution ledger for saga pattern (3-phase commit).
 
@@ -14,7 +14,12 @@ This ledger is append-only and provides:
 - Recovery capability (replay to reconstruct state)
 - No silent data loss
 
-File: dt_execution_ledger.jsonl (append-only)
+File: dt_execution_ledger.jsonl (append-only tail)
+
+Reads go through ExecutionLedger: an in-memory index of the latest record
+per execution plus the pending set, built once from the compacted snapshot
+(dt_execution_ledger.snapshot.json) and the tail, then kept current by the
+record_* functions. Periodic compaction keeps startup and lookups flat.
 
 Example flow:
     1. record_pending("AAPL", "BUY", 10, 180.0) -> "exec_abc123"
@@ -30,13 +35,14 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import uuid
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from dt_backend.core.file_locking import AppendLocked
+from dt_backend.core.file_locking import AcquireLock
 from dt_backend.core.logger_dt import log
 from dt_backend.core.time_override_dt import now_utc as _now_utc_override
 
@@ -113,6 +119,305 @@ class ExecutionRecord:
         return {k: v for k, v in d.items() if v is not None}
 
 
+_LIVE_STATUSES = frozenset({"pending", "confirmed"})
+_TERMINAL_STATUSES = frozenset({"recorded", "failed"})
+_SNAPSHOT_VERSION = 1
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except Exception:
+        return int(default)
+
+
+class ExecutionLedger:
+    """In-memory view of one ledger: latest record per execution + pending set.
+
+    On disk the ledger is a compacted snapshot plus the append-only tail:
+
+        dt_execution_ledger.snapshot.json   latest state per execution
+        dt_execution_ledger.jsonl           records appended since the snapshot
+
+    The index is built once (snapshot + streaming replay of the tail) and then
+    kept current by append(). Reads first fold any tail bytes other processes
+    appended (tracked by offset), so lookups never rescan the file.
+
+    compact() folds the tail into a new snapshot and moves the raw tail lines
+    into dt_execution_ledger_archive/ (the audit trail is kept, just not
+    replayed). Terminal executions beyond the newest `keep_recent` are
+    dropped from the snapshot and only counted, so startup cost stays flat.
+
+    Appends and the compaction rename both lock the sidecar `<tail>.lock`,
+    never the tail itself: the rename swaps the tail's inode, so a lock taken
+    on the old inode would not exclude a writer that reopens the new one.
+
+    Crash safety: the tail is renamed to `<tail>.g<N>` before snapshot
+    generation N is written. On load, leftover `.g<k>` files with k <= N are
+    already in the snapshot and are archived; k > N is replayed.
+
+    Configured by env:
+        DT_EXEC_LEDGER_COMPACT_BYTES = tail size that triggers compaction
+                                       after an append (default 4 MiB, 0 = never)
+        DT_EXEC_LEDGER_KEEP_RECENT   = terminal records kept in the snapshot (default 2000)
+    """
+
+    def __init__(self, path: Path, *, compact_bytes: Optional[int] = None, keep_recent: Optional[int] = None):
+        self.path = Path(path)
+        self.snapshot_path = self.path.with_name(self.path.stem + ".snapshot.json")
+        self.archive_dir = self.path.with_name(self.path.stem + "_archive")
+        self.tail_lock_path = self.path.with_name(self.path.name + ".lock")
+        self.compact_bytes = _env_int("DT_EXEC_LEDGER_COMPACT_BYTES", 4 << 20) if compact_bytes is None else int(compact_bytes)
+        self.keep_recent = _env_int("DT_EXEC_LEDGER_KEEP_RECENT", 2000) if keep_recent is None else int(keep_recent)
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._pending: Set[str] = set()
+        self._evicted: Dict[str, int] = {}
+        self._generation = 0
+        self._snapshot_sig: Tuple[int, int] = (0, 0)
+        self._offset = 0
+
+    # ---------------------------------------------------------
+    # Loading / incremental replay
+    # ---------------------------------------------------------
+
+    @staticmethod
+    def _sig(path: Path) -> Tuple[int, int]:
+        try:
+            st = path.stat()
+            return int(st.st_mtime_ns), int(st.st_size)
+        except FileNotFoundError:
+            return 0, 0
+
+    def _apply(self, rec: Dict[str, Any]) -> None:
+        exec_id = rec.get("execution_id")
+        if not exec_id:
+            return
+        self._records[exec_id] = rec
+        if rec.get("status") in _LIVE_STATUSES:
+            self._pending.add(exec_id)
+        else:
+            self._pending.discard(exec_id)
+
+    def _apply_lines(self, data: bytes) -> None:
+        for raw in data.splitlines():
+            if not raw.strip():
+                continue
+            try:
+                rec = json.loads(raw)
+            except Exception:
+                continue
+            if isinstance(rec, dict):
+                self._apply(rec)
+
+    def _leftover_tails(self) -> List[Tuple[int, Path]]:
+        out: List[Tuple[int, Path]] = []
+        for p in self.path.parent.glob(self.path.name + ".g*"):
+            try:
+                out.append((int(p.name.rsplit(".g", 1)[1]), p))
+            except (IndexError, ValueError):
+                continue
+        return sorted(out)
+
+    def _archive(self, gen: int, src: Path) -> None:
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        os.replace(src, self.archive_dir / f"{day}_g{gen:06d}.jsonl")
+
+    def _load(self) -> None:
+        self._records.clear()
+        self._pending.clear()
+        self._evicted = {}
+        self._generation = 0
+        self._offset = 0
+
+        self._snapshot_sig = self._sig(self.snapshot_path)
+        if self._snapshot_sig[1]:
+            try:
+                snap = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+                if isinstance(snap, dict) and snap.get("version") == _SNAPSHOT_VERSION:
+                    self._generation = int(snap.get("generation") or 0)
+                    self._evicted = {str(k): int(v) for k, v in (snap.get("evicted") or {}).items()}
+                    for rec in snap.get("records") or []:
+                        if isinstance(rec, dict):
+                            self._apply(rec)
+            except Exception as e:
+                log(f"[exec_ledger] ⚠️ unreadable snapshot {self.snapshot_path.name}: {e}")
+
+        for gen, p in self._leftover_tails():
+            try:
+                if gen <= self._generation:
+                    self._archive(gen, p)
+                else:
+                    self._apply_lines(p.read_bytes())
+            except Exception as e:
+                log(f"[exec_ledger] ⚠️ leftover tail {p.name}: {e}")
+
+        self._loaded = True
+        self._catch_up()
+
+    def _catch_up(self) -> None:
+        """Fold tail bytes appended since the last look; reload after a compaction elsewhere."""
+        if self._sig(self.snapshot_path) != self._snapshot_sig:
+            self._load()
+            return
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self._offset:
+            self._load()
+            return
+        if size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return
+        self._apply_lines(chunk[: end + 1])
+        self._offset += end + 1
+
+    def _ensure(self) -> None:
+        if not self._loaded:
+            self._load()
+        else:
+            self._catch_up()
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+
+    def exists(self) -> bool:
+        return self.path.exists() or self.snapshot_path.exists()
+
+    def append(self, record: Dict[str, Any]) -> bool:
+        """Append one full-state record to the tail and index it."""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._ensure()
+            with AcquireLock(self.tail_lock_path, timeout=5.0) as acquired:
+                if not acquired:
+                    log(f"[exec_ledger] ⚠️ Failed to acquire tail lock for append: {self.path.name}")
+                    return False
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(line)
+                        f.flush()
+                        os.fsync(f.fileno())
+                except Exception as e:
+                    log(f"[exec_ledger] ⚠️ Failed to append to {self.path.name}: {e}")
+                    return False
+            self._catch_up()
+            if self.compact_bytes > 0 and self._offset >= self.compact_bytes:
+                self.compact()
+            return True
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._ensure()
+            rec = self._records.get(execution_id)
+            return dict(rec) if rec is not None else None
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Executions still pending or confirmed (not recorded/failed)."""
+        with self._lock:
+            self._ensure()
+            return [dict(self._records[e]) for e in self._pending]
+
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._ensure()
+            recs = sorted(self._records.values(), key=lambda r: r.get("ts", ""), reverse=True)
+            return [dict(r) for r in recs[: max(0, int(limit))]]
+
+    def counts(self) -> Dict[str, int]:
+        """Latest-status counts including executions dropped from the snapshot."""
+        with self._lock:
+            self._ensure()
+            out: Dict[str, int] = dict(self._evicted)
+            for rec in self._records.values():
+                st = str(rec.get("status") or "")
+                out[st] = out.get(st, 0) + 1
+            out["total"] = sum(out.values())
+            out.setdefault("recorded", 0)
+            out.setdefault("failed", 0)
+            return out
+
+    def compact(self) -> Dict[str, Any]:
+        """Fold the tail into a new snapshot generation and archive the raw tail."""
+        lock_path = self.path.with_name(self.path.name + ".compact.lock")
+        with self._lock, AcquireLock(lock_path, timeout=10.0) as acquired:
+            if not acquired:
+                return {"status": "locked"}
+            self._ensure()
+            gen = self._generation + 1
+            moved = self.path.with_name(f"{self.path.name}.g{gen}")
+
+            with AcquireLock(self.tail_lock_path, timeout=5.0) as tail_locked:
+                if not tail_locked:
+                    return {"status": "locked"}
+                self._catch_up()
+                if self.path.exists():
+                    os.replace(self.path, moved)
+            # Lines that landed after our last fold but before the rename.
+            if moved.exists():
+                size = moved.stat().st_size
+                if size > self._offset:
+                    with open(moved, "rb") as f:
+                        f.seek(self._offset)
+                        self._apply_lines(f.read())
+
+            terminal = sorted(
+                (r for e, r in self._records.items() if e not in self._pending),
+                key=lambda r: r.get("ts", ""),
+                reverse=True,
+            )
+            for rec in terminal[max(0, self.keep_recent):]:
+                st = str(rec.get("status") or "")
+                self._evicted[st] = self._evicted.get(st, 0) + 1
+                self._records.pop(rec.get("execution_id"), None)
+
+            snap = {
+                "version": _SNAPSHOT_VERSION,
+                "generation": gen,
+                "ts": _utc_iso(datetime.now(timezone.utc)),
+                "evicted": self._evicted,
+                "records": list(self._records.values()),
+            }
+            tmp = self.snapshot_path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(snap, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.snapshot_path)
+
+            self._generation = gen
+            self._snapshot_sig = self._sig(self.snapshot_path)
+            self._offset = 0
+            if moved.exists():
+                self._archive(gen, moved)
+
+            log(f"[exec_ledger] 🗜️ compacted ledger (gen={gen}, live={len(self._records)}, pending={len(self._pending)})")
+            return {"status": "ok", "generation": gen, "records": len(self._records), "pending": len(self._pending)}
+
+
+_ledgers: Dict[str, ExecutionLedger] = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_ledger() -> ExecutionLedger:
+    """Process-wide ExecutionLedger for the current ledger path (honours DT_TRUTH_DIR)."""
+    path = _ledger_path()
+    key = str(path.resolve())
+    with _ledgers_lock:
+        ledger = _ledgers.get(key)
+        if ledger is None:
+            ledger = ExecutionLedger(path)
+            _ledgers[key] = ledger
+        return ledger
+
+
 def _generate_execution_id() -> str:
     """Generate unique execution ID."""
     return f"exec_{uuid.uuid4().hex[:12]}"
@@ -163,8 +468,7 @@ def record_pending(
     )
     
     # Append to ledger with locking
-    line = json.dumps(record.to_dict(), ensure_ascii=False)
-    success = AppendLocked(_ledger_path(), line, timeout=5.0)
+    success = get_ledger().append(record.to_dict())
     
     if success:
         log(f"[exec_ledger] ✅ Phase 1 (pending): {exec_id} {side} {qty} {symbol} @ {price}")
@@ -223,8 +527,7 @@ def record_confirmed(
     )
     
     # Append to ledger
-    line = json.dumps(record.to_dict(), ensure_ascii=False)
-    success = AppendLocked(_ledger_path(), line, timeout=5.0)
+    success = get_ledger().append(record.to_dict())
     
     if success:
         log(f"[exec_ledger] ✅ Phase 2 (confirmed): {execution_id} filled @ {fill_price}")
@@ -280,8 +583,7 @@ def record_recorded(
     )
     
     # Append to ledger
-    line = json.dumps(record.to_dict(), ensure_ascii=False)
-    success = AppendLocked(_ledger_path(), line, timeout=5.0)
+    success = get_ledger().append(record.to_dict())
     
     if success:
         log(f"[exec_ledger] ✅ Phase 3 (recorded): {execution_id} complete")
@@ -337,8 +639,7 @@ def record_failed(
     )
     
     # Append to ledger
-    line = json.dumps(record.to_dict(), ensure_ascii=False)
-    success = AppendLocked(_ledger_path(), line, timeout=5.0)
+    success = get_ledger().append(record.to_dict())
     
     if success:
         log(f"[exec_ledger] ❌ Recorded failure: {execution_id} - {error_msg}")
@@ -349,61 +650,9 @@ def record_failed(
 
 
 def _find_record(execution_id: str) -> Optional[Dict[str, Any]]:
-    """Find most recent record for execution_id in ledger.
-    
-    Scans ledger backward to find latest state.
-    Memory-efficient: processes one line at a time.
-    """
-    ledger_file = _ledger_path()
-    if not ledger_file.exists():
-        return None
-    
+    """Latest record for execution_id (served from the in-memory index)."""
     try:
-        # Read file backward line by line for memory efficiency
-        result = None
-        with open(ledger_file, "r", encoding="utf-8") as f:
-            # Seek to end
-            f.seek(0, 2)
-            file_size = f.tell()
-            
-            # Read backward in chunks
-            chunk_size = 8192
-            position = file_size
-            lines = []
-            
-            while position > 0:
-                chunk_size = min(chunk_size, position)
-                position -= chunk_size
-                f.seek(position)
-                chunk = f.read(chunk_size)
-                
-                # Split into lines and reverse
-                chunk_lines = chunk.split('\n')
-                lines = chunk_lines + lines
-                
-                # Process complete lines from the end
-                while len(lines) > 1:
-                    line = lines.pop()
-                    if not line.strip():
-                        continue
-                    try:
-                        record = json.loads(line.strip())
-                        if record.get("execution_id") == execution_id:
-                            return record
-                    except Exception:
-                        continue
-        
-        # Check remaining first line
-        if lines and lines[0].strip():
-            try:
-                record = json.loads(lines[0].strip())
-                if record.get("execution_id") == execution_id:
-                    return record
-            except Exception:
-                pass
-        
-        return None
-        
+        return get_ledger().get(execution_id)
     except Exception as e:
         log(f"[exec_ledger] ⚠️ Error finding record {execution_id}: {e}")
         return None
@@ -417,32 +666,8 @@ def get_pending() -> List[Dict[str, Any]]:
     Returns:
         List of execution records in pending or confirmed state
     """
-    ledger_file = _ledger_path()
-    if not ledger_file.exists():
-        return []
-    
     try:
-        # Build map of execution_id -> latest state
-        executions: Dict[str, Dict[str, Any]] = {}
-        
-        with open(ledger_file, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    record = json.loads(line.strip())
-                    exec_id = record.get("execution_id")
-                    if exec_id:
-                        executions[exec_id] = record
-                except Exception:
-                    continue
-        
-        # Filter to pending/confirmed (not recorded or failed)
-        pending = [
-            rec for rec in executions.values()
-            if rec.get("status") in {"pending", "confirmed"}
-        ]
-        
-        return pending
-        
+        return get_ledger().pending()
     except Exception as e:
         log(f"[exec_ledger] ⚠️ Error getting pending executions: {e}")
         return []
@@ -457,34 +682,8 @@ def get_recent(limit: int = 100) -> List[Dict[str, Any]]:
     Returns:
         List of most recent execution records
     """
-    ledger_file = _ledger_path()
-    if not ledger_file.exists():
-        return []
-    
     try:
-        # Build map of execution_id -> latest state
-        executions: Dict[str, Dict[str, Any]] = {}
-        
-        with open(ledger_file, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    record = json.loads(line.strip())
-                    exec_id = record.get("execution_id")
-                    if exec_id:
-                        # Keep only latest record per execution
-                        executions[exec_id] = record
-                except Exception:
-                    continue
-        
-        # Sort by timestamp (descending) and limit
-        records = sorted(
-            executions.values(),
-            key=lambda r: r.get("ts", ""),
-            reverse=True
-        )
-        
-        return records[:limit]
-        
+        return get_ledger().recent(limit)
     except Exception as e:
         log(f"[exec_ledger] ⚠️ Error getting recent executions: {e}")
         return []
@@ -501,54 +700,34 @@ def replay_ledger() -> Dict[str, Any]:
     Returns:
         Dict with statistics and incomplete executions
     """
-    ledger_file = _ledger_path()
-    if not ledger_file.exists():
-        return {
-            "status": "no_ledger",
-            "total": 0,
-            "completed": 0,
-            "pending": 0,
-            "failed": 0,
-            "incomplete": [],
-        }
-    
     try:
-        # Build map of execution_id -> latest state
-        executions: Dict[str, Dict[str, Any]] = {}
-        
-        with open(ledger_file, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    record = json.loads(line.strip())
-                    exec_id = record.get("execution_id")
-                    if exec_id:
-                        executions[exec_id] = record
-                except Exception:
-                    continue
-        
-        # Analyze final states
-        total = len(executions)
-        completed = sum(1 for r in executions.values() if r.get("status") == "recorded")
-        failed = sum(1 for r in executions.values() if r.get("status") == "failed")
-        pending = sum(1 for r in executions.values() if r.get("status") in {"pending", "confirmed"})
-        
-        # Get incomplete executions for manual review
-        incomplete = [
-            r for r in executions.values()
-            if r.get("status") in {"pending", "confirmed"}
-        ]
-        
+        ledger = get_ledger()
+        if not ledger.exists():
+            return {
+                "status": "no_ledger",
+                "total": 0,
+                "completed": 0,
+                "pending": 0,
+                "failed": 0,
+                "incomplete": [],
+            }
+
+        counts = ledger.counts()
+        incomplete = ledger.pending()
         result = {
             "status": "ok",
-            "total": total,
-            "completed": completed,
-            "pending": pending,
-            "failed": failed,
+            "total": counts["total"],
+            "completed": counts["recorded"],
+            "pending": len(incomplete),
+            "failed": counts["failed"],
             "incomplete": incomplete,
-            "ledger_path": str(ledger_file),
+            "ledger_path": str(ledger.path),
         }
         
-        log(f"[exec_ledger] 📊 Replay: {total} total, {completed} completed, {pending} pending, {failed} failed")
+        log(
+            f"[exec_ledger] 📊 Replay: {result['total']} total, {result['completed']} completed, "
+            f"{result['pending']} pending, {result['failed']} failed"
+        )
         
         return result
         
@@ -563,3 +742,12 @@ def replay_ledger() -> Dict[str, Any]:
             "failed": 0,
             "incomplete": [],
         }
+
+
+def compact_ledger() -> Dict[str, Any]:
+    """Fold the tail log into the snapshot now (see ExecutionLedger.compact)."""
+    try:
+        return get_ledger().compact()
+    except Exception as e:
+        log(f"[exec_ledger] ⚠️ Compaction failed: {e}")
+        return {"status": "error", "error": str(e)}
@@ -7,6 +7,8 @@ What this does
 * Pulls 1Min and/or 5Min bars from Alpaca Data API in *batches*.
 * Merges bars into rolling[symbol] without duplicating timestamps.
 * Trims history to a configurable max length (keeps rolling lightweight).
+* Appends every fetched bar to the columnar bar store (bar_store_dt), so
+  feature engineering can read NumPy columns instead of re-parsing dicts.
 
 Why it exists
 -------------
@@ -37,6 +39,7 @@ from dt_backend.core.logger_dt import log, warn, error
 from dt_backend.core.locks_dt import acquire_lock_file, release_lock_file
 from dt_backend.services.dt_truth_store import BARS_FETCH_LOCK_PATH
 from dt_backend.core.bars_fetch_state_dt import get_last_end, set_last_end
+from dt_backend.core.bar_store_dt import append_fetched_bars
 
 try:
     from pathlib import Path
@@ -113,9 +116,13 @@ def fetch_bars_batch(
     end_dt: datetime | None = None,
     limit: int = 10000,
     bars_url: str = DEFAULT_BARS_URL,
+    store: bool = True,
 ) -> Dict[str, List[Dict[str, Any]]]:
     """Fetch bars for a batch of symbols from Alpaca.
 
+    When `store` is True (and DT_BAR_STORE is enabled) the fetched bars are
+    also appended to the columnar bar store.
+
     Returns:
         {"AAPL": [bar, ...], "MSFT": [bar, ...], ...}
     """
@@ -164,6 +171,11 @@ def fetch_bars_batch(
                 norm.append(b)
         if norm:
             out[sym] = norm
+
+    if store and out:
+        appended = append_fetched_bars(out, timeframe)
+        if appended:
+            log(f"[bars_fetch] 🗄️ bar store +{sum(appended.values())} bars ({len(appended)} syms, tf={timeframe})")
     return out
 
 
@@ -0,0 +1,365 @@
+"""dt_backend/services/metrics_registry_dt.py
+
+In-process metrics registry (counters, gauges, histograms) for dt_backend.
+
+Why
+---
+bump_metric() used to read dt_metrics.json, bump one counter and rewrite the
+whole file (indent=2) on every call, from hot paths that call it many times
+per cycle. The registry keeps metrics in memory and flushes them on a timer
+or at cycle end instead.
+
+Multi-process
+-------------
+Every process writes only its own shard; readers merge:
+
+    <intraday>/dt_metrics_shards/<pid>.json    live per-process totals
+    <intraday>/dt_metrics_shards/_base.json    folded shards of dead PIDs
+
+Merging: counters and histogram buckets add up, gauges keep the most
+recently set value. Shards of processes that are no longer alive are folded
+into _base.json on the next flush, so the directory does not grow with
+restarts and counters stay cumulative (as they were in dt_metrics.json).
+
+Snapshot API
+------------
+    registry.snapshot()                 this process only; no disk access
+    registry.snapshot(merged=True)      all processes (reads shards, cached by mtime)
+
+Configured by env:
+    DT_METRICS_FLUSH_SEC = seconds between timed flushes (default 5, 0 = every update)
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dt_backend.core.file_locking import AcquireLock
+from dt_backend.core.logger_dt import log
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+_BASE_NAME = "_base.json"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return float(default)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except Exception:
+        return True
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts per upper bound + overflow)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "min", "max")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: List[float] = sorted(float(b) for b in buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        v = float(value)
+        i = 0
+        for i, b in enumerate(self.buckets):
+            if v <= b:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.sum += v
+        self.count += 1
+        self.min = v if self.min is None else min(self.min, v)
+        self.max = v if self.max is None else max(self.max, v)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "sum": self.sum,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+def _merge_hist(dst: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
+    if not dst:
+        return {k: (list(v) if isinstance(v, list) else v) for k, v in src.items()}
+    if list(dst.get("buckets") or []) != list(src.get("buckets") or []):
+        return dst  # incompatible layouts: keep the first one seen
+    dst["counts"] = [int(a) + int(b) for a, b in zip(dst.get("counts") or [], src.get("counts") or [])]
+    dst["sum"] = float(dst.get("sum") or 0.0) + float(src.get("sum") or 0.0)
+    dst["count"] = int(dst.get("count") or 0) + int(src.get("count") or 0)
+    mins = [m for m in (dst.get("min"), src.get("min")) if m is not None]
+    maxs = [m for m in (dst.get("max"), src.get("max")) if m is not None]
+    dst["min"] = min(mins) if mins else None
+    dst["max"] = max(maxs) if maxs else None
+    return dst
+
+
+def merge_snapshots(snaps: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge registry snapshots (counters add, gauges latest-wins, histograms add)."""
+    counters: Dict[str, float] = {}
+    gauges: Dict[str, Tuple[float, float]] = {}
+    hists: Dict[str, Dict[str, Any]] = {}
+    for snap in snaps:
+        if not isinstance(snap, dict):
+            continue
+        for k, v in (snap.get("counters") or {}).items():
+            try:
+                counters[k] = counters.get(k, 0.0) + float(v)
+            except Exception:
+                continue
+        for k, v in (snap.get("gauges") or {}).items():
+            try:
+                val, ts = float(v[0]), float(v[1])
+            except Exception:
+                continue
+            if k not in gauges or ts >= gauges[k][1]:
+                gauges[k] = (val, ts)
+        for k, v in (snap.get("histograms") or {}).items():
+            if isinstance(v, dict):
+                hists[k] = _merge_hist(hists.get(k) or {}, v)
+    return {
+        "counters": counters,
+        "gauges": {k: [v, ts] for k, (v, ts) in gauges.items()},
+        "histograms": hists,
+    }
+
+
+class MetricsRegistry:
+    """Counters / gauges / histograms for one process, flushed to a per-PID shard."""
+
+    def __init__(self, shard_dir: Path, *, flush_sec: Optional[float] = None):
+        self.shard_dir = Path(shard_dir)
+        self.flush_sec = _env_float("DT_METRICS_FLUSH_SEC", 5.0) if flush_sec is None else float(flush_sec)
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, Tuple[float, float]] = {}
+        self._hists: Dict[str, Histogram] = {}
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._merged_cache: Optional[Tuple[Tuple[Tuple[str, int], ...], Dict[str, Any]]] = None
+        self._fold_dead_shards(include_own=True)
+
+    # ---------------------------------------------------------
+    # Updates
+    # ---------------------------------------------------------
+
+    def _check_fork(self) -> None:
+        # A forked child inherits the parent's totals; start it from zero.
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._counters.clear()
+            self._gauges.clear()
+            self._hists.clear()
+            self._dirty = False
+
+    def inc(self, name: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._check_fork()
+            self._counters[name] = self._counters.get(name, 0.0) + float(amount)
+            self._dirty = True
+        self.maybe_flush()
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._check_fork()
+            self._gauges[name] = (float(value), time.time())
+            self._dirty = True
+        self.maybe_flush()
+
+    def observe(self, name: str, value: float, *, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        with self._lock:
+            self._check_fork()
+            h = self._hists.get(name)
+            if h is None:
+                h = Histogram(buckets)
+                self._hists[name] = h
+            h.observe(value)
+            self._dirty = True
+        self.maybe_flush()
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Observe the wall time of the block (seconds) into histogram `name`."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    # ---------------------------------------------------------
+    # Snapshots
+    # ---------------------------------------------------------
+
+    def snapshot(self, *, merged: bool = False) -> Dict[str, Any]:
+        """{"counters", "gauges": {name: [value, ts]}, "histograms"}."""
+        if merged:
+            return self._merged_snapshot()
+        with self._lock:
+            self._check_fork()
+            return {
+                "counters": dict(self._counters),
+                "gauges": {k: [v, ts] for k, (v, ts) in self._gauges.items()},
+                "histograms": {k: h.to_dict() for k, h in self._hists.items()},
+            }
+
+    def _shard_files(self) -> List[Path]:
+        try:
+            return sorted(p for p in self.shard_dir.glob("*.json") if p.is_file())
+        except Exception:
+            return []
+
+    def _merged_snapshot(self) -> Dict[str, Any]:
+        self.flush(force=False)
+        files = self._shard_files()
+        sig: List[Tuple[str, int]] = []
+        for p in files:
+            try:
+                sig.append((p.name, int(p.stat().st_mtime_ns)))
+            except FileNotFoundError:
+                continue
+        key = tuple(sig)
+        with self._lock:
+            if self._merged_cache is not None and self._merged_cache[0] == key and not self._dirty:
+                return self._merged_cache[1]
+            own = f"{self._pid}.json"
+            snaps: List[Dict[str, Any]] = [self.snapshot()]
+            for name, _ in key:
+                if name == own:
+                    continue
+                snaps.append(self._read(self.shard_dir / name))
+            out = merge_snapshots(snaps)
+            self._merged_cache = (key, out)
+            return out
+
+    # ---------------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------------
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, Any]:
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            return raw if isinstance(raw, dict) else {}
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _write(path: Path, obj: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(obj, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def maybe_flush(self) -> None:
+        if self.flush_sec <= 0 or (time.monotonic() - self._last_flush) >= self.flush_sec:
+            self.flush(force=True)
+
+    def flush(self, *, force: bool = True) -> bool:
+        """Write this process's shard if anything changed (and the timer allows)."""
+        with self._lock:
+            self._check_fork()
+            if not self._dirty:
+                return False
+            if not force and (time.monotonic() - self._last_flush) < self.flush_sec:
+                return False
+            snap = self.snapshot()
+            snap["pid"] = self._pid
+            snap["ts"] = time.time()
+            try:
+                self._write(self.shard_dir / f"{self._pid}.json", snap)
+            except Exception as e:
+                log(f"[metrics] ⚠️ shard flush failed: {e}")
+                return False
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        self._fold_dead_shards()
+        return True
+
+    def _fold_dead_shards(self, *, include_own: bool = False) -> None:
+        """Fold shards of exited processes into _base.json."""
+        dead: List[Path] = []
+        for p in self._shard_files():
+            if p.name == _BASE_NAME:
+                continue
+            try:
+                pid = int(p.stem)
+            except ValueError:
+                continue
+            if (pid == self._pid and include_own) or (pid != self._pid and not _pid_alive(pid)):
+                dead.append(p)
+        if not dead:
+            return
+        base_path = self.shard_dir / _BASE_NAME
+        try:
+            with AcquireLock(self.shard_dir / ".fold.lock", timeout=2.0) as acquired:
+                if not acquired:
+                    return
+                snaps = [self._read(base_path)]
+                present = [p for p in dead if p.exists()]
+                snaps.extend(self._read(p) for p in present)
+                self._write(base_path, merge_snapshots(snaps))
+                for p in present:
+                    p.unlink()
+        except Exception as e:
+            log(f"[metrics] ⚠️ folding dead shards failed: {e}")
+
+
+# -------------------------------------------------------------
+# Singleton access
+# -------------------------------------------------------------
+
+_registries: Dict[str, MetricsRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_metrics_registry(shard_dir: Path) -> MetricsRegistry:
+    """Process-wide registry writing shards under `shard_dir`."""
+    key = str(Path(shard_dir).resolve())
+    with _registries_lock:
+        reg = _registries.get(key)
+        if reg is None:
+            reg = MetricsRegistry(Path(shard_dir))
+            _registries[key] = reg
+        return reg
+
+
+def flush_all() -> None:
+    for reg in list(_registries.values()):
+        try:
+            reg.flush(force=True)
+        except Exception:
+            pass
+
+
+atexit.register(flush_all)
@@ -0,0 +1,256 @@
+"""dt_backend/services/trade_journal_dt.py
+
+Date-partitioned trade-event journal with an in-process aggregate index.
+
+Why
+---
+count_trades_today() / get_symbol_pnl_today() used to json.loads every line
+of dt_trades.jsonl since inception, and the risk rails call them per symbol
+per cycle. The journal keeps one segment per UTC date next to the legacy
+file:
+
+    <intraday>/dt_trades_segments/<YYYY-MM-DD>.jsonl
+
+and a per-day, per-symbol index of entry counts and realized P&L. On first
+use in a process a day's index is rebuilt from its segment; after that,
+appends and queries only fold the bytes added since the last fold (ours or
+another process's, tracked by offset). Queries are a stat + dict lookup.
+
+dt_trades.jsonl is still written (replay metrics, routers and tools read
+it). The first time a journal finds no segments directory it splits the
+legacy file into segments once, so counts survive the upgrade.
+
+Counting rules (unchanged from the scanning implementation):
+  • entries: type in {order_submitted, bracket_set} and side == BUY
+  • realized P&L: type in {exit, fill_exit, order_filled}, pnl or realized_pnl
+  • the day of an event is str(ts)[:10]
+
+Configured by env:
+    DT_TRADE_JOURNAL = "1" (default) use the journal, "0" scan dt_trades.jsonl
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from dt_backend.core.file_locking import AcquireLock, AppendLocked
+from dt_backend.core.logger_dt import log
+
+ENTRY_TYPES = frozenset({"order_submitted", "bracket_set"})
+EXIT_TYPES = frozenset({"exit", "fill_exit", "order_filled"})
+
+SEGMENTS_DIRNAME = "dt_trades_segments"
+_MIGRATED_MARKER = ".migrated"
+_MIGRATE_LOCK = ".migrate.lock"
+
+
+def trade_journal_enabled() -> bool:
+    return str(os.getenv("DT_TRADE_JOURNAL", "1")).strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def _today_utc() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _event_day(event: Dict[str, Any]) -> str:
+    day = str(event.get("ts", ""))[:10]
+    return day if len(day) == 10 else _today_utc()
+
+
+@dataclass
+class _DayIndex:
+    """Aggregates for one segment, valid up to `offset` bytes."""
+
+    offset: int = 0
+    entries: Dict[str, int] = field(default_factory=dict)
+    pnl: Dict[str, float] = field(default_factory=dict)
+
+    def fold(self, evt: Dict[str, Any]) -> None:
+        typ = evt.get("type")
+        if typ in ENTRY_TYPES:
+            if str(evt.get("side", "")).upper() == "BUY":
+                sym = str(evt.get("symbol", "")).upper()
+                self.entries[sym] = self.entries.get(sym, 0) + 1
+        elif typ in EXIT_TYPES:
+            sym = str(evt.get("symbol", "")).upper()
+            try:
+                val = float(evt.get("pnl") or evt.get("realized_pnl") or 0.0)
+            except (ValueError, TypeError):
+                return
+            self.pnl[sym] = self.pnl.get(sym, 0.0) + val
+
+
+class TradeJournal:
+    """Segment-per-day trade journal rooted at `root` (the segments dir)."""
+
+    def __init__(self, root: Path, *, legacy_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.legacy_path = Path(legacy_path) if legacy_path is not None else None
+        self._lock = threading.RLock()
+        self._days: Dict[str, _DayIndex] = {}
+        self._ready = False
+
+    def segment_path(self, day: str) -> Path:
+        return self.root / f"{day}.jsonl"
+
+    # ---------------------------------------------------------
+    # One-time split of the legacy monolithic file
+    # ---------------------------------------------------------
+
+    def _ensure_ready(self) -> None:
+        if self._ready:
+            return
+        marker = self.root / _MIGRATED_MARKER
+        if marker.exists():
+            self._ready = True
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with AcquireLock(self.root / _MIGRATE_LOCK, timeout=30.0) as acquired:
+            if not acquired or marker.exists():
+                self._ready = bool(acquired) or marker.exists()
+                return
+            n = self._split_legacy()
+            marker.write_text(_today_utc(), encoding="utf-8")
+            if n:
+                log(f"[trade_journal] 🗂️ split {n} legacy events into {self.root}")
+        self._ready = True
+
+    def _split_legacy(self) -> int:
+        src = self.legacy_path
+        if src is None or not src.exists():
+            return 0
+        n = 0
+        handles: Dict[str, Any] = {}
+        try:
+            with open(src, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        evt = json.loads(line)
+                    except Exception:
+                        continue
+                    if not isinstance(evt, dict):
+                        continue
+                    day = _event_day(evt)
+                    out = handles.get(day)
+                    if out is None:
+                        out = open(self.segment_path(day), "a", encoding="utf-8")
+                        handles[day] = out
+                    out.write(line + "\n")
+                    n += 1
+        finally:
+            for out in handles.values():
+                out.close()
+        return n
+
+    # ---------------------------------------------------------
+    # Write path
+    # ---------------------------------------------------------
+
+    def append(self, event: Dict[str, Any]) -> bool:
+        """Append one event to its day segment and update the index."""
+        self._ensure_ready()
+        day = _event_day(event)
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            if not AppendLocked(self.segment_path(day), line, timeout=5.0):
+                return False
+            # Fold from the file rather than the event: other processes may
+            # have appended ahead of us, and offsets must stay line-aligned.
+            self._refresh(day)
+            return True
+
+    # ---------------------------------------------------------
+    # Index
+    # ---------------------------------------------------------
+
+    def _refresh(self, day: str) -> _DayIndex:
+        """Index for `day`, folding any bytes appended to its segment since last seen."""
+        idx = self._days.get(day)
+        if idx is None:
+            idx = _DayIndex()
+            self._days[day] = idx
+        path = self.segment_path(day)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return idx
+        if size < idx.offset:
+            # Segment was replaced/truncated: rebuild.
+            idx = _DayIndex()
+            self._days[day] = idx
+        if size == idx.offset:
+            return idx
+
+        with open(path, "rb") as f:
+            f.seek(idx.offset)
+            chunk = f.read(size - idx.offset)
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return idx  # only a partial line so far
+        for raw in chunk[: end + 1].splitlines():
+            if not raw.strip():
+                continue
+            try:
+                evt = json.loads(raw)
+            except Exception:
+                continue
+            if isinstance(evt, dict):
+                idx.fold(evt)
+        idx.offset += end + 1
+        return idx
+
+    def entries(self, symbol: str, day: Optional[str] = None) -> int:
+        """BUY entries for `symbol` on `day` (default: today, UTC)."""
+        self._ensure_ready()
+        with self._lock:
+            idx = self._refresh(day or _today_utc())
+            return int(idx.entries.get(str(symbol).upper().strip(), 0))
+
+    def realized_pnl(self, symbol: str, day: Optional[str] = None) -> float:
+        """Realized P&L for `symbol` on `day` (default: today, UTC)."""
+        self._ensure_ready()
+        with self._lock:
+            idx = self._refresh(day or _today_utc())
+            return float(idx.pnl.get(str(symbol).upper().strip(), 0.0))
+
+    def day_summary(self, day: Optional[str] = None) -> Dict[str, Any]:
+        """{"entries": {sym: n}, "pnl": {sym: usd}} for `day`."""
+        self._ensure_ready()
+        with self._lock:
+            idx = self._refresh(day or _today_utc())
+            return {"entries": dict(idx.entries), "pnl": dict(idx.pnl)}
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._days.clear()
+            self._ready = False
+
+
+# -------------------------------------------------------------
+# Singleton access
+# -------------------------------------------------------------
+
+_journals: Dict[str, TradeJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_trade_journal(legacy_path: Path) -> TradeJournal:
+    """Process-wide journal whose segments live beside `legacy_path` (dt_trades.jsonl)."""
+    legacy = Path(legacy_path)
+    root = legacy.parent / SEGMENTS_DIRNAME
+    key = str(root.resolve())
+    with _journals_lock:
+        j = _journals.get(key)
+        if j is None:
+            j = TradeJournal(root, legacy_path=legacy)
+            _journals[key] = j
+        return j
@@ -2,6 +2,10 @@
  * useSSE - React hook for Server-Sent Events
  * 
  * Manages SSE connection lifecycle and provides real-time data updates.
+ *
+ * Plain messages carry the full payload. Streams opened with `?delta=1`
+ * follow up with `delta` events ({ set, unset } top-level keys) that are
+ * merged into the last full payload.
  */
 
 import { useEffect, useRef, useState } from "react";
@@ -23,6 +27,7 @@ export function useSSE<T = any>({
   const [error, setError] = useState<string | null>(null);
   const [isConnected, setIsConnected] = useState(false);
   const eventSourceRef = useRef<EventSource | null>(null);
+  const lastDataRef = useRef<T | null>(null);
   
   // Use refs to hold latest callbacks to avoid dependency issues
   const onDataRef = useRef(onData);
@@ -60,6 +65,7 @@ export function useSSE<T = any>({
     eventSource.onmessage = (event) => {
       try {
         const parsed = JSON.parse(event.data) as T;
+        lastDataRef.current = parsed;
         setData(parsed);
         onDataRef.current?.(parsed);
       } catch (err) {
@@ -68,6 +74,28 @@ export function useSSE<T = any>({
       }
     };
 
+    eventSource.addEventListener("delta", (event) => {
+      try {
+        const delta = JSON.parse((event as MessageEvent).data) as {
+          set?: Record<string, unknown>;
+          unset?: string[];
+        };
+        const merged: Record<string, unknown> = {
+          ...((lastDataRef.current as Record<string, unknown> | null) ?? {}),
+          ...(delta.set ?? {}),
+        };
+        for (const key of delta.unset ?? []) {
+          delete merged[key];
+        }
+        lastDataRef.current = merged as T;
+        setData(merged as T);
+        onDataRef.current?.(merged as T);
+      } catch (err) {
+        console.error("Failed to apply SSE delta:", err);
+        setError("Failed to parse server data");
+      }
+    });
+
     eventSource.onerror = (event) => {
       setIsConnected(false);
       setError("Connection error");
@@ -0,0 +1,89 @@
+"""Indexed realized-return lookups in the accuracy engine vs. the old scalar rule."""
+
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from backend.services import accuracy_engine as ae
+
+
+def _history(n, seed, start=date(2024, 1, 2)):
+    rng = np.random.default_rng(seed)
+    out, d = [], start
+    for _ in range(n):
+        out.append({"date": d.isoformat(), "close": float(100 + 10 * rng.random())})
+        d += timedelta(days=1 if d.weekday() < 4 else 3)
+    # duplicate date (last occurrence wins) + unsorted order
+    out.append({"date": out[5]["date"], "close": 999.0})
+    rng.shuffle(out)
+    return out
+
+
+def _scalar_realized(node, entry_date, entry_close, horizon):
+    """Reference: the pre-index linear lookup."""
+    dates, closes = ae._extract_history_series(node)
+    idx = None
+    for i in range(len(dates) - 1, -1, -1):
+        if dates[i] <= entry_date:
+            idx = i
+            break
+    steps = ae.HORIZON_STEPS[horizon]
+    if idx is None or idx + steps >= len(closes) or not entry_close:
+        return None
+    return closes[idx + steps] / entry_close - 1.0
+
+
+class TestHistoryIndex:
+    def test_matches_scalar_lookup(self):
+        rolling = {"AAA": {"history": _history(60, 1)}, "_meta": {}}
+        index = ae.HistoryIndex(rolling)
+
+        entries = [date(2023, 12, 30), date(2024, 1, 2), date(2024, 1, 6), date(2024, 2, 1), date(2024, 3, 20)]
+        for h in ("1d", "1w", "4w"):
+            ok, _exit, real = index.realized(
+                "aaa",
+                np.array(entries, dtype="datetime64[D]"),
+                np.full(len(entries), 100.0),
+                np.full(len(entries), ae.HORIZON_STEPS[h]),
+            )
+            for i, d in enumerate(entries):
+                ref = _scalar_realized(rolling["AAA"], d.isoformat(), 100.0, h)
+                assert bool(ok[i]) == (ref is not None)
+                if ref is not None:
+                    assert real[i] == pytest.approx(ref)
+
+    def test_history_parsed_once_per_symbol(self, monkeypatch):
+        calls = []
+        orig = ae._extract_history_series
+        monkeypatch.setattr(ae, "_extract_history_series", lambda node: calls.append(1) or orig(node))
+        index = ae.HistoryIndex({"AAA": {"history": _history(30, 2)}})
+        for _ in range(5):
+            index.series("AAA")
+        assert len(calls) == 1
+        assert index.series("MISSING") is None
+
+
+class TestScoreLedger:
+    def test_groups_rows_by_symbol(self, tmp_path, monkeypatch):
+        rolling = {"AAA": {"history": _history(60, 3)}, "BBB": {"history": _history(60, 4)}}
+        rows = [
+            {"symbol": "AAA", "horizon": "1w", "entry_date": "2024-01-10", "entry_close": 100.0},
+            {"symbol": "bbb", "horizon": "1d", "entry_date": "2024-01-10", "entry_close": 50.0},
+            {"symbol": "AAA", "horizon": "4w", "entry_date": "2024-03-25", "entry_close": 100.0},  # no future data
+            {"symbol": "ZZZ", "horizon": "1d", "entry_date": "2024-01-10", "entry_close": 10.0},  # not in rolling
+            {"symbol": "AAA", "horizon": "1d", "entry_date": "bad", "entry_close": 10.0},
+            {"symbol": "AAA", "horizon": "nope", "entry_date": "2024-01-10", "entry_close": 10.0},
+        ]
+        ledger_path = tmp_path / "predictions_ledger.jsonl"
+        ledger_path.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+        monkeypatch.setattr(ae, "LEDGER_PATH", ledger_path)
+
+        cols = ae._read_ledger()
+        assert len(cols) == 5  # unknown horizon dropped
+
+        ok, real = ae._score_ledger(cols.arrays(), ae.HistoryIndex(rolling))
+        assert ok.tolist() == [True, True, False, False, False]
+        assert real[0] == pytest.approx(_scalar_realized(rolling["AAA"], "2024-01-10", 100.0, "1w"))
+        assert real[1] == pytest.approx(_scalar_realized(rolling["BBB"], "2024-01-10", 50.0, "1d"))
@@ -0,0 +1,162 @@
+"""Unit tests for the columnar intraday bar store (dt_backend.core.bar_store_dt)."""
+
+import multiprocessing
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from dt_backend.core import bar_store_dt
+from dt_backend.core.bar_store_dt import ColumnarBarStore, bars_to_columns
+from dt_backend.engines import feature_engineering as fe
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _make_bars(start: datetime, n: int, *, seed: int = 7):
+    rng = random.Random(seed)
+    price = 100.0
+    out = []
+    for i in range(n):
+        price *= 1.0 + rng.gauss(0.0, 0.002)
+        out.append({
+            "ts": _iso(start + timedelta(minutes=i)),
+            "o": price,
+            "h": price * 1.002,
+            "l": price * 0.998,
+            "c": price * (1.0 + rng.gauss(0.0, 0.0005)),
+            "v": 1000 + rng.randint(0, 500),
+            "vw": price,
+        })
+    return out
+
+
+# 2025-03-03 09:30 New York
+OPEN_UTC = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ColumnarBarStore(tmp_path / "bars")
+
+
+class TestColumnarBarStore:
+
+    def test_append_and_read_day(self, store):
+        bars = _make_bars(OPEN_UTC, 30)
+        assert store.append_bars("aapl", "1Min", bars) == 30
+        assert store.days("AAPL", "1Min") == ["2025-03-03"]
+
+        arr = store.read_day("AAPL", "1Min", "2025-03-03")
+        assert len(arr) == 30
+        assert arr.ts.dtype == np.int64
+        assert arr.c.dtype == np.float64
+        assert int(arr.ts[0]) == int(OPEN_UTC.timestamp())
+        assert arr.c[-1] == pytest.approx(bars[-1]["c"])
+
+    def test_overlapping_appends_are_deduplicated(self, store):
+        bars = _make_bars(OPEN_UTC, 20)
+        store.append_bars("AAPL", "1Min", bars[:15])
+        assert store.append_bars("AAPL", "1Min", bars[10:]) == 5
+        assert store.append_bars("AAPL", "1Min", bars) == 0
+        assert len(store.tail("AAPL", "1Min", 100)) == 20
+
+    def test_tail_spans_day_partitions(self, store):
+        day1 = _make_bars(OPEN_UTC, 10)
+        day2 = _make_bars(OPEN_UTC + timedelta(days=1), 10, seed=8)
+        store.append_bars("AAPL", "5Min", day1 + day2)
+        assert store.days("AAPL", "5Min") == ["2025-03-03", "2025-03-04"]
+
+        arr = store.tail("AAPL", "5Min", 15)
+        assert len(arr) == 15
+        assert np.all(np.diff(arr.ts) > 0)
+
+        end = int(datetime.fromisoformat(day1[-1]["ts"].replace("Z", "+00:00")).timestamp())
+        arr = store.tail("AAPL", "5Min", 4, end_ts=end)
+        assert int(arr.ts[-1]) == end
+        assert len(arr) == 4
+
+    def test_torn_tail_is_ignored_and_repaired(self, store):
+        bars = _make_bars(OPEN_UTC, 10)
+        store.append_bars("AAPL", "1Min", bars)
+        day_dir = store.root / "1Min" / "AAPL" / "2025-03-03"
+        with open(day_dir / "c.f8", "ab") as f:
+            f.write(b"\x00" * 8)  # value column written, ts never followed
+
+        fresh = ColumnarBarStore(store.root)
+        assert len(fresh.read_day("AAPL", "1Min", "2025-03-03")) == 10
+        assert fresh.append_bars("AAPL", "1Min", _make_bars(OPEN_UTC + timedelta(minutes=10), 1)) == 1
+        arr = fresh.read_day("AAPL", "1Min", "2025-03-03")
+        assert len(arr) == 11
+        assert (day_dir / "c.f8").stat().st_size == 11 * 8
+
+    def test_bars_to_columns_matches_dict_rules(self):
+        bars = [
+            {"ts": _iso(OPEN_UTC + timedelta(minutes=1)), "o": 1, "h": 2, "l": 0.5, "c": 1.5, "v": None},
+            {"ts": _iso(OPEN_UTC), "o": 1, "h": 2, "l": 0.5, "c": 1.2, "v": 10, "vw": 1.1},
+            {"ts": _iso(OPEN_UTC + timedelta(minutes=2)), "o": None, "h": 2, "l": 0.5, "c": 1.2},
+            {"o": 1, "h": 1, "l": 1, "c": 1},
+        ]
+        ts, cols = bars_to_columns(bars)
+        assert len(ts) == 2 and ts[0] < ts[1]
+        assert cols["v"].tolist() == [10.0, 0.0]
+        assert np.isnan(cols["vw"][1])
+
+    def test_concurrent_writer_processes_keep_columns_aligned(self, store):
+        bars = _make_bars(OPEN_UTC, 300)
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_append_one_by_one, args=(store.root, bars)) for _ in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(60)
+        assert all(p.exitcode == 0 for p in procs)
+
+        day_dir = store.root / "1Min" / "AAPL" / "2025-03-03"
+        sizes = {f.name: f.stat().st_size // 8 for f in day_dir.iterdir()}
+        assert set(sizes.values()) == {300}, sizes
+        arr = ColumnarBarStore(store.root).read_day("AAPL", "1Min", "2025-03-03")
+        assert np.all(np.diff(arr.ts) == 60)
+
+
+def _append_one_by_one(root, bars):
+    store = ColumnarBarStore(root)
+    for b in bars:
+        store.append_bars("AAPL", "1Min", [b])
+
+
+class TestFeatureEngineeringStorePath:
+
+    def test_store_path_matches_dict_path(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DT_BAR_STORE_DIR", str(tmp_path / "bars"))
+        bars_1m = _make_bars(OPEN_UTC, 120)
+        bars_5m = _make_bars(OPEN_UTC, 40, seed=3)
+        store = bar_store_dt.get_bar_store()
+        store.append_bars("AAPL", "1Min", bars_1m)
+        store.append_bars("AAPL", "5Min", bars_5m)
+
+        node = {"bars_intraday": bars_1m, "bars_intraday_5m": bars_5m, "context_dt": {}}
+        now = OPEN_UTC + timedelta(hours=3)
+
+        # Store path must actually be taken for this window.
+        cols = fe._ohlcv_from_bars(bars_5m, "AAPL", "5Min")
+        assert isinstance(cols[-1], np.ndarray)
+
+        monkeypatch.setenv("DT_BAR_STORE", "0")
+        slow = fe._feature_snapshot_for_symbol("AAPL", node, rolling={}, tf_key="5Min", mkt={}, now_utc=now)
+        monkeypatch.setenv("DT_BAR_STORE", "1")
+        fast = fe._feature_snapshot_for_symbol("AAPL", node, rolling={}, tf_key="5Min", mkt={}, now_utc=now)
+
+        assert slow and slow == fast
+
+    def test_store_mismatch_falls_back_to_dicts(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DT_BAR_STORE_DIR", str(tmp_path / "bars"))
+        bars = _make_bars(OPEN_UTC, 40)
+        bar_store_dt.get_bar_store().append_bars("AAPL", "1Min", bars[:30])
+
+        cols = fe._ohlcv_from_bars(bars, "AAPL", "1Min")
+        assert isinstance(cols[-1], list)
+        assert len(cols[3]) == 40
@@ -438,3 +438,112 @@ class TestSagaScenarios:
         # exec2 was only pending, safe to fail
         pending_exec = [e for e in incomplete if e["status"] == "pending"][0]
         assert pending_exec["execution_id"] == exec2
+
+
+class TestLedgerIndexAndCompaction:
+    """Test the in-memory index and snapshot + tail compaction."""
+
+    def _saga(self, n_done, n_failed, n_open):
+        ids = {"done": [], "failed": [], "open": []}
+        for i in range(n_done):
+            e = execution_ledger.record_pending(f"D{i}", "BUY", 1, 10.0)
+            execution_ledger.record_confirmed(e, f"b{i}", 10.0)
+            execution_ledger.record_recorded(e, {"qty": 1})
+            ids["done"].append(e)
+        for i in range(n_failed):
+            e = execution_ledger.record_pending(f"F{i}", "BUY", 1, 10.0)
+            execution_ledger.record_failed(e, "rejected")
+            ids["failed"].append(e)
+        for i in range(n_open):
+            ids["open"].append(execution_ledger.record_pending(f"O{i}", "BUY", 1, 10.0))
+        return ids
+
+    def test_compaction_preserves_state(self, temp_ledger_dir):
+        ids = self._saga(3, 2, 2)
+        before = execution_ledger.replay_ledger()
+
+        assert execution_ledger.compact_ledger()["status"] == "ok"
+        assert not (temp_ledger_dir / "dt_execution_ledger.jsonl").exists()
+        assert (temp_ledger_dir / "dt_execution_ledger.snapshot.json").exists()
+        assert len(list((temp_ledger_dir / "dt_execution_ledger_archive").glob("*.jsonl"))) == 1
+
+        # A fresh process rebuilds from the snapshot alone.
+        fresh = execution_ledger.ExecutionLedger(temp_ledger_dir / "dt_execution_ledger.jsonl")
+        assert {r["execution_id"] for r in fresh.pending()} == set(ids["open"])
+        assert fresh.counts()["total"] == before["total"]
+
+        # Records keep flowing into the new tail.
+        assert execution_ledger.record_confirmed(ids["open"][0], "b9", 10.0)
+        after = execution_ledger.replay_ledger()
+        assert after["total"] == before["total"]
+        assert after["pending"] == 2
+        assert fresh.get(ids["open"][0])["status"] == "confirmed"
+
+    def test_old_terminal_records_are_counted_not_kept(self, temp_ledger_dir):
+        path = temp_ledger_dir / "dt_execution_ledger.jsonl"
+        self._saga(5, 3, 1)
+        ledger = execution_ledger.ExecutionLedger(path, keep_recent=2)
+        ledger.compact()
+
+        counts = execution_ledger.ExecutionLedger(path).counts()
+        assert counts["total"] == 9
+        assert counts["recorded"] == 5 and counts["failed"] == 3
+        assert len(ledger.recent(100)) == 3  # 2 terminal + 1 pending
+
+    def test_index_sees_other_writers(self, temp_ledger_dir):
+        path = temp_ledger_dir / "dt_execution_ledger.jsonl"
+        a = execution_ledger.ExecutionLedger(path)
+        b = execution_ledger.ExecutionLedger(path)
+        a.append({"execution_id": "exec_x", "status": "pending", "ts": "2025-01-01T00:00:00Z"})
+        assert [r["execution_id"] for r in b.pending()] == ["exec_x"]
+
+        a.compact()
+        b.append({"execution_id": "exec_x", "status": "failed", "ts": "2025-01-01T00:00:00Z"})
+        assert a.pending() == []
+        assert a.counts()["failed"] == 1
+
+    def test_interrupted_compaction_replays_renamed_tail(self, temp_ledger_dir):
+        ids = self._saga(1, 0, 1)
+        tail = temp_ledger_dir / "dt_execution_ledger.jsonl"
+        tail.rename(tail.with_name(tail.name + ".g1"))  # crash before snapshot write
+
+        fresh = execution_ledger.ExecutionLedger(tail)
+        assert [r["execution_id"] for r in fresh.pending()] == ids["open"]
+        assert fresh.counts()["total"] == 2
+
+    def test_append_racing_compaction_lands_in_new_tail(self, temp_ledger_dir, monkeypatch):
+        import threading
+        import time
+
+        path = temp_ledger_dir / "dt_execution_ledger.jsonl"
+        a = execution_ledger.ExecutionLedger(path)
+        b = execution_ledger.ExecutionLedger(path)
+        a.append({"execution_id": "exec_a", "status": "pending", "ts": "2025-01-01T00:00:00Z"})
+        b.pending()
+
+        real_replace = os.replace
+        writer = threading.Thread(
+            target=b.append,
+            args=({"execution_id": "exec_b", "status": "pending", "ts": "2025-01-01T00:00:01Z"},),
+        )
+
+        blocked = []
+
+        def replace_then_race(src, dst):
+            real_replace(src, dst)
+            if Path(src) == path and not blocked:
+                # The old inode is gone; a writer reopening the tail by name
+                # must still wait for the compaction to release the lock.
+                writer.start()
+                time.sleep(0.3)
+                blocked.append(writer.is_alive())
+
+        monkeypatch.setattr(execution_ledger.os, "replace", replace_then_race)
+        assert a.compact()["status"] == "ok"
+        writer.join(5)
+        assert blocked == [True]
+
+        archived = list((temp_ledger_dir / "dt_execution_ledger_archive").glob("*.jsonl"))
+        assert "exec_b" not in archived[0].read_text()
+        assert [json.loads(l)["execution_id"] for l in path.read_text().splitlines()] == ["exec_b"]
+        assert {r["execution_id"] for r in a.pending()} == {"exec_a", "exec_b"}
@@ -0,0 +1,154 @@
+"""Vectorized intraday backtester: executor/position-manager rules as array ops."""
+
+import time
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from dt_backend.engines import fast_backtest as fb
+from dt_backend.engines.trade_executor import ExecutionConfig, _size_from_phit_with_conviction
+
+BASE = ExecutionConfig(
+    dry_run=False,
+    max_orders_per_cycle=3,
+    min_confidence=0.2,
+    eod_flatten=True,
+    eod_flatten_minutes=5,
+    min_flip_minutes=0,
+    min_hold_time_minutes=0,
+    fallback_stop_atr=1.0,
+    fallback_tp_atr=2.0,
+    scratch_min=0,
+    min_phit=0.5,
+    max_symbol_fraction=0.15,
+)
+
+
+def _day(prices, *, side=None, phit=0.9, atr=1.0, step=5.0, close_at=None):
+    """[T, S] day with plan risk left unset (ATR fallbacks apply)."""
+    last = np.asarray(prices, dtype=float)
+    T, S = last.shape
+    nan = np.full((T, S), np.nan)
+    sides = np.zeros((T, S), dtype=np.int32) if side is None else np.asarray(side, dtype=np.int32)
+    close_at = T * step + 60 if close_at is None else close_at
+    minutes = 570.0 + np.arange(T) * step
+    return fb.DayArrays(
+        date="2025-03-03",
+        symbols=[f"S{j}" for j in range(S)],
+        minutes=minutes,
+        mins_to_close=close_at - (minutes - 570.0),
+        last=last,
+        atr=np.full((T, S), float(atr)),
+        side=sides,
+        size=np.where(sides != 0, 1.0, 0.0),
+        conf=np.full((T, S), 0.8),
+        phit=np.full((T, S), float(phit)),
+        plan_stop=nan.copy(),
+        plan_tp=nan.copy(),
+        plan_time_stop=nan.copy(),
+        plan_trail=np.zeros((T, S), dtype=np.int32),
+        plan_partials=np.zeros((T, S), dtype=np.int32),
+        plan_trail_mult=nan.copy(),
+        plan_scratch_min=nan.copy(),
+        plan_scratch_frac=nan.copy(),
+        rank=np.tile(np.arange(S, dtype=np.int32), (T, 1)),
+    )
+
+
+def _qty(phit, last, atr, equity=100_000.0, cfg=BASE):
+    atr_pct = atr / last * 100.0
+    vol = "high" if atr_pct > 3.0 else "low" if atr_pct < 1.5 else "medium"
+    frac = _size_from_phit_with_conviction(phit, 1.0, vol, cfg=cfg)  # no plan risk → expected_r 1.0
+    return max(1, int(frac * equity / last))
+
+
+class TestRules:
+    def test_long_hits_fallback_take_profit(self):
+        day = _day([[100.0], [101.0], [102.5], [103.0]], side=[[1], [0], [0], [0]])
+        res = fb.simulate([day], [BASE])
+        q = _qty(0.9, 100.0, 1.0)
+        assert res["trades"][0] == 1
+        assert res["exits_take_profit"][0] == 1
+        assert res["pnl"][0] == pytest.approx(2.5 * q)
+
+    def test_stop_then_flip_cooldown_blocks_reentry(self):
+        prices = [[100.0], [98.5], [99.0], [99.0]]
+        sides = [[1], [-1], [-1], [-1]]
+        cfg = replace(BASE, allow_shorts=True, min_flip_minutes=60)
+        res = fb.simulate([_day(prices, side=sides)], [cfg])
+        assert res["exits_stop_hit"][0] == 1
+        assert res["trades"][0] == 1
+
+        res = fb.simulate([_day(prices, side=sides)], [replace(cfg, min_flip_minutes=0)])
+        assert res["trades"][0] == 1  # the short opened at step 1 stays open
+
+    def test_eod_flatten_and_brackets_off(self):
+        day = _day([[100.0], [100.5], [100.7]], side=[[1], [0], [0]], close_at=12.0)
+        res = fb.simulate([day], [BASE, replace(BASE, enable_brackets=False)])
+        assert list(res["exits_eod_flatten"]) == [1, 0]
+        assert res["pnl"][0] == pytest.approx(0.7 * _qty(0.9, 100.0, 1.0))
+        assert res["trades"][1] == 0
+
+    def test_sizing_matches_executor(self):
+        cfgs = [replace(BASE, max_symbol_fraction=f) for f in (0.05, 0.15)]
+        for phit in (0.55, 0.8):
+            day = _day([[50.0], [52.0]], side=[[1], [0]], phit=phit, atr=1.0)
+            res = fb.simulate([day], cfgs)
+            for k, cfg in enumerate(cfgs):
+                assert res["pnl"][k] == pytest.approx(2.0 * _qty(phit, 50.0, 1.0, cfg=cfg))
+
+    def test_low_phit_falls_back_to_default_qty(self):
+        # Like execute_from_policy: zero conviction size → default_qty × size.
+        day = _day([[100.0], [105.0]], side=[[1], [0]], phit=0.45)
+        res = fb.simulate([day], [BASE, replace(BASE, default_qty=3.0)])
+        assert list(res["trades"]) == [1, 1]
+        assert list(res["pnl"]) == pytest.approx([5.0, 15.0])
+
+    def test_confidence_gates_entries(self):
+        day = _day([[100.0], [105.0]], side=[[1], [0]])
+        assert fb.simulate([day], [replace(BASE, min_confidence=0.9)])["trades"][0] == 0
+
+    def test_max_orders_follow_ranking(self):
+        prices = [[100.0] * 4, [110.0] * 4]
+        day = _day(prices, side=[[1] * 4, [0] * 4], atr=5.0)
+        day.rank[0] = [3, 1, 0, 2]
+        res = fb.simulate([day], [replace(BASE, max_orders_per_cycle=2)])
+        assert res["trades"][0] == 2
+        res = fb.simulate([day], [replace(BASE, max_orders_per_cycle=4)])
+        assert res["trades"][0] == 4
+
+
+class TestSweep:
+    def test_grid_and_arrays_roundtrip(self, tmp_path):
+        cfgs = fb.expand_grid({"min_confidence": [0.1, 0.9], "fallback_tp_atr": [1.0, 2.0, 3.0]}, BASE)
+        assert len(cfgs) == 6 and cfgs[-1].min_confidence == 0.9 and cfgs[-1].fallback_tp_atr == 3.0
+        with pytest.raises(ValueError):
+            fb.expand_grid({"nope": [1]})
+
+        day = _day([[100.0], [102.0]], side=[[1], [0]])
+        day.save(tmp_path / "d.npz")
+        again = fb.DayArrays.load(tmp_path / "d.npz")
+        assert again.symbols == day.symbols
+        assert np.array_equal(again.side, day.side)
+        assert np.isnan(again.plan_stop).all()
+
+        rows = fb.sweep([again], cfgs, chunk=4)
+        assert len(rows) == 6
+        assert rows[0]["pnl"] >= rows[-1]["pnl"]
+        assert all(r["trades"] == 0 for r in rows if r["knobs"]["min_confidence"] == 0.9)
+
+    def test_thousands_of_configs_per_minute(self):
+        rng = np.random.default_rng(3)
+        T, S = 78, 40
+        prices = 50.0 * np.exp(np.cumsum(rng.normal(0, 0.003, (T, S)), axis=0))
+        sides = rng.choice([-1, 0, 0, 1], size=(T, S))
+        day = _day(prices, side=sides, atr=0.5, close_at=T * 5 - 10)
+        cfgs = fb.expand_grid(
+            {"min_confidence": [0.2, 0.5], "fallback_stop_atr": [0.5, 1.0, 1.5, 2.0], "fallback_tp_atr": [1.0, 2.0, 3.0], "allow_shorts": [False, True]},
+            BASE,
+        ) * 25
+        t0 = time.time()
+        res = fb.simulate([day], cfgs)
+        assert len(res["pnl"]) == len(cfgs) == 1200
+        assert time.time() - t0 < 30.0
@@ -0,0 +1,120 @@
+"""Parity tests for the batched intraday feature engine.
+
+_feature_snapshots_batch must produce the same features as the per-symbol
+_feature_snapshot_for_symbol path for every symbol it is given.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dt_backend.engines import feature_engineering as fe
+
+
+# 2025-03-03 09:30 New York
+OPEN_UTC = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _bars(rng: random.Random, n: int, step_min: int, *, flat: bool = False, zero_volume: bool = False):
+    price = rng.uniform(5.0, 500.0)
+    out = []
+    for i in range(n):
+        if not flat:
+            price *= 1.0 + rng.gauss(0.0, 0.003)
+        out.append({
+            "ts": _iso(OPEN_UTC + timedelta(minutes=step_min * i)),
+            "o": price,
+            "h": price if flat else price * (1.0 + abs(rng.gauss(0.0, 0.001))),
+            "l": price if flat else price * (1.0 - abs(rng.gauss(0.0, 0.001))),
+            "c": price,
+            "v": 0 if zero_volume else rng.randint(0, 5000),
+            "vw": price,
+        })
+    return out
+
+
+def _universe(seed: int = 11):
+    rng = random.Random(seed)
+    entries = []
+    for k in range(60):
+        kind = k % 6
+        n1 = rng.randint(20, 390)
+        n5 = rng.randint(15, 78)
+        node = {"context_dt": {"intraday_trend": rng.choice(["up", "down", "flat"])}}
+        if kind == 0:  # short primary window -> fallback timeframe
+            node["bars_intraday"] = _bars(rng, n1, 1)
+            node["bars_intraday_5m"] = _bars(rng, rng.randint(0, 14), 5)
+        elif kind == 1:  # flat prices
+            node["bars_intraday"] = _bars(rng, n1, 1, flat=True)
+            node["bars_intraday_5m"] = _bars(rng, n5, 5, flat=True)
+        elif kind == 2:  # zero volume
+            node["bars_intraday"] = _bars(rng, n1, 1, zero_volume=True)
+            node["bars_intraday_5m"] = _bars(rng, n5, 5, zero_volume=True)
+        elif kind == 3:  # too short everywhere -> skipped
+            node["bars_intraday"] = _bars(rng, rng.randint(0, 14), 1)
+            node["bars_intraday_5m"] = _bars(rng, rng.randint(0, 14), 5)
+        elif kind == 4:  # no 1Min bars (opening range from 5Min)
+            node["bars_intraday_5m"] = _bars(rng, n5, 5)
+        else:
+            node["bars_intraday"] = _bars(rng, n1, 1)
+            node["bars_intraday_5m"] = _bars(rng, n5, 5)
+        entries.append((f"S{k:03d}", node))
+    return entries
+
+
+def _assert_same(scalar, batch):
+    assert scalar.keys() == batch.keys()
+    for key, want in scalar.items():
+        got = batch[key]
+        if isinstance(want, float) and isinstance(got, float):
+            # NumPy's square and libm pow() may differ in the last ulp.
+            assert got == pytest.approx(want, rel=1e-12, abs=1e-12) or (math.isnan(want) and math.isnan(got)), key
+        else:
+            assert got == want, key
+
+
+@pytest.fixture(autouse=True)
+def _no_bar_store(monkeypatch):
+    monkeypatch.setenv("DT_BAR_STORE", "0")
+
+
+@pytest.mark.parametrize("tf_key", ["5Min", "1Min"])
+def test_batch_matches_scalar(tf_key):
+    entries = _universe()
+    mkt = {"mkt_ret_5": 0.001, "mkt_trend_dir": 1.0}
+    now = OPEN_UTC + timedelta(hours=4)
+
+    batch = fe._feature_snapshots_batch(entries, tf_key=tf_key, mkt=mkt, now_utc=now)
+    scalar = {}
+    for sym, node in entries:
+        feat = fe._feature_snapshot_for_symbol(sym, node, rolling={}, tf_key=tf_key, mkt=mkt, now_utc=now)
+        if feat:
+            scalar[sym] = feat
+
+    assert set(batch) == set(scalar)
+    assert len(scalar) >= 40
+    for sym in scalar:
+        _assert_same(scalar[sym], batch[sym])
+
+
+def test_batch_during_opening_range():
+    entries = _universe(seed=5)
+    now = OPEN_UTC + timedelta(minutes=10)
+
+    batch = fe._feature_snapshots_batch(entries, tf_key="5Min", mkt={}, now_utc=now)
+    for sym, node in entries:
+        feat = fe._feature_snapshot_for_symbol(sym, node, rolling={}, tf_key="5Min", mkt={}, now_utc=now)
+        if feat:
+            _assert_same(feat, batch[sym])
+        else:
+            assert sym not in batch
+
+
+def test_batch_empty_input():
+    assert fe._feature_snapshots_batch([], tf_key="5Min", mkt={}, now_utc=OPEN_UTC) == {}
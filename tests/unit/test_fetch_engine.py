@@ -0,0 +1,163 @@
+"""Async fetch engine against a local stub HTTP server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from backend.services.fetch_engine import FetchEngine, FetchError, ProviderConfig
+
+
+class _Stub:
+    """Tiny threaded HTTP server; routes map path -> list of (status, body) replies."""
+
+    def __init__(self):
+        self.hits = {}
+        self.routes = {}
+        self.delay = 0.0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self):
+                path = self.path.split("?", 1)[0]
+                stub.hits[path] = stub.hits.get(path, 0) + 1
+                replies = stub.routes.get(path) or [(404, {"error": "nope"})]
+                status, body = replies.pop(0) if len(replies) > 1 else replies[0]
+                time.sleep(stub.delay)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _reply
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self._reply()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    s = _Stub()
+    yield s
+    s.close()
+
+
+def _engine(tmp_path, **kw):
+    cfg = dict(rate_per_sec=1000, burst=100, backoff_base=0.01, max_retries=3)
+    cfg.update(kw)
+    return FetchEngine({"p": ProviderConfig("p", **cfg)}, cache_dir=tmp_path / "http")
+
+
+class TestFetchEngine:
+    def test_duplicate_requests_coalesce_and_cache_on_disk(self, stub, tmp_path):
+        stub.routes["/q/AAA"] = [(200, {"sym": "AAA"})]
+        stub.delay = 0.1
+
+        async def go():
+            async with _engine(tmp_path, cache_ttl=3600) as eng:
+                res = await asyncio.gather(*[eng.get_json("p", f"{stub.url}/q/AAA") for _ in range(4)])
+                return res, eng.stats()["p"]
+
+        res, st = asyncio.run(go())
+        assert res == [{"sym": "AAA"}] * 4
+        assert stub.hits["/q/AAA"] == 1
+        assert st["coalesced"] == 3
+
+        res, st = asyncio.run(go())  # fresh engine, same cache dir
+        assert stub.hits["/q/AAA"] == 1
+        assert st["cache_hits"] == 4
+
+    def test_retries_transient_errors_but_not_client_errors(self, stub, tmp_path):
+        stub.routes["/flaky"] = [(503, {}), (429, {}), (200, {"ok": True})]
+
+        async def go():
+            async with _engine(tmp_path) as eng:
+                ok = await eng.get_json("p", f"{stub.url}/flaky")
+                with pytest.raises(FetchError) as info:
+                    await eng.get_json("p", f"{stub.url}/missing")
+                return ok, info.value.status, eng.stats()["p"]
+
+        ok, status, st = asyncio.run(go())
+        assert ok == {"ok": True}
+        assert status == 404
+        assert stub.hits == {"/flaky": 3, "/missing": 1}
+        assert st["retries"] == 2
+        assert st["errors"] == 1
+
+    def test_token_bucket_spaces_requests(self, stub, tmp_path):
+        for i in range(6):
+            stub.routes[f"/r/{i}"] = [(200, {"i": i})]
+
+        async def go():
+            async with _engine(tmp_path, rate_per_sec=20, burst=1) as eng:
+                t0 = time.monotonic()
+                await asyncio.gather(*[eng.get_json("p", f"{stub.url}/r/{i}") for i in range(6)])
+                return time.monotonic() - t0, eng.stats()["p"]
+
+        elapsed, st = asyncio.run(go())
+        assert elapsed >= 0.24  # 5 waits at 20/s
+        assert st["rate_wait_secs"] > 0
+
+
+class TestBackfillYahooHistories:
+    def test_chart_histories_are_parsed_and_duplicates_coalesced(self, stub, tmp_path, monkeypatch):
+        pytest.importorskip("yfinance")
+        from backend.services import backfill_history as bh
+
+        chart = {
+            "chart": {
+                "result": [
+                    {
+                        "meta": {"gmtoffset": -14400},
+                        "timestamp": [1704205800, 1704292200, 1704378600],
+                        "indicators": {
+                            "quote": [
+                                {
+                                    "open": [10.0, None, 12.0],
+                                    "high": [11.0, None, 13.0],
+                                    "low": [9.0, None, 11.0],
+                                    "close": [10.5, None, 12.5],
+                                    "volume": [100, None, 300],
+                                }
+                            ]
+                        },
+                    }
+                ]
+            }
+        }
+        stub.routes["/chart/AAA"] = [(200, chart)]
+        monkeypatch.setattr(bh, "YF_CHART_BASE", f"{stub.url}/chart")
+
+        async def go():
+            async with FetchEngine(
+                {"yahoo": ProviderConfig("yahoo", rate_per_sec=1000, burst=10)}, cache_dir=tmp_path / "http"
+            ) as eng:
+                return await bh._fetch_yf_histories_async(eng, ["aaa", "AAA", "ZZZ"], days=30)
+
+        out = asyncio.run(go())
+        assert stub.hits["/chart/AAA"] == 1
+        assert set(out) == {"AAA"}  # ZZZ 404s → no bars
+        assert [b["date"] for b in out["AAA"]] == ["2024-01-02", "2024-01-04"]
+        assert out["AAA"][1] == {
+            "date": "2024-01-04", "open": 12.0, "high": 13.0, "low": 11.0, "close": 12.5, "volume": 300.0,
+        }
@@ -0,0 +1,89 @@
+"""Latest-row-per-symbol fallback: Arrow reduction and the sidecar index."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.core import latest_row_index as lri
+from backend.core.ai_model.feature_pipeline import _latest_rows_from_dataset
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+FEATS = ["f_a", "f_b", "f_c"]
+
+
+def _write_dataset(path, n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    syms = np.array(["aaa", "AAA", "bbb", "CCC", "ddd", "EEE"])
+    dates = pd.date_range("2024-01-01", periods=40).strftime("%Y-%m-%d").to_numpy()
+    df = pd.DataFrame(
+        {
+            "symbol": syms[rng.integers(0, len(syms), n)],
+            "asof_date": dates[rng.integers(0, len(dates), n)],
+            "f_a": rng.normal(size=n),
+            "f_b": rng.normal(size=n),
+            "f_c": rng.normal(size=n),
+        }
+    )
+    df.loc[df.sample(frac=0.05, random_state=seed).index, "f_b"] = np.inf
+    df.loc[df.sample(frac=0.05, random_state=seed + 1).index, "f_c"] = np.nan
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), str(path), row_group_size=500)
+    return df
+
+
+def _reference(df, cols, whitelist=None):
+    """The per-row loop this replaced: first row wins on asof_date ties."""
+    latest = {}
+    feats = df[cols].replace([np.inf, -np.inf], np.nan).fillna(0.0).to_numpy(dtype=np.float32)
+    for i, (s, d) in enumerate(zip(df["symbol"].str.upper(), df["asof_date"].astype(str))):
+        if whitelist and s not in whitelist:
+            continue
+        if s not in latest or d > latest[s][0]:
+            latest[s] = (d, feats[i])
+    syms = sorted(latest)
+    return pd.DataFrame(np.vstack([latest[s][1] for s in syms]), index=syms, columns=cols)
+
+
+class TestLatestRows:
+    def test_scan_matches_row_loop_including_ties(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AION_LATEST_ROW_INDEX", "0")
+        path = tmp_path / "ds.parquet"
+        df = _write_dataset(path)
+        out = _latest_rows_from_dataset(path, FEATS + ["f_missing"])
+        ref = _reference(df, FEATS)
+        ref["f_missing"] = np.float32(0.0)
+        pd.testing.assert_frame_equal(out, ref)
+
+        out = _latest_rows_from_dataset(path, FEATS, symbol_whitelist={"bbb", "EEE", "ZZZ"})
+        pd.testing.assert_frame_equal(out, _reference(df, FEATS, whitelist={"BBB", "EEE"}))
+
+    def test_index_reads_only_latest_row_groups(self, tmp_path, monkeypatch):
+        path = tmp_path / "ds.parquet"
+        df = _write_dataset(path)
+        assert lri.build_index(path) == 5
+        idx = pq.read_table(str(lri.index_path_for(path)))
+        assert idx.column("symbol").to_pylist() == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+
+        read_groups = []
+        real = pq.ParquetFile.read_row_group
+        monkeypatch.setattr(
+            pq.ParquetFile,
+            "read_row_group",
+            lambda self, i, *a, **kw: read_groups.append(i) or real(self, i, *a, **kw),
+        )
+        out = _latest_rows_from_dataset(path, FEATS)
+        pd.testing.assert_frame_equal(out, _reference(df, FEATS))
+        assert len(read_groups) <= 5
+        assert sorted(read_groups) == sorted(set(idx.column("row_group").to_pylist()))
+
+        positions = idx.column("row").to_pylist()
+        assert df.iloc[positions]["symbol"].str.upper().tolist() == idx.column("symbol").to_pylist()
+
+    def test_stale_index_falls_back_to_scan(self, tmp_path):
+        path = tmp_path / "ds.parquet"
+        _write_dataset(path, seed=0)
+        lri.build_index(path)
+        df = _write_dataset(path, n=2000, seed=3)  # dataset rebuilt, index not
+        assert lri.read_latest_rows(path, FEATS) is None
+        pd.testing.assert_frame_equal(_latest_rows_from_dataset(path, FEATS), _reference(df, FEATS))
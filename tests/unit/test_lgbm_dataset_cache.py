@@ -0,0 +1,72 @@
+"""Unit tests for persisted LightGBM dataset keying/pruning (backend.core.ai_model.dataset_cache)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from backend.core.ai_model.dataset_cache import LgbmDatasetCache, dataset_partition_fingerprint
+
+
+@pytest.fixture
+def parquet(tmp_path):
+    path = tmp_path / "training_data_daily.parquet"
+    path.write_bytes(b"v1")
+    return path
+
+
+def _stored(cache, path):
+    """Simulate save_lgbm_binary() output for `path`."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_bytes(b"bin")
+    Path(path + ".json").write_text(json.dumps(cache.meta(rows=1)), encoding="utf-8")
+
+
+class TestKeying:
+    def test_path_depends_on_features_selection_and_whitelist(self, tmp_path, parquet):
+        a = LgbmDatasetCache(tmp_path / "models", ["f1", "f2"], parquet)
+        b = LgbmDatasetCache(tmp_path / "models", ["f1", "f3"], parquet)
+        p = a.path("1d", "fit", max_rows=10, clip=0.1)
+        assert p == a.path("1d", "fit", clip=0.1, max_rows=10)
+        assert p != b.path("1d", "fit", max_rows=10, clip=0.1)
+        assert p != a.path("1d", "fit", max_rows=10, clip=0.2)
+        assert p != a.path("1d", "fit", symbol_whitelist={"AAPL"}, max_rows=10, clip=0.1)
+        assert a.path("1d", "fit", symbol_whitelist={"aapl"}) == a.path("1d", "fit", symbol_whitelist={"AAPL"})
+
+    def test_new_partition_changes_fingerprint(self, parquet):
+        before = dataset_partition_fingerprint(parquet)
+        parts = parquet.with_name("training_data_daily.raw.parts")
+        (parts / "asof_day=2026-01-02").mkdir(parents=True)
+        assert dataset_partition_fingerprint(parquet) != before
+
+    def test_rewritten_parquet_keeps_fingerprint_until_content_changes(self, tmp_path):
+        pd = pytest.importorskip("pandas")
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "training_data_daily.parquet"
+        df = pd.DataFrame({"symbol": ["AAPL", "MSFT"], "f1": [1.0, 2.0]})
+        df.to_parquet(path, index=False)
+        before = dataset_partition_fingerprint(path)
+
+        df.to_parquet(path, index=False)
+        assert dataset_partition_fingerprint(path) == before
+
+        df.assign(f1=[1.0, 3.0]).to_parquet(path, index=False)
+        assert dataset_partition_fingerprint(path) != before
+
+
+class TestPrune:
+    def test_prunes_other_feature_lists_and_partials(self, tmp_path, parquet):
+        old = LgbmDatasetCache(tmp_path / "models", ["f1"], parquet)
+        old_path = old.path("1d", "fit")
+        _stored(old, old_path)
+
+        cur = LgbmDatasetCache(tmp_path / "models", ["f1", "f2"], parquet)
+        keep = cur.path("1d", "fit")
+        _stored(cur, keep)
+        partial = cur.root / "1d.fit.deadbeef.bin"
+        partial.write_bytes(b"x")
+
+        assert cur.prune() == 2
+        remaining = sorted(p.name for p in cur.root.iterdir())
+        assert remaining == [Path(keep).name, Path(keep).name + ".json"]
+        assert cur.stats()["pruned"] == 2
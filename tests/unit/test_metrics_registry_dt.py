@@ -0,0 +1,110 @@
+"""Unit tests for the buffered metrics registry (metrics_registry_dt)."""
+
+import json
+import os
+
+import pytest
+
+from dt_backend.services import dt_truth_store
+from dt_backend.services.metrics_registry_dt import MetricsRegistry, merge_snapshots
+
+
+def _shard(path, pid, counters=None, gauges=None, histograms=None):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / f"{pid}.json").write_text(json.dumps({
+        "pid": pid,
+        "counters": counters or {},
+        "gauges": gauges or {},
+        "histograms": histograms or {},
+    }))
+
+
+def _dead_pid():
+    pid = 999_999
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return pid
+        except PermissionError:
+            pass
+        pid -= 1
+
+
+class TestMetricsRegistry:
+
+    def test_updates_are_buffered_until_flush(self, tmp_path):
+        reg = MetricsRegistry(tmp_path / "shards", flush_sec=3600)
+        reg.inc("orders_submitted")
+        reg.inc("orders_submitted", 2)
+        reg.set_gauge("open_positions", 4)
+        with reg.timer("cycle_seconds"):
+            pass
+
+        snap = reg.snapshot()
+        assert snap["counters"] == {"orders_submitted": 3.0}
+        assert snap["gauges"]["open_positions"][0] == 4.0
+        assert snap["histograms"]["cycle_seconds"]["count"] == 1
+        assert not (tmp_path / "shards" / f"{os.getpid()}.json").exists()
+
+        assert reg.flush() is True
+        assert reg.flush() is False  # nothing changed since
+        shard = json.loads((tmp_path / "shards" / f"{os.getpid()}.json").read_text())
+        assert shard["counters"] == {"orders_submitted": 3.0}
+
+    def test_zero_interval_flushes_every_update(self, tmp_path):
+        reg = MetricsRegistry(tmp_path / "shards", flush_sec=0)
+        reg.inc("x")
+        assert (tmp_path / "shards" / f"{os.getpid()}.json").exists()
+
+    def test_histogram_buckets(self, tmp_path):
+        reg = MetricsRegistry(tmp_path / "shards", flush_sec=3600)
+        for v in (0.0005, 0.3, 0.3, 500.0):
+            reg.observe("lat", v)
+        h = reg.snapshot()["histograms"]["lat"]
+        assert h["count"] == 4 and sum(h["counts"]) == 4
+        assert h["counts"][0] == 1 and h["counts"][-1] == 1
+        assert h["min"] == 0.0005 and h["max"] == 500.0
+
+    def test_merged_snapshot_across_processes(self, tmp_path):
+        shards = tmp_path / "shards"
+        _shard(shards, os.getppid(), counters={"orders_submitted": 5}, gauges={"open_positions": [1.0, 1e12]})
+        reg = MetricsRegistry(shards, flush_sec=3600)
+        reg.inc("orders_submitted", 2)
+        reg.set_gauge("open_positions", 7)
+
+        merged = reg.snapshot(merged=True)
+        assert merged["counters"]["orders_submitted"] == 7.0
+        assert merged["gauges"]["open_positions"][0] == 1.0  # newer ts wins
+
+    def test_dead_shards_fold_into_base(self, tmp_path):
+        shards = tmp_path / "shards"
+        dead = _dead_pid()
+        _shard(shards, dead, counters={"order_errors": 2})
+        reg = MetricsRegistry(shards, flush_sec=3600)
+
+        assert not (shards / f"{dead}.json").exists()
+        assert (shards / "_base.json").exists()
+        reg.inc("order_errors")
+        assert reg.snapshot(merged=True)["counters"]["order_errors"] == 3.0
+
+    def test_merge_snapshots_skips_mismatched_histograms(self):
+        a = {"histograms": {"h": {"buckets": [1.0], "counts": [1, 0], "sum": 0.5, "count": 1}}}
+        b = {"histograms": {"h": {"buckets": [2.0], "counts": [1, 0], "sum": 0.5, "count": 1}}}
+        assert merge_snapshots([a, b])["histograms"]["h"]["count"] == 1
+
+
+class TestTruthStoreMetrics:
+
+    def test_bump_metric_lands_in_snapshot(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DT_TRUTH_DIR", str(tmp_path))
+        dt_truth_store.bump_metric("orders_submitted")
+        dt_truth_store.bump_metric("orders_submitted", 2)
+        dt_truth_store.bump_metric("", 1)
+
+        assert dt_truth_store.metrics_snapshot(merged=False)["counters"]["orders_submitted"] == 3.0
+
+        out = dt_truth_store.write_metrics_snapshot(rolling={})
+        assert out["counters"]["orders_submitted"] == 3.0
+        on_disk = json.loads(dt_truth_store.metrics_path().read_text())
+        assert on_disk["counters"]["orders_submitted"] == pytest.approx(3.0)
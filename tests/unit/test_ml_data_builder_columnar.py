@@ -0,0 +1,236 @@
+"""Parity tests: columnar ML dataset builder vs the legacy dict-row path."""
+
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("tqdm")
+
+from backend.services import ml_data_builder as mdb  # noqa: E402
+
+
+def _history(n, seed, *, start=date(2023, 1, 2), with_hl=True):
+    rng = np.random.default_rng(seed)
+    price = 20.0 + 30.0 * rng.random()
+    out = []
+    d = start
+    for i in range(n):
+        price *= 1.0 + rng.normal(0.0, 0.02)
+        bar = {"date": d.isoformat(), "close": price, "volume": float(rng.integers(0, 10_000))}
+        if with_hl:
+            bar["high"] = price * 1.01
+            bar["low"] = price * 0.99
+        if i == 7:
+            bar["close"] = 0.0  # dropped by the price sanity filter
+        out.append(bar)
+        d += timedelta(days=1 if d.weekday() < 4 else 3)
+    return out
+
+
+def _rolling():
+    rolling = {"_meta": {"x": 1}}
+    sectors = ["TECHNOLOGY", "ENERGY", ""]
+    for i in range(9):
+        sym = f"S{i}"
+        rolling[sym] = {
+            "name": f"Company {i}",
+            "sector": sectors[i % 3],
+            "history": _history(40 + 13 * i, seed=i, with_hl=i % 2 == 0),
+            "fundamentals": {"marketCap": 1e9 * (i + 1), "pe": 10 + i if i % 2 else None},
+            "metrics": {"beta": 1.0 + i / 10},
+            "context": {"trend": i % 3},
+            "shares_outstanding": 1e6 * (i + 1),
+            "public_float": 5e5 * (i + 1),
+        }
+        if i == 4:
+            rolling[sym]["social"] = {"buzz": 3}
+    rolling["SHORT"] = {"history": _history(10, seed=99)}
+    return rolling
+
+
+@pytest.fixture
+def builder(tmp_path, monkeypatch):
+    ds_dir = tmp_path / "dataset"
+    ds_dir.mkdir()
+    for attr, name in (
+        ("DATASET_FILE", "training_data_daily.parquet"),
+        ("RAW_DATASET_FILE", "training_data_daily.raw.parquet"),
+        ("FEATURE_LIST_FILE", "feature_list_daily.json"),
+        ("LATEST_FEATURES_FILE", "latest_features_daily.parquet"),
+        ("LATEST_FEATURES_CSV", "latest_features_daily.csv"),
+    ):
+        monkeypatch.setattr(mdb, attr, ds_dir / name)
+    monkeypatch.setattr(mdb, "CSV_CHUNKS_DIR", ds_dir / "_csv_chunks")
+    monkeypatch.setattr(mdb, "MACRO_STATE_FILE", tmp_path / "macro_state.json")
+    monkeypatch.setattr(mdb, "NEWS_FEATURES_DIR", tmp_path / "news_features")
+    (tmp_path / "macro_state.json").write_text(json.dumps({"vix": 18.5, "spy_ret": 0.01}))
+
+    rolling = _rolling()
+    brain = {"S1": {"horizon_perf": {"1d": {"drift_score": 0.2, "short_stats": {"hit_ratio": 0.6, "mae": 0.01}}}}}
+    monkeypatch.setattr(mdb, "_read_rolling", lambda: rolling)
+    monkeypatch.setattr(mdb, "_read_brain", lambda: brain)
+
+    def _build(columnar):
+        monkeypatch.setenv("ML_BUILDER_COLUMNAR", "1" if columnar else "0")
+        mdb.build_ml_dataset(use_multiprocessing=False, chunk_symbols=4, return_dataframe="none")
+        meta = json.loads(mdb.FEATURE_LIST_FILE.read_text())
+        return (
+            pd.read_parquet(mdb.RAW_DATASET_FILE),
+            pd.read_parquet(mdb.DATASET_FILE),
+            pd.read_parquet(mdb.LATEST_FEATURES_FILE),
+            meta,
+        )
+
+    return _build
+
+
+def test_block_rows_match_legacy_rows():
+    rolling = _rolling()
+    macro = {"macro_vix": 18.5}
+    sectors = mdb._collect_sectors(rolling)
+    for sym, node in rolling.items():
+        if sym.startswith("_"):
+            continue
+        for as_of in (None, "2023-02-01"):
+            legacy = mdb._build_rows_for_symbol(sym, node, macro, {}, {}, sectors, as_of_date=as_of)
+            block = mdb._build_block_for_symbol(sym, node, macro, {}, {}, sectors, as_of_date=as_of)
+            got = block.to_rows() if block is not None else []
+            assert len(got) == len(legacy), (sym, as_of)
+            for a, b in zip(got, legacy):
+                assert a.keys() == b.keys()
+                for k in a:
+                    if isinstance(b[k], float) and np.isnan(b[k]):
+                        assert np.isnan(a[k]), (sym, k)
+                    else:
+                        assert a[k] == b[k], (sym, k)
+
+
+def test_dataset_matches_legacy_path(builder):
+    raw_c, final_c, latest_c, meta_c = builder(columnar=True)
+    raw_l, final_l, latest_l, meta_l = builder(columnar=False)
+
+    assert len(raw_c) > 0
+    assert list(raw_c.columns) == list(raw_l.columns)
+    pd.testing.assert_frame_equal(raw_c, raw_l)
+    pd.testing.assert_frame_equal(final_c, final_l)
+    pd.testing.assert_frame_equal(latest_c.reset_index(drop=True), latest_l.reset_index(drop=True))
+    assert meta_c["feature_columns"] == meta_l["feature_columns"]
+    assert meta_c["n_rows"] == meta_l["n_rows"]
+    assert (raw_c[meta_c["target_columns"]].dtypes == np.float32).all()
+
+
+def test_iso_dates_matches_timestamp_isoformat():
+    s = pd.Series([pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03 15:30:00"), pd.Timestamp("2024-01-04 00:00:00.5")])
+    assert list(mdb._iso_dates(s)) == [d.isoformat() for d in s]
+    tz = pd.Series([pd.Timestamp("2024-01-02T00:00:00+00:00")])
+    assert list(mdb._iso_dates(tz)) == [d.isoformat() for d in tz]
+
+
+def _truncate(rolling, drop):
+    out = {}
+    for sym, node in rolling.items():
+        if isinstance(node, dict) and "history" in node:
+            node = dict(node, history=node["history"][: len(node["history"]) - drop])
+        out[sym] = node
+    return out
+
+
+def _sorted(df):
+    return df.sort_values(["symbol", "asof_date"]).reset_index(drop=True)
+
+
+@pytest.fixture
+def inc_paths(tmp_path, monkeypatch, builder):
+    ds_dir = tmp_path / "dataset"
+    monkeypatch.setattr(mdb, "RAW_PARTS_DIR", ds_dir / "training_data_daily.raw.parts")
+    monkeypatch.setattr(mdb, "INCREMENTAL_STATE_FILE", ds_dir / "training_data_daily.incremental.json")
+    monkeypatch.setattr(mdb, "CORR_SAMPLE_FILE", ds_dir / "training_data_daily.corr_sample.parquet")
+    return ds_dir
+
+
+def _run(monkeypatch, rolling, **kw):
+    monkeypatch.setattr(mdb, "_read_rolling", lambda: rolling)
+    mdb.build_ml_dataset(use_multiprocessing=False, chunk_symbols=4, return_dataframe="none", **kw)
+    meta = json.loads(mdb.FEATURE_LIST_FILE.read_text())
+    return pd.read_parquet(mdb.DATASET_FILE), pd.read_parquet(mdb.LATEST_FEATURES_FILE), meta
+
+
+def test_incremental_append_matches_full_rebuild(inc_paths, monkeypatch):
+    full_rolling = _rolling()
+
+    # night 1: seeds the partitioned dataset; nights 2-3 append 3 + 1 days
+    _, _, meta = _run(monkeypatch, _truncate(full_rolling, 4), incremental=True)
+    assert meta["incremental"]["mode"] == "full"
+    assert not mdb.RAW_DATASET_FILE.exists()
+    _, _, meta = _run(monkeypatch, _truncate(full_rolling, 1), incremental=True)
+    assert meta["incremental"]["mode"] == "append"
+    assert meta["incremental"]["new_rows"] == 3 * 9
+    assert meta["incremental"]["backfilled_targets"] > 0
+    final_i, latest_i, meta_i = _run(monkeypatch, full_rolling, incremental=True)
+    assert meta_i["incremental"]["new_rows"] == 9
+
+    final_f, latest_f, meta_f = _run(monkeypatch, full_rolling, incremental=False)
+    assert meta_f["incremental"]["mode"] == "off"
+    assert not mdb.INCREMENTAL_STATE_FILE.exists()
+
+    assert meta_i["n_rows"] == meta_f["n_rows"]
+    assert meta_i["feature_columns"] == meta_f["feature_columns"]
+    pd.testing.assert_frame_equal(_sorted(final_i), _sorted(final_f))
+    pd.testing.assert_frame_equal(_sorted(latest_i), _sorted(latest_f))
+
+
+def test_incremental_rerun_is_idempotent_and_plan_change_rebuilds(inc_paths, monkeypatch):
+    rolling = _rolling()
+    _run(monkeypatch, rolling, incremental=True)
+    final_a, _, _ = _run(monkeypatch, rolling, incremental=True)
+    final_b, _, meta = _run(monkeypatch, rolling, incremental=True)
+    assert meta["incremental"]["new_rows"] == 0
+    pd.testing.assert_frame_equal(_sorted(final_a), _sorted(final_b))
+
+    rolling["S0"]["metrics"]["new_metric"] = 1.0
+    _, _, meta = _run(monkeypatch, rolling, incremental=True)
+    assert meta["incremental"]["mode"] == "full"
+
+
+def test_incremental_prunes_dropped_symbols_and_counts_partition_rows(inc_paths, monkeypatch):
+    rolling = _rolling()
+    _run(monkeypatch, _truncate(rolling, 2), incremental=True)
+
+    del rolling["S3"]
+    final_i, _, meta_i = _run(monkeypatch, rolling, incremental=True)
+    assert meta_i["incremental"]["mode"] == "append"
+    assert meta_i["incremental"]["pruned_symbols"] == 1
+    assert "S3" not in set(final_i["symbol"])
+    assert meta_i["n_rows"] == len(final_i)
+
+    _, _, meta_again = _run(monkeypatch, rolling, incremental=True)
+    assert meta_again["n_rows"] == meta_i["n_rows"]
+
+    final_f, _, meta_f = _run(monkeypatch, rolling, incremental=False)
+    assert meta_i["n_rows"] == meta_f["n_rows"]
+    pd.testing.assert_frame_equal(_sorted(final_i), _sorted(final_f))
+
+
+def test_stale_full_rebuild_forces_a_rebuild(inc_paths, monkeypatch):
+    rolling = _rolling()
+    _run(monkeypatch, rolling, incremental=True)
+    state = json.loads(mdb.INCREMENTAL_STATE_FILE.read_text())
+    assert state["full_built_at"]
+
+    _, _, meta = _run(monkeypatch, rolling, incremental=True)
+    assert meta["incremental"]["mode"] == "append"
+
+    state["full_built_at"] = "2000-01-01T00:00:00+00:00"
+    mdb.INCREMENTAL_STATE_FILE.write_text(json.dumps(state))
+    _, _, meta = _run(monkeypatch, rolling, incremental=True)
+    assert meta["incremental"]["mode"] == "full"
+
+    monkeypatch.setenv("ML_BUILDER_FULL_REBUILD_DAYS", "0")
+    state = json.loads(mdb.INCREMENTAL_STATE_FILE.read_text())
+    state["full_built_at"] = "2000-01-01T00:00:00+00:00"
+    mdb.INCREMENTAL_STATE_FILE.write_text(json.dumps(state))
+    _, _, meta = _run(monkeypatch, rolling, incremental=True)
+    assert meta["incremental"]["mode"] == "append"
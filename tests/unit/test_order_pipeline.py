@@ -0,0 +1,233 @@
+"""Concurrent order pipeline against a local mock broker (REST + trade_updates stream)."""
+
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("aiohttp")
+from aiohttp import web
+
+from dt_backend.engines import broker_api
+from dt_backend.engines import order_pipeline as op
+from dt_backend.engines.broker_api import Order
+
+
+class _MockBroker:
+    """Alpaca-shaped paper broker on a background loop.
+
+    Orders fill `fill_delay` seconds after the POST; symbols in `reject`
+    are rejected, in `stuck` never fill, in `partial` fill half.
+    """
+
+    def __init__(self, *, stream=True, post_delay=0.1, fill_delay=0.05):
+        self.stream = stream
+        self.post_delay = post_delay
+        self.fill_delay = fill_delay
+        self.reject, self.stuck, self.partial = set(), set(), set()
+        self.orders = {}
+        self.hits = Counter()
+        self.inflight = self.peak = 0
+        self.sockets = []
+
+        app = web.Application()
+        app.router.add_post("/v2/orders", self._post)
+        app.router.add_get("/v2/orders", self._list)
+        app.router.add_get("/v2/orders/{oid}", self._get)
+        app.router.add_delete("/v2/orders/{oid}", self._delete)
+        app.router.add_get("/stream", self._ws)
+
+        self.loop = asyncio.new_event_loop()
+        self.runner = web.AppRunner(app)
+        ready = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.runner.setup())
+            site = web.TCPSite(self.runner, "127.0.0.1", 0)
+            self.loop.run_until_complete(site.start())
+            self.port = site._server.sockets[0].getsockname()[1]
+            ready.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=serve, daemon=True)
+        self.thread.start()
+        ready.wait(5)
+        self.base = f"http://127.0.0.1:{self.port}/v2"
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+    def _push(self, order):
+        msg = json.dumps({"stream": "trade_updates", "data": {"event": order["status"], "order": order}})
+        for ws in list(self.sockets):
+            asyncio.ensure_future(ws.send_bytes(msg.encode("utf-8")))
+
+    def _fill(self, oid):
+        o = self.orders[oid]
+        if o["status"] != "new":
+            return
+        half = o["symbol"] in self.partial
+        o["filled_qty"] = str(float(o["qty"]) / 2 if half else float(o["qty"]))
+        o["filled_avg_price"] = "100.0"
+        o["status"] = "partially_filled" if half else "filled"
+        self._push(dict(o))
+
+    async def _post(self, request):
+        self.hits["POST /orders"] += 1
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+        try:
+            body = await request.json()
+            await asyncio.sleep(self.post_delay)
+        finally:
+            self.inflight -= 1
+        oid = f"o{len(self.orders) + 1}"
+        o = {**body, "id": oid, "status": "new", "filled_qty": "0", "filled_avg_price": None}
+        if body["symbol"] in self.reject:
+            o.update(status="rejected", reason="symbol_not_tradable")
+        self.orders[oid] = o
+        if o["status"] == "new" and body["symbol"] not in self.stuck:
+            asyncio.get_running_loop().call_later(self.fill_delay, self._fill, oid)
+        return web.json_response(dict(o))
+
+    async def _list(self, request):
+        self.hits["GET /orders"] += 1
+        syms = set((request.query.get("symbols") or "").split(","))
+        return web.json_response([dict(o) for o in self.orders.values() if o["symbol"] in syms])
+
+    async def _get(self, request):
+        self.hits["GET /orders/{id}"] += 1
+        return web.json_response(dict(self.orders[request.match_info["oid"]]))
+
+    async def _delete(self, request):
+        self.hits["DELETE /orders/{id}"] += 1
+        o = self.orders[request.match_info["oid"]]
+        if o["status"] != "filled":
+            o["status"] = "canceled"
+        return web.Response(status=204)
+
+    async def _ws(self, request):
+        if not self.stream:
+            return web.Response(status=404)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for msg in ws:
+            data = json.loads(msg.data)
+            if data.get("action") == "auth":
+                await ws.send_json({"stream": "authorization", "data": {"status": "authorized", "action": "authenticate"}})
+            elif data.get("action") == "listen":
+                self.sockets.append(ws)
+                await ws.send_json({"stream": "listening", "data": {"streams": ["trade_updates"]}})
+        return ws
+
+
+@pytest.fixture
+def broker():
+    b = _MockBroker()
+    yield b
+    b.close()
+
+
+def _payloads(symbols):
+    return [
+        {"symbol": s, "side": "buy", "type": "market", "time_in_force": "day", "qty": "10", "client_order_id": f"c-{s}"}
+        for s in symbols
+    ]
+
+
+def _run(broker, payloads, **kw):
+    stream = kw.pop("stream_url", op.stream_url_for(broker.base))
+    pipe = op.OrderPipeline(broker.base, {"APCA-API-KEY-ID": "k", "APCA-API-SECRET-KEY": "s"}, stream_url=stream, **kw)
+    return asyncio.run(pipe.run(payloads)), pipe
+
+
+class TestOrderPipeline:
+    def test_batch_posts_concurrently_and_fills_arrive_on_the_stream(self, broker):
+        syms = [f"S{i:02d}" for i in range(20)]
+        t0 = time.time()
+        outcomes, pipe = _run(broker, _payloads(syms), fill_timeout=5.0)
+        elapsed = time.time() - t0
+
+        assert [o.final["status"] for o in outcomes] == ["filled"] * 20
+        assert [o.payload["symbol"] for o in outcomes] == syms
+        assert broker.peak > 1
+        assert elapsed < 20 * broker.post_delay
+        assert pipe.stats["stream_events"] == 20
+        assert broker.hits["GET /orders/{id}"] == 0
+        assert broker.hits["DELETE /orders/{id}"] == 0
+
+    def test_without_stream_pending_orders_are_polled_in_batches(self):
+        broker = _MockBroker(stream=False)
+        try:
+            outcomes, pipe = _run(broker, _payloads(["AAA", "BBB", "CCC", "DDD"]), fill_timeout=3.0, poll_interval=0.05)
+        finally:
+            broker.close()
+        assert all(o.final["status"] == "filled" for o in outcomes)
+        assert pipe.stats["stream_events"] == 0
+        assert broker.hits["GET /orders"] >= 1
+        assert broker.hits["GET /orders/{id}"] == 0
+
+    def test_unfilled_and_partial_orders_are_cancelled_at_the_deadline(self, broker):
+        broker.reject.add("BAD")
+        broker.stuck.add("SLOW")
+        broker.partial.add("HALF")
+        outcomes, _ = _run(broker, _payloads(["OK", "BAD", "SLOW", "HALF"]), fill_timeout=0.5, stream_idle_poll=0.1)
+        final = {o.payload["symbol"]: o.final for o in outcomes}
+
+        assert final["OK"]["status"] == "filled"
+        assert final["BAD"]["status"] == "rejected"
+        assert final["SLOW"]["status"] == "new"
+        assert (final["HALF"]["status"], final["HALF"]["filled_qty"]) == ("partially_filled", "5.0")
+        assert broker.hits["DELETE /orders/{id}"] == 3
+        assert {o["symbol"]: o["status"] for o in broker.orders.values()}["SLOW"] == "canceled"
+
+
+class TestSubmitOrders:
+    @pytest.fixture
+    def ledger(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(broker_api, "LEDGER_PATH", tmp_path / "bot.json")
+        monkeypatch.setenv("AION_POSITION_REGISTRY_PATH", str(tmp_path / "registry.json"))
+        monkeypatch.setenv("DT_ORDER_PIPELINE", "1")
+        monkeypatch.setenv("DT_BOT_START_CASH", "3500")
+        saves = []
+        real_save = broker_api._save_ledger
+        monkeypatch.setattr(broker_api, "_save_ledger", lambda st: (saves.append(1), real_save(st)))
+        state = broker_api._default_ledger()
+        state["cash"] = 3500.0
+        real_save(state)
+        return saves
+
+    def test_alpaca_batch_reserves_cash_and_saves_the_ledger_once(self, broker, ledger, monkeypatch):
+        monkeypatch.setattr(broker_api, "ALPACA_API_KEY_ID", "k")
+        monkeypatch.setattr(broker_api, "ALPACA_API_SECRET_KEY", "s")
+        monkeypatch.setattr(broker_api, "ALPACA_PAPER_BASE_URL", broker.base)
+        broker.reject.add("BAD")
+
+        items = [(Order(s, "BUY", 10), 100.0) for s in ("AAA", "BAD", "BBB", "CCC")]
+        res = broker_api.submit_orders(items)  # BAD keeps its cash reservation, so CCC no longer fits
+
+        assert [r["status"] for r in res] == ["filled", "rejected", "filled", "rejected"]
+        assert res[1]["reason"] == "alpaca_not_filled_fast"
+        assert res[1]["alpaca_reason"] == "symbol_not_tradable"
+        assert res[3]["reason"] == "insufficient_cash_allowance"
+        assert broker.hits["POST /orders"] == 3
+        assert len(ledger) == 1
+
+        state = broker_api._read_ledger()
+        assert state["cash"] == pytest.approx(1500.0)
+        assert set(state["positions"]["ACTIVE"]) == {"AAA", "BBB"}
+        assert broker_api._ownership_can_sell("AAA", 10) == 10
+
+    def test_local_batch_matches_serial_fills(self, ledger, monkeypatch):
+        monkeypatch.setattr(broker_api, "_alpaca_enabled", lambda: False)
+        res = broker_api.submit_orders([(Order("AAA", "BUY", 5), 100.0), (Order("BBB", "BUY", 5, limit_price=90.0), 100.0)])
+        assert [r["status"] for r in res] == ["filled", "rejected"]
+        assert res[1]["reason"] == "limit_not_reached"
+        assert len(ledger) == 1
+        assert broker_api._read_ledger()["cash"] == pytest.approx(3000.0)
@@ -159,9 +159,13 @@ class TestPredictPageDataFallback:
             }
         }
         
-        # Mock _read_rolling to return test data
+        # The raw-rolling fallback reads the rolling summary index built from this data
+        from backend.core.data_pipeline import HORIZONS
+        from backend.core.rolling_summary import RollingSummary
+
+        summary_rows = RollingSummary.from_rolling(test_data, HORIZONS).rows()
         with patch("backend.routers.page_data_router.PATHS", setup_test_files):
-            with patch("backend.core.data_pipeline._read_rolling", return_value=test_data):
+            with patch("backend.core.data_pipeline.read_rolling_summary", return_value=summary_rows):
                 from backend.routers.page_data_router import get_predict_page_data
                 
                 result = await get_predict_page_data()
@@ -0,0 +1,166 @@
+"""Unit tests for the phase DAG executor (backend.jobs.pipeline_dag)."""
+
+import threading
+import time
+
+import pytest
+
+from backend.jobs.pipeline_dag import (
+    DagAborted,
+    DagExecutor,
+    PhaseCheckpoint,
+    PhaseNode,
+    resolve_dependencies,
+)
+
+
+def _node(key, reads=(), writes=(), fn=None, **kw):
+    return PhaseNode(key=key, title=key, fn=fn or (lambda: key), reads=tuple(reads), writes=tuple(writes), **kw)
+
+
+class TestResolveDependencies:
+    """Edges come from read/write hazards over dotted resources."""
+
+    def test_field_writers_are_independent(self):
+        nodes = [
+            _node("load", reads=["rolling"]),
+            _node("backfill", reads=["rolling"], writes=["rolling"]),
+            _node("fundamentals", writes=["rolling.fundamentals"]),
+            _node("metrics", writes=["rolling.metrics"]),
+            _node("macro", writes=["macro"]),
+            _node("dataset", reads=["rolling", "macro"], writes=["dataset"]),
+        ]
+        deps = resolve_dependencies(nodes)
+        assert deps["fundamentals"] == ("backfill",)
+        assert deps["metrics"] == ("backfill",)
+        assert deps["macro"] == ()
+        assert set(deps["dataset"]) == {"fundamentals", "metrics", "macro"}
+
+    def test_transitive_edges_are_reduced_and_after_is_honoured(self):
+        nodes = [
+            _node("a", writes=["x"]),
+            _node("b", reads=["x"], writes=["y"]),
+            _node("c", reads=["x", "y"]),
+            _node("d", after=("a",)),
+        ]
+        deps = resolve_dependencies(nodes)
+        assert deps["c"] == ("b",)
+        assert deps["d"] == ("a",)
+
+
+class TestDagExecutor:
+    """Scheduling, pool limits, failures and reporting."""
+
+    def test_single_worker_keeps_declared_order(self):
+        order = []
+        nodes = [_node(k, fn=(lambda k=k: order.append(k))) for k in ("a", "b", "c")]
+        DagExecutor(nodes, max_workers=1).run()
+        assert order == ["a", "b", "c"]
+
+    def test_pool_limit_caps_concurrency(self):
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def work():
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+
+        nodes = [_node(f"n{i}", fn=work, pool="net") for i in range(6)]
+        rep = DagExecutor(nodes, pools={"net": 2}, max_workers=6).run()
+        assert active["peak"] == 2
+        assert rep["parallelism"] > 1.0
+
+    def test_non_fatal_error_releases_dependents(self):
+        errors = []
+
+        def boom():
+            raise ValueError("nope")
+
+        nodes = [_node("a", writes=["x"], fn=boom), _node("b", reads=["x"])]
+        ok = []
+        DagExecutor(
+            nodes,
+            max_workers=2,
+            on_ok=lambda n, p, t0: ok.append(n.key),
+            on_error=lambda n, e, t0: errors.append((n.key, str(e))),
+        ).run()
+        assert errors == [("a", "nope")]
+        assert ok == ["b"]
+
+    def test_fatal_error_aborts_and_skips_dependents(self):
+        ran = []
+
+        def boom():
+            raise RuntimeError("model failure")
+
+        nodes = [
+            _node("train", writes=["models"], fn=boom, fatal=True),
+            _node("predict", reads=["models"], fn=lambda: ran.append("predict")),
+        ]
+        ex = DagExecutor(nodes, max_workers=2, on_error=lambda n, e, t0: None)
+        with pytest.raises(DagAborted) as info:
+            ex.run()
+        assert info.value.key == "train"
+        assert ran == []
+        assert ex.report()["critical_path"] == ["train"]
+
+    def test_critical_path_follows_longest_chain(self):
+        nodes = [
+            _node("slow", writes=["a"], fn=lambda: time.sleep(0.1)),
+            _node("fast", writes=["b"]),
+            _node("join", reads=["a", "b"]),
+        ]
+        rep = DagExecutor(nodes, max_workers=2).run()
+        assert rep["critical_path"] == ["slow", "join"]
+        assert rep["nodes"]["slow"]["on_critical_path"] is True
+        assert "on_critical_path" not in rep["nodes"]["fast"]
+        assert rep["nodes"]["join"]["deps"] == ["slow", "fast"]
+
+
+class TestCheckpointResume:
+    """Completed nodes are skipped on a rerun with the same run key."""
+
+    def test_resume_skips_completed_and_restores_state(self, tmp_path):
+        path = tmp_path / "ckpt.json"
+        calls = []
+
+        def step(k, fail=False):
+            def fn():
+                calls.append(k)
+                if fail:
+                    raise RuntimeError("crash")
+                state[k] = True
+            return fn
+
+        state = {}
+        nodes = [
+            _node("load", fn=step("load"), always_run=True),
+            _node("a", writes=["x"], fn=step("a")),
+            _node("b", reads=["x"], fn=step("b", fail=True), fatal=True),
+        ]
+        with pytest.raises(DagAborted):
+            DagExecutor(nodes, max_workers=1, checkpoint=PhaseCheckpoint(path, "normal:2024-01-02"), state=state).run()
+        assert calls == ["load", "a", "b"]
+
+        ckpt = PhaseCheckpoint(path, "normal:2024-01-02")
+        prev = ckpt.load()
+        assert set(prev["completed"]) == {"a"}
+        assert prev["state"] == {"load": True, "a": True}
+
+        calls.clear()
+        nodes[2] = _node("b", reads=["x"], fn=step("b"), fatal=True)
+        rep = DagExecutor(nodes, max_workers=1, checkpoint=ckpt, state=prev["state"]).run(prev["completed"])
+        assert calls == ["load", "b"]
+        assert rep["resumed"] == ["a"]
+        assert rep["nodes"]["a"]["resumed"] is True
+
+    def test_other_run_key_starts_fresh(self, tmp_path):
+        path = tmp_path / "ckpt.json"
+        PhaseCheckpoint(path, "normal:2024-01-02").mark("a", {"status": "ok"}, {})
+        assert PhaseCheckpoint(path, "normal:2024-01-03").load() == {"completed": {}, "state": {}}
+        PhaseCheckpoint(path, "normal:2024-01-02").clear()
+        assert not path.exists()
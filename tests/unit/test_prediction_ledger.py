@@ -0,0 +1,177 @@
+"""Columnar prediction ledger and the incremental accuracy pass."""
+
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from backend.services import accuracy_engine as ae
+from backend.services import prediction_ledger as pl
+
+TODAY = date(2024, 4, 30)
+
+
+def _trading_days(start, end):
+    out, d = [], start
+    while d <= end:
+        if d.weekday() < 5:
+            out.append(d)
+        d += timedelta(days=1)
+    return out
+
+
+def _ledger_rows(runs, syms, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for run in runs:
+        for s in syms:
+            for h in ("1d", "1w", "4w"):
+                rows.append(
+                    {
+                        "run_ts": f"{run.isoformat()}T22:00:00",
+                        "symbol": s,
+                        "horizon": h,
+                        "entry_date": run.isoformat(),
+                        "entry_close": 50.0,
+                        "predicted_return": float(rng.normal(0, 0.03)),
+                        "confidence": float(rng.uniform(0.45, 1.0)),
+                        "score": None,
+                        "no_signal": False,
+                    }
+                )
+    return rows
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    days = _trading_days(date(2024, 1, 2), TODAY)
+    rng = np.random.default_rng(1)
+    syms = ["AAA", "BBB", "CCC", "GONE"]
+    full = {
+        s: {"history": [{"date": d.isoformat(), "close": float(50 + 5 * rng.random())} for d in days]}
+        for s in syms[:3]
+    }
+    jsonl = tmp_path / "predictions_ledger.jsonl"
+    jsonl.write_text("".join(json.dumps(r) + "\n" for r in _ledger_rows(days[-40:], syms)), encoding="utf-8")
+
+    state = {"today": TODAY}
+    monkeypatch.setattr(pl, "LEDGER_DIR", tmp_path / "ledger")
+    monkeypatch.setattr(ae, "LEDGER_PATH", jsonl)
+    monkeypatch.setattr(ae, "_build_symbol_to_sector_map", lambda: {"AAA": "TECH", "BBB": "ENERGY"})
+    monkeypatch.setattr(ae, "_today", lambda: state["today"])
+    monkeypatch.setattr(
+        ae,
+        "read_rolling_view",
+        lambda: {
+            s: {"history": [r for r in n["history"] if r["date"] <= state["today"].isoformat()]}
+            for s, n in full.items()
+        },
+    )
+
+    def run(out_dir, columnar, today=TODAY):
+        monkeypatch.setenv("AION_COLUMNAR_LEDGER", "1" if columnar else "0")
+        monkeypatch.setattr(ae, "ACCURACY_DIR", out_dir)
+        monkeypatch.setattr(ae, "CALIBRATION_PATH", out_dir / "confidence_calibration.json")
+        monkeypatch.setattr(ae, "SECTOR_ACCURACY_PATH", out_dir / "accuracy_by_sector.json")
+        monkeypatch.setattr(ae, "INCREMENTAL_STATE_PATH", out_dir / "state.json")
+        state["today"] = today
+        return ae.compute_accuracy()
+
+    return run, tmp_path, jsonl
+
+
+def _rounded(o):
+    if isinstance(o, dict):
+        return {k: _rounded(v) for k, v in o.items() if k != "file"}
+    if isinstance(o, list):
+        return [_rounded(v) for v in o]
+    return round(o, 9) if isinstance(o, float) else o
+
+
+def _comparable(out):
+    return {h: _rounded(hblk["windows"]) for h, hblk in out["horizons"].items()}
+
+
+class TestColumnarLedger:
+    def test_run_file_is_typed_and_partitioned_by_run_date(self, tmp_path):
+        rows = _ledger_rows([date(2024, 3, 1)], ["aaa"])
+        rows[0]["target_price"] = "51.5"
+        path = pl.write_run(rows, tmp_path)
+        assert path.relative_to(tmp_path).parts[0] == "run_date=2024-03-01"
+
+        table = pl.read_run(path, horizons=["1w"])
+        assert table.num_rows == 1
+        assert str(table.schema.field("entry_date").type) == "date32[day]"
+        assert table.column("symbol").to_pylist() == ["AAA"]
+        assert table.column("score").to_pylist() == [None]
+        assert pl.read_run(path).column("target_price").to_pylist()[0] == 51.5
+
+    def test_import_jsonl_resumes_from_offset(self, tmp_path):
+        jsonl = tmp_path / "l.jsonl"
+        first = _ledger_rows([date(2024, 3, 1)], ["AAA"])
+        jsonl.write_text("".join(json.dumps(r) + "\n" for r in first), encoding="utf-8")
+        written, offset = pl.import_jsonl(jsonl, tmp_path / "ledger")
+        assert (written, offset) == (3, jsonl.stat().st_size)
+
+        with jsonl.open("a", encoding="utf-8") as f:
+            for r in _ledger_rows([date(2024, 3, 4)], ["AAA", "BBB"]):
+                f.write(json.dumps(r) + "\n")
+            f.write('{"partial": ')
+        written, offset2 = pl.import_jsonl(jsonl, tmp_path / "ledger", start_offset=offset)
+        assert written == 6
+        assert offset2 == jsonl.stat().st_size - len('{"partial": ')
+        assert len(pl.list_run_files(tmp_path / "ledger")) == 2
+
+
+class TestIncrementalAccuracy:
+    def test_nightly_passes_match_full_rescore(self, env):
+        run, tmp_path, _jsonl = env
+        full = run(tmp_path / "full", columnar=False)
+
+        for k in range(20, -1, -1):
+            inc = run(tmp_path / "inc", columnar=True, today=TODAY - timedelta(days=k))
+        assert inc["ledger"]["mode"] == "columnar"
+        assert _comparable(inc) == _comparable(full)
+        assert _rounded(json.loads((tmp_path / "inc" / "accuracy_by_sector.json").read_text())) == _rounded(
+            json.loads((tmp_path / "full" / "accuracy_by_sector.json").read_text())
+        )
+        for h in full["horizons"]:
+            assert inc["horizons"][h]["rows_total"] == full["horizons"][h]["rows_total"]
+            assert inc["horizons"][h]["rows_scored"] == full["horizons"][h]["rows_scored"]
+
+    def test_settled_runs_are_not_read_again(self, env):
+        run, tmp_path, _jsonl = env
+        first = run(tmp_path / "inc", columnar=True)
+        assert first["ledger"]["runs_read"] == first["ledger"]["runs_total"] == 40
+
+        again = run(tmp_path / "inc", columnar=True)
+        # Only runs whose 4w horizon has not matured yet are worth a look.
+        assert 0 < again["ledger"]["runs_read"] < 40
+        assert again["ledger"]["pairs_settled"] == 0
+        assert _comparable(again) == _comparable(first)
+
+    def test_lagging_symbol_holds_the_pair_until_its_bar_arrives(self, env, monkeypatch):
+        run, tmp_path, _jsonl = env
+        full_view = ae.read_rolling_view
+        lagged = {"AAA"}
+
+        def view():
+            out = full_view()
+            for s in lagged:
+                out[s] = {"history": out[s]["history"][:-1]}
+            return out
+
+        monkeypatch.setattr(ae, "read_rolling_view", view)
+        out = run(tmp_path / "inc", columnar=True)
+        state = json.loads((tmp_path / "inc" / "state.json").read_text())
+        last_run = max(k for k in state["runs"] if k.startswith("run_date=2024-04-29/"))
+        assert "1d" in state["runs"][last_run]["pending"]
+
+        lagged.clear()
+        out = run(tmp_path / "inc", columnar=True)
+        state = json.loads((tmp_path / "inc" / "state.json").read_text())
+        assert "1d" not in state["runs"][last_run]["pending"]
+        assert out["ledger"]["pairs_settled"] >= 1
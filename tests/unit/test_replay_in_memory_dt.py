@@ -0,0 +1,152 @@
+"""In-memory step replay: pipeline stages run on a caller-owned rolling dict.
+
+With rolling_override + save=False, context/features/regime/daily-plan must
+update the given dict in place and never touch the rolling cache on disk.
+"""
+
+import gzip
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from dt_backend.core import context_state_dt as ctx
+from dt_backend.core import data_pipeline_dt as dp
+from dt_backend.core import meta_controller_dt as meta
+from dt_backend.core import regime_detector_dt as regime
+from dt_backend.engines import feature_engineering as fe
+from dt_backend.engines import broker_api
+from dt_backend.engines import trade_executor
+from dt_backend.historical_replay import step_replay_engine_dt as sre
+
+# 2025-03-03 09:30 New York
+OPEN_UTC = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+
+
+def _bars(rng, n):
+    price = rng.uniform(20.0, 200.0)
+    out = []
+    for i in range(n):
+        price *= 1.0 + rng.gauss(0.0, 0.003)
+        out.append({
+            "ts": (OPEN_UTC + timedelta(minutes=i)).isoformat().replace("+00:00", "Z"),
+            "o": price, "h": price * 1.001, "l": price * 0.999, "c": price,
+            "v": rng.randint(100, 5000), "vw": price,
+        })
+    return out
+
+
+@pytest.fixture
+def rolling():
+    rng = random.Random(5)
+    out = {sym: {"bars_intraday": _bars(rng, 90)} for sym in ("SPY", "QQQ", "AAA", "BBB", "CCC")}
+    out["VIX"] = {"context_dt": {"last_price": 18.0}}
+    return out
+
+
+@pytest.fixture
+def no_disk(monkeypatch):
+    def boom(*_a, **_k):
+        raise AssertionError("rolling cache touched")
+
+    for mod in (ctx, fe, regime, meta):
+        monkeypatch.setattr(mod, "_read_rolling", boom)
+        monkeypatch.setattr(mod, "save_rolling", boom)
+
+
+class TestRollingOverride:
+    def test_stages_update_the_live_dict_without_disk_round_trips(self, rolling, no_disk):
+        now = OPEN_UTC + timedelta(minutes=90)
+
+        meta.ensure_daily_plan(date_override="2025-03-03", rolling_override=rolling, save=False)
+        regime.classify_intraday_regime(now_utc=now, rolling_override=rolling, save=False)
+        out = ctx.build_intraday_context(target_date="2025-03-03", now_utc=now, rolling_override=rolling, save=False)
+        feats = fe.build_intraday_features(now_utc=now, rolling_override=rolling, save=False, ignore_min_interval=True)
+
+        g = rolling["_GLOBAL_DT"]
+        assert g["daily_plan_dt"]["date"] == "2025-03-03"
+        assert "regime_dt" in g
+        assert g["vix_level"] == 18.0
+        assert out["updated"] == 5
+        assert feats["updated"] >= 3
+        assert all(rolling[s]["context_dt"]["has_intraday_data"] for s in ("AAA", "BBB", "CCC"))
+        assert rolling["AAA"]["features_dt"]["last_price"] == pytest.approx(rolling["AAA"]["bars_intraday"][-1]["c"])
+
+    def test_growing_bars_between_steps_are_seen_by_the_next_pass(self, rolling, no_disk):
+        full = {s: n["bars_intraday"] for s, n in rolling.items() if "bars_intraday" in n}
+        for s in full:
+            rolling[s]["bars_intraday"] = list(full[s][:40])
+
+        fe.build_intraday_features(now_utc=OPEN_UTC + timedelta(minutes=40), rolling_override=rolling, save=False)
+        first = rolling["AAA"]["features_dt"]["last_price"]
+
+        for s in full:
+            rolling[s]["bars_intraday"].extend(full[s][40:])
+        fe.build_intraday_features(now_utc=OPEN_UTC + timedelta(minutes=90), rolling_override=rolling, save=False)
+        assert rolling["AAA"]["features_dt"]["last_price"] == pytest.approx(full["AAA"][-1]["c"])
+        assert rolling["AAA"]["features_dt"]["last_price"] != first
+
+
+class TestStepReplay:
+    """replay_intraday_day_step: in-memory cursors vs the per-step disk path."""
+
+    @pytest.fixture
+    def day(self, tmp_path, monkeypatch):
+        rng = random.Random(11)
+        raw_day = [{"symbol": sym, "bars": _bars(rng, 40)} for sym in ("SPY", "QQQ", "AAA", "BBB")]
+        raw_day[3]["bars"] = raw_day[3]["bars"][5:]  # starts late: cursor must not release early bars
+        monkeypatch.setattr(sre, "_load_raw_day", lambda _d: raw_day)
+
+        def hold(df, models=None):
+            return pd.DataFrame({"BUY": 0.0, "HOLD": 1.0, "SELL": 0.0}, index=df.index), None
+
+        monkeypatch.setattr(sre, "load_intraday_models", lambda: None)
+        monkeypatch.setattr(sre, "score_intraday_batch", hold)
+        monkeypatch.setattr(broker_api, "_alpaca_enabled", lambda: False)
+        # decision / feature-importance logs write under the real ml_data_dt
+        monkeypatch.setattr(trade_executor, "DecisionRecorder", None)
+        monkeypatch.setattr(trade_executor, "get_feature_tracker", None)
+
+        writes = []
+        real_lock = dp._acquire_lock
+        monkeypatch.setattr(dp, "_acquire_lock", lambda **kw: (writes.append(1), real_lock(**kw))[1])
+
+        def run(name, in_memory):
+            root = tmp_path / name
+            for k, v in {
+                "DT_TRUTH_DIR": root / "truth",
+                "DT_ROLLING_PATH": root / "rolling.json.gz",
+                "DT_LOCK_PATH": root / "rolling.lock",
+                "DT_BOT_LEDGER_PATH": root / "ledger.json",
+            }.items():
+                monkeypatch.setenv(k, str(v))
+            writes.clear()
+            out = sre.replay_intraday_day_step(date_str="2025-03-03", step_minutes=5, in_memory=in_memory)
+            with gzip.open(root / "rolling.json.gz", "rt", encoding="utf-8") as f:
+                return out, len(writes), json.load(f)
+
+        return raw_day, run
+
+    def test_in_memory_writes_once_and_matches_the_legacy_bars(self, day):
+        raw_day, run = day
+        mem, mem_writes, mem_rolling = run("mem", True)
+        legacy, legacy_writes, legacy_rolling = run("legacy", False)
+
+        assert mem_writes == 1
+        assert legacy_writes > mem.steps
+        assert (mem.steps, mem.symbols, mem.predicted_steps) == (legacy.steps, legacy.symbols, legacy.predicted_steps)
+        for entry in raw_day:
+            sym = entry["symbol"]
+            assert mem_rolling[sym]["bars_intraday"] == entry["bars"]
+            assert mem_rolling[sym]["bars_intraday"] == legacy_rolling[sym]["bars_intraday"]
+            assert mem_rolling[sym]["predictions_dt"]["label"] == "HOLD"
+
+    def test_cursor_releases_each_bar_once(self):
+        bars = _bars(random.Random(2), 10)
+        cur = sre._parse_day([{"symbol": "aaa", "bars": bars}])["AAA"]
+        t = [sre._bar_ts(b) for b in bars]
+        assert (cur.advance(t[3]), cur.i) == (0, 4)
+        assert (cur.advance(t[3]), cur.i) == (4, 4)
+        assert (cur.advance(t[9]), cur.i) == (4, 10)
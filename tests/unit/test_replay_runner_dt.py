@@ -0,0 +1,92 @@
+"""Replay runner: out-of-order checkpoints and merged run metrics."""
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from dt_backend.historical_replay import replay_state_dt as state
+from dt_backend.historical_replay.replay_metrics_dt import compute_metrics_from_trades, merge_metrics_from_trades
+
+
+def _trade_events(sym, entry, exit_px):
+    return [
+        {"type": "bracket_set", "symbol": sym, "side": "BUY", "qty": 10, "entry": entry, "stop": entry - 1.0},
+        {"type": "exit_signal", "symbol": sym, "last": exit_px, "reason": "tp"},
+    ]
+
+
+def _write_jsonl(path: Path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+
+
+class TestCheckpoint:
+    def test_next_date_only_moves_over_contiguous_days(self):
+        st = state._init_run("2025-01-01", "2025-01-06", "v")
+        state._advance_checkpoint(st, ["2025-01-03", "2025-01-05"])
+        assert (st.next_date, st.done_ahead) == ("2025-01-01", ["2025-01-03", "2025-01-05"])
+
+        state._advance_checkpoint(st, ["2025-01-01"])
+        assert (st.next_date, st.done_ahead) == ("2025-01-02", ["2025-01-03", "2025-01-05"])
+
+        state._advance_checkpoint(st, ["2025-01-02"])
+        assert (st.next_date, st.done_ahead) == ("2025-01-04", ["2025-01-05"])
+
+    def test_old_state_files_load_without_done_ahead(self, tmp_path):
+        st = state._init_run("2025-01-01", "2025-01-02", "v")
+        raw = {k: v for k, v in asdict(st).items() if k != "done_ahead"}
+        (tmp_path / "s.json").write_text(json.dumps(raw), encoding="utf-8")
+        assert state._load_state(tmp_path / "s.json").done_ahead == []
+
+    def test_resume_state_roundtrip(self, tmp_path):
+        st = state._init_run("2025-01-01", "2025-01-09", "v")
+        state._advance_checkpoint(st, ["2025-01-01", "2025-01-04"])
+        state._save_state(tmp_path / "s.json", st)
+        again = state._load_state(tmp_path / "s.json")
+        assert (again.next_date, again.done_ahead) == ("2025-01-02", ["2025-01-04"])
+
+
+class TestMergedMetrics:
+    def test_merge_equals_metrics_of_concatenated_days(self, tmp_path):
+        d1, d2 = tmp_path / "d1.jsonl", tmp_path / "d2.jsonl"
+        _write_jsonl(d1, _trade_events("AAA", 10.0, 12.0) + _trade_events("BBB", 20.0, 19.0))
+        _write_jsonl(d2, _trade_events("AAA", 11.0, 9.0))
+        _write_jsonl(tmp_path / "all.jsonl", _trade_events("AAA", 10.0, 12.0) + _trade_events("BBB", 20.0, 19.0) + _trade_events("AAA", 11.0, 9.0))
+
+        merged = merge_metrics_from_trades([d1, d2])
+        assert merged == compute_metrics_from_trades(tmp_path / "all.jsonl")
+        assert merged["trades"] == 3
+        assert merged["drawdown"] == pytest.approx(30.0)
+
+    def test_sequential_run_resumes_and_summarizes_every_day(self, tmp_path, monkeypatch):
+        # The runner pulls in the step engine and the intraday model stack.
+        runner = pytest.importorskip("dt_backend.historical_replay.replay_runner_dt", exc_type=ImportError)
+        from dt_backend.historical_replay.step_replay_engine_dt import StepReplaySummary
+
+        monkeypatch.setattr(runner, "_runs_root", lambda: tmp_path)
+        calls = []
+
+        def fake_replay(*, date_str, **_kw):
+            calls.append(date_str)
+            if date_str == "2025-01-03" and calls.count(date_str) == 1:
+                raise RuntimeError("boom")
+            truth = Path(runner.os.environ["DT_TRUTH_DIR"]) / "intraday" / "dt_trades.jsonl"
+            _write_jsonl(truth, _trade_events("AAA", 10.0, 11.0))
+            return StepReplaySummary(date=date_str, steps=3, symbols=1, predicted_steps=3)
+
+        monkeypatch.setattr(runner, "replay_intraday_day_step", fake_replay)
+        kw = dict(start="2025-01-01", end="2025-01-04", step_minutes=5, version="v", workers=1)
+
+        with pytest.raises(RuntimeError):
+            runner.run_replay(resume=False, force_restart=True, **kw)
+        assert runner._load_state(tmp_path / "replay_state.json").next_date == "2025-01-03"
+
+        out = runner.run_replay(resume=True, force_restart=False, **kw)
+        assert calls == ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-03", "2025-01-04"]
+        assert runner._load_state(tmp_path / "replay_state.json").status == "COMPLETE"
+
+        summary = json.loads((Path(out["run_dir"]) / "run_summary.json").read_text())
+        assert [r["date"] for r in summary["reports"]] == ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"]
+        assert summary["metrics"]["trades"] == 4
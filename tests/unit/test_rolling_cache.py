@@ -0,0 +1,139 @@
+"""Unit tests for the rolling snapshot cache (backend.core.rolling_cache)."""
+
+import copy
+import gzip
+import json
+import os
+
+import pytest
+
+from backend.core import data_pipeline
+from backend.core.rolling_cache import CopyOnWriteRolling, RollingSnapshotCache
+
+
+def _write(path, data):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "rolling.json.gz"
+    _write(path, {"AAPL": {"history": [{"close": 1.0}], "predictions": {"1d": {"score": 0.5}}}, "_meta": {"v": 1}})
+    calls = []
+
+    def load():
+        calls.append(1)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    return path, load, calls
+
+
+class TestRollingSnapshotCache:
+    """Keying, invalidation and counters."""
+
+    def test_parses_once_until_file_changes(self, source):
+        path, load, calls = source
+        cache = RollingSnapshotCache()
+        cache.snapshot(path, load)
+        cache.snapshot(path, load)
+        assert len(calls) == 1
+
+        _write(path, {"MSFT": {}})
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert set(cache.snapshot(path, load).data) == {"MSFT"}
+        assert len(calls) == 2
+
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 2
+        assert stats["parse_seconds_total"] >= 0.0
+
+    def test_invalidate_forces_reload(self, source):
+        path, load, calls = source
+        cache = RollingSnapshotCache()
+        cache.snapshot(path, load)
+        cache.invalidate(path)
+        cache.snapshot(path, load)
+        assert len(calls) == 2
+        assert cache.stats()["invalidations"] == 1
+
+    def test_missing_file_is_not_cached(self, tmp_path):
+        cache = RollingSnapshotCache()
+        assert cache.snapshot(tmp_path / "nope.json.gz", dict).data == {}
+        assert cache.stats()["entries"] == {}
+
+
+class TestViews:
+    """Read-only and copy-on-write views never mutate the shared snapshot."""
+
+    def test_copy_on_write_isolates_callers(self, source):
+        path, load, _ = source
+        cache = RollingSnapshotCache()
+        first = cache.snapshot(path, load).mutable()
+        assert isinstance(first, CopyOnWriteRolling)
+        first["AAPL"]["history"][0]["close"] = 99.0
+        first.setdefault("MSFT", {})["sector"] = "TECH"
+        for _, node in first.items():
+            node["touched"] = True
+
+        second = cache.snapshot(path, load).mutable()
+        assert second["AAPL"]["history"][0]["close"] == 1.0
+        assert "MSFT" not in second and "touched" not in second["AAPL"]
+        assert first["MSFT"] == {"sector": "TECH", "touched": True}
+
+    def test_plain_dict_copies_do_not_share_nodes(self, source):
+        path, load, _ = source
+        cache = RollingSnapshotCache()
+        plain = dict(cache.snapshot(path, load).mutable())
+        plain["AAPL"]["predictions"]["1d"]["score"] = 0.0
+        assert cache.snapshot(path, load).data["AAPL"]["predictions"]["1d"]["score"] == 0.5
+
+    def test_read_only_view(self, source):
+        path, load, _ = source
+        view = RollingSnapshotCache().snapshot(path, load).view()
+        node = view["AAPL"]
+        assert isinstance(node, dict) and isinstance(node["history"], list)
+        with pytest.raises(TypeError):
+            node["sector"] = "TECH"
+        with pytest.raises(TypeError):
+            node["history"].append({})
+        with pytest.raises(TypeError):
+            dict(view)["AAPL"]["predictions"]["1d"]["score"] = 0.0
+
+        thawed = node.copy()
+        thawed["history"].append({"close": 2.0})
+        assert len(view["AAPL"]["history"]) == 1
+        assert json.loads(json.dumps(view)) == load()
+        assert type(copy.deepcopy(view)) is dict
+
+
+class TestDataPipelineCache:
+    """_read_rolling / read_rolling_view go through the cache; saves invalidate it."""
+
+    @pytest.fixture
+    def body(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AION_ROLLING_SHARDED", "0")
+        monkeypatch.setenv("AION_ROLLING_CACHE", "1")
+        monkeypatch.setattr(data_pipeline, "ROLLING_BODY_PATH", tmp_path / "rolling_body.json.gz")
+        monkeypatch.setattr(data_pipeline, "BACKUP_DIR", tmp_path / "backups")
+        monkeypatch.setattr(data_pipeline, "ROLLING_SUMMARY_PATH", tmp_path / "rolling_summary.npz")
+        (tmp_path / "backups").mkdir()
+        return tmp_path
+
+    def test_reads_hit_cache_and_save_invalidates(self, body):
+        data_pipeline.save_rolling({"AAPL": {"sector": "tech"}})
+        before = data_pipeline.rolling_cache_stats()
+
+        rolling = data_pipeline._read_rolling()
+        rolling["AAPL"]["sector"] = "MUTATED"
+        assert data_pipeline.read_rolling_view()["AAPL"]["sector"] == "TECH"
+        assert data_pipeline.get_node("AAPL")["sector"] == "TECH"
+
+        after = data_pipeline.rolling_cache_stats()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 2
+
+        data_pipeline.put_node("AAPL", {"sector": "software"})
+        assert data_pipeline._read_rolling()["AAPL"]["sector"] == "SOFTWARE"
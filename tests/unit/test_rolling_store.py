@@ -0,0 +1,148 @@
+"""Unit tests for the sharded rolling store (backend.core.rolling_store)."""
+
+import json
+import multiprocessing
+
+import pytest
+
+from backend.core import data_pipeline
+from backend.core.rolling_store import ShardedRollingStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ShardedRollingStore(tmp_path / "shards_root")
+
+
+class TestShardedRollingStore:
+    """Per-symbol shard IO and manifest behaviour."""
+
+    def test_put_and_get_node(self, store):
+        assert store.put_node("AAPL", {"symbol": "AAPL", "close": 1.0}) is True
+        assert store.get_node("AAPL") == {"symbol": "AAPL", "close": 1.0}
+        assert store.get_node("MSFT") is None
+        assert "AAPL" in store
+        assert len(store) == 1
+
+    def test_unchanged_node_is_not_rewritten(self, store):
+        store.put_node("AAPL", {"close": 1.0})
+        assert store.put_node("AAPL", {"close": 1.0}) is False
+        assert store.put_node("AAPL", {"close": 2.0}) is True
+
+    def test_symbols_with_unsafe_characters(self, store):
+        store.put_nodes({"BRK/B": {"x": 1}, "^VIX": {"x": 2}, "_meta": {"v": 3}})
+        fresh = ShardedRollingStore(store.root)
+        assert fresh.get_node("BRK/B") == {"x": 1}
+        assert fresh.get_node("^VIX") == {"x": 2}
+        assert fresh.get_node("_meta") == {"v": 3}
+
+    def test_replace_all_writes_only_changed_and_removes_missing(self, store):
+        store.replace_all({"AAPL": {"c": 1}, "MSFT": {"c": 2}, "TSLA": {"c": 3}})
+        stats = store.replace_all({"AAPL": {"c": 1}, "MSFT": {"c": 20}})
+        assert stats == {"written": 1, "unchanged": 1, "removed": 1}
+        assert store.load_all() == {"AAPL": {"c": 1}, "MSFT": {"c": 20}}
+        assert not store._shard_path("TSLA").exists()
+
+    def test_returned_nodes_are_independent_copies(self, store):
+        store.put_node("AAPL", {"c": 1})
+        node = store.get_node("AAPL")
+        node["c"] = 99
+        assert store.get_node("AAPL") == {"c": 1}
+
+    def test_manifest_rebuilt_when_corrupt(self, store):
+        store.put_nodes({"AAPL": {"c": 1}, "MSFT": {"c": 2}})
+        store.manifest_path.write_text("{not json", encoding="utf-8")
+        fresh = ShardedRollingStore(store.root)
+        assert sorted(fresh.symbols()) == ["AAPL", "MSFT"]
+        assert fresh.get_node("MSFT") == {"c": 2}
+
+    def test_shard_cache_skips_load_all_and_is_bounded(self, tmp_path):
+        store = ShardedRollingStore(tmp_path / "root", cache_bytes=40)
+        store.put_nodes({s: {"pad": "x" * 10} for s in ("A", "B", "C")})
+        assert len(store.load_all()) == 3
+        assert not store._cache
+
+        for s in ("A", "B", "C"):
+            store.get_node(s)
+        assert list(store._cache) == ["B", "C"]  # 20-byte payloads, 40-byte budget
+        assert store._cache_bytes <= 40
+
+
+def _put_many(root, prefix, n):
+    store = ShardedRollingStore(root)
+    for i in range(n):
+        store.put_node(f"{prefix}{i}", {"c": i})
+
+
+class TestManifestLocking:
+    def test_concurrent_processes_keep_every_manifest_entry(self, store):
+        store.put_node("SEED", {"c": 0})
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_put_many, args=(store.root, p, 25)) for p in "ABCD"]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(60)
+        assert [p.exitcode for p in procs] == [0, 0, 0, 0]
+        assert len(ShardedRollingStore(store.root)) == 101
+
+    def test_errors_inside_the_update_propagate(self, store, monkeypatch):
+        monkeypatch.setattr(store, "_write_shard", lambda sym, payload: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            store.put_node("AAPL", {"c": 1})
+
+
+class TestDataPipelineShardedBackend:
+    """_read_rolling / save_rolling / get_node / put_node with AION_ROLLING_SHARDED=1."""
+
+    @pytest.fixture
+    def sharded(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AION_ROLLING_SHARDED", "1")
+        monkeypatch.setenv("AION_ROLLING_MONOLITH_MIRROR", "0")
+        monkeypatch.setattr(data_pipeline, "ROLLING_BODY_PATH", tmp_path / "rolling_body.json.gz")
+        monkeypatch.setattr(data_pipeline, "ROLLING_SHARDS_DIR", tmp_path / "rolling_shards")
+        monkeypatch.setattr(data_pipeline, "BACKUP_DIR", tmp_path / "backups")
+        monkeypatch.setattr(data_pipeline, "ROLLING_SUMMARY_PATH", tmp_path / "rolling_summary.npz")
+        return tmp_path
+
+    def test_save_and_read_roundtrip(self, sharded):
+        data_pipeline.save_rolling({"AAPL": {"sector": "tech"}, "_meta": {"v": 1}})
+        rolling = data_pipeline._read_rolling()
+        assert set(rolling) == {"AAPL", "_meta"}
+        assert rolling["AAPL"]["sector"] == "TECH"
+        assert set(rolling["AAPL"]["predictions"]) == set(data_pipeline.HORIZONS)
+        assert not (sharded / "rolling_body.json.gz").exists()
+
+    def test_get_and_put_single_node(self, sharded):
+        data_pipeline.save_rolling({"AAPL": {"sector": "tech"}, "MSFT": {"sector": "tech"}})
+        data_pipeline.put_node("MSFT", {"sector": "software"})
+        assert data_pipeline.get_node("MSFT")["sector"] == "SOFTWARE"
+        assert data_pipeline.get_node("AAPL")["sector"] == "TECH"
+        assert data_pipeline.get_node("NOPE") is None
+        assert set(data_pipeline.get_nodes(["AAPL", "NOPE"])) == {"AAPL"}
+
+    def test_falls_back_to_monolith_until_first_sharded_save(self, sharded, monkeypatch):
+        monkeypatch.setenv("AION_ROLLING_SHARDED", "0")
+        data_pipeline.save_rolling({"AAPL": {"sector": "tech"}})
+        monkeypatch.setenv("AION_ROLLING_SHARDED", "1")
+
+        assert set(data_pipeline._read_rolling()) == {"AAPL"}
+
+        # First put_node seeds shards from the monolith, never a partial universe.
+        data_pipeline.put_node("MSFT", {"sector": "tech"})
+        manifest = json.loads((sharded / "rolling_shards" / "manifest.json").read_text())
+        assert set(manifest["symbols"]) == {"AAPL", "MSFT"}
+
+    def test_put_node_defers_the_monolith_mirror(self, sharded, monkeypatch):
+        monkeypatch.setenv("AION_ROLLING_MONOLITH_MIRROR", "1")
+        data_pipeline.save_rolling({"AAPL": {"sector": "tech"}})
+        body = sharded / "rolling_body.json.gz"
+        assert set(data_pipeline._load_json_gz(body)) == {"AAPL"}
+
+        data_pipeline.put_node("MSFT", {"sector": "tech"})
+        data_pipeline.put_node("TSLA", {"sector": "auto"})
+        assert set(data_pipeline._load_json_gz(body)) == {"AAPL"}
+
+        assert data_pipeline.sync_rolling_mirror() is True
+        assert set(data_pipeline._load_json_gz(body)) == {"AAPL", "MSFT", "TSLA"}
+        assert data_pipeline.sync_rolling_mirror() is False
@@ -0,0 +1,120 @@
+"""Unit tests for the rolling summary side index (backend.core.rolling_summary)."""
+
+import os
+
+import pytest
+
+from backend.core import data_pipeline
+from backend.core.rolling_summary import RollingSummary, RollingSummaryIndex
+
+HORIZONS = ["1d", "1w"]
+
+
+def _rolling():
+    return {
+        "_meta": {"v": 1},
+        "AAPL": {
+            "name": "Apple",
+            "sector": "TECH",
+            "close": 190.5,
+            "history": [{"close": float(i)} for i in range(50)],
+            "predictions": {"1d": {"score": 0.4, "confidence": 0.7, "predicted_return": 0.01}},
+        },
+        "MSFT": {"sector": "TECH", "price": 0, "last": 410.0},
+        "NOPX": {"name": "No price"},
+    }
+
+
+class TestRollingSummaryIndex:
+    """Columnar write/load/update of the summary file."""
+
+    def test_write_and_load_rows(self, tmp_path):
+        idx = RollingSummaryIndex(tmp_path / "summary.npz")
+        assert idx.write(_rolling(), HORIZONS) == 3
+
+        summary = RollingSummaryIndex(idx.path).load()
+        assert len(summary) == 3 and "_meta" not in summary
+        aapl = summary.get("AAPL")
+        assert aapl["name"] == "Apple" and aapl["sector"] == "TECH"
+        assert aapl["price"] == pytest.approx(190.5)
+        assert aapl["predictions"]["1d"] == pytest.approx(
+            {"score": 0.4, "confidence": 0.7, "predicted_return": 0.01}
+        )
+        assert "1w" not in aapl["predictions"]
+        assert summary.get("NOPX")["predictions"] == {}
+        assert summary.prices() == {"AAPL": pytest.approx(190.5), "MSFT": 410.0}
+
+    def test_update_upserts_rows(self, tmp_path):
+        idx = RollingSummaryIndex(tmp_path / "summary.npz")
+        assert idx.update({"AAPL": {}}, HORIZONS) is False
+        idx.write(_rolling(), HORIZONS)
+
+        assert idx.update({"TSLA": {"sector": "AUTO", "close": 250.0}}, HORIZONS) is True
+        rows = RollingSummaryIndex(idx.path).load().rows(["TSLA", "AAPL", "NOPE"])
+        assert set(rows) == {"TSLA", "AAPL"}
+        assert rows["TSLA"]["sector"] == "AUTO"
+        assert rows["AAPL"]["predictions"]["1d"]["confidence"] == pytest.approx(0.7)
+
+    def test_update_rewrites_only_touched_rows(self, tmp_path, monkeypatch):
+        idx = RollingSummaryIndex(tmp_path / "summary.npz")
+        idx.write(_rolling(), HORIZONS)
+        before = idx.load()
+        monkeypatch.setattr(RollingSummary, "to_items", lambda self: pytest.fail("full re-layout"))
+
+        long_name = "Microsoft Corporation (a name longer than any stored so far)"
+        idx.update({"MSFT": {"name": long_name, "sector": "SOFTWARE", "close": 420.0}}, HORIZONS)
+        summary = RollingSummaryIndex(idx.path).load()
+
+        assert summary.symbols == before.symbols
+        assert summary.get("MSFT")["name"] == long_name
+        assert summary.get("MSFT")["price"] == 420.0
+        assert summary.get("AAPL") == before.get("AAPL")
+        assert before.get("MSFT")["price"] == 410.0  # the cached view is not mutated
+
+    def test_read_rebuilds_when_older_than_source(self, tmp_path):
+        idx = RollingSummaryIndex(tmp_path / "summary.npz")
+        idx.write({"AAPL": {"close": 1.0}}, HORIZONS)
+        calls = []
+
+        def load():
+            calls.append(1)
+            return {"AAPL": {"close": 2.0}}
+
+        fresh_mtime = os.stat(idx.path).st_mtime_ns
+        assert idx.read(source_mtime_ns=fresh_mtime, load_rolling=load, horizons=HORIZONS).prices() == {"AAPL": 1.0}
+        assert calls == []
+
+        summary = idx.read(source_mtime_ns=fresh_mtime + 10**9, load_rolling=load, horizons=HORIZONS)
+        assert summary.prices() == {"AAPL": 2.0}
+        assert calls == [1]
+
+
+class TestDataPipelineSummary:
+    """save_rolling / put_node keep the index in sync; read_rolling_summary serves it."""
+
+    @pytest.fixture
+    def paths(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AION_ROLLING_SHARDED", "1")
+        monkeypatch.setenv("AION_ROLLING_MONOLITH_MIRROR", "0")
+        monkeypatch.setenv("AION_ROLLING_SUMMARY", "1")
+        monkeypatch.setattr(data_pipeline, "ROLLING_BODY_PATH", tmp_path / "rolling_body.json.gz")
+        monkeypatch.setattr(data_pipeline, "ROLLING_SHARDS_DIR", tmp_path / "rolling_shards")
+        monkeypatch.setattr(data_pipeline, "BACKUP_DIR", tmp_path / "backups")
+        monkeypatch.setattr(data_pipeline, "ROLLING_SUMMARY_PATH", tmp_path / "rolling_summary.npz")
+        return tmp_path
+
+    def test_save_rolling_writes_summary(self, paths):
+        data_pipeline.save_rolling(_rolling())
+        assert (paths / "rolling_summary.npz").exists()
+
+        rows = data_pipeline.read_rolling_summary()
+        assert set(rows) == {"AAPL", "MSFT", "NOPX"}
+        assert rows["AAPL"]["price"] == pytest.approx(190.5)
+        assert data_pipeline.read_rolling_summary(["MSFT"])["MSFT"]["price"] == 410.0
+
+    def test_put_node_updates_summary(self, paths):
+        data_pipeline.save_rolling(_rolling())
+        data_pipeline.put_node("MSFT", {"sector": "software", "close": 420.0})
+        row = data_pipeline.read_rolling_summary(["MSFT"])["MSFT"]
+        assert row["sector"] == "SOFTWARE"
+        assert row["price"] == 420.0
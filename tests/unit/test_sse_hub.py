@@ -0,0 +1,100 @@
+"""Unit tests for the SSE broadcast hub (backend.services.sse_hub)."""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.services.sse_hub import BroadcastHub
+
+
+def _frame_payload(frame):
+    lines = frame.strip().split("\n")
+    event = lines[0][len("event: "):] if lines[0].startswith("event: ") else "message"
+    return event, json.loads(lines[-1][len("data: "):])
+
+
+class TestBroadcastHub:
+    @pytest.mark.asyncio
+    async def test_topic_is_computed_once_per_tick_for_all_subscribers(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        hub = BroadcastHub()
+        topic = hub.register("t", fetch, interval=60)
+        subs = [hub.subscribe("t") for _ in range(5)]
+        await asyncio.sleep(0.05)  # first tick runs on the producer task
+
+        frames = [await s.next_frame(timeout=1) for s in subs]
+        assert len(calls) == 1
+        assert all(_frame_payload(f) == ("message", {"n": 1}) for f in frames)
+
+        stats = hub.stats()
+        assert stats["subscribers"] == 5
+        assert stats["topics"]["t"]["ticks"] == 1
+        assert stats["topics"]["t"]["compute_last_ms"] >= 0.0
+
+        for s in subs:
+            hub.unsubscribe(s)
+        topic.task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_payload_is_not_resent_and_deltas_are_top_level(self):
+        state = {"a": 1, "b": {"x": 1}, "c": 3}
+        hub = BroadcastHub()
+        topic = hub.register("t", lambda: dict(state), interval=60)
+        full = hub.subscribe("t")
+        delta = hub.subscribe("t", delta=True)
+        await asyncio.sleep(0.05)
+        assert _frame_payload(await delta.next_frame(timeout=1)) == ("message", state)
+        await full.next_frame(timeout=1)
+
+        assert await hub.tick(topic) is False
+        assert await full.next_frame(timeout=0.05) == ": keepalive\n\n"
+
+        state["b"] = {"x": 2}
+        del state["c"]
+        assert await hub.tick(topic) is True
+        assert _frame_payload(await delta.next_frame(timeout=1)) == ("delta", {"set": {"b": {"x": 2}}, "unset": ["c"]})
+        assert _frame_payload(await full.next_frame(timeout=1)) == ("message", {"a": 1, "b": {"x": 2}})
+        assert hub.stats()["topics"]["t"]["unchanged_ticks"] == 1
+
+        hub.unsubscribe(full)
+        hub.unsubscribe(delta)
+        topic.task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_keeps_latest_and_resyncs_with_full_payload(self):
+        state = {"v": 0}
+        hub = BroadcastHub()
+        topic = hub.register("t", lambda: dict(state), interval=60)
+        slow = hub.subscribe("t", delta=True, maxsize=2)
+        await asyncio.sleep(0.05)
+        await slow.next_frame(timeout=1)
+
+        for v in range(1, 6):
+            state["v"] = v
+            await hub.tick(topic)
+        assert slow.queue.qsize() <= 2
+        assert hub.stats()["topics"]["t"]["dropped_messages"] > 0
+
+        # Overflow drops the backlog; the resync after drops is a full snapshot.
+        assert _frame_payload(await slow.next_frame(timeout=1)) == ("message", {"v": 5})
+        assert slow.queue.empty()
+
+        hub.unsubscribe(slow)
+        topic.task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_producer_stops_without_subscribers(self):
+        hub = BroadcastHub()
+        topic = hub.register("t", lambda: {"ok": True}, interval=0.01)
+        sub = hub.subscribe("t")
+        await asyncio.sleep(0.05)
+        hub.unsubscribe(sub)
+        await asyncio.wait_for(topic.task, timeout=1)
+        assert hub.stats()["topics"]["t"]["running"] is False
+        assert topic.last_text is None
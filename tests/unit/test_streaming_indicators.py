@@ -0,0 +1,170 @@
+"""Unit tests for streaming (incremental) intraday indicator state."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dt_backend.core.bar_store_dt import ColumnarBarStore, bars_to_columns
+from dt_backend.engines import feature_engineering as fe
+from dt_backend.engines import indicators as ind
+from dt_backend.engines import streaming_indicators as si
+from dt_backend.engines.streaming_indicators import IndicatorState, IndicatorStateStore
+
+
+# 2025-03-03 09:30 New York
+OPEN_UTC = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _bars(start: datetime, n: int, *, seed: int = 3, step_min: int = 1):
+    rng = random.Random(seed)
+    price = 50.0
+    out = []
+    for i in range(n):
+        price *= 1.0 + rng.gauss(0.0, 0.003)
+        out.append({
+            "ts": _iso(start + timedelta(minutes=step_min * i)),
+            "o": price,
+            "h": price * 1.002,
+            "l": price * 0.997,
+            "c": price,
+            "v": rng.choice([0, 100, 2500]),
+            "vw": price,
+        })
+    return out
+
+
+def _expected(bars):
+    _, cols = bars_to_columns(bars)
+    h, l, c, v = (cols[k].tolist() for k in ("h", "l", "c", "v"))
+    vw = fe._session_vwap_series(h, l, c, v)
+    rets = [ind.pct_change(c[i], c[i - 1]) for i in range(1, len(c))]
+    return {
+        "vwap": vw[-1],
+        "vwap_slope": ind.lin_slope(vw, window=min(20, len(vw))),
+        "atr_14": ind.atr(h, l, c, window=14),
+        "realized_vol": ind.realized_vol(rets),
+        "ema_9": ind.ema(c, 9),
+        "rsi_14": ind.rsi(c, 14),
+    }
+
+
+@pytest.fixture
+def bar_store(tmp_path):
+    return ColumnarBarStore(tmp_path / "bars")
+
+
+@pytest.mark.parametrize("n", [1, 2, 9, 14, 15, 16, 60])
+def test_state_matches_scalar_helpers(n):
+    bars = _bars(OPEN_UTC, n)
+    ts, cols = bars_to_columns(bars)
+    st = IndicatorState()
+    for i in range(n):
+        st.update(int(ts[i]), cols["h"][i], cols["l"][i], cols["c"][i], cols["v"][i])
+
+    got = st.features()
+    for key, want in _expected(bars).items():
+        assert got[key] == pytest.approx(want, rel=1e-9, abs=1e-12), key
+
+
+def test_advance_consumes_only_new_rows(bar_store):
+    states = IndicatorStateStore(bar_store)
+    bars = _bars(OPEN_UTC, 50)
+
+    bar_store.append_bars("AAPL", "1Min", bars[:30])
+    assert states.advance(["AAPL"], "1Min") == {"AAPL": 30}
+    assert states.advance(["AAPL"], "1Min") == {}
+
+    bar_store.append_bars("AAPL", "1Min", bars[25:])
+    assert states.advance(["aapl"], "1Min") == {"AAPL": 20}
+
+    # A fresh store reloads the persisted state.
+    st = IndicatorStateStore(bar_store).get("AAPL", "1Min")
+    assert st.rows == 50 and st.n == 50
+    for key, want in _expected(bars).items():
+        assert st.features()[key] == pytest.approx(want, rel=1e-9, abs=1e-12), key
+
+
+def test_new_session_resets_state(bar_store):
+    states = IndicatorStateStore(bar_store)
+    bar_store.append_bars("AAPL", "1Min", _bars(OPEN_UTC, 40))
+    states.advance(["AAPL"], "1Min")
+
+    day2 = _bars(OPEN_UTC + timedelta(days=1), 12, seed=9)
+    bar_store.append_bars("AAPL", "1Min", day2)
+    assert states.advance(["AAPL"], "1Min") == {"AAPL": 12}
+
+    st = states.get("AAPL", "1Min")
+    assert st.day == "2025-03-04" and st.n == 12
+    assert st.features()["ema_9"] == pytest.approx(_expected(day2)["ema_9"])
+
+
+def test_features_served_only_when_state_is_current(tmp_path, monkeypatch):
+    monkeypatch.setenv("DT_BAR_STORE_DIR", str(tmp_path / "bars"))
+    monkeypatch.setenv("DT_FEATURES_STREAMING", "1")
+    bars = _bars(OPEN_UTC, 30, step_min=5)
+    node = {"bars_intraday_5m": bars}
+    now = OPEN_UTC + timedelta(hours=3)
+
+    from dt_backend.core.bar_store_dt import get_bar_store
+    get_bar_store().append_bars("AAPL", "5Min", bars[:29])
+    si.advance_indicator_state(["AAPL"], "5Min")
+
+    # State stops one bar short of the window: computed from bars.
+    stale = fe._feature_snapshot_for_symbol("AAPL", node, rolling={}, tf_key="5Min", mkt={}, now_utc=now)
+    assert stale["ema_9"] == ind.ema([b["c"] for b in bars], 9)
+
+    get_bar_store().append_bars("AAPL", "5Min", bars[29:])
+    si.advance_indicator_state(["AAPL"], "5Min")
+    st = si.get_indicator_state_store().get("AAPL", "5Min")
+
+    scalar = fe._feature_snapshot_for_symbol("AAPL", node, rolling={}, tf_key="5Min", mkt={}, now_utc=now)
+    batch = fe._feature_snapshots_batch([("AAPL", node)], tf_key="5Min", mkt={}, now_utc=now)["AAPL"]
+    for key, want in st.features().items():
+        assert scalar[key] == want
+        assert batch[key] == want
+
+
+def test_state_files_are_per_symbol(bar_store):
+    states = IndicatorStateStore(bar_store)
+    bar_store.append_bars("AAPL", "1Min", _bars(OPEN_UTC, 20))
+    bar_store.append_bars("MSFT", "1Min", _bars(OPEN_UTC, 20, seed=5))
+    states.advance(["AAPL", "MSFT"], "1Min")
+    msft = bar_store.root / "1Min" / "MSFT" / "_indicator_state.json"
+    before = msft.stat().st_mtime_ns
+
+    bar_store.append_bars("AAPL", "1Min", _bars(OPEN_UTC + timedelta(minutes=20), 5, seed=7))
+    assert states.advance(["AAPL", "MSFT"], "1Min") == {"AAPL": 5}
+    assert msft.stat().st_mtime_ns == before
+    assert bar_store.days("AAPL", "1Min") == ["2025-03-03"]
+
+
+def test_live_advance_is_off_unless_features_consume_it(tmp_path, monkeypatch):
+    monkeypatch.setenv("DT_BAR_STORE_DIR", str(tmp_path / "bars"))
+    monkeypatch.delenv("DT_FEATURES_STREAMING", raising=False)
+    from dt_backend.core.bar_store_dt import get_bar_store
+    get_bar_store().append_bars("AAPL", "5Min", _bars(OPEN_UTC, 20, step_min=5))
+
+    assert si.advance_indicator_state(["AAPL"], "5Min") == {}
+    assert not list((tmp_path / "bars").rglob("_indicator_state.json"))
+
+
+def test_window_spanning_sessions_is_computed_from_bars(tmp_path, monkeypatch):
+    monkeypatch.setenv("DT_BAR_STORE_DIR", str(tmp_path / "bars"))
+    monkeypatch.setenv("DT_FEATURES_STREAMING", "1")
+    prev = _bars(OPEN_UTC - timedelta(days=1), 10, seed=4, step_min=5)
+    today = _bars(OPEN_UTC, 20, step_min=5)
+    from dt_backend.core.bar_store_dt import get_bar_store
+    get_bar_store().append_bars("AAPL", "5Min", prev + today)
+    si.advance_indicator_state(["AAPL"], "5Min")
+    assert si.get_indicator_state_store().get("AAPL", "5Min").n == 20
+
+    bars = prev + today
+    snap = fe._feature_snapshot_for_symbol(
+        "AAPL", {"bars_intraday_5m": bars}, rolling={}, tf_key="5Min", mkt={}, now_utc=OPEN_UTC + timedelta(hours=3)
+    )
+    assert snap["ema_9"] == ind.ema([b["c"] for b in bars], 9)
@@ -0,0 +1,148 @@
+"""Parallel swing replay: per-day sandboxes, snapshot mounts, stage cache, scheduling."""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from backend.core.config import PATHS
+from backend.historical_replay_swing import parallel_executor as pe
+
+
+class TestSandbox:
+    def test_outputs_are_rerooted_and_inputs_shared(self, tmp_path):
+        boxed = pe.sandbox_paths(dict(PATHS), tmp_path)
+
+        assert boxed["rolling_body"] == tmp_path / "da_brains" / "rolling_body.json.gz"
+        assert boxed["core_brains"] == tmp_path / "da_brains" / "core"
+        assert boxed["nightly_predictions"] == tmp_path / "logs" / "nightly" / "predictions"
+        assert boxed["bots_config"] == tmp_path / "ml_data" / "config" / "bots_config.json"
+        assert boxed["swing_replay_snapshots"] == tmp_path / "snapshots"
+        for key in ("universe_master_file", "raw_daily", "news_cache", "swing_replay_state", "root"):
+            assert boxed[key] == PATHS[key]
+        assert boxed["ML_DATASET_DAILY"] == PATHS["ML_DATASET_DAILY"]
+
+    def test_mount_exposes_only_the_replayed_day(self, tmp_path):
+        snaps = tmp_path / "snaps"
+        for day in ("2025-01-02", "2025-01-03"):
+            (snaps / day).mkdir(parents=True)
+            (snaps / day / "manifest.json").write_text(json.dumps({"date": day}))
+
+        mount = pe.mount_snapshot(snaps, tmp_path / "box", "2025-01-03")
+        assert [p.name for p in mount.iterdir()] == ["2025-01-03"]
+        assert json.loads((mount / "2025-01-03" / "manifest.json").read_text())["date"] == "2025-01-03"
+
+    def test_apply_sandbox_reroots_already_imported_rolling_paths(self, tmp_path):
+        # A spawned day worker may already hold backend.core (e.g. re-imported
+        # by the parent's main module); its rolling writes must still land in
+        # the sandbox.
+        script = (
+            "import json, sys\n"
+            "from backend.historical_replay_swing import parallel_executor as pe\n"
+            "clean = 'backend.core' not in sys.modules\n"
+            "from backend.core import data_pipeline as dp\n"
+            "pe.apply_sandbox(sys.argv[1])\n"
+            "print(json.dumps({'clean': clean, 'paths': [str(p) for p in (\n"
+            "    dp.ROLLING_BODY_PATH, dp.BRAIN_PATH, dp.BACKUP_DIR,\n"
+            "    dp.ROLLING_SHARDS_DIR, dp.ROLLING_SUMMARY_PATH)]}))\n"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", script, str(tmp_path)],
+            cwd=str(PATHS["root"]),
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert proc.returncode == 0, proc.stderr
+        out = json.loads(proc.stdout.strip().splitlines()[-1])
+        assert out["clean"]
+        for p in out["paths"]:
+            assert Path(p).is_relative_to(tmp_path), p
+
+
+class TestStageCache:
+    def test_first_day_fills_later_days_reuse(self, tmp_path):
+        cache = pe.StageCache(tmp_path / "stage_cache")
+        calls = []
+
+        def phase(ctx):
+            calls.append(ctx)
+            out = Path(ctx) / "ml_data" / "news_features"
+            out.mkdir(parents=True)
+            (out / "intel.json").write_text('{"n": 3}')
+            return {"rows": 3}
+
+        outputs = ("ml_data/news_features",)
+        a, b = tmp_path / "a", tmp_path / "b"
+        assert cache.wrap("news_intel", phase, a, outputs)(str(a)) == {"rows": 3}
+        assert cache.wrap("news_intel", phase, b, outputs)(str(b)) == {"stage_cache": "hit", "result": {"rows": 3}}
+        assert calls == [str(a)]
+        assert (b / "ml_data" / "news_features" / "intel.json").read_text() == '{"n": 3}'
+
+    def test_failed_fill_is_retried_by_the_next_day(self, tmp_path):
+        cache = pe.StageCache(tmp_path)
+        attempts = []
+
+        def phase(_ctx):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+            return {"ok": True}
+
+        with pytest.raises(RuntimeError):
+            cache.wrap("news_intel", phase, tmp_path / "a")(None)
+        assert cache.wrap("news_intel", phase, tmp_path / "b")(None) == {"ok": True}
+        assert not (tmp_path / "news_intel.lock").exists()
+
+
+class TestScheduling:
+    def _run(self, tmp_path, days, workers, stop_after=None):
+        lock = threading.Lock()
+        live, peak, starts, done = set(), [0], [], []
+
+        def fake_day(day, run_root, snapshots_root):
+            with lock:
+                live.add(day)
+                peak[0] = max(peak[0], len(live))
+            time.sleep(0.05)
+            with lock:
+                live.discard(day)
+            return {"day": day, "status": "error" if day.endswith("03") else "ok", "secs": 1.0}
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pe.run_days_parallel(
+                days,
+                workers=workers,
+                run_root=tmp_path,
+                executor=pool,
+                on_start=starts.append,
+                on_done=lambda res, in_flight: done.append((res["day"], in_flight)),
+                should_stop=lambda: stop_after is not None and len(done) >= stop_after,
+                day_fn=fake_day,
+            )
+        return results, peak[0], starts, done
+
+    def test_keeps_workers_days_in_flight(self, tmp_path):
+        days = [f"2025-01-{d:02d}" for d in range(1, 8)]
+        results, peak, starts, done = self._run(tmp_path, days, workers=3)
+        assert sorted(r["day"] for r in results) == days
+        assert peak == 3
+        assert max(len(s) for s in starts) == 3
+        assert [r["status"] for r in results if r["day"] == "2025-01-03"] == ["error"]
+        assert done[-1][1] == []
+
+    def test_stop_lets_in_flight_days_finish_without_new_ones(self, tmp_path):
+        days = [f"2025-01-{d:02d}" for d in range(1, 8)]
+        results, _, _, _ = self._run(tmp_path, days, workers=2, stop_after=1)
+        assert 1 <= len(results) <= 2
+        assert {r["day"] for r in results} <= {"2025-01-01", "2025-01-02"}
+
+    def test_eta_counts_worker_rounds(self):
+        assert pe.compute_parallel_eta([10.0, 20.0], remaining=5, workers=2) == 45.0
+        assert pe.compute_parallel_eta([], remaining=5, workers=2) is None
+        assert pe.compute_parallel_eta([10.0], remaining=0, workers=2) == 0.0
@@ -0,0 +1,101 @@
+"""Unit tests for the date-partitioned trade journal (trade_journal_dt)."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from dt_backend.services import dt_truth_store
+from dt_backend.services.trade_journal_dt import TradeJournal
+
+
+TODAY = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _evt(typ, sym, *, side="BUY", day=TODAY, **extra):
+    return {"ts": f"{day}T15:00:00Z", "type": typ, "symbol": sym, "side": side, **extra}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return TradeJournal(tmp_path / "dt_trades_segments", legacy_path=tmp_path / "dt_trades.jsonl")
+
+
+class TestTradeJournal:
+
+    def test_counts_and_pnl(self, journal):
+        journal.append(_evt("order_submitted", "aapl"))
+        journal.append(_evt("bracket_set", "AAPL"))
+        journal.append(_evt("order_submitted", "AAPL", side="SELL"))
+        journal.append(_evt("fill_exit", "AAPL", pnl=12.5))
+        journal.append(_evt("exit", "AAPL", realized_pnl="-2.5"))
+        journal.append(_evt("order_filled", "AAPL", pnl="bad"))
+        journal.append(_evt("order_submitted", "AAPL", day="2020-01-02"))
+
+        assert journal.entries("AAPL") == 2
+        assert journal.realized_pnl("aapl") == pytest.approx(10.0)
+        assert journal.entries("AAPL", "2020-01-02") == 1
+        assert journal.entries("MSFT") == 0
+        assert (journal.root / f"{TODAY}.jsonl").exists()
+
+    def test_index_rebuilt_from_segment(self, journal):
+        for _ in range(3):
+            journal.append(_evt("order_submitted", "MSFT"))
+        journal.append(_evt("exit", "MSFT", pnl=4.0))
+
+        fresh = TradeJournal(journal.root, legacy_path=journal.legacy_path)
+        assert fresh.entries("MSFT") == 3
+        assert fresh.realized_pnl("MSFT") == pytest.approx(4.0)
+
+    def test_sees_appends_from_other_writers(self, journal):
+        other = TradeJournal(journal.root, legacy_path=journal.legacy_path)
+        assert journal.entries("TSLA") == 0
+        other.append(_evt("order_submitted", "TSLA"))
+        journal.append(_evt("order_submitted", "TSLA"))
+        assert journal.entries("TSLA") == 2
+        assert other.entries("TSLA") == 2
+
+    def test_partial_trailing_line_is_deferred(self, journal):
+        journal.append(_evt("order_submitted", "NVDA"))
+        seg = journal.segment_path(TODAY)
+        line = json.dumps(_evt("order_submitted", "NVDA"))
+        with open(seg, "a", encoding="utf-8") as f:
+            f.write(line[:10])
+        assert journal.entries("NVDA") == 1
+        with open(seg, "a", encoding="utf-8") as f:
+            f.write(line[10:] + "\n")
+        assert journal.entries("NVDA") == 2
+
+    def test_legacy_file_split_on_first_use(self, tmp_path):
+        legacy = tmp_path / "dt_trades.jsonl"
+        lines = [_evt("order_submitted", "AMD"), _evt("order_submitted", "AMD", day="2020-01-02"), _evt("exit", "AMD", pnl=3)]
+        legacy.write_text("\n".join(json.dumps(e) for e in lines) + "\nnot json\n", encoding="utf-8")
+
+        j = TradeJournal(tmp_path / "dt_trades_segments", legacy_path=legacy)
+        assert j.entries("AMD") == 1
+        assert j.realized_pnl("AMD") == pytest.approx(3.0)
+        assert sorted(p.name for p in j.root.glob("*.jsonl")) == ["2020-01-02.jsonl", f"{TODAY}.jsonl"]
+
+        # Split happens once.
+        again = TradeJournal(j.root, legacy_path=legacy)
+        assert again.entries("AMD") == 1
+
+
+class TestTruthStoreQueries:
+
+    def test_journal_matches_legacy_scan(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DT_TRUTH_DIR", str(tmp_path))
+        monkeypatch.setattr(dt_truth_store, "get_shared_store", lambda: None)
+
+        dt_truth_store.append_trade_event(_evt("order_submitted", "AAPL"))
+        dt_truth_store.append_trade_event(_evt("bracket_set", "AAPL"))
+        dt_truth_store.append_trade_event(_evt("fill_exit", "AAPL", pnl=-7.25))
+        dt_truth_store.append_trade_event(_evt("order_submitted", "MSFT", day="2020-01-02"))
+
+        assert dt_truth_store.count_trades_today("AAPL") == 2
+        assert dt_truth_store.get_symbol_pnl_today("AAPL") == pytest.approx(-7.25)
+        assert dt_truth_store.count_trades_today("MSFT") == 0
+
+        monkeypatch.setenv("DT_TRADE_JOURNAL", "0")
+        assert dt_truth_store.count_trades_today("AAPL") == 2
+        assert dt_truth_store.get_symbol_pnl_today("AAPL") == pytest.approx(-7.25)
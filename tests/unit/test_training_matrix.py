@@ -0,0 +1,121 @@
+"""Tests for the shared multi-horizon training matrix (backend.core.memmap_trainer)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("lightgbm")
+pytest.importorskip("pyarrow")
+
+from backend.core import memmap_trainer as mt  # noqa: E402
+
+FEATURES = ["f_a", "f_b", "f_missing"]
+TARGETS = ["target_ret_1d", "target_ret_1w"]
+
+
+@pytest.fixture
+def parquet(tmp_path):
+    n = 400
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "symbol": np.where(np.arange(n) % 2 == 0, "aaa", "BBB"),
+            "f_a": rng.normal(size=n),
+            "f_b": rng.normal(size=n),
+            "target_ret_1d": rng.normal(0.0, 0.02, size=n),
+            "target_ret_1w": rng.normal(0.0, 0.05, size=n),
+        }
+    )
+    df.loc[df.index % 4 == 0, "target_ret_1w"] = np.nan
+    df.loc[df.index % 10 == 0, ["target_ret_1d", "target_ret_1w"]] = np.nan  # no target at all
+    df.loc[5, "f_b"] = np.nan
+    path = tmp_path / "train.parquet"
+    df.to_parquet(path, index=False)
+    return path, df
+
+
+def _build(path, **kw):
+    kw.setdefault("max_rows", 10_000)
+    return mt.build_training_matrix(str(path), FEATURES, TARGETS, tmp_root=str(path.parent / "mm"), batch_rows=64, **kw)
+
+
+def test_single_pass_keeps_rows_with_any_target(parquet):
+    path, df = parquet
+    mx = _build(path)
+    eligible = df[df[TARGETS].notna().any(axis=1)]
+
+    assert mx.rows_used == mx.rows_seen == len(eligible)
+    np.testing.assert_allclose(mx.X[:, 0], eligible["f_a"].to_numpy(dtype=np.float32))
+    assert (mx.X[:, 2] == 0.0).all()  # missing feature column → zeros
+    np.testing.assert_allclose(mx.target("target_ret_1w"), eligible["target_ret_1w"].to_numpy(dtype=np.float32))
+    assert mx.usable_counts == {c: int(df[c].notna().sum()) for c in TARGETS}
+    assert not mx.features_finite[list(eligible.index).index(5)]
+
+    rows = mx.target_rows("target_ret_1w")
+    X = mx.features(rows)
+    assert np.isfinite(X).all() and len(rows) == int(df["target_ret_1w"].notna().sum())
+    mx.cleanup()
+
+
+def test_symbol_row_mask(parquet):
+    path, df = parquet
+    mx = _build(path)
+    mask = mx.row_mask({"AAA"})
+    assert mask is not None and mask.sum() == int(df[TARGETS].notna().any(axis=1)[df["symbol"] == "aaa"].sum())
+    assert mx.row_mask(None) is None
+
+    filtered = _build(path, symbol_whitelist={"bbb"})
+    assert set(filtered.symbols) == {"BBB"}
+    mx.cleanup()
+    filtered.cleanup()
+
+
+def test_reservoir_caps_rows(parquet):
+    path, df = parquet
+    mx = _build(path, max_rows=50)
+    assert mx.rows_used == 50
+    assert mx.rows_seen == int(df[TARGETS].notna().any(axis=1).sum())
+    assert mx.usable_rows_est("target_ret_1d", mx.target_rows("target_ret_1d"), None) == int(df["target_ret_1d"].notna().sum())
+    mx.cleanup()
+
+
+def test_reservoir_slots_keep_last_row_per_slot():
+    rng = np.random.default_rng(1)
+    src, slots = mt._reservoir_slots(rng, seen_before=10, m=1000, max_rows=10)
+    assert len(set(slots.tolist())) == len(slots)
+    assert (slots < 10).all() and (src < 1000).all()
+
+
+def test_train_lgbm_on_rows_uses_finite_rows_only(parquet):
+    path, df = parquet
+    mx = _build(path)
+    res = mt.train_lgbm_on_rows(
+        mx,
+        "target_ret_1d",
+        {"objective": "regression", "verbosity": -1, "num_boost_round": 5, "min_data_in_leaf": 5},
+        mx.row_mask({"AAA"}),
+        min_rows=10,
+    )
+    expected = (df["symbol"] == "aaa") & df["target_ret_1d"].notna() & df[["f_a", "f_b"]].notna().all(axis=1)
+    assert res.rows_used == int(expected.sum())
+    assert res.model.num_trees() == 5
+    mx.cleanup()
+
+
+def test_train_lgbm_on_rows_reuses_binary_dataset(parquet, tmp_path):
+    path, _ = parquet
+    mx = _build(path)
+    params = {"objective": "regression", "verbosity": -1, "num_boost_round": 5, "min_data_in_leaf": 5}
+    cache = str(tmp_path / "ds" / "1d.fit.bin")
+
+    first = mt.train_lgbm_on_rows(mx, "target_ret_1d", params, min_rows=10, binary_cache=cache, binary_meta={"k": 1})
+    assert not first.dataset_cached
+
+    # Different tree params must still work against the saved bins.
+    second = mt.train_lgbm_on_rows(
+        mx, "target_ret_1d", {**params, "min_data_in_leaf": 2}, min_rows=10, binary_cache=cache
+    )
+    assert second.dataset_cached
+    assert second.rows_used == first.rows_used
+    assert second.model.num_trees() == 5
+    mx.cleanup()
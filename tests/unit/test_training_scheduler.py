@@ -0,0 +1,88 @@
+"""Unit tests for the process-wide training scheduler (backend.core.training_scheduler)."""
+
+import threading
+import time
+
+import pytest
+
+from backend.core.training_scheduler import ResourceBudget, TrainingScheduler
+
+
+class TestResourceBudget:
+    """Core split and env overrides."""
+
+    def test_cores_split_into_workers(self, monkeypatch):
+        monkeypatch.setenv("AION_TRAIN_TOTAL_CORES", "16")
+        monkeypatch.setenv("AION_TRAIN_THREADS_PER_JOB", "4")
+        monkeypatch.delenv("AION_TRAIN_MAX_WORKERS", raising=False)
+        monkeypatch.setenv("AION_TRAIN_MEM_GB", "2")
+        b = ResourceBudget.from_env()
+        assert (b.total_cores, b.threads_per_job, b.max_workers) == (16, 4, 4)
+        assert b.mem_bytes == 2 * 1024**3
+
+    def test_max_workers_cap_and_thread_clamp(self, monkeypatch):
+        monkeypatch.setenv("AION_TRAIN_TOTAL_CORES", "2")
+        monkeypatch.setenv("AION_TRAIN_THREADS_PER_JOB", "8")
+        monkeypatch.setenv("AION_TRAIN_MAX_WORKERS", "1")
+        b = ResourceBudget.from_env()
+        assert b.threads_per_job == 2
+        assert b.max_workers == 1
+
+
+class TestMemoryAdmission:
+    """Jobs wait while their memory estimate does not fit."""
+
+    def test_second_job_waits_for_release(self):
+        sched = TrainingScheduler(ResourceBudget(total_cores=2, threads_per_job=1, max_workers=2, mem_bytes=100))
+        sched._acquire_mem(70)
+        admitted = threading.Event()
+
+        def second():
+            sched._acquire_mem(70)
+            admitted.set()
+
+        t = threading.Thread(target=second)
+        t.start()
+        assert not admitted.wait(0.2)
+        sched._release_mem(70)
+        assert admitted.wait(2.0)
+        t.join()
+
+    def test_oversized_job_runs_alone(self):
+        sched = TrainingScheduler(ResourceBudget(total_cores=2, threads_per_job=1, max_workers=2, mem_bytes=100))
+        sched._acquire_mem(10_000)
+        assert sched._mem_in_use == 100
+        sched._release_mem(10_000)
+        assert sched._mem_in_use == 0
+
+
+class TestSubmitAndReport:
+    """Jobs run in the pool and report queue/wall times."""
+
+    @pytest.fixture
+    def sched(self):
+        s = TrainingScheduler(ResourceBudget(total_cores=2, threads_per_job=1, max_workers=2, mem_bytes=1024**3))
+        yield s
+        s.shutdown()
+
+    def test_results_and_timings(self, sched):
+        t0 = time.time()
+        futs = [sched.submit(f"job{i}", dict, {"i": i}, group="g1") for i in range(3)]
+        assert [f.result(timeout=60) for f in futs] == [{"i": 0}, {"i": 1}, {"i": 2}]
+
+        rep = sched.report(group="g1", since=t0)
+        assert rep["totals"]["jobs"] == 3
+        assert rep["totals"]["errors"] == 0
+        assert all(j["queue_secs"] is not None and j["wall_secs"] is not None for j in rep["jobs"])
+        assert rep["budget"]["max_workers"] == 2
+
+    def test_errors_are_reported_and_groups_filtered(self, sched):
+        fut = sched.submit("bad", int, {"x": "nope"}, group="g2")
+        with pytest.raises(TypeError):
+            fut.result(timeout=60)
+        sched.submit("ok", dict, {}, group="g3").result(timeout=60)
+
+        rep = sched.report(group="g2")
+        assert rep["totals"] == {**rep["totals"], "jobs": 1, "errors": 1}
+        assert rep["jobs"][0]["status"] == "error"
+        assert sched._mem_in_use == 0